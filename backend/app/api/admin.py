@@ -2,6 +2,9 @@ from fastapi import APIRouter, HTTPException, Depends, Query
 from supabase import Client
 from app.core.supabase_client import get_supabase_client
 from app.core.logging import get_logger
+from app.core.ai_metrics import ai_metrics
+from app.services.embedding_index import rebuild_index
+from app.services.skill_index import backfill_skills
 from pydantic import BaseModel, EmailStr
 from typing import Optional, List, Dict, Any
 from datetime import datetime, timedelta
@@ -159,6 +162,65 @@ async def get_analytics_trends(
         raise HTTPException(status_code=500, detail=f"Failed to fetch trends: {str(e)}")
 
 
+# ==================== AI USAGE ENDPOINTS ====================
+
+@router.get("/ai/usage")
+async def get_ai_usage(
+    days: int = Query(default=7, ge=1, le=90),
+    caller: Optional[str] = Query(default=None, description="Filter to one feature tag"),
+):
+    """
+    Get AI token and latency accounting per feature.
+
+    Reports call counts, errors, retries, token totals and p50/p95 latency for
+    each AI call site (resume parsing, matching, question generation,
+    evaluation, voice interviews), plus daily token totals.
+    Figures cover calls handled by this API worker since it started.
+    """
+    try:
+        return ai_metrics.summary(days=days, caller=caller)
+    except Exception as e:
+        logger.error(f"Error fetching AI usage: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to fetch AI usage: {str(e)}")
+
+
+@router.post("/embeddings/rebuild")
+async def rebuild_embedding_index(
+    supabase: Client = Depends(get_supabase_client)
+):
+    """
+    Re-embed every candidate and job into the pre-rank index.
+
+    Needed once after enabling the index on an existing database, after
+    changing EMBEDDING_PROVIDER/EMBEDDING_DIM, and on each new host (the
+    index files are local). Candidates and jobs written through the API are
+    indexed as they are stored.
+    """
+    try:
+        return {"indexed": await rebuild_index(supabase)}
+    except Exception as e:
+        logger.error(f"Error rebuilding embedding index: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to rebuild embedding index: {str(e)}")
+
+
+@router.post("/skills/backfill")
+async def backfill_candidate_skills(
+    supabase: Client = Depends(get_supabase_client)
+):
+    """
+    Re-normalize candidates.skills_normalized from parsed_data.
+
+    Migration 008 backfills lowercased skills; this applies the API's alias
+    mapping (k8s -> kubernetes) to rows written before it. Rows already up
+    to date are skipped.
+    """
+    try:
+        return {"updated": backfill_skills(supabase)}
+    except Exception as e:
+        logger.error(f"Error backfilling candidate skills: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to backfill candidate skills: {str(e)}")
+
+
 # ==================== USER MANAGEMENT ENDPOINTS ====================
 
 @router.get("/users")
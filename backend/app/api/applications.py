@@ -1,8 +1,9 @@
 from fastapi import APIRouter, HTTPException, Depends
 from pydantic import BaseModel
 from supabase import Client
-from app.services.ai_matching import match_candidate_to_job
+from app.services.ai_matching import MATCH_STRATEGIES, match_candidate_to_job, stream_match_recommendation
 from app.core.logging import get_logger
+from app.core.sse import sse_response
 from app.core.supabase_client import get_supabase_client
 from app.models.application import (
     Application,
@@ -21,6 +22,8 @@ class MatchRequest(BaseModel):
     candidate_email: str | None = None
     job_id: str
     cover_letter: str | None = None
+    force: bool = False  # re-run the AI match even if nothing changed
+    strategy: str = "llm"  # or "lexical": keyword score, no AI call, not saved
 
 @router.post("/match", response_model=MatchResponse)
 async def match_candidate(
@@ -34,8 +37,17 @@ async def match_candidate(
     1. Compare candidate profile with JD
     2. Generate fit score (0-100)
     3. Provide explainable highlights
+
+    If neither the candidate nor the job changed since the last match, the
+    stored analysis is returned (`cached: true`); pass `force` to re-run it.
+
+    strategy "lexical" returns a deterministic keyword (BM25) score instead,
+    without an AI call and without saving it.
     """
     try:
+        if request.strategy not in MATCH_STRATEGIES:
+            raise HTTPException(status_code=400, detail=f"Invalid strategy. Must be one of: {', '.join(MATCH_STRATEGIES)}")
+
         # Resolve candidate_id if only email is provided
         candidate_id = request.candidate_id
         if not candidate_id and request.candidate_email:
@@ -51,33 +63,50 @@ async def match_candidate(
 
         logger.info(f"Matching candidate {candidate_id} to job {request.job_id}")
 
-        # Match using AI service
-        result = await match_candidate_to_job(candidate_id, request.job_id)
-        
-        # Create application in database
-        # Merge cover letter into highlights for storage
-        merged_highlights = dict(result['highlights'] or {})
-        if request.cover_letter:
-            merged_highlights["cover_letter"] = request.cover_letter
-
-        application_data = ApplicationCreate(
-            candidate_id=candidate_id,
-            job_id=request.job_id,
-            fit_score=result['fit_score'],
-            highlights=merged_highlights
+        # Scores, stores the application (with the cover letter) and reuses
+        # the previous analysis if neither side changed
+        result = await match_candidate_to_job(
+            candidate_id,
+            request.job_id,
+            cover_letter=request.cover_letter,
+            force=request.force,
+            strategy=request.strategy,
         )
-        # Upsert to avoid duplicate applications for same candidate+job
-        supabase.table("applications").upsert(
-            application_data.model_dump(mode="json"),
-            on_conflict="candidate_id,job_id",
-        ).execute()
-
         return result
     
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error matching candidate: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.get("/{application_id}/recommendation/stream")
+async def stream_application_recommendation(
+    application_id: str,
+    supabase: Client = Depends(get_supabase_client)
+):
+    """
+    Stream an AI hiring recommendation for an application as Server-Sent Events.
+
+    Emits `token` events ({"text": ...}) as Gemini generates them, then `done`.
+    Closing the connection cancels generation.
+    """
+    try:
+        response = supabase.table("applications").select("candidate_id, job_id").eq("id", application_id).single().execute()
+        if not response.data:
+            raise HTTPException(status_code=404, detail="Application not found")
+
+        chunks = await stream_match_recommendation(response.data["candidate_id"], response.data["job_id"])
+        return sse_response(chunks)
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error streaming recommendation for application {application_id}: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to stream recommendation.")
+
+
 @router.get("/{application_id}", response_model=ApplicationDetail)
 async def get_application(
     application_id: str,
@@ -1,19 +1,25 @@
-from fastapi import APIRouter, UploadFile, File, HTTPException, Depends
+from fastapi import APIRouter, UploadFile, File, HTTPException, Depends, Query
 from supabase import Client
 from app.models.candidate import ResumeUploadResponse, Candidate, CandidateCreate, ParsedData
-from app.services.ai_parser import parse_resume
+from app.services.ai_parser import RESUME_PARSE_MODES, reparse_stored_resume, reuse_cached_resume
+from app.services.resume_cache import find_by_content_hash
+from app.core.config import settings
 from app.core.logging import get_logger
-from app.core.supabase_client import get_supabase_client, ensure_storage_bucket_exists
+from app.core.uploads import UploadTooLargeError, spool_upload
+from app.core.supabase_client import get_supabase_client
+from app.services.resume_pipeline import process_resume_upload
+from app.services.resume_storage import ResumeStorageError
+from app.services.resume_text import load_resume_text
+from app.services.embedding_index import index_candidate
+from app.services.skill_index import MAX_QUERY_SKILLS, normalize_skills, search_candidates, skill_columns
+from app.services.bulk_ingestion import BulkIngestionError, bulk_manager, zip_entries
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
 import uuid
 
 logger = get_logger(__name__)
 router = APIRouter()
 
-# Storage bucket name for resumes
-RESUMES_BUCKET_NAME = "resumes"
-
 class CandidateUpdate(BaseModel):
     """Model for updating candidate information"""
     name: Optional[str] = None
@@ -23,6 +29,7 @@ class CandidateUpdate(BaseModel):
 @router.post("/parse", response_model=ResumeUploadResponse)
 async def upload_and_parse_resume(
     file: UploadFile = File(...),
+    force: bool = Query(False, description="Re-parse even if this resume was parsed before"),
     supabase: Client = Depends(get_supabase_client)
 ):
     """
@@ -30,14 +37,18 @@ async def upload_and_parse_resume(
 
     This endpoint:
     1. Accepts a resume file (PDF/DOC/DOCX)
-    2. Ensures the storage bucket exists
-    3. Uploads the resume to Supabase Storage
-    4. Uses AI to extract structured data
-    5. Scrapes links found in the resume
-    6. Stores the candidate in the database
+    2. Uploads the resume to Supabase Storage while
+    3. Extracting text and parsing it with AI
+    4. Stores the candidate in the database
+    5. Queues scraping of links found in the resume; poll
+       /api/footprints/{candidate_id}/status for progress
+
+    A byte-identical file that was parsed before is answered from the
+    resume cache (no upload or AI call) unless force=true.
 
     Args:
         file: The resume file to upload and parse
+        force: Skip the resume cache and re-parse
         supabase: Supabase client instance (injected dependency)
 
     Returns:
@@ -56,67 +67,28 @@ async def upload_and_parse_resume(
             logger.warning(error_msg)
             raise HTTPException(status_code=400, detail=error_msg)
 
-        # Ensure storage bucket exists before uploading
-        # Note: If automatic creation fails, user must create bucket manually in Supabase Dashboard
+        # Stream the upload into a spooled temp file, enforcing the size limit as it is read
         try:
-            ensure_storage_bucket_exists(RESUMES_BUCKET_NAME, supabase)
-        except Exception as bucket_error:
-            error_msg = str(bucket_error)
-            logger.warning(
-                f"Could not automatically create storage bucket '{RESUMES_BUCKET_NAME}': {error_msg}. "
-                f"Will attempt upload - if bucket doesn't exist, upload will fail with clear instructions."
-            )
-            # Don't fail here - let the upload attempt happen
-            # The upload error will provide better context
-
-        # Read file content
-        content = await file.read()
-
-        # Validate file size (10MB limit)
-        max_size = 10 * 1024 * 1024  # 10MB
-        if len(content) > max_size:
-            error_msg = f"File size ({len(content)} bytes) exceeds maximum allowed size ({max_size} bytes)"
-            logger.warning(error_msg)
-            raise HTTPException(status_code=400, detail=error_msg)
-
-        # Generate a unique file name
-        unique_filename = f"{uuid.uuid4()}.{file_ext}"
-        storage_path = f"resumes/{unique_filename}"
-
-        logger.info(f"Uploading resume to storage: {storage_path}")
-
-        # Upload to Supabase Storage
-        try:
-            upload_response = supabase.storage.from_(RESUMES_BUCKET_NAME).upload(
-                file=content,
-                path=storage_path,
-                file_options={"content-type": file.content_type or "application/octet-stream"}
-            )
-            logger.info(f"Successfully uploaded resume to storage: {storage_path}")
-        except Exception as upload_error:
-            error_msg = str(upload_error)
-            logger.error(f"Failed to upload resume to storage: {error_msg}")
-
-            # Provide more helpful error messages
-            if "Bucket not found" in error_msg or "bucket" in error_msg.lower():
-                raise HTTPException(
-                    status_code=500,
-                    detail=f"Storage bucket '{RESUMES_BUCKET_NAME}' not found. Please create it in your Supabase dashboard under Storage."
-                )
-            raise HTTPException(status_code=500, detail=f"Failed to upload resume: {error_msg}")
-
-        # Get public URL
-        try:
-            resume_url = supabase.storage.from_(RESUMES_BUCKET_NAME).get_public_url(storage_path)
-            logger.info(f"Resume public URL: {resume_url}")
-        except Exception as url_error:
-            logger.error(f"Failed to get public URL: {str(url_error)}")
-            # Continue without URL if it fails, but log the error
-            resume_url = f"{RESUMES_BUCKET_NAME}/{storage_path}"
-
-        # Parse resume using AI service
-        logger.info("Starting AI parsing of resume content...")
-        result = await parse_resume(content, file.filename, resume_url)
+            upload = await spool_upload(file, settings.MAX_UPLOAD_SIZE)
+        except UploadTooLargeError as too_large:
+            logger.warning(f"Rejected {file.filename}: {str(too_large)}")
+            raise HTTPException(status_code=413, detail=str(too_large))
+
+        with upload:
+            # Exact re-upload: reuse the stored file and parse
+            if not force:
+                cached = find_by_content_hash(upload.sha256, supabase)
+                if cached:
+                    logger.info(f"Resume {file.filename} already parsed; reusing cached result")
+                    return await reuse_cached_resume(cached, supabase)
+
+            # Storage upload runs alongside extraction + AI parsing; link
+            # scraping is queued for the footprint enrichment worker
+            logger.info("Starting AI parsing of resume content...")
+            try:
+                result = await process_resume_upload(upload, supabase, force=force)
+            except ResumeStorageError as upload_error:
+                raise HTTPException(status_code=500, detail=str(upload_error))
 
         # Log the parsed data for debugging
         logger.info(f"Parse result - candidate_id: {result.candidate_id}")
@@ -134,6 +106,111 @@ async def upload_and_parse_resume(
         logger.error(error_msg, exc_info=True)
         raise HTTPException(status_code=500, detail=error_msg)
 
+@router.post("/parse/bulk", status_code=202)
+async def bulk_upload_and_parse_resumes(
+    files: List[UploadFile] = File(...),
+    force: bool = Query(False, description="Re-parse resumes even if they were parsed before"),
+    supabase: Client = Depends(get_supabase_client)
+):
+    """
+    Upload and parse many resumes at once.
+
+    Accepts any mix of resume files (PDF/DOC/DOCX) and ZIP archives of
+    resumes. Processing runs in the background as a pipeline (upload,
+    extraction, AI parsing, storage; link scraping is queued); poll
+    GET /parse/bulk/{job_id} for per-file progress. Resumes parsed before
+    are reused from the resume cache unless force=true.
+
+    Returns:
+        The job id, file count and status URL
+
+    Raises:
+        HTTPException: If the upload is empty, too large, or a ZIP is invalid
+    """
+    spooled_files = []
+    try:
+        entries = []
+        for file in files:
+            # Copied into temp files we own (FastAPI closes uploads after the
+            # response). Per-file size limits are applied by the pipeline.
+            spooled = await spool_upload(file, None)
+            spooled_files.append(spooled)
+            if (file.filename or "").lower().endswith(".zip"):
+                entries.extend(zip_entries(spooled.file))
+            else:
+                entries.append((file.filename or "resume", spooled.read_bytes))
+
+        job = bulk_manager.start(
+            entries,
+            supabase,
+            cleanup=[spooled.close for spooled in spooled_files],
+            force=force,
+        )
+        logger.info(f"Bulk upload accepted: {len(entries)} files, job {job.id}")
+        return {
+            **job.to_dict(include_files=False),
+            "status_url": f"/api/candidates/parse/bulk/{job.id}",
+        }
+
+    except BulkIngestionError as e:
+        for spooled in spooled_files:
+            spooled.close()
+        logger.warning(f"Bulk upload rejected: {str(e)}")
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        for spooled in spooled_files:
+            spooled.close()
+        error_msg = f"Failed to start bulk resume parsing: {str(e)}"
+        logger.error(error_msg, exc_info=True)
+        raise HTTPException(status_code=500, detail=error_msg)
+
+@router.get("/parse/bulk/{job_id}")
+async def get_bulk_parse_status(job_id: str):
+    """Progress and per-file results of a bulk resume upload"""
+    job = bulk_manager.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Bulk upload job not found")
+    return job.to_dict()
+
+@router.post("/{candidate_id}/reparse", response_model=ResumeUploadResponse)
+async def reparse_candidate_resume(
+    candidate_id: str,
+    mode: Optional[str] = Query(None, description="Parse mode: llm, hybrid, sections or rules (default RESUME_PARSE_MODE)"),
+    supabase: Client = Depends(get_supabase_client)
+):
+    """
+    Re-parse a candidate's resume from its stored extracted text.
+
+    Useful after a prompt or model change: the original file is not
+    downloaded or extracted again. Candidates stored before resume text
+    was kept have to upload their resume again.
+    """
+    try:
+        if mode is not None and mode.lower() not in RESUME_PARSE_MODES:
+            raise HTTPException(status_code=400, detail=f"Invalid mode: {mode}. Use one of: {', '.join(RESUME_PARSE_MODES)}")
+
+        candidate = supabase.table("candidates").select("id, parsed_data").eq("id", candidate_id).limit(1).execute()
+        if not candidate.data:
+            raise HTTPException(status_code=404, detail="Candidate not found")
+
+        text = load_resume_text(candidate_id, supabase)
+        if text is None:
+            raise HTTPException(status_code=409, detail="No stored resume text for this candidate; upload the resume again")
+
+        previous_links = (candidate.data[0].get("parsed_data") or {}).get("links") or None
+        parsed_data = await reparse_stored_resume(candidate_id, text, supabase, previous_links, mode=mode)
+        return ResumeUploadResponse(
+            candidate_id=candidate_id,
+            message="Resume re-parsed from stored text",
+            parsed_data=parsed_data,
+        )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error re-parsing resume for candidate {candidate_id}: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 @router.get("/")
 async def list_candidates(
     supabase: Client = Depends(get_supabase_client)
@@ -151,6 +228,37 @@ async def list_candidates(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/search")
+async def search_candidates_by_skill(
+    all_skills: Optional[List[str]] = Query(None, alias="all", description="Skills the candidate must have (AND)"),
+    any_skills: Optional[List[str]] = Query(None, alias="any", description="Skills of which the candidate needs at least one (OR)"),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    supabase: Client = Depends(get_supabase_client)
+):
+    """
+    Search candidates by skill, newest first, with the total match count.
+
+    `all` and `any` may be repeated or comma-separated and combined:
+    ?all=python&all=kubernetes&any=aws,gcp finds candidates with Python
+    and Kubernetes and either AWS or GCP. Aliases match (k8s = kubernetes).
+    """
+    try:
+        # Count skills after comma-splitting and de-duplication, not raw query values
+        required = normalize_skills(all_skills)
+        alternatives = normalize_skills(any_skills)
+        if not required and not alternatives:
+            raise HTTPException(status_code=400, detail="Provide at least one skill in 'all' or 'any'")
+        if len(required) > MAX_QUERY_SKILLS or len(alternatives) > MAX_QUERY_SKILLS:
+            raise HTTPException(status_code=400, detail=f"At most {MAX_QUERY_SKILLS} skills per list")
+        return search_candidates(supabase, all_skills=required, any_skills=alternatives, limit=limit, offset=offset)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error searching candidates by skill: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to search candidates.")
+
+
 @router.get("/me")
 async def get_current_candidate(
     email: str,
@@ -211,10 +319,12 @@ async def create_candidate(
             "email": candidate.email,
             "parsed_data": candidate.parsed_data.dict() if hasattr(candidate, 'parsed_data') and candidate.parsed_data else None
         }
+        data.update(skill_columns(data["parsed_data"]))
 
         response = supabase.table("candidates").insert(data).execute()
 
         if response.data and len(response.data) > 0:
+            await index_candidate(response.data[0]["id"], data["parsed_data"])
             return response.data[0]
         raise HTTPException(status_code=500, detail="Failed to create candidate")
 
@@ -238,6 +348,7 @@ async def update_candidate(
             data["email"] = update_data.email
         if update_data.parsed_data is not None:
             data["parsed_data"] = update_data.parsed_data.dict()
+            data.update(skill_columns(data["parsed_data"]))
 
         if not data:
             raise HTTPException(status_code=400, detail="No fields to update")
@@ -245,6 +356,8 @@ async def update_candidate(
         response = supabase.table("candidates").update(data).eq("id", candidate_id).execute()
 
         if response.data and len(response.data) > 0:
+            if "parsed_data" in data:
+                await index_candidate(candidate_id, data["parsed_data"])
             return response.data[0]
         raise HTTPException(status_code=404, detail="Candidate not found")
 
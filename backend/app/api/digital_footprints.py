@@ -2,6 +2,7 @@ from fastapi import APIRouter, HTTPException, Depends
 from supabase import Client
 from app.core.logging import get_logger
 from app.core.supabase_client import get_supabase_client
+from app.services.footprint_enrichment import completed_footprint, get_enrichment_status
 from typing import Dict, Any
 
 logger = get_logger(__name__)
@@ -32,6 +33,29 @@ async def get_digital_footprint(
         logger.error(f"Error getting digital footprint for candidate {candidate_id}: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.get("/{candidate_id}/status")
+async def get_digital_footprint_status(
+    candidate_id: str,
+    supabase: Client = Depends(get_supabase_client)
+):
+    """
+    Get the enrichment progress of a candidate's digital footprint.
+
+    Link scraping runs in the background after a resume upload; poll this
+    until enrichment_status is completed, failed or skipped.
+    """
+    try:
+        status = get_enrichment_status(candidate_id, supabase)
+        if status:
+            return status
+        raise HTTPException(status_code=404, detail="Digital footprint not found")
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error getting digital footprint status for candidate {candidate_id}: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 @router.post("/{candidate_id}/refresh")
 async def refresh_digital_footprint(
     candidate_id: str,
@@ -62,12 +86,7 @@ async def refresh_digital_footprint(
         enriched_data = await scrape_links(links)
         
         # Update digital footprint
-        footprint_data = {
-            "candidate_id": candidate_id,
-            "github_data": enriched_data.get("github"),
-            "linkedin_data": enriched_data.get("linkedin"),
-            "portfolio_data": enriched_data.get("portfolio"),
-        }
+        footprint_data = completed_footprint(candidate_id, links, enriched_data)
         
         supabase.table("digital_footprints").upsert(
             footprint_data, on_conflict="candidate_id"
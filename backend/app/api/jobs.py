@@ -1,11 +1,16 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Query
 from supabase import Client
-from typing import List
-from pydantic import BaseModel
+from typing import List, Optional
+from pydantic import BaseModel, Field
 
 from app.models.job import Job, JobCreate, JobUpdate
+from app.core.config import settings
 from app.core.logging import get_logger
+from app.core.sse import sse_event_response
 from app.core.supabase_client import get_supabase_client
+from app.services.embedding_index import index_job, remove_job
+from app.services.job_ranking import MAX_SHORTLIST, RANK_STRATEGIES, first_stage, rank_job
+from app.services.job_rescoring import RESCORE_FIELDS, enqueue_rescore, get_rescore_status, needs_rescore
 
 logger = get_logger(__name__)
 router = APIRouter()
@@ -14,6 +19,13 @@ class JobStatusUpdate(BaseModel):
     """Request to update job status"""
     status: str
 
+class RankRequest(BaseModel):
+    """Options for ranking a job's candidates"""
+    strategy: str = "embedding"
+    shortlist: Optional[int] = Field(default=None, ge=1, le=MAX_SHORTLIST)
+    applicants_only: bool = True
+    concurrency: Optional[int] = Field(default=None, ge=1, le=16)
+
 @router.post("/", response_model=Job)
 async def create_job(
     job: JobCreate,
@@ -25,6 +37,7 @@ async def create_job(
         response = supabase.table("jobs").insert(job.dict()).execute()
         
         if response.data:
+            await index_job(response.data[0])
             return response.data[0]
         
         raise HTTPException(status_code=500, detail="Failed to create job.")
@@ -64,10 +77,24 @@ async def update_job(
     job: JobUpdate,
     supabase: Client = Depends(get_supabase_client)
 ):
-    """Update a job posting"""
+    """
+    Update a job posting.
+
+    Changing the description or requirements queues a background re-score
+    of the job's applications; follow it with GET /{job_id}/rescore.
+    """
     try:
-        response = supabase.table("jobs").update(job.dict(exclude_unset=True)).eq("id", job_id).execute()
+        changes = job.dict(exclude_unset=True)
+        before = None
+        if any(field in changes for field in RESCORE_FIELDS):
+            current = supabase.table("jobs").select(", ".join(RESCORE_FIELDS)).eq("id", job_id).execute()
+            before = current.data[0] if current.data else None
+
+        response = supabase.table("jobs").update(changes).eq("id", job_id).execute()
         if response.data:
+            await index_job(response.data[0])
+            if before is not None and needs_rescore(before, response.data[0]):
+                enqueue_rescore(job_id, supabase)
             return response.data[0]
         raise HTTPException(status_code=404, detail="Job not found to update")
     except Exception as e:
@@ -85,6 +112,7 @@ async def delete_job(
         response = supabase.table("jobs").delete().eq("id", job_id).execute()
         if not response.data:
              raise HTTPException(status_code=404, detail="Job not found to delete")
+        remove_job(job_id)
         return
     except Exception as e:
         logger.error(f"Error deleting job {job_id}: {str(e)}")
@@ -116,3 +144,130 @@ async def update_job_status(
     except Exception as e:
         logger.error(f"Error updating job status: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to update job status.")
+
+
+@router.get("/{job_id}/prerank")
+async def prerank_job_candidates(
+    job_id: str,
+    limit: int = Query(50, ge=1, le=500),
+    applicants_only: bool = True,
+    strategy: str = "embedding",
+    supabase: Client = Depends(get_supabase_client)
+):
+    """
+    Shortlist candidates for a job before any LLM scoring.
+
+    With the default embedding strategy, prerank_score is the cosine
+    similarity between the job and each candidate's profile; "skills" gives
+    the share of the job's skills, "lexical" the BM25 fit score (0-100).
+    With applicants_only (the default) the job's applicants are ranked;
+    otherwise the whole candidate pool.
+    """
+    try:
+        if strategy not in RANK_STRATEGIES:
+            raise HTTPException(status_code=400, detail=f"Invalid strategy. Must be one of: {', '.join(RANK_STRATEGIES)}")
+        if strategy == "embedding" and not settings.EMBEDDING_ENABLED:
+            raise HTTPException(status_code=400, detail="Embedding ranking is disabled; use strategy 'skills'")
+
+        job_response = supabase.table("jobs").select("*").eq("id", job_id).execute()
+        if not job_response.data:
+            raise HTTPException(status_code=404, detail="Job not found")
+        job = job_response.data[0]
+
+        candidate_ids = None
+        if applicants_only:
+            applications = supabase.table("applications").select("candidate_id").eq("job_id", job_id).execute()
+            candidate_ids = list(dict.fromkeys(row["candidate_id"] for row in applications.data or []))
+
+        pool_size, ranked = await first_stage(job, supabase, strategy, candidate_ids, limit)
+
+        names = {}
+        if ranked:
+            candidates = supabase.table("candidates").select("id, name, email").in_("id", [cid for cid, _ in ranked]).execute()
+            names = {row["id"]: row for row in candidates.data or []}
+
+        return {
+            "job_id": job_id,
+            "strategy": strategy,
+            "pool_size": pool_size,
+            "candidates": [
+                {
+                    "candidate_id": candidate_id,
+                    "name": names.get(candidate_id, {}).get("name"),
+                    "email": names.get(candidate_id, {}).get("email"),
+                    "prerank_score": round(score, 4),
+                }
+                for candidate_id, score in ranked
+            ],
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error pre-ranking candidates for job {job_id}: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to pre-rank candidates.")
+
+
+@router.post("/{job_id}/rank")
+async def rank_job_candidates(
+    job_id: str,
+    request: Optional[RankRequest] = None,
+    supabase: Client = Depends(get_supabase_client)
+):
+    """
+    Rank candidates for a job, streamed as Server-Sent Events.
+
+    A cheap first stage (embedding similarity or skill overlap) shortlists
+    the pool; only the shortlist is scored by the LLM matcher, with bounded
+    concurrency. Emits `shortlist`, then a `result` per candidate as its
+    score lands, then `done` with the final ranking. Scores are saved to
+    applications.fit_score in batches as they arrive.
+    """
+    request = request or RankRequest()
+    try:
+        if request.strategy not in RANK_STRATEGIES:
+            raise HTTPException(status_code=400, detail=f"Invalid strategy. Must be one of: {', '.join(RANK_STRATEGIES)}")
+        if request.strategy == "embedding" and not settings.EMBEDDING_ENABLED:
+            raise HTTPException(status_code=400, detail="Embedding ranking is disabled; use strategy 'skills'")
+
+        job_response = supabase.table("jobs").select("*").eq("id", job_id).execute()
+        if not job_response.data:
+            raise HTTPException(status_code=404, detail="Job not found")
+
+        events = rank_job(
+            job_response.data[0],
+            supabase,
+            strategy=request.strategy,
+            shortlist=request.shortlist,
+            applicants_only=request.applicants_only,
+            concurrency=request.concurrency,
+        )
+        return sse_event_response(events)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error ranking candidates for job {job_id}: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to rank candidates.")
+
+
+@router.get("/{job_id}/rescore")
+async def get_job_rescore_status(
+    job_id: str,
+    supabase: Client = Depends(get_supabase_client)
+):
+    """
+    Progress of the background re-score queued by the job's last edit.
+
+    status is pending, processing, completed or failed. Of `total`
+    applications, `rescored` got a new fit_score, `unchanged` already had a
+    current one and `failed` could not be matched.
+    """
+    try:
+        progress = get_rescore_status(job_id, supabase)
+        if not progress:
+            raise HTTPException(status_code=404, detail="No re-score queued for this job")
+        return progress
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error getting re-score status for job {job_id}: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to retrieve re-score status.")
@@ -1,8 +1,9 @@
 from fastapi import APIRouter, HTTPException, Depends
 from supabase import Client
-from app.models.screening import ScreeningCreate, ScreeningResponse, Screening
-from app.services.ai_screening import conduct_screening
+from app.models.screening import ScreeningCreate, ScreeningResponse, Screening, ScreeningChatRequest
+from app.services.ai_screening import conduct_screening, stream_screening_summary, stream_screening_chat_reply
 from app.core.logging import get_logger
+from app.core.sse import sse_response
 from app.core.supabase_client import get_supabase_client
 import uuid
 
@@ -51,6 +52,45 @@ async def start_screening(
         logger.error(f"Error conducting screening: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.post("/chat/stream")
+async def stream_screening_chat(
+    request: ScreeningChatRequest,
+):
+    """
+    Stream the interviewer's next turn in a text screening chat (Server-Sent Events).
+
+    Emits `token` events ({"text": ...}) as Gemini generates them, then `done`.
+    """
+    try:
+        chunks = await stream_screening_chat_reply(request.application_id, request.messages)
+        return sse_response(chunks)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error streaming screening chat for application {request.application_id}: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/{screening_id}/summary/stream")
+async def stream_summary(
+    screening_id: str,
+    supabase: Client = Depends(get_supabase_client)
+):
+    """
+    Stream an AI summary of a completed screening as Server-Sent Events.
+    """
+    try:
+        response = supabase.table("screenings").select("transcript, ai_summary").eq("id", screening_id).single().execute()
+        if not response.data:
+            raise HTTPException(status_code=404, detail="Screening not found")
+
+        chunks = await stream_screening_summary(response.data)
+        return sse_response(chunks)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error streaming summary for screening {screening_id}: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 @router.get("/{screening_id}")
 async def get_screening(
     screening_id: str,
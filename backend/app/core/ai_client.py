@@ -4,31 +4,34 @@ Unified AI Client — Google Gemini Integration
 Provides a centralized async client for Google Gemini models.
 Public API (generate_ai_response / generate_json_response) is unchanged
 so all callers (ai_parser, ai_matching, ai_screening, etc.) work as-is.
+generate_ai_response_stream yields text chunks for Server-Sent Events, and
+generate_json_batch runs many JSON prompts concurrently. All calls share a
+process-wide concurrency limit (settings.AI_MAX_CONCURRENCY).
+
+Requests are served by the backend selected with settings.AI_PROVIDER (see
+app.core.ai_providers): Gemini in production, or recorded/synthetic
+responses for offline benchmarks and CI.
 """
 
 import asyncio
 import json
-import google.generativeai as genai
+import random
+import time
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Sequence, Union
 
 from app.core.config import settings
 from app.core.logging import get_logger
+from app.core.ai_metrics import AICallRecord, DEFAULT_CALLER, ai_metrics
+from app.core.ai_providers import AIRequest, get_ai_provider
 
 logger = get_logger(__name__)
 
 # Default model — confirmed working with the project's GEMINI_API_KEY
 DEFAULT_MODEL = "gemini-2.5-flash"
 
-# Configure the Gemini SDK once at import time
-def _configure_gemini() -> None:
-    if not settings.GEMINI_API_KEY:
-        raise ValueError(
-            "GEMINI_API_KEY is not configured. "
-            "Please set GEMINI_API_KEY in your environment variables."
-        )
-    genai.configure(api_key=settings.GEMINI_API_KEY)
-    logger.debug("Configured Google Gemini SDK")
-
-_configure_gemini()
+# Resolve the provider at import time so a missing GEMINI_API_KEY fails fast
+get_ai_provider()
 
 
 def _get_model_name(model: str | None) -> str:
@@ -44,22 +47,82 @@ def _get_model_name(model: str | None) -> str:
     return chosen
 
 
+# Substrings of Gemini/transport errors worth retrying
+_TRANSIENT_ERROR_MARKERS = (
+    "429", "500", "502", "503", "504",
+    "resource exhausted", "resource_exhausted", "unavailable",
+    "deadline", "timed out", "timeout", "internal error",
+)
+
+
+def _is_transient_error(error: Exception) -> bool:
+    """Whether an error from the Gemini SDK is likely to succeed on retry."""
+    message = str(error).lower()
+    return any(marker in message for marker in _TRANSIENT_ERROR_MARKERS)
+
+
+def _retry_delay(attempt: int) -> float:
+    """Exponential backoff with full jitter for the given retry attempt (0-based)."""
+    return random.uniform(0, settings.AI_RETRY_BASE_DELAY * (2 ** attempt))
+
+
+# Process-wide cap on in-flight Gemini requests, shared by every call site.
+# Created lazily (and per event loop) since semaphores bind to a loop.
+_ai_limiter: Optional[asyncio.Semaphore] = None
+_ai_limiter_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _get_ai_limiter() -> asyncio.Semaphore:
+    global _ai_limiter, _ai_limiter_loop
+    loop = asyncio.get_running_loop()
+    if _ai_limiter is None or _ai_limiter_loop is not loop:
+        _ai_limiter = asyncio.Semaphore(max(1, settings.AI_MAX_CONCURRENCY))
+        _ai_limiter_loop = loop
+    return _ai_limiter
+
+
+def _build_request(
+    prompt: str,
+    model_name: str,
+    temperature: float = None,
+    max_tokens: int = None,
+    system_message: str = None,
+    caller: str = None,
+) -> AIRequest:
+    """Apply generation defaults from settings."""
+    return AIRequest(
+        prompt=prompt,
+        model=model_name,
+        temperature=temperature if temperature is not None else settings.AI_TEMPERATURE,
+        max_tokens=max_tokens or settings.AI_MAX_TOKENS,
+        system_message=system_message or None,
+        caller=caller,
+    )
+
+
 async def generate_ai_response(
     prompt: str,
     model: str = None,
     temperature: float = None,
     max_tokens: int = None,
     system_message: str = None,
+    caller: str = None,
 ) -> str:
     """
     Generate a text response using Google Gemini.
 
+    Call sites listed in settings.AI_LATENCY_BUDGETS_MS are latency-critical:
+    they get a hedged duplicate request once the caller's observed p90
+    latency has passed, and a request to settings.AI_FALLBACK_MODEL once the
+    budget is exhausted. The first good response wins; the rest are cancelled.
+
     Args:
         prompt: The user prompt/message
         model: Gemini model name (defaults to gemini-2.5-flash)
         temperature: Sampling temperature (0-2, defaults to settings.AI_TEMPERATURE)
         max_tokens: Max tokens in response (defaults to settings.AI_MAX_TOKENS)
         system_message: Optional system instruction for context
+        caller: Feature tag used for token/latency accounting (e.g. "resume_parse")
 
     Returns:
         str: Generated text response
@@ -67,41 +130,218 @@ async def generate_ai_response(
     Raises:
         Exception: If API call fails
     """
+    caller = caller or DEFAULT_CALLER
+    model_name = _get_model_name(model)
+    budget_ms = settings.AI_LATENCY_BUDGETS_MS.get(caller)
+    if budget_ms:
+        return await _generate_within_budget(
+            prompt, model_name, temperature, max_tokens, system_message, caller, budget_ms
+        )
+    return await _generate_once(prompt, model_name, temperature, max_tokens, system_message, caller)
+
+
+async def _generate_once(
+    prompt: str,
+    model_name: str,
+    temperature: float,
+    max_tokens: int,
+    system_message: str,
+    caller: str,
+) -> str:
+    """Single request with transient-error retries and accounting."""
+    started = time.perf_counter()
+    retries = 0
     try:
-        model_name = _get_model_name(model)
-        temp = temperature if temperature is not None else settings.AI_TEMPERATURE
-        tokens = max_tokens or settings.AI_MAX_TOKENS
+        provider = get_ai_provider()
+        request = _build_request(prompt, model_name, temperature, max_tokens, system_message, caller)
 
-        generation_config = genai.types.GenerationConfig(
-            temperature=temp,
-            max_output_tokens=tokens,
-        )
+        logger.info(f"Making {provider.name} AI call — model: {model_name}, caller: {caller}")
 
-        # Build the Gemini model (system_instruction replaces OpenAI's system role)
-        # Note: Gemini SDK rejects empty string — must use None when no system message
-        gemini_model = genai.GenerativeModel(
-            model_name=model_name,
-            system_instruction=system_message if system_message else None,
-            generation_config=generation_config,
-        )
+        while True:
+            try:
+                async with _get_ai_limiter():
+                    result = await provider.generate(request)
+                break
+            except Exception as e:
+                if retries >= settings.AI_MAX_RETRIES or not _is_transient_error(e):
+                    raise
+                delay = _retry_delay(retries)
+                retries += 1
+                logger.warning(
+                    f"Transient Gemini error for {caller} ({e}); "
+                    f"retry {retries}/{settings.AI_MAX_RETRIES} in {delay:.2f}s"
+                )
+                await asyncio.sleep(delay)
+
+        ai_metrics.record(AICallRecord(
+            caller=caller,
+            model=model_name,
+            latency_ms=(time.perf_counter() - started) * 1000,
+            prompt_tokens=result.prompt_tokens,
+            output_tokens=result.output_tokens,
+            retries=retries,
+        ))
+        logger.debug(f"AI response length: {len(result.text)} chars")
+        return result.text
 
-        logger.info(f"Making Gemini API call — model: {model_name}")
+    except Exception as e:
+        ai_metrics.record(AICallRecord(
+            caller=caller,
+            model=model_name,
+            latency_ms=(time.perf_counter() - started) * 1000,
+            retries=retries,
+            success=False,
+        ))
+        error_msg = str(e)
+        logger.error(f"Error generating AI response: {error_msg}")
+        raise Exception(f"AI API Error: {error_msg}")
 
-        # The google-generativeai SDK is synchronous; wrap in asyncio.to_thread
-        # so we don't block FastAPI's event loop
-        response = await asyncio.to_thread(
-            gemini_model.generate_content, prompt
+
+async def _generate_within_budget(
+    prompt: str,
+    model_name: str,
+    temperature: float,
+    max_tokens: int,
+    system_message: str,
+    caller: str,
+    budget_ms: float,
+) -> str:
+    """
+    Race a primary request against a hedged duplicate and a fallback model.
+
+    Tiers launch on a schedule (or immediately if everything in flight has
+    failed): the hedge after the caller's observed p90 latency for this
+    model, the fallback model once `budget_ms` has elapsed. Extra spend is
+    bounded to at most two additional requests per call.
+    """
+    observed = ai_metrics.latency_percentile(
+        caller,
+        settings.AI_HEDGE_PERCENTILE,
+        min_samples=settings.AI_HEDGE_MIN_SAMPLES,
+        model=model_name,
+    )
+    tiers = []
+    if observed is not None and observed < budget_ms:
+        tiers.append((observed / 1000, "hedge", model_name))
+    fallback = settings.AI_FALLBACK_MODEL
+    if fallback and fallback != model_name:
+        tiers.append((budget_ms / 1000, "fallback", fallback))
+
+    def launch(tier_model: str) -> asyncio.Task:
+        return asyncio.create_task(
+            _generate_once(prompt, tier_model, temperature, max_tokens, system_message, caller)
         )
 
-        result_text = response.text.strip()
-        logger.debug(f"Gemini response length: {len(result_text)} chars")
-        return result_text
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    pending = {launch(model_name)}
+    last_error: Optional[BaseException] = None
+    try:
+        while pending or tiers:
+            if not pending:
+                # Everything in flight failed; don't wait for the schedule
+                _, label, tier_model = tiers.pop(0)
+                logger.warning(f"{caller}: launching {label} request ({tier_model}) after failure")
+                pending.add(launch(tier_model))
+                continue
+
+            timeout = None
+            if tiers:
+                timeout = max(0.0, tiers[0][0] - (loop.time() - started))
+            done, pending = await asyncio.wait(
+                pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+            )
+
+            for task in done:
+                if task.exception() is None:
+                    return task.result()
+                last_error = task.exception()
+
+            if not done and tiers:
+                _, label, tier_model = tiers.pop(0)
+                logger.info(
+                    f"{caller}: no response after {(loop.time() - started) * 1000:.0f}ms, "
+                    f"launching {label} request ({tier_model})"
+                )
+                pending.add(launch(tier_model))
+
+        raise last_error or Exception("AI API Error: all requests failed")
+    finally:
+        # Cancel the losers; results of already-running SDK threads are discarded
+        for task in pending:
+            task.cancel()
+
+
+async def generate_ai_response_stream(
+    prompt: str,
+    model: str = None,
+    temperature: float = None,
+    max_tokens: int = None,
+    system_message: str = None,
+    caller: str = None,
+) -> AsyncIterator[str]:
+    """
+    Stream a text response from Google Gemini as chunks arrive.
+
+    Usage:
+        async for chunk in generate_ai_response_stream(prompt, caller="match_recommendation"):
+            ...
+
+    Closing the generator early (e.g. the HTTP client disconnects) stops
+    reading from Gemini; the partial call is still recorded for accounting.
+
+    Args:
+        prompt: The user prompt/message
+        model: Gemini model name (defaults to gemini-2.5-flash)
+        temperature: Sampling temperature
+        max_tokens: Max tokens in response
+        system_message: Optional system instruction
+        caller: Feature tag used for token/latency accounting
+
+    Yields:
+        str: Text chunks in generation order
+
+    Raises:
+        Exception: If the API call fails before or during streaming
+    """
+    caller = caller or DEFAULT_CALLER
+    model_name = _get_model_name(model)
+    started = time.perf_counter()
+    first_token_ms = None
+    prompt_tokens = output_tokens = 0
+    success = False
+    try:
+        provider = get_ai_provider()
+        request = _build_request(prompt, model_name, temperature, max_tokens, system_message, caller)
+        logger.info(f"Making streaming {provider.name} AI call — model: {model_name}, caller: {caller}")
+
+        async with _get_ai_limiter():
+            async for chunk in provider.stream(request):
+                prompt_tokens = chunk.prompt_tokens or prompt_tokens
+                output_tokens = chunk.output_tokens or output_tokens
+                if not chunk.text:
+                    continue
+                if first_token_ms is None:
+                    first_token_ms = (time.perf_counter() - started) * 1000
+                yield chunk.text
+        success = True
 
     except Exception as e:
         error_msg = str(e)
-        logger.error(f"Error generating Gemini response: {error_msg}")
+        logger.error(f"Error streaming AI response: {error_msg}")
         raise Exception(f"AI API Error: {error_msg}")
 
+    finally:
+        ai_metrics.record(AICallRecord(
+            caller=caller,
+            model=model_name,
+            latency_ms=(time.perf_counter() - started) * 1000,
+            first_token_ms=first_token_ms,
+            prompt_tokens=prompt_tokens,
+            output_tokens=output_tokens,
+            success=success,
+        ))
+
 
 async def generate_json_response(
     prompt: str,
@@ -109,6 +349,7 @@ async def generate_json_response(
     temperature: float = None,
     max_tokens: int = None,
     system_message: str = None,
+    caller: str = None,
 ) -> dict:
     """
     Generate a JSON response using Google Gemini.
@@ -121,6 +362,7 @@ async def generate_json_response(
         temperature: Sampling temperature
         max_tokens: Max tokens in response
         system_message: Optional system instruction
+        caller: Feature tag used for token/latency accounting
 
     Returns:
         dict: Parsed JSON response
@@ -140,6 +382,7 @@ async def generate_json_response(
         temperature=temperature,
         max_tokens=max_tokens,
         system_message=system_message,
+        caller=caller,
     )
 
     # Strip markdown fences if the model adds them
@@ -158,3 +401,112 @@ async def generate_json_response(
         logger.error(f"Failed to parse JSON response: {e}")
         logger.error(f"Raw text (first 500 chars): {cleaned[:500]}")
         raise ValueError(f"AI response is not valid JSON: {e}")
+
+
+@dataclass
+class BatchItemResult:
+    """Outcome of one prompt in a generate_json_batch call."""
+    index: int
+    result: Any = None
+    error: Optional[str] = None
+    attempts: int = 1
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+BatchPrompt = Union[str, Dict[str, Any]]
+
+
+async def _run_batch_item(
+    index: int,
+    item: BatchPrompt,
+    defaults: Dict[str, Any],
+    slots: asyncio.Semaphore,
+    max_attempts: int,
+) -> BatchItemResult:
+    kwargs = {**defaults, **(item if isinstance(item, dict) else {"prompt": item})}
+    attempt = 0
+    async with slots:
+        while True:
+            attempt += 1
+            try:
+                result = await generate_json_response(**kwargs)
+                return BatchItemResult(index=index, result=result, attempts=attempt)
+            except ValueError as e:
+                # Invalid/truncated JSON is usually a one-off; transient API
+                # errors are already retried inside generate_ai_response.
+                if attempt >= max_attempts:
+                    return BatchItemResult(index=index, error=str(e), attempts=attempt)
+                await asyncio.sleep(_retry_delay(attempt - 1))
+            except Exception as e:
+                return BatchItemResult(index=index, error=str(e), attempts=attempt)
+
+
+async def iter_json_batch(
+    prompts: Sequence[BatchPrompt],
+    concurrency: int = None,
+    **defaults: Any,
+) -> AsyncIterator[BatchItemResult]:
+    """
+    Run many JSON prompts concurrently, yielding results as they complete.
+
+    Each prompt is either a prompt string or a dict of generate_json_response
+    keyword arguments (which override `defaults`). Failures are reported per
+    item rather than raised. Breaking out of the loop cancels pending prompts.
+    """
+    slots = asyncio.Semaphore(max(1, concurrency or settings.AI_BATCH_CONCURRENCY))
+    max_attempts = settings.AI_MAX_RETRIES + 1
+    tasks = [
+        asyncio.create_task(_run_batch_item(i, item, defaults, slots, max_attempts))
+        for i, item in enumerate(prompts)
+    ]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def generate_json_batch(
+    prompts: Sequence[BatchPrompt],
+    concurrency: int = None,
+    on_result: Callable[[BatchItemResult], Any] = None,
+    **defaults: Any,
+) -> List[BatchItemResult]:
+    """
+    Generate JSON responses for many prompts with bounded parallelism.
+
+    Prompts run under both the per-batch `concurrency` limit and the global
+    AI limiter, so a large batch cannot starve interactive requests beyond
+    its share. A failing prompt yields a BatchItemResult with `error` set
+    instead of failing the batch.
+
+    Args:
+        prompts: Prompt strings, or dicts of generate_json_response kwargs
+        concurrency: Max prompts in flight for this batch
+            (defaults to settings.AI_BATCH_CONCURRENCY)
+        on_result: Optional callback (sync or async) invoked with each
+            BatchItemResult as soon as it completes
+        **defaults: Keyword arguments applied to every prompt
+            (model, temperature, system_message, caller, ...)
+
+    Returns:
+        List[BatchItemResult]: One result per prompt, in input order
+    """
+    results: List[Optional[BatchItemResult]] = [None] * len(prompts)
+    async for item in iter_json_batch(prompts, concurrency=concurrency, **defaults):
+        results[item.index] = item
+        if on_result is not None:
+            try:
+                outcome = on_result(item)
+                if asyncio.iscoroutine(outcome):
+                    await outcome
+            except Exception as e:
+                logger.error(f"Batch on_result callback failed for item {item.index}: {e}")
+
+    failed = sum(1 for r in results if r is not None and not r.ok)
+    logger.info(f"JSON batch complete: {len(prompts) - failed}/{len(prompts)} succeeded")
+    return results
@@ -0,0 +1,155 @@
+"""
+AI Call Accounting
+
+Records token usage, latency, model and retry counts for every call made
+through app.core.ai_client, tagged with the feature (caller) that made it.
+Records live in a bounded in-memory buffer per worker process and are
+aggregated on demand for the admin usage endpoint.
+"""
+
+import math
+import threading
+from collections import defaultdict, deque
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+from app.core.config import settings
+
+# Caller tag used when a call site does not identify itself
+DEFAULT_CALLER = "unspecified"
+
+
+@dataclass
+class AICallRecord:
+    """A single AI call as seen by the client."""
+    caller: str
+    model: str
+    latency_ms: float
+    prompt_tokens: int = 0
+    output_tokens: int = 0
+    retries: int = 0
+    success: bool = True
+    first_token_ms: Optional[float] = None  # streaming calls only
+    timestamp: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+
+    @property
+    def total_tokens(self) -> int:
+        return self.prompt_tokens + self.output_tokens
+
+
+def _percentile(values: List[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile; returns None for an empty sample."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+class AIMetrics:
+    """Thread-safe, bounded store of AI call records."""
+
+    def __init__(self, max_records: int = 10000):
+        self._records: deque = deque(maxlen=max_records)
+        self._lock = threading.Lock()
+
+    def record(self, record: AICallRecord) -> None:
+        with self._lock:
+            self._records.append(record)
+
+    def records(
+        self,
+        caller: Optional[str] = None,
+        since: Optional[datetime] = None,
+    ) -> List[AICallRecord]:
+        with self._lock:
+            snapshot = list(self._records)
+        return [
+            r for r in snapshot
+            if (caller is None or r.caller == caller)
+            and (since is None or r.timestamp >= since)
+        ]
+
+    def latency_percentile(
+        self,
+        caller: str,
+        pct: float,
+        min_samples: int = 1,
+        model: Optional[str] = None,
+    ) -> Optional[float]:
+        """Observed latency percentile (ms) of successful calls for a caller."""
+        latencies = [
+            r.latency_ms for r in self.records(caller=caller)
+            if r.success and (model is None or r.model == model)
+        ]
+        if len(latencies) < min_samples:
+            return None
+        return _percentile(latencies, pct)
+
+    def summary(self, days: int = 7, caller: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Aggregate recorded calls over the last `days` days.
+
+        Returns per-feature call counts, token totals and latency percentiles,
+        plus daily token totals per feature.
+        """
+        since = datetime.now(timezone.utc) - timedelta(days=days)
+        records = self.records(caller=caller, since=since)
+
+        by_caller: Dict[str, List[AICallRecord]] = defaultdict(list)
+        daily: Dict[tuple, Dict[str, int]] = defaultdict(
+            lambda: {"calls": 0, "prompt_tokens": 0, "output_tokens": 0, "total_tokens": 0}
+        )
+        for r in records:
+            by_caller[r.caller].append(r)
+            bucket = daily[(r.timestamp.date().isoformat(), r.caller)]
+            bucket["calls"] += 1
+            bucket["prompt_tokens"] += r.prompt_tokens
+            bucket["output_tokens"] += r.output_tokens
+            bucket["total_tokens"] += r.total_tokens
+
+        features = {}
+        for name, items in sorted(by_caller.items()):
+            latencies = [r.latency_ms for r in items if r.success]
+            first_tokens = [r.first_token_ms for r in items if r.first_token_ms is not None]
+            models: Dict[str, int] = defaultdict(int)
+            for r in items:
+                models[r.model] += 1
+            features[name] = {
+                "calls": len(items),
+                "errors": sum(1 for r in items if not r.success),
+                "retries": sum(r.retries for r in items),
+                "prompt_tokens": sum(r.prompt_tokens for r in items),
+                "output_tokens": sum(r.output_tokens for r in items),
+                "total_tokens": sum(r.total_tokens for r in items),
+                "latency_ms": {
+                    "avg": round(sum(latencies) / len(latencies), 2) if latencies else None,
+                    "p50": _percentile(latencies, 50),
+                    "p95": _percentile(latencies, 95),
+                    "max": max(latencies) if latencies else None,
+                    "first_token_p95": _percentile(first_tokens, 95),
+                },
+                "models": dict(models),
+            }
+
+        daily_totals = [
+            {"date": date, "caller": name, **totals}
+            for (date, name), totals in sorted(daily.items())
+        ]
+
+        return {
+            "window_days": days,
+            "total_calls": len(records),
+            "total_tokens": sum(r.total_tokens for r in records),
+            "features": features,
+            "daily": daily_totals,
+        }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._records.clear()
+
+
+# Process-wide metrics store used by the AI client
+ai_metrics = AIMetrics(max_records=settings.AI_METRICS_MAX_RECORDS)
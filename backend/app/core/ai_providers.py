@@ -0,0 +1,356 @@
+"""
+AI Provider Backends
+
+The AI client (app.core.ai_client) owns retries, concurrency limits and
+accounting; a provider only turns one request into text. Selected with
+settings.AI_PROVIDER:
+
+- "gemini":    Google Gemini (production)
+- "replay":    responses recorded to a JSON file, keyed by a hash of the
+               request; record mode calls Gemini and saves what it returns
+- "synthetic": no network at all; canned responses with a configurable
+               latency distribution and failure rate, for load tests and CI
+"""
+
+import abc
+import asyncio
+import hashlib
+import json
+import random
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import AsyncIterator, Dict, List, Optional
+
+import google.generativeai as genai
+
+from app.core.config import settings
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class AIRequest:
+    """A single generation request, after defaults have been resolved."""
+    prompt: str
+    model: str
+    temperature: float
+    max_tokens: int
+    system_message: Optional[str] = None
+    caller: Optional[str] = None
+
+    def cache_key(self) -> str:
+        """Stable hash of everything that influences the response."""
+        payload = json.dumps(
+            [self.model, self.system_message, self.temperature, self.max_tokens, self.prompt],
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class AIResult:
+    """Generated text (or a streamed chunk of it) plus token usage, if known."""
+    text: str
+    prompt_tokens: int = 0
+    output_tokens: int = 0
+
+
+class AIProvider(abc.ABC):
+    """Interface implemented by every backend."""
+
+    name = "base"
+
+    @abc.abstractmethod
+    async def generate(self, request: AIRequest) -> AIResult:
+        """Generate the full response text."""
+
+    @abc.abstractmethod
+    def stream(self, request: AIRequest) -> AsyncIterator[AIResult]:
+        """Yield chunks as they arrive; usage is reported on the chunk carrying it."""
+
+
+def _usage_count(usage, name: str) -> int:
+    """Read a token count from Gemini usage_metadata, tolerating missing fields."""
+    value = getattr(usage, name, None) if usage is not None else None
+    return value if isinstance(value, int) else 0
+
+
+class GeminiProvider(AIProvider):
+    """Google Gemini via the google-generativeai SDK."""
+
+    name = "gemini"
+
+    def __init__(self):
+        if not settings.GEMINI_API_KEY:
+            raise ValueError(
+                "GEMINI_API_KEY is not configured. "
+                "Please set GEMINI_API_KEY in your environment variables."
+            )
+        genai.configure(api_key=settings.GEMINI_API_KEY)
+        logger.debug("Configured Google Gemini SDK")
+
+    @staticmethod
+    def _build_model(request: AIRequest):
+        generation_config = genai.types.GenerationConfig(
+            temperature=request.temperature,
+            max_output_tokens=request.max_tokens,
+        )
+        # Note: Gemini SDK rejects empty string — must use None when no system message
+        return genai.GenerativeModel(
+            model_name=request.model,
+            system_instruction=request.system_message or None,
+            generation_config=generation_config,
+        )
+
+    @staticmethod
+    def _result(response, text: str) -> AIResult:
+        usage = getattr(response, "usage_metadata", None)
+        return AIResult(
+            text=text,
+            prompt_tokens=_usage_count(usage, "prompt_token_count"),
+            output_tokens=_usage_count(usage, "candidates_token_count"),
+        )
+
+    async def generate(self, request: AIRequest) -> AIResult:
+        model = self._build_model(request)
+        # The SDK call is synchronous; run it off the event loop
+        response = await asyncio.to_thread(model.generate_content, request.prompt)
+        return self._result(response, response.text.strip())
+
+    async def stream(self, request: AIRequest) -> AsyncIterator[AIResult]:
+        model = self._build_model(request)
+        response = await model.generate_content_async(request.prompt, stream=True)
+        async for chunk in response:
+            yield self._result(chunk, getattr(chunk, "text", "") or "")
+
+
+def _chunk_text(text: str, words_per_chunk: int = 4) -> List[str]:
+    """Split text into word groups, preserving whitespace, to mimic streaming."""
+    words = text.split(" ")
+    return [
+        " ".join(words[i:i + words_per_chunk]) + (" " if i + words_per_chunk < len(words) else "")
+        for i in range(0, len(words), words_per_chunk)
+    ]
+
+
+class ReplayProvider(AIProvider):
+    """
+    Deterministic responses from a recorded JSON store.
+
+    In "record" mode every request goes to `upstream` (Gemini by default)
+    and the response is saved under the request's cache key. In "replay"
+    mode unknown requests raise instead of silently calling out, so a
+    benchmark can never spend money by accident.
+    """
+
+    name = "replay"
+
+    def __init__(
+        self,
+        path: str = None,
+        mode: str = None,
+        upstream: Optional[AIProvider] = None,
+        replay_latency: bool = None,
+    ):
+        self.path = Path(path or settings.AI_REPLAY_PATH)
+        self.mode = (mode or settings.AI_REPLAY_MODE).lower()
+        if self.mode not in ("record", "replay"):
+            raise ValueError(f"AI_REPLAY_MODE must be 'record' or 'replay', got '{self.mode}'")
+        self.replay_latency = (
+            settings.AI_REPLAY_USE_RECORDED_LATENCY if replay_latency is None else replay_latency
+        )
+        self._upstream = upstream
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict] = {}
+        if self.path.exists():
+            self._entries = json.loads(self.path.read_text(encoding="utf-8"))
+        logger.info(f"Replay provider ({self.mode}) loaded {len(self._entries)} responses from {self.path}")
+
+    @property
+    def upstream(self) -> AIProvider:
+        if self._upstream is None:
+            self._upstream = GeminiProvider()
+        return self._upstream
+
+    def _save(self, key: str, request: AIRequest, result: AIResult, latency_ms: float) -> None:
+        with self._lock:
+            self._entries[key] = {
+                "caller": request.caller,
+                "model": request.model,
+                "text": result.text,
+                "prompt_tokens": result.prompt_tokens,
+                "output_tokens": result.output_tokens,
+                "latency_ms": round(latency_ms, 1),
+            }
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.path.write_text(json.dumps(self._entries, indent=2, ensure_ascii=False), encoding="utf-8")
+
+    async def _lookup(self, request: AIRequest) -> AIResult:
+        key = request.cache_key()
+        entry = self._entries.get(key)
+        if entry is None:
+            raise LookupError(f"No recorded response for request {key[:12]} (caller: {request.caller})")
+        if self.replay_latency:
+            await asyncio.sleep(entry.get("latency_ms", 0) / 1000)
+        return AIResult(
+            text=entry["text"],
+            prompt_tokens=entry.get("prompt_tokens", 0),
+            output_tokens=entry.get("output_tokens", 0),
+        )
+
+    async def generate(self, request: AIRequest) -> AIResult:
+        if self.mode == "replay":
+            return await self._lookup(request)
+        started = time.perf_counter()
+        result = await self.upstream.generate(request)
+        self._save(request.cache_key(), request, result, (time.perf_counter() - started) * 1000)
+        return result
+
+    async def stream(self, request: AIRequest) -> AsyncIterator[AIResult]:
+        # Recorded as a whole response; replayed as word chunks
+        result = await self.generate(request)
+        for piece in _chunk_text(result.text):
+            yield AIResult(text=piece)
+        yield AIResult(text="", prompt_tokens=result.prompt_tokens, output_tokens=result.output_tokens)
+
+
+# Canned JSON for callers whose parsers expect a particular shape; anything
+# else gets plain text. Kept minimal but valid for every downstream model.
+_SYNTHETIC_RESPONSES: Dict[str, object] = {
+    "resume_parse": {
+        "name": "Synthetic Candidate",
+        "email": "candidate@example.com",
+        "phone": None,
+        "skills": ["Python", "FastAPI", "PostgreSQL"],
+        "education": [{"degree": "BSc Computer Science", "institution": "Example University", "year": "2020"}],
+        "experience": [{"company": "Example Corp", "role": "Engineer", "duration": "2020-2024", "description": "Built APIs"}],
+        "links": {},
+    },
+    "candidate_match": {
+        "fit_score": 72,
+        "strengths": ["Relevant backend experience"],
+        "weaknesses": ["No production Kubernetes experience"],
+        "recommendations": ["Probe system design depth"],
+    },
+    "screening_questions": [
+        "Tell me about a project you are proud of.",
+        "Describe a time you resolved a disagreement on your team.",
+        "How do you approach learning a new technology?",
+    ],
+    "screening_evaluation": {
+        "communication_score": 70,
+        "domain_knowledge_score": 68,
+        "overall_score": 69,
+        "summary": "Synthetic evaluation.",
+        "strengths": ["Clear communicator"],
+        "weaknesses": ["Limited depth in some areas"],
+    },
+}
+_SYNTHETIC_RESPONSES["voice_questions"] = _SYNTHETIC_RESPONSES["screening_questions"]
+_SYNTHETIC_RESPONSES["voice_evaluation"] = _SYNTHETIC_RESPONSES["screening_evaluation"]
+
+_SYNTHETIC_TEXT = (
+    "This is a synthetic response generated locally for benchmarking. "
+    "It has roughly the length and shape of a short recruiter-facing summary."
+)
+
+
+class SyntheticProvider(AIProvider):
+    """
+    Offline stand-in for an LLM with a tunable latency/failure profile.
+
+    Latency is log-normal around `median_ms` (spread `sigma`), which matches
+    the long right tail of real API latencies. Failures are raised as 503s
+    so the client's retry and hedging paths are exercised. A fixed `seed`
+    makes a benchmark run reproducible.
+    """
+
+    name = "synthetic"
+
+    def __init__(
+        self,
+        median_ms: float = None,
+        sigma: float = None,
+        failure_rate: float = None,
+        seed: Optional[int] = None,
+        first_token_ratio: float = 0.3,
+    ):
+        self.median_ms = settings.AI_SYNTHETIC_LATENCY_MEDIAN_MS if median_ms is None else median_ms
+        self.sigma = settings.AI_SYNTHETIC_LATENCY_SIGMA if sigma is None else sigma
+        self.failure_rate = settings.AI_SYNTHETIC_FAILURE_RATE if failure_rate is None else failure_rate
+        seed = settings.AI_SYNTHETIC_SEED if seed is None else seed
+        self.first_token_ratio = first_token_ratio
+        self._random = random.Random(seed)
+
+    def _latency_s(self) -> float:
+        if self.median_ms <= 0:
+            return 0.0
+        return self._random.lognormvariate(0, self.sigma) * self.median_ms / 1000
+
+    def _maybe_fail(self) -> None:
+        if self.failure_rate and self._random.random() < self.failure_rate:
+            raise Exception("503 Service Unavailable (synthetic failure)")
+
+    @staticmethod
+    def _response_text(request: AIRequest) -> str:
+        canned = _SYNTHETIC_RESPONSES.get(request.caller)
+        if canned is not None:
+            return json.dumps(canned)
+        return _SYNTHETIC_TEXT
+
+    @staticmethod
+    def _usage(request: AIRequest, text: str) -> AIResult:
+        return AIResult(
+            text=text,
+            prompt_tokens=len(request.prompt) // 4,
+            output_tokens=len(text) // 4,
+        )
+
+    async def generate(self, request: AIRequest) -> AIResult:
+        await asyncio.sleep(self._latency_s())
+        self._maybe_fail()
+        return self._usage(request, self._response_text(request))
+
+    async def stream(self, request: AIRequest) -> AsyncIterator[AIResult]:
+        total = self._latency_s()
+        text = self._response_text(request)
+        chunks = _chunk_text(text)
+        await asyncio.sleep(total * self.first_token_ratio)
+        self._maybe_fail()
+        gap = total * (1 - self.first_token_ratio) / max(1, len(chunks))
+        for i, piece in enumerate(chunks):
+            if i:
+                await asyncio.sleep(gap)
+            yield AIResult(text=piece)
+        usage = self._usage(request, text)
+        yield AIResult(text="", prompt_tokens=usage.prompt_tokens, output_tokens=usage.output_tokens)
+
+
+_PROVIDERS = {
+    "gemini": GeminiProvider,
+    "replay": ReplayProvider,
+    "synthetic": SyntheticProvider,
+}
+
+_provider: Optional[AIProvider] = None
+
+
+def get_ai_provider() -> AIProvider:
+    """Return the process-wide provider selected by settings.AI_PROVIDER."""
+    global _provider
+    if _provider is None:
+        name = settings.AI_PROVIDER.lower()
+        if name not in _PROVIDERS:
+            raise ValueError(f"Unknown AI_PROVIDER '{name}'. Expected one of: {', '.join(_PROVIDERS)}")
+        _provider = _PROVIDERS[name]()
+        logger.info(f"Using AI provider: {name}")
+    return _provider
+
+
+def set_ai_provider(provider: Optional[AIProvider]) -> None:
+    """Swap the active provider (benchmarks, tests). None re-reads settings."""
+    global _provider
+    _provider = provider
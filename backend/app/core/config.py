@@ -1,6 +1,6 @@
 from pydantic_settings import BaseSettings
 from pydantic import field_validator
-from typing import List, Union
+from typing import Dict, List, Optional, Union
 import logging
 
 logger = logging.getLogger(__name__)
@@ -26,6 +26,43 @@ class Settings(BaseSettings):
     AI_MODEL: str = "gemini-2.5-flash"
     AI_TEMPERATURE: float = 0.7
     AI_MAX_TOKENS: int = 2048
+    AI_MAX_RETRIES: int = 2  # retries for transient Gemini errors (429/5xx/timeouts)
+    AI_RETRY_BASE_DELAY: float = 0.5  # seconds, doubled per attempt with full jitter
+    AI_MAX_CONCURRENCY: int = 8  # global cap on in-flight Gemini requests per process
+    AI_BATCH_CONCURRENCY: int = 4  # default parallelism for generate_json_batch
+    AI_METRICS_MAX_RECORDS: int = 10000  # per-process buffer for AI usage accounting
+    # Latency-critical call sites (caller tag -> budget in ms). These get a hedged
+    # duplicate after the observed p90 and fall back to AI_FALLBACK_MODEL once the
+    # budget is spent. Set as JSON in the environment, e.g. '{"candidate_match": 10000}'.
+    AI_LATENCY_BUDGETS_MS: Dict[str, int] = {
+        "candidate_match": 12000,
+        "screening_questions": 6000,
+        "voice_questions": 6000,
+    }
+    AI_FALLBACK_MODEL: str = "gemini-2.5-flash-lite"
+    AI_HEDGE_PERCENTILE: float = 90
+    AI_HEDGE_MIN_SAMPLES: int = 20  # observed calls needed before hedging kicks in
+    # Backend serving AI calls: gemini, replay (recorded responses) or synthetic (offline)
+    AI_PROVIDER: str = "gemini"
+    AI_REPLAY_PATH: str = "benchmarks/recordings/ai_replay.json"
+    AI_REPLAY_MODE: str = "replay"  # replay, or record (calls Gemini and saves responses)
+    AI_REPLAY_USE_RECORDED_LATENCY: bool = False
+    AI_SYNTHETIC_LATENCY_MEDIAN_MS: float = 800
+    AI_SYNTHETIC_LATENCY_SIGMA: float = 0.5  # log-normal spread; 0.5 gives p95 ≈ 2.3x median
+    AI_SYNTHETIC_FAILURE_RATE: float = 0.0
+    AI_SYNTHETIC_SEED: Optional[int] = None
+    # Prompt context budgets (approximate tokens per section, ~4 chars/token)
+    PROMPT_CANDIDATE_TOKEN_BUDGET: int = 1200
+    PROMPT_FOOTPRINT_TOKEN_BUDGET: int = 300
+    PROMPT_JOB_TOKEN_BUDGET: int = 800
+    PROMPT_RESUME_TOKEN_BUDGET: int = 6000
+    # Resume parsing: llm (whole resume to the model), hybrid (rule-based
+    # extraction first, model only for unresolved fields/sections), sections
+    # (one concurrent prompt per resume section) or rules (no model)
+    RESUME_PARSE_MODE: str = "llm"
+    RESUME_RULE_MIN_SKILLS: int = 5  # fewer dictionary hits and hybrid asks the model for skills
+    RESUME_SECTION_PARSE_MIN_CHARS: int = 12000  # longer resumes get sections mode instead of one prompt; 0 disables
+    RESUME_SECTION_CHUNK_TOKENS: int = 1500  # long sections are split into prompts of about this size
     GEMINI_LIVE_MODEL: str = "models/gemini-2.5-flash-native-audio-preview-09-2025"
     GEMINI_LIVE_VOICE: str = "Zephyr"
     GEMINI_LIVE_SAMPLE_RATE_SEND: int = 16000
@@ -74,6 +111,50 @@ class Settings(BaseSettings):
     # File Upload Configuration
     MAX_UPLOAD_SIZE: int = 10485760  # 10MB
     ALLOWED_EXTENSIONS: str = "pdf,doc,docx"
+    EXTRACTION_WORKERS: int = 2  # resume extraction processes; 0 runs it in a thread instead
+    EXTRACTION_TIMEOUT_SECONDS: float = 20.0  # per document
+    EXTRACTION_MAX_PAGES: int = 50  # pages beyond this are ignored
+    EXTRACTION_MAX_CHARS: int = 40000  # resume text kept per document (~10k tokens), cut section by section
+    BULK_MAX_FILES: int = 1000  # per bulk upload (files or ZIP entries)
+    BULK_MAX_UPLOAD_SIZE: int = 524288000  # 500MB request body per bulk upload
+    BULK_QUEUE_SIZE: int = 16  # items buffered between pipeline stages
+    # Concurrent workers per bulk ingestion stage
+    BULK_STAGE_WORKERS: Dict[str, int] = {
+        "upload": 4,
+        "extract": 2,
+        "parse": 4,
+        "store": 2,
+    }
+    BULK_JOB_HISTORY: int = 50  # finished bulk jobs kept for status queries
+    BULK_RESUME_PARSE_MODE: Optional[str] = None  # overrides RESUME_PARSE_MODE for bulk jobs, e.g. "rules"
+
+    # Digital footprint enrichment (link scraping, queued in digital_footprints)
+    FOOTPRINT_WORKER_ENABLED: bool = True  # run the enrichment worker in this API process
+    FOOTPRINT_WORKER_CONCURRENCY: int = 4  # footprints scraped at once
+    FOOTPRINT_BATCH_SIZE: int = 10  # queue rows claimed per poll
+    FOOTPRINT_POLL_INTERVAL_SECONDS: float = 5.0
+    FOOTPRINT_MAX_ATTEMPTS: int = 3  # then the footprint is marked failed
+    FOOTPRINT_STALE_AFTER_SECONDS: int = 300  # reclaim rows left 'processing' by a dead worker
+
+    # Embedding pre-rank index (app.services.embedding_index)
+    EMBEDDING_ENABLED: bool = True  # index candidates/jobs on write and serve /jobs/{id}/prerank
+    EMBEDDING_PROVIDER: str = "hashing"  # hashing (local, no API calls) or gemini
+    EMBEDDING_MODEL: str = "models/text-embedding-004"  # gemini only
+    EMBEDDING_DIM: int = 768
+    EMBEDDING_MAX_TOKENS: int = 2000  # text embedded per candidate or job
+    EMBEDDING_INDEX_DIR: str = "data/embeddings"  # memory-mapped vector files, shared by workers on a host
+
+    # Two-stage job ranking (app.services.job_ranking)
+    RANK_SHORTLIST_SIZE: int = 20  # candidates passed from the first stage to the LLM matcher
+    RANK_PERSIST_BATCH_SIZE: int = 10  # fit scores per applications upsert
+
+    # Background re-scoring after job edits (app.services.job_rescoring, queued in job_rescores)
+    RESCORE_WORKER_ENABLED: bool = True  # run the re-score worker in this API process
+    RESCORE_CONCURRENCY: int = 2  # match prompts in flight per re-score, capped at AI_MAX_CONCURRENCY
+    RESCORE_CHUNK_SIZE: int = 50  # applications re-matched between progress updates
+    RESCORE_POLL_INTERVAL_SECONDS: float = 30.0
+    RESCORE_MAX_ATTEMPTS: int = 3  # then the re-score is marked failed
+    RESCORE_STALE_AFTER_SECONDS: int = 600  # reclaim runs with no progress heartbeat for this long
 
     # Security
     SECRET_KEY: str
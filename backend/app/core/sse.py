@@ -0,0 +1,81 @@
+"""
+Server-Sent Events helpers
+
+Wraps async text generators (e.g. generate_ai_response_stream) into
+`text/event-stream` responses. Each chunk is sent as a `token` event with a
+JSON payload so newlines in model output survive framing; the stream ends
+with a `done` event, or an `error` event if generation fails midway.
+
+sse_event_response streams structured progress instead: (event, payload)
+pairs from the producer, e.g. job ranking results as they complete.
+"""
+
+import json
+from typing import Any, AsyncIterator, Dict, Tuple
+
+from fastapi.responses import StreamingResponse
+
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+def format_sse(data: Dict[str, Any], event: str = None) -> str:
+    """Encode a single SSE frame."""
+    frame = f"event: {event}\n" if event else ""
+    return f"{frame}data: {json.dumps(data)}\n\n"
+
+
+async def _sse_events(chunks: AsyncIterator[str]) -> AsyncIterator[str]:
+    try:
+        async for chunk in chunks:
+            yield format_sse({"text": chunk}, event="token")
+        yield format_sse({}, event="done")
+    except Exception as e:
+        logger.error(f"SSE stream failed: {str(e)}")
+        yield format_sse({"detail": str(e)}, event="error")
+    finally:
+        # Runs on client disconnect too, so the upstream generator stops
+        # pulling tokens as soon as nobody is listening.
+        aclose = getattr(chunks, "aclose", None)
+        if aclose:
+            await aclose()
+
+
+async def _sse_named_events(events: AsyncIterator[Tuple[str, Dict[str, Any]]]) -> AsyncIterator[str]:
+    try:
+        async for event, data in events:
+            yield format_sse(data, event=event)
+    except Exception as e:
+        logger.error(f"SSE stream failed: {str(e)}")
+        yield format_sse({"detail": str(e)}, event="error")
+    finally:
+        aclose = getattr(events, "aclose", None)
+        if aclose:
+            await aclose()
+
+
+def _streaming_response(frames: AsyncIterator[str]) -> StreamingResponse:
+    return StreamingResponse(
+        frames,
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",  # disable proxy buffering (nginx/Railway)
+        },
+    )
+
+
+def sse_response(chunks: AsyncIterator[str]) -> StreamingResponse:
+    """Build a StreamingResponse that pushes text chunks as SSE events."""
+    return _streaming_response(_sse_events(chunks))
+
+
+def sse_event_response(events: AsyncIterator[Tuple[str, Dict[str, Any]]]) -> StreamingResponse:
+    """
+    Build a StreamingResponse from (event name, payload) pairs.
+
+    For structured progress streams; the producer sends its own final
+    event. An exception midway becomes an `error` event.
+    """
+    return _streaming_response(_sse_named_events(events))
@@ -0,0 +1,173 @@
+"""
+Upload Handling
+
+Bounded reads of multipart uploads. Oversized requests are rejected from
+the Content-Length header (or, for chunked bodies, as soon as the limit is
+crossed) before the multipart form is parsed. Accepted files are copied in
+chunks into a SpooledTemporaryFile, which keeps small files in memory and
+moves larger ones to disk. The SHA-256 is computed during the same read.
+"""
+
+import hashlib
+import io
+import json
+import tempfile
+from typing import Dict, Optional
+
+from fastapi import HTTPException, UploadFile
+
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+UPLOAD_CHUNK_SIZE = 64 * 1024
+SPOOL_MEMORY_LIMIT = 1024 * 1024  # larger uploads are spooled to disk
+MULTIPART_OVERHEAD = 64 * 1024  # boundaries and part headers on top of the file itself
+
+
+def _too_large_detail(max_size: int) -> str:
+    return f"Upload exceeds maximum allowed size ({max_size} bytes)"
+
+
+class UploadTooLargeError(Exception):
+    """Raised when an upload exceeds its size limit."""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        super().__init__(_too_large_detail(max_size))
+
+
+class _SpoolRaw(io.RawIOBase):
+    """Raw stream over a spooled file, so it can be wrapped in a BufferedReader."""
+
+    def __init__(self, spooled: tempfile.SpooledTemporaryFile):
+        self._spooled = spooled
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        data = self._spooled.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+
+class SpooledUpload:
+    """An accepted upload: spooled contents plus size and SHA-256."""
+
+    def __init__(self, filename: str, content_type: Optional[str], spooled: tempfile.SpooledTemporaryFile, size: int, sha256: str):
+        self.filename = filename
+        self.content_type = content_type
+        self.file = spooled
+        self.size = size
+        self.sha256 = sha256
+
+    @classmethod
+    def from_bytes(cls, filename: str, content_type: Optional[str], content: bytes) -> "SpooledUpload":
+        """Wrap contents that are already in memory (tests, benchmarks, re-processing)."""
+        spooled = tempfile.SpooledTemporaryFile(max_size=SPOOL_MEMORY_LIMIT)
+        spooled.write(content)
+        spooled.seek(0)
+        return cls(filename, content_type, spooled, len(content), hashlib.sha256(content).hexdigest())
+
+    def reader(self) -> io.BufferedReader:
+        """
+        Buffered stream over the contents from the start, for consumers
+        that take a file object (e.g. storage uploads) instead of bytes.
+        """
+        self.file.seek(0)
+        return io.BufferedReader(_SpoolRaw(self.file), buffer_size=UPLOAD_CHUNK_SIZE)
+
+    def read_bytes(self) -> bytes:
+        """Materialize the contents; callers should drop the bytes as soon as they can."""
+        self.file.seek(0)
+        return self.file.read()
+
+    def close(self) -> None:
+        self.file.close()
+
+    def __enter__(self) -> "SpooledUpload":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+async def spool_upload(file: UploadFile, max_size: Optional[int]) -> SpooledUpload:
+    """
+    Copy an upload into a spooled temp file in chunks, enforcing `max_size`.
+
+    Raises:
+        UploadTooLargeError: As soon as more than `max_size` bytes are read
+    """
+    spooled = tempfile.SpooledTemporaryFile(max_size=SPOOL_MEMORY_LIMIT)
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        await file.seek(0)
+        while True:
+            chunk = await file.read(UPLOAD_CHUNK_SIZE)
+            if not chunk:
+                break
+            size += len(chunk)
+            if max_size is not None and size > max_size:
+                raise UploadTooLargeError(max_size)
+            digest.update(chunk)
+            spooled.write(chunk)
+    except BaseException:
+        spooled.close()
+        raise
+    spooled.seek(0)
+    return SpooledUpload(file.filename or "", file.content_type, spooled, size, digest.hexdigest())
+
+
+class UploadSizeLimitMiddleware:
+    """
+    Reject request bodies over a per-path limit before they are buffered.
+
+    Requests with a Content-Length over the limit get a 413 without the
+    body being read. Chunked bodies are counted as they stream in and cut
+    off with a 413 at the limit.
+    """
+
+    def __init__(self, app, limits: Dict[str, int]):
+        self.app = app
+        self.limits = limits
+
+    async def __call__(self, scope, receive, send):
+        limit = self.limits.get(scope.get("path", "").rstrip("/")) if scope["type"] == "http" else None
+        if limit is None or scope.get("method") not in ("POST", "PUT"):
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope.get("headers") or [])
+        content_length = headers.get(b"content-length")
+        if content_length is not None and content_length.isdigit() and int(content_length) > limit:
+            logger.warning(f"Rejected {scope['path']} upload of {int(content_length)} bytes (limit {limit})")
+            await self._reject(send, limit)
+            return
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    logger.warning(f"Cut off streamed {scope['path']} upload at {limit} bytes")
+                    # FastAPI re-raises HTTPExceptions from body parsing as-is
+                    raise HTTPException(status_code=413, detail=_too_large_detail(limit))
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+    @staticmethod
+    async def _reject(send, limit: int) -> None:
+        body = json.dumps({"detail": _too_large_detail(limit)}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 413,
+            "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+        })
+        await send({"type": "http.response.body", "body": body})
@@ -1,7 +1,12 @@
+import asyncio
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
 from app.core.logging import setup_logging
+from app.core.uploads import MULTIPART_OVERHEAD, UploadSizeLimitMiddleware
+from app.services.document_extraction import shutdown_extraction_pool, warm_extraction_pool
+from app.services.footprint_enrichment import footprint_worker
+from app.services.job_rescoring import rescore_worker
 from app.api import candidates, jobs, applications, screenings, digital_footprints, admin, employees, attendance, payroll, performance, leave, voice_interviews
 
 # Setup logging
@@ -16,6 +21,17 @@ app = FastAPI(
     redoc_url="/redoc",
 )
 
+# Reject oversized resume uploads before the multipart body is buffered.
+# Added before CORS so CORS wraps it and the 413 reaches the browser with
+# CORS headers instead of as an opaque network error.
+app.add_middleware(
+    UploadSizeLimitMiddleware,
+    limits={
+        "/api/candidates/parse": settings.MAX_UPLOAD_SIZE + MULTIPART_OVERHEAD,
+        "/api/candidates/parse/bulk": settings.BULK_MAX_UPLOAD_SIZE,
+    },
+)
+
 # Configure CORS to allow frontend to communicate with backend
 allowed_origins = settings.cors_origins_list
 
@@ -47,6 +63,35 @@ app.include_router(performance.router, prefix="/api/performance", tags=["Perform
 app.include_router(leave.router, prefix="/api/leave", tags=["Leave Management"])
 app.include_router(voice_interviews.router, prefix="/api/voice-interviews", tags=["Voice Interviews"])
 
+@app.on_event("startup")
+async def start_extraction_pool():
+    """Spawn resume extraction workers before the first upload arrives"""
+    await asyncio.to_thread(warm_extraction_pool)
+
+@app.on_event("shutdown")
+async def stop_extraction_pool():
+    shutdown_extraction_pool()
+
+@app.on_event("startup")
+async def start_footprint_worker():
+    """Drain the digital footprint enrichment queue in the background"""
+    if settings.FOOTPRINT_WORKER_ENABLED:
+        footprint_worker.start()
+
+@app.on_event("shutdown")
+async def stop_footprint_worker():
+    await footprint_worker.stop()
+
+@app.on_event("startup")
+async def start_rescore_worker():
+    """Re-score applications of edited jobs in the background"""
+    if settings.RESCORE_WORKER_ENABLED:
+        rescore_worker.start()
+
+@app.on_event("shutdown")
+async def stop_rescore_worker():
+    await rescore_worker.stop()
+
 @app.get("/")
 async def root():
     """Health check endpoint"""
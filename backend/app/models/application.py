@@ -32,6 +32,8 @@ class MatchResponse(BaseModel):
     """Response with matching score and highlights"""
     fit_score: float
     highlights: dict
+    cached: bool = False  # stored analysis reused; candidate and job unchanged
+    strategy: str = "llm"  # llm or lexical (keyword score, not saved)
 
 
 class ApplicationStatusUpdate(BaseModel):
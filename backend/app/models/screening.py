@@ -38,3 +38,14 @@ class ScreeningResponse(BaseModel):
     evaluation: ScreeningEvaluation
     timeline: List[Dict[str, Any]] = []
 
+
+class ScreeningChatMessage(BaseModel):
+    """A single turn in a text screening chat"""
+    role: str  # "user" (candidate) or "assistant" (interviewer)
+    content: str
+
+
+class ScreeningChatRequest(BaseModel):
+    """Request for the interviewer's next chat turn"""
+    application_id: str
+    messages: List[ScreeningChatMessage] = []
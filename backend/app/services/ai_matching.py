@@ -1,20 +1,111 @@
-from typing import Dict, List
+import hashlib
+import json
+from typing import Any, AsyncIterator, Dict, List, Optional
 from supabase import Client
 from app.core.config import settings
 from app.core.logging import get_logger
 from app.core.supabase_client import get_supabase_client
-from app.core.ai_client import generate_json_response
+from app.core.ai_client import generate_json_response, generate_ai_response_stream
+from app.services.lexical_scoring import lexical_match
+from app.services.prompt_context import render_candidate, render_job
 
 logger = get_logger(__name__)
 
-async def match_candidate_to_job(candidate_id: str, job_id: str) -> Dict:
+# llm: Gemini fit analysis; lexical: deterministic BM25 score (app.services.lexical_scoring), no AI call
+MATCH_STRATEGIES = ("llm", "lexical")
+MATCH_SYSTEM_MESSAGE = "You are an expert HR recruiter specializing in candidate-job matching. Provide accurate, detailed analysis."
+
+
+def match_request_options() -> Dict:
+    """generate_json_response options shared by single matches and bulk ranking (app.services.job_ranking)."""
+    return {
+        "model": settings.AI_MODEL,
+        "temperature": settings.AI_TEMPERATURE,
+        "max_tokens": settings.AI_MAX_TOKENS,
+        "system_message": MATCH_SYSTEM_MESSAGE,
+        "caller": "candidate_match",
+    }
+
+
+def build_match_prompt(candidate_profile: Dict, job: Dict) -> str:
+    """Fit-analysis prompt for a candidate row (parsed_data, digital_footprints) and a job row."""
+    return f"""
+        You are an expert HR recruiter. Analyze how well this candidate matches the job requirements.
+        
+        Candidate Profile:
+        {render_candidate(candidate_profile)}
+        
+        Job Description:
+        {render_job(job)}
+        
+        Provide a detailed analysis in JSON format with:
+        1. fit_score: A number from 0-100 indicating overall match quality
+        2. strengths: List of candidate's strengths relevant to this role
+        3. weaknesses: List of gaps or areas where candidate doesn't match
+        4. recommendations: List of suggestions for the recruiter
+        """
+
+
+def match_fingerprint(candidate_profile: Dict, job: Dict) -> str:
+    """
+    Hash of everything a match depends on: the rendered prompt (candidate
+    profile and footprints, job posting), the model and the system message.
+    """
+    options = match_request_options()
+    inputs = {
+        "prompt": build_match_prompt(candidate_profile, job),
+        "model": options["model"],
+        "system_message": options["system_message"],
+    }
+    return hashlib.sha256(json.dumps(inputs, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def parse_fit_score(analysis: Any) -> Optional[float]:
+    """The analysis' fit_score clamped to 0-100, or None if it has no numeric one."""
+    try:
+        score = float(analysis["fit_score"])
+    except (KeyError, TypeError, ValueError):
+        return None
+    return round(min(100.0, max(0.0, score)), 2)
+
+
+def match_highlights(analysis: Dict) -> Dict:
+    """The recruiter-facing part of a fit analysis."""
+    return {
+        "strengths": analysis.get("strengths", []),
+        "weaknesses": analysis.get("weaknesses", []),
+        "recommendations": analysis.get("recommendations", []),
+    }
+
+
+async def match_candidate_to_job(
+    candidate_id: str,
+    job_id: str,
+    cover_letter: Optional[str] = None,
+    force: bool = False,
+    strategy: str = "llm",
+) -> Dict:
     """
     Match a candidate against a job description using AI.
+
+    The application stores a fingerprint of the match inputs; if neither
+    the candidate nor the job changed since the last match, the stored
+    analysis is returned without an AI call (force=True re-runs it).
+    Otherwise the application is written with a single upsert. Existing
+    highlight keys (e.g. a cover letter) are kept.
+
+    strategy="lexical" scores with the deterministic BM25 scorer instead.
+    It makes no AI call and writes nothing, so a stored LLM analysis is
+    never overwritten by a keyword score.
     
     Returns:
     - fit_score: 0-100 score indicating match quality
     - highlights: Strengths, weaknesses, and recommendations
+    - cached: Whether the stored analysis was reused
+    - strategy: The scorer used
     """
+    if strategy not in MATCH_STRATEGIES:
+        raise ValueError(f"Unknown match strategy: {strategy}")
     try:
         supabase = get_supabase_client()
         
@@ -29,69 +120,113 @@ async def match_candidate_to_job(candidate_id: str, job_id: str) -> Dict:
         if not job_response.data:
             raise ValueError(f"Job with id {job_id} not found.")
         job_description = job_response.data
-        
-        # Craft matching prompt
-        prompt = f"""
-        You are an expert HR recruiter. Analyze how well this candidate matches the job requirements.
-        
-        Candidate Profile:
-        {candidate_profile}
-        
-        Job Description:
-        {job_description}
-        
-        Provide a detailed analysis in JSON format with:
-        1. fit_score: A number from 0-100 indicating overall match quality
-        2. strengths: List of candidate's strengths relevant to this role
-        3. weaknesses: List of gaps or areas where candidate doesn't match
-        4. recommendations: List of suggestions for the recruiter
-        """
+
+        if strategy == "lexical":
+            analysis = lexical_match(candidate_profile, job_description)
+            logger.info(f"Lexical match of candidate {candidate_id} to job {job_id}: {analysis['fit_score']}")
+            return {
+                "fit_score": analysis["fit_score"],
+                "highlights": match_highlights(analysis),
+                "cached": False,
+                "strategy": strategy,
+            }
+
+        existing_app = supabase.table("applications").select(
+            "id, fit_score, highlights, match_fingerprint"
+        ).eq("candidate_id", candidate_id).eq("job_id", job_id).limit(1).execute()
+        application = existing_app.data[0] if existing_app.data else {}
+        highlights = application.get("highlights")
+        highlights = dict(highlights) if isinstance(highlights, dict) else {}
+
+        fingerprint = match_fingerprint(candidate_profile, job_description)
+        if not force and application.get("match_fingerprint") == fingerprint and application.get("fit_score") is not None:
+            logger.info(f"Candidate {candidate_id} and job {job_id} unchanged since last match; reusing stored analysis")
+            if cover_letter and highlights.get("cover_letter") != cover_letter:
+                highlights["cover_letter"] = cover_letter
+                supabase.table("applications").update({"highlights": highlights}).eq("id", application["id"]).execute()
+            return {
+                "fit_score": float(application["fit_score"]),
+                "highlights": match_highlights(highlights),
+                "cached": True,
+                "strategy": strategy,
+            }
         
         # Generate analysis using MegaLLM
         analysis = await generate_json_response(
-            prompt=prompt,
-            model=settings.AI_MODEL,
-            temperature=settings.AI_TEMPERATURE,
-            max_tokens=settings.AI_MAX_TOKENS,
-            system_message="You are an expert HR recruiter specializing in candidate-job matching. Provide accurate, detailed analysis."
+            prompt=build_match_prompt(candidate_profile, job_description),
+            **match_request_options(),
         )
+        fit_score = parse_fit_score(analysis)
+        if fit_score is None:
+            raise ValueError("AI response has no numeric fit_score")
+
+        highlights.update(match_highlights(analysis))
+        if cover_letter:
+            highlights["cover_letter"] = cover_letter
+        supabase.table("applications").upsert(
+            {
+                "candidate_id": candidate_id,
+                "job_id": job_id,
+                "fit_score": fit_score,
+                "highlights": highlights,
+                "match_fingerprint": fingerprint,
+            },
+            on_conflict="candidate_id,job_id",
+        ).execute()
         
-        # Store application with fit score in database
-        application_data = {
-            "candidate_id": candidate_id,
-            "job_id": job_id,
-            "fit_score": analysis["fit_score"],
-            "highlights": analysis
-        }
-        
-        # Check if application already exists
-        existing_app = supabase.table("applications").select("id").eq(
-            "candidate_id", candidate_id
-        ).eq("job_id", job_id).execute()
-        
-        if existing_app.data:
-            # Update existing application
-            supabase.table("applications").update(application_data).eq(
-                "id", existing_app.data[0]['id']
-            ).execute()
-            logger.info(f"Updated application for candidate {candidate_id} to job {job_id}")
-        else:
-            # Create new application
-            supabase.table("applications").insert(application_data).execute()
-            logger.info(f"Created new application for candidate {candidate_id} to job {job_id}")
-        
-        logger.info(f"Matched candidate {candidate_id} to job {job_id} with score {analysis['fit_score']}")
+        logger.info(f"Matched candidate {candidate_id} to job {job_id} with score {fit_score}")
         
         return {
-            "fit_score": analysis["fit_score"],
-            "highlights": {
-                "strengths": analysis.get("strengths", []),
-                "weaknesses": analysis.get("weaknesses", []),
-                "recommendations": analysis.get("recommendations", [])
-            }
+            "fit_score": fit_score,
+            "highlights": match_highlights(analysis),
+            "cached": False,
+            "strategy": strategy,
         }
     
     except Exception as e:
         logger.error(f"Error matching candidate to job: {str(e)}")
         raise
 
+
+async def stream_match_recommendation(candidate_id: str, job_id: str) -> AsyncIterator[str]:
+    """
+    Prepare a streamed, recruiter-facing recommendation for a candidate/job pair.
+
+    Candidate and job are loaded up front so missing records raise ValueError
+    before any response is started; the returned iterator yields text chunks
+    as Gemini produces them.
+    """
+    supabase = get_supabase_client()
+
+    candidate_response = supabase.table("candidates").select(
+        "name, parsed_data, digital_footprints(github_data, linkedin_data)"
+    ).eq("id", candidate_id).single().execute()
+    if not candidate_response.data:
+        raise ValueError(f"Candidate with id {candidate_id} not found.")
+
+    job_response = supabase.table("jobs").select("title, description, requirements").eq("id", job_id).single().execute()
+    if not job_response.data:
+        raise ValueError(f"Job with id {job_id} not found.")
+
+    prompt = f"""
+        You are an expert HR recruiter. Write a concise recommendation for the hiring team
+        on whether to advance this candidate for the role.
+
+        Candidate Profile:
+        {render_candidate(candidate_response.data)}
+
+        Job Description:
+        {render_job(job_response.data)}
+
+        Cover fit with the key requirements, notable strengths, gaps to probe in an interview,
+        and a clear recommendation. Use short paragraphs or bullet points in plain text.
+        """
+
+    return generate_ai_response_stream(
+        prompt=prompt,
+        model=settings.AI_MODEL,
+        temperature=settings.AI_TEMPERATURE,
+        max_tokens=settings.AI_MAX_TOKENS,
+        system_message="You are an expert HR recruiter specializing in candidate-job matching. Provide accurate, actionable recommendations.",
+        caller="match_recommendation",
+    )
@@ -1,16 +1,30 @@
-import io
+import json
 import re
-from typing import Dict, Any
-from PyPDF2 import PdfReader
-from docx import Document
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Optional, Tuple
 from supabase import Client
 
 from app.models.candidate import ResumeUploadResponse, ParsedData
 from app.services.link_scraper import scrape_links
+from app.services.embedding_index import index_candidate
+from app.services.footprint_enrichment import completed_footprint, enqueue_footprint
+from app.services.resume_text import store_resume_text
+from app.services.skill_index import skill_columns
+from app.services.link_classifier import extract_profile_links
 from app.core.config import settings
 from app.core.logging import get_logger
 from app.core.supabase_client import get_supabase_client
-from app.core.ai_client import generate_json_response
+from app.core.ai_client import generate_json_batch, generate_json_response
+from app.services.prompt_context import estimate_tokens, render_resume_text
+from app.services.resume_prefilter import PrefilterResult, find_email, prefilter_resume, split_sections
+from app.services.document_extraction import DocumentExtraction, extract_document, extract_pdf
+from app.services.resume_cache import (
+    cache_text_hash,
+    cached_parsed_data,
+    content_hash,
+    find_by_text_hash,
+    record_parse,
+)
 
 logger = get_logger(__name__)
 
@@ -35,188 +49,61 @@ def _sanitize_url(url: str) -> str | None:
 
 async def extract_text_from_pdf(content: bytes) -> str:
     """Extract text from PDF file"""
-    try:
-        pdf_file = io.BytesIO(content)
-        pdf_reader = PdfReader(pdf_file)
-        text = ""
-        for page in pdf_reader.pages:
-            text += page.extract_text()
-        return text
-    except Exception as e:
-        logger.error(f"Error extracting PDF text: {str(e)}")
-        raise
+    return (await extract_document(content, 'pdf')).text
+
 
 def extract_hyperlinks_from_pdf(content: bytes) -> Dict[str, str]:
     """Extract hyperlinks from PDF annotations"""
-    links = {}
     try:
-        pdf_file = io.BytesIO(content)
-        pdf_reader = PdfReader(pdf_file)
-
-        all_urls = []
-        for page in pdf_reader.pages:
-            # Extract hyperlinks from annotations
-            if "/Annots" in page:
-                annotations = page["/Annots"]
-                try:
-                    for annotation in annotations:
-                        obj = annotation.get_object()
-                        if obj.get("/Subtype") == "/Link":
-                            if "/A" in obj:
-                                action = obj["/A"]
-                                if "/URI" in action:
-                                    uri = str(action["/URI"])
-                                    # Skip mailto links
-                                    if not uri.startswith('mailto:'):
-                                        all_urls.append(uri)
-                except Exception as annot_error:
-                    logger.warning(f"Error extracting annotations: {str(annot_error)}")
-
-        logger.info(f"Extracted {len(all_urls)} hyperlinks from PDF: {all_urls}")
-
-        # Categorize URLs
-        for url in all_urls:
-            url_lower = url.lower()
-            if 'github.com' in url_lower and 'github' not in links:
-                links['github'] = url
-            elif 'linkedin.com' in url_lower and 'linkedin' not in links:
-                links['linkedin'] = url
-            elif 'portfolio' not in links and 'github.com' not in url_lower and 'linkedin.com' not in url_lower:
-                # Assume first non-github/linkedin link is portfolio
-                # Check if it looks like a personal site (vercel, netlify, personal domain, etc.)
-                if any(domain in url_lower for domain in ['vercel', 'netlify', 'github.io', 'herokuapp', 'portfolio']):
-                    links['portfolio'] = url
-
-        logger.info(f"Categorized PDF links: {links}")
-        return links
-
+        return extract_pdf(content).links
     except Exception as e:
         logger.error(f"Error extracting hyperlinks from PDF: {str(e)}")
         return {}
 
+
 async def extract_text_from_docx(content: bytes) -> str:
     """Extract text from DOCX file"""
-    try:
-        doc_file = io.BytesIO(content)
-        doc = Document(doc_file)
-        text = "\n".join([paragraph.text for paragraph in doc.paragraphs])
-        return text
-    except Exception as e:
-        logger.error(f"Error extracting DOCX text: {str(e)}")
-        raise
+    return (await extract_document(content, 'docx')).text
 
 def extract_links_with_regex(text: str) -> Dict[str, str]:
     """
-    Extract professional links from resume text using regex patterns.
+    Extract professional links from resume text.
     Looks for GitHub, LinkedIn, and Portfolio URLs with contextual keywords.
     """
-    links = {}
-
-    # Normalize text for better matching
-    text_lower = text.lower()
-
-    # GitHub patterns - look for github.com URLs
-    github_patterns = [
-        r'(?:https?://)?(?:www\.)?github\.com/[\w-]+/?',  # Standard GitHub URL
-        r'github\.com/[\w-]+',  # Without protocol
-    ]
-    for pattern in github_patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
-        if match:
-            url = match.group()
-            # Ensure it has https://
-            if not url.startswith('http'):
-                url = f"https://{url}"
-            # Remove trailing slash
-            links['github'] = url.rstrip('/')
-            logger.info(f"Extracted GitHub URL: {links['github']}")
-            break
-
-    # LinkedIn patterns - look for linkedin.com URLs
-    linkedin_patterns = [
-        r'(?:https?://)?(?:www\.)?linkedin\.com/in/[\w-]+/?',  # Standard LinkedIn profile
-        r'linkedin\.com/in/[\w-]+',  # Without protocol
-    ]
-    for pattern in linkedin_patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
-        if match:
-            url = match.group()
-            if not url.startswith('http'):
-                url = f"https://{url}"
-            links['linkedin'] = url.rstrip('/')
-            logger.info(f"Extracted LinkedIn URL: {links['linkedin']}")
-            break
-
-    # Portfolio patterns - look for personal websites
-    # Look for URLs near keywords like "portfolio", "website", "personal site"
-    portfolio_keywords = ['portfolio', 'website', 'personal site', 'web site', 'blog']
-
-    # Find all URLs in text
-    url_pattern = r'(?:https?://)?(?:www\.)?[\w.-]+\.(?:com|net|org|io|dev|me|co|in|app|site)(?:/[\w/-]*)?'
-    all_urls = re.findall(url_pattern, text, re.IGNORECASE)
-
-    for url in all_urls:
-        # Skip if already identified as GitHub or LinkedIn
-        if 'github.com' in url.lower() or 'linkedin.com' in url.lower():
-            continue
-
-        # Find the context around this URL
-        url_index = text_lower.find(url.lower())
-        if url_index != -1:
-            # Check 100 characters before the URL for portfolio keywords
-            context_start = max(0, url_index - 100)
-            context = text_lower[context_start:url_index]
-
-            if any(keyword in context for keyword in portfolio_keywords):
-                if not url.startswith('http'):
-                    url = f"https://{url}"
-                links['portfolio'] = url.rstrip('/')
-                logger.info(f"Extracted Portfolio URL: {links['portfolio']}")
-                break
-
-    # If no portfolio found but there's a URL that's not github/linkedin, consider it
-    if 'portfolio' not in links and all_urls:
-        for url in all_urls:
-            if 'github.com' not in url.lower() and 'linkedin.com' not in url.lower():
-                if not url.startswith('http'):
-                    url = f"https://{url}"
-                links['portfolio'] = url.rstrip('/')
-                logger.info(f"Extracted potential Portfolio URL: {links['portfolio']}")
-                break
-
+    links = extract_profile_links(text)
+    for category, url in links.items():
+        logger.info(f"Extracted {category} URL: {url}")
     return links
 
-async def parse_resume_with_ai(text: str, pdf_links: Dict[str, str] = None) -> ParsedData:
-    """
-    Use MegaLLM (GPT-5) to parse resume text and extract structured data.
-
-    Extracts: name, email, phone, skills, education, experience, and links
-
-    Args:
-        text: Raw text extracted from resume file
-        pdf_links: Optional dictionary of links extracted from PDF annotations
-
-    Returns:
-        ParsedData: Structured candidate data extracted from resume
-
-    Raises:
-        Exception: If parsing fails or response is invalid
-    """
-    try:
-        if pdf_links is None:
-            pdf_links = {}
-
-        # Craft prompt for structured extraction
-        prompt = f"""
+# Prompt line per field, shared by the full and the unresolved-only prompts
+_FIELD_INSTRUCTIONS = {
+    "name": "- name: Full name of the candidate",
+    "email": "- email: Email address",
+    "phone": "- phone: Phone number (if available)",
+    "skills": "- skills: List of technical and professional skills",
+    "education": "- education: List of education entries with degree, institution, year",
+    "experience": "- experience: List of work experience with company, role, duration, description",
+}
+
+# Resume sections that carry each field (see resume_prefilter.split_sections)
+_FIELD_SECTIONS = {
+    "name": ("header",),
+    "email": ("header",),
+    "phone": ("header",),
+    "skills": ("skills", "projects", "summary"),
+    "education": ("education",),
+    "experience": ("experience",),
+}
+
+
+async def _parse_full_with_ai(text: str) -> Dict[str, Any]:
+    """Send the whole resume to the model and ask for every field."""
+    fields = "\n        ".join(_FIELD_INSTRUCTIONS.values())
+    prompt = f"""
         Parse the following resume and extract structured information in JSON format.
 
         Extract the following fields:
-        - name: Full name of the candidate
-        - email: Email address
-        - phone: Phone number (if available)
-        - skills: List of technical and professional skills
-        - education: List of education entries with degree, institution, year
-        - experience: List of work experience with company, role, duration, description
+        {fields}
         - links: Object with github, linkedin, portfolio URLs (if found)
 
         IMPORTANT for links extraction:
@@ -229,22 +116,283 @@ async def parse_resume_with_ai(text: str, pdf_links: Dict[str, str] = None) -> P
         - Only include valid, complete URLs
 
         Resume text:
-        {text}
+        {render_resume_text(text)}
 
         Return ONLY valid JSON without any markdown formatting or additional text.
         """
 
-        # Generate JSON response using MegaLLM
-        parsed_json = await generate_json_response(
-            prompt=prompt,
-            model=settings.AI_MODEL,
-            temperature=settings.AI_TEMPERATURE,
-            max_tokens=settings.AI_MAX_TOKENS,
-            system_message="You are an expert resume parser. Extract structured data accurately and return only valid JSON."
-        )
+    return await generate_json_response(
+        prompt=prompt,
+        model=settings.AI_MODEL,
+        temperature=settings.AI_TEMPERATURE,
+        max_tokens=settings.AI_MAX_TOKENS,
+        system_message="You are an expert resume parser. Extract structured data accurately and return only valid JSON.",
+        caller="resume_parse",
+    )
+
+
+async def _parse_unresolved_with_ai(text: str, prefiltered: PrefilterResult) -> Dict[str, Any]:
+    """
+    Start from the rule-based fields and ask the model only for the rest,
+    sending just the resume sections those fields live in.
+    """
+    parsed_json: Dict[str, Any] = {
+        "name": prefiltered.name,
+        "email": prefiltered.email,
+        "phone": prefiltered.phone,
+        "skills": prefiltered.skills,
+        "education": prefiltered.education,
+        "experience": prefiltered.experience,
+    }
+    missing = prefiltered.unresolved(settings.RESUME_RULE_MIN_SKILLS)
+    if not missing:
+        logger.info("Resume fully resolved by rule-based extraction; skipping AI parse")
+        return parsed_json
+    if ("name" in missing or "email" in missing) and not prefiltered.phone:
+        missing.append("phone")
+
+    section_names = []
+    for name in missing:
+        for section in _FIELD_SECTIONS[name]:
+            if section in prefiltered.sections and section not in section_names:
+                section_names.append(section)
+    if all(any(section in prefiltered.sections for section in _FIELD_SECTIONS[name]) for name in missing):
+        excerpt = "\n\n".join(f"{section.upper()}:\n{prefiltered.sections[section]}" for section in section_names)
+    else:
+        # Some field has no recognisable section; let the model see everything
+        excerpt = text
+    logger.info(f"Asking AI for unresolved resume fields {missing} from sections {section_names or ['all']}")
+
+    fields = "\n        ".join(_FIELD_INSTRUCTIONS[name] for name in missing)
+    prompt = f"""
+        Extract the following fields from the resume excerpt below, in JSON format.
+        Only these keys are needed; other details were already extracted.
+
+        {fields}
+
+        Resume excerpt:
+        {render_resume_text(excerpt)}
+
+        Return ONLY valid JSON without any markdown formatting or additional text.
+        """
+
+    ai_json = await generate_json_response(
+        prompt=prompt,
+        model=settings.AI_MODEL,
+        temperature=settings.AI_TEMPERATURE,
+        max_tokens=settings.AI_MAX_TOKENS,
+        system_message="You are an expert resume parser. Extract structured data accurately and return only valid JSON.",
+        caller="resume_parse",
+    )
+
+    for name in missing:
+        value = ai_json.get(name)
+        if name == "skills":
+            # Dictionary hits are reliable; the model adds whatever it doesn't know
+            known = {skill.lower() for skill in prefiltered.skills}
+            extra = [skill for skill in (value or []) if isinstance(skill, str) and skill.lower() not in known]
+            parsed_json["skills"] = prefiltered.skills + extra
+        elif value:
+            parsed_json[name] = value
+    return parsed_json
+
+
+def _parse_with_rules_only(prefiltered: PrefilterResult) -> Dict[str, Any]:
+    """Rule-based fields only (RESUME_PARSE_MODE=rules); no model call."""
+    if not prefiltered.email:
+        raise ValueError("No email address found in resume; rule-based parsing needs one")
+    name = prefiltered.name
+    if not name:
+        # jane.doe@example.com -> Jane Doe
+        name = " ".join(part.capitalize() for part in re.split(r"[._-]+", prefiltered.email.split("@")[0]) if part)
+    return {
+        "name": name,
+        "email": prefiltered.email,
+        "phone": prefiltered.phone,
+        "skills": prefiltered.skills,
+        "education": prefiltered.education,
+        "experience": prefiltered.experience,
+    }
+
+
+# "sections" mode: task -> (fields, resume sections it reads). Contact
+# details come from the top of the resume; each list field is parsed from
+# its own section, in chunks when the section is long.
+_SECTION_TASKS = {
+    "contact": (("name", "email", "phone"), ("header",)),
+    "skills": (("skills",), ("skills", "summary", "certifications")),
+    "experience": (("experience",), ("experience",)),
+    "education": (("education",), ("education",)),
+    "projects": (("skills",), ("projects",)),
+}
+_PROJECT_SKILLS_INSTRUCTION = "- skills: Technologies and skills used in these projects"
+_LIST_FIELDS = ("education", "experience")
+
+
+def _chunk_section(text: str, max_tokens: int) -> List[str]:
+    """Split section text on line boundaries into pieces of about `max_tokens`."""
+    chunks: List[str] = []
+    current: List[str] = []
+    size = 0
+    for line in text.splitlines():
+        tokens = estimate_tokens(line) + 1
+        if current and size + tokens > max_tokens:
+            chunks.append("\n".join(current))
+            current, size = [], 0
+        current.append(line)
+        size += tokens
+    if current:
+        chunks.append("\n".join(current))
+    return chunks
+
+
+def _section_prompt(label: str, instructions: List[str], excerpt: str) -> str:
+    fields = "\n        ".join(instructions)
+    return f"""
+        Extract the following fields from one part of a resume ({label}), in JSON format.
+        Only these keys are needed; the rest of the resume is parsed separately.
+
+        {fields}
+
+        Resume {label}:
+        {render_resume_text(excerpt)}
+
+        Return ONLY valid JSON without any markdown formatting or additional text.
+        """
+
+
+def _section_tasks(text: str, sections: Dict[str, str]) -> List[Tuple[str, Tuple[str, ...], str]]:
+    """(label, fields, prompt) for every section prompt, in merge order."""
+    tasks = []
+    unplaced: List[str] = []
+    for task, (fields, sources) in _SECTION_TASKS.items():
+        excerpt = "\n\n".join(sections[source] for source in sources if source in sections)
+        if not excerpt:
+            # Projects are optional; other fields fall back to the full text
+            if task != "projects":
+                unplaced.extend(name for name in fields if name not in unplaced)
+            continue
+        instructions = [
+            _PROJECT_SKILLS_INSTRUCTION if task == "projects" else _FIELD_INSTRUCTIONS[name] for name in fields
+        ]
+        chunks = [excerpt] if task == "contact" else _chunk_section(excerpt, settings.RESUME_SECTION_CHUNK_TOKENS)
+        for index, chunk in enumerate(chunks):
+            label = task if len(chunks) == 1 else f"{task}, part {index + 1} of {len(chunks)}"
+            tasks.append((label, fields, _section_prompt(label, instructions, chunk)))
+    if unplaced:
+        instructions = [_FIELD_INSTRUCTIONS[name] for name in unplaced]
+        tasks.append(("full text", tuple(unplaced), _section_prompt("full text", instructions, text)))
+    return tasks
+
+
+def _merge_section_results(results: List[Tuple[Tuple[str, ...], Dict[str, Any]]]) -> Dict[str, Any]:
+    """
+    Merge section answers in task order: first non-empty value for scalar
+    fields, ordered unions for skills (case-insensitive) and list entries.
+    """
+    merged: Dict[str, Any] = {"name": None, "email": None, "phone": None, "skills": [], "education": [], "experience": []}
+    seen: Dict[str, set] = {"skills": set(), "education": set(), "experience": set()}
+    for fields, data in results:
+        for name in fields:
+            value = data.get(name)
+            if not value:
+                continue
+            if name == "skills":
+                for skill in value if isinstance(value, list) else []:
+                    if isinstance(skill, str) and skill.strip() and skill.strip().lower() not in seen["skills"]:
+                        seen["skills"].add(skill.strip().lower())
+                        merged["skills"].append(skill.strip())
+            elif name in _LIST_FIELDS:
+                for entry in value if isinstance(value, list) else []:
+                    key = json.dumps(entry, sort_keys=True, default=str)
+                    if isinstance(entry, dict) and key not in seen[name]:
+                        seen[name].add(key)
+                        merged[name].append(entry)
+            elif merged[name] is None:
+                merged[name] = value
+    return merged
+
+
+async def _parse_sections_with_ai(text: str) -> Dict[str, Any]:
+    """
+    Map-reduce parse for long resumes: one small prompt per section (long
+    sections split into chunks), run concurrently, then merged
+    deterministically. Each response is short, so it neither hits
+    AI_MAX_TOKENS mid-JSON nor waits on one long generation.
+    """
+    sections = split_sections(text)
+    if not set(sections) - {"header"}:
+        # No recognisable headings to split on
+        return await _parse_full_with_ai(text)
+
+    tasks = _section_tasks(text, sections)
+    logger.info(f"Parsing resume in {len(tasks)} section prompts: {[label for label, _, _ in tasks]}")
+    results = await generate_json_batch(
+        [prompt for _, _, prompt in tasks],
+        model=settings.AI_MODEL,
+        temperature=settings.AI_TEMPERATURE,
+        max_tokens=settings.AI_MAX_TOKENS,
+        system_message="You are an expert resume parser. Extract structured data accurately and return only valid JSON.",
+        caller="resume_parse",
+    )
+    failed = [(label, result.error) for (label, _, _), result in zip(tasks, results) if not result.ok]
+    if failed:
+        raise ValueError(f"Section parsing failed for {', '.join(label for label, _ in failed)}: {failed[0][1]}")
+
+    merged = _merge_section_results([
+        (fields, result.result if isinstance(result.result, dict) else {})
+        for (_, fields, _), result in zip(tasks, results)
+    ])
+    merged["email"] = merged["email"] or find_email(text)
+    return merged
+
+
+RESUME_PARSE_MODES = ("llm", "hybrid", "sections", "rules")
+
+
+async def parse_resume_with_ai(text: str, pdf_links: Dict[str, str] = None, mode: str = None) -> ParsedData:
+    """
+    Parse resume text into structured data.
+
+    Extracts: name, email, phone, skills, education, experience, and links
+
+    Args:
+        text: Raw text extracted from resume file
+        pdf_links: Optional dictionary of links extracted from PDF annotations
+        mode: "llm", "hybrid", "sections" or "rules"; defaults to
+            settings.RESUME_PARSE_MODE. hybrid resolves what it can with rules
+            (resume_prefilter) and asks the model only for the rest; sections
+            sends one concurrent prompt per resume section; rules never calls
+            the model. An llm-mode resume longer than
+            settings.RESUME_SECTION_PARSE_MIN_CHARS is parsed as in sections mode.
+
+    Returns:
+        ParsedData: Structured candidate data extracted from resume
+
+    Raises:
+        Exception: If parsing fails or response is invalid
+    """
+    try:
+        if pdf_links is None:
+            pdf_links = {}
+        mode = (mode or settings.RESUME_PARSE_MODE).lower()
+
+        prefiltered = prefilter_resume(text) if mode in ("hybrid", "rules") else None
+        long_resume = 0 < settings.RESUME_SECTION_PARSE_MIN_CHARS <= len(text)
+        if mode == "rules":
+            parsed_json = _parse_with_rules_only(prefiltered)
+        elif mode == "sections" or (mode == "llm" and long_resume):
+            parsed_json = await _parse_sections_with_ai(text)
+        elif prefiltered is not None and set(prefiltered.sections) - {"header"}:
+            parsed_json = await _parse_unresolved_with_ai(text, prefiltered)
+        else:
+            # llm mode, or no recognisable sections to work from
+            parsed_json = await _parse_full_with_ai(text)
+            if prefiltered is not None:
+                parsed_json["email"] = prefiltered.email or parsed_json.get("email")
 
         # Extract links using regex as a fallback/enhancement
-        regex_links = extract_links_with_regex(text)
+        regex_links = prefiltered.links if prefiltered is not None else extract_links_with_regex(text)
         logger.info(f"Regex extracted links: {regex_links}")
         logger.info(f"PDF annotation links: {pdf_links}")
 
@@ -293,17 +441,37 @@ async def parse_resume_with_ai(text: str, pdf_links: Dict[str, str] = None) -> P
         # Create ParsedData object
         parsed_data = ParsedData(**parsed_json)
 
-        logger.info(f"Successfully parsed resume for {parsed_data.name} using {settings.AI_MODEL}")
+        logger.info(f"Successfully parsed resume for {parsed_data.name} ({mode} mode, {settings.AI_MODEL})")
         return parsed_data
 
     except Exception as e:
         logger.error(f"Error parsing resume with AI: {str(e)}")
         raise
 
-async def store_candidate_data(parsed_data: ParsedData, resume_url: str, supabase: Client) -> str:
+async def store_candidate_data(
+    parsed_data: ParsedData,
+    resume_url: str,
+    supabase: Client,
+    scrape: bool = True,
+    extraction_meta: Optional[Dict[str, Any]] = None,
+    resume_text: Optional[str] = None,
+) -> str:
     """
     Stores candidate and digital footprint data in the database.
     Creates a new candidate or updates an existing one based on email.
+
+    With scrape=True, link scraping is queued for the footprint
+    enrichment worker rather than run here. Pass scrape=False to store
+    only the candidate row and run store_digital_footprint separately
+    (the bulk pipeline does this).
+
+    extraction_meta (DocumentExtraction.meta()) records how much of the
+    document was read and whether it was truncated. resume_text, the
+    extracted text, is kept compressed for later re-parsing
+    (app.services.resume_text).
+
+    The candidate is (re-)embedded for job pre-ranking
+    (app.services.embedding_index).
     """
     # Check if candidate exists
     existing_candidate = supabase.table("candidates").select("id").eq("email", parsed_data.email).execute()
@@ -314,6 +482,9 @@ async def store_candidate_data(parsed_data: ParsedData, resume_url: str, supabas
         "resume_url": resume_url,
         "parsed_data": parsed_data.dict()
     }
+    candidate_data.update(skill_columns(candidate_data["parsed_data"]))
+    if extraction_meta is not None:
+        candidate_data["extraction_meta"] = extraction_meta
 
     if existing_candidate.data:
         # Update existing candidate
@@ -326,61 +497,167 @@ async def store_candidate_data(parsed_data: ParsedData, resume_url: str, supabas
         candidate_id = new_candidate.data[0]['id']
         logger.info(f"Created new candidate: {candidate_id}")
 
-    # Scrape links and store digital footprint
-    if parsed_data.links:
-        enriched_data = await scrape_links(parsed_data.links)
-        footprint_data = {
-            "candidate_id": candidate_id,
-            "github_data": enriched_data.get("github"),
-            "linkedin_data": enriched_data.get("linkedin"),
-            "portfolio_data": enriched_data.get("portfolio"),
-        }
-        # Upsert to handle existing footprints
-        supabase.table("digital_footprints").upsert(footprint_data, on_conflict="candidate_id").execute()
-        logger.info(f"Stored digital footprint for candidate: {candidate_id}")
+    if resume_text:
+        store_resume_text(candidate_id, resume_text, supabase)
+
+    await index_candidate(candidate_id, candidate_data["parsed_data"])
+
+    if scrape:
+        try:
+            enqueue_footprint(candidate_id, parsed_data.links, supabase)
+        except Exception as e:
+            # The candidate is stored; the footprint can still be refreshed later
+            logger.error(f"Failed to queue digital footprint for {candidate_id}: {str(e)}")
 
     return candidate_id
 
-async def parse_resume(content: bytes, filename: str, resume_url: str) -> ResumeUploadResponse:
+async def store_digital_footprint(candidate_id: str, links: Dict[str, str], supabase: Client) -> None:
+    """Scrape a candidate's links and upsert their digital footprint."""
+    if not links:
+        return
+    enriched_data = await scrape_links(links)
+    footprint_data = completed_footprint(candidate_id, links, enriched_data)
+    # Upsert to handle existing footprints
+    supabase.table("digital_footprints").upsert(footprint_data, on_conflict="candidate_id").execute()
+    logger.info(f"Stored digital footprint for candidate: {candidate_id}")
+
+@dataclass
+class ResumeAnalysis:
+    """Outcome of parsing an extracted resume."""
+    parsed_data: ParsedData
+    text_hash: Optional[str]  # None when the text is too short to key the cache on
+    cached: bool  # parse reused from the resume cache
+    extraction_meta: Optional[Dict[str, Any]] = None
+    resume_text: Optional[str] = field(default=None, repr=False)  # extracted text, for storing
+
+    @property
+    def message(self) -> str:
+        return "Resume matched a previous upload; AI parsing skipped" if self.cached else "Resume parsed successfully"
+
+
+async def parse_extracted_resume(
+    extraction: DocumentExtraction,
+    filename: str,
+    supabase: Client,
+    force: bool = False,
+) -> ResumeAnalysis:
+    """
+    AI-parse extracted resume text, reusing an earlier parse of the same
+    text (a re-exported or re-saved CV) unless force=True.
+    """
+    logger.info(f"Extracted PDF hyperlinks: {extraction.links}")
+    digest = cache_text_hash(extraction.text)
+    cached = None if force else find_by_text_hash(digest, supabase)
+    if cached:
+        logger.info(f"Reusing cached parse for {filename}; skipping AI parsing")
+        return ResumeAnalysis(
+            cached_parsed_data(cached), digest, cached=True,
+            extraction_meta=extraction.meta(), resume_text=extraction.text,
+        )
+    # Parse with AI, passing PDF links for merging
+    parsed_data = await parse_resume_with_ai(extraction.text, extraction.links)
+    return ResumeAnalysis(
+        parsed_data, digest, cached=False,
+        extraction_meta=extraction.meta(), resume_text=extraction.text,
+    )
+
+
+async def parse_resume(
+    content: bytes,
+    filename: str,
+    resume_url: str,
+    force: bool = False,
+    storage_path: str = None,
+    file_hash: str = None,
+) -> ResumeUploadResponse:
     """
     Main function to parse resume.
 
     Steps:
     1. Extract text from file
-    2. Use AI to parse structured data
+    2. Use AI to parse structured data (skipped if the same text was parsed before)
     3. Scrape links found in resume
     4. Store candidate and footprint data in database
+    5. Record the parse in the resume cache
+
+    Pass force=True to re-run the AI parse even on a cache hit, and
+    file_hash if the SHA-256 of content is already known.
     """
     try:
         # Get supabase client
         supabase = get_supabase_client()
+        file_hash = file_hash or content_hash(content)
 
-        # Extract text based on file type
+        # Extract text (and PDF hyperlink annotations) off the event loop
         file_ext = filename.lower().split('.')[-1]
+        extraction = await extract_document(content, file_ext)
+        # Not needed past extraction; don't hold the file through AI parsing and scraping
+        content = None
 
-        # Extract hyperlinks from PDF annotations (if PDF)
-        pdf_links = {}
-        if file_ext == 'pdf':
-            text = await extract_text_from_pdf(content)
-            pdf_links = extract_hyperlinks_from_pdf(content)
-            logger.info(f"Extracted PDF hyperlinks: {pdf_links}")
-        elif file_ext in ['doc', 'docx']:
-            text = await extract_text_from_docx(content)
-        else:
-            raise ValueError(f"Unsupported file format: {file_ext}")
-
-        # Parse with AI, passing PDF links for merging
-        parsed_data = await parse_resume_with_ai(text, pdf_links)
+        analysis = await parse_extracted_resume(extraction, filename, supabase, force=force)
+        parsed_data = analysis.parsed_data
 
         # Store candidate and enriched data in Supabase
-        candidate_id = await store_candidate_data(parsed_data, resume_url, supabase)
+        candidate_id = await store_candidate_data(
+            parsed_data, resume_url, supabase,
+            extraction_meta=analysis.extraction_meta, resume_text=analysis.resume_text,
+        )
+        record_parse(file_hash, analysis.text_hash, parsed_data, candidate_id, resume_url, storage_path, supabase)
 
         return ResumeUploadResponse(
             candidate_id=candidate_id,
-            message="Resume parsed successfully",
+            message=analysis.message,
             parsed_data=parsed_data
         )
 
     except Exception as e:
         logger.error(f"Error in parse_resume: {str(e)}")
         raise
+
+async def reparse_stored_resume(
+    candidate_id: str,
+    text: str,
+    supabase: Client,
+    previous_links: Optional[Dict[str, str]] = None,
+    mode: Optional[str] = None,
+) -> ParsedData:
+    """
+    Re-run parsing on a candidate's stored resume text (see
+    app.services.resume_text), e.g. after a prompt change. No storage
+    download or document extraction happens.
+
+    Links from the previous parse are passed through like PDF annotation
+    links, since the stored text doesn't carry hyperlink targets. The
+    candidate's email is left as is.
+    """
+    parsed_data = await parse_resume_with_ai(text, previous_links, mode=mode)
+    supabase.table("candidates").update({
+        "name": parsed_data.name,
+        "parsed_data": parsed_data.dict(),
+        **skill_columns(parsed_data.dict()),
+    }).eq("id", candidate_id).execute()
+    await index_candidate(candidate_id, parsed_data.dict())
+    logger.info(f"Re-parsed stored resume text for candidate {candidate_id}")
+    return parsed_data
+
+async def reuse_cached_resume(cached: Dict[str, Any], supabase: Client) -> ResumeUploadResponse:
+    """
+    Serve a byte-identical re-upload from the resume cache.
+
+    No storage upload, extraction or AI call happens. The candidate row is
+    only rewritten if it no longer exists.
+    """
+    parsed_data = cached_parsed_data(cached)
+    candidate_id = cached.get("candidate_id")
+    if candidate_id:
+        existing = supabase.table("candidates").select("id").eq("id", candidate_id).execute()
+        if not existing.data:
+            candidate_id = None
+    if not candidate_id:
+        candidate_id = await store_candidate_data(parsed_data, cached.get("resume_url"), supabase)
+
+    return ResumeUploadResponse(
+        candidate_id=candidate_id,
+        message="Resume already uploaded; reused previous parse",
+        parsed_data=parsed_data
+    )
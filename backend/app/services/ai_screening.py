@@ -1,18 +1,24 @@
-from typing import Dict, List
-from app.models.screening import ScreeningResponse, ScreeningEvaluation
+from typing import AsyncIterator, Dict, List
+from app.models.screening import ScreeningResponse, ScreeningEvaluation, ScreeningChatMessage
 from app.core.config import settings
 from app.core.logging import get_logger
-from app.core.ai_client import generate_json_response, generate_ai_response
+from app.core.ai_client import generate_json_response, generate_ai_response, generate_ai_response_stream
+from app.services.prompt_context import render_section, render_value
 
 logger = get_logger(__name__)
 
-async def generate_screening_questions(job_role: str, candidate_profile: Dict) -> List[str]:
+async def generate_screening_questions(
+    job_role: str,
+    candidate_profile: Dict,
+    caller: str = "screening_questions",
+) -> List[str]:
     """
     Generate adaptive screening questions based on job and candidate using MegaLLM.
 
     Args:
         job_role: The job role/position being screened for
         candidate_profile: Dictionary containing candidate information
+        caller: Feature tag for AI usage accounting
 
     Returns:
         List[str]: List of screening questions
@@ -46,7 +52,7 @@ Technical: high-level understanding, practical experience, approach to challenge
 Generate 3 screening interview questions for a candidate applying for: {job_role}
 
 Candidate Background:
-{candidate_profile}
+{render_section(candidate_profile, settings.PROMPT_CANDIDATE_TOKEN_BUDGET)}
 
 Interview Style: {interview_style}
 
@@ -70,7 +76,8 @@ Example format: ["Question 1?", "Question 2?", "Question 3?"]
             model=settings.AI_MODEL,
             temperature=settings.AI_TEMPERATURE,
             max_tokens=settings.AI_MAX_TOKENS,
-            system_message="You are an expert interviewer. Generate relevant, insightful screening questions."
+            system_message="You are an expert interviewer. Generate relevant, insightful screening questions.",
+            caller=caller,
         )
 
         # Ensure we return a list
@@ -91,13 +98,18 @@ Example format: ["Question 1?", "Question 2?", "Question 3?"]
             "What excites you most about this role, and how does it align with your career goals?"
         ]
 
-async def evaluate_screening_responses(questions: List[str], responses: List[str]) -> ScreeningEvaluation:
+async def evaluate_screening_responses(
+    questions: List[str],
+    responses: List[str],
+    caller: str = "screening_evaluation",
+) -> ScreeningEvaluation:
     """
     Evaluate candidate's responses using MegaLLM AI.
 
     Args:
         questions: List of screening questions asked
         responses: List of candidate's responses
+        caller: Feature tag for AI usage accounting
 
     Returns:
         ScreeningEvaluation: Evaluation object with scores and feedback
@@ -133,7 +145,8 @@ async def evaluate_screening_responses(questions: List[str], responses: List[str
             model=settings.AI_MODEL,
             temperature=settings.AI_TEMPERATURE,
             max_tokens=settings.AI_MAX_TOKENS,
-            system_message="You are an expert interviewer and evaluator. Provide fair, accurate, and constructive evaluations."
+            system_message="You are an expert interviewer and evaluator. Provide fair, accurate, and constructive evaluations.",
+            caller=caller,
         )
 
         evaluation = ScreeningEvaluation(**evaluation_data)
@@ -260,3 +273,93 @@ async def conduct_screening(application_id: str, mode: str = "text") -> Screenin
                 weaknesses=["Technical evaluation unavailable"]
             )
         )
+
+
+async def stream_screening_summary(screening: Dict) -> AsyncIterator[str]:
+    """
+    Stream a recruiter-facing summary of a stored screening.
+
+    Args:
+        screening: Screening row with transcript and ai_summary
+
+    Returns:
+        AsyncIterator[str]: Text chunks as they are generated
+    """
+    evaluation = screening.get("ai_summary") or {}
+    prompt = f"""
+        Summarize this candidate screening interview for a recruiter.
+
+        Interview Transcript:
+        {screening.get("transcript") or "(no transcript captured)"}
+
+        Automated Evaluation:
+        {evaluation}
+
+        Highlight how the candidate communicated, what they know well, concerns worth
+        following up on, and a one-line hiring signal. Use plain text, no JSON.
+        """
+
+    return generate_ai_response_stream(
+        prompt=prompt,
+        model=settings.AI_MODEL,
+        temperature=settings.AI_TEMPERATURE,
+        max_tokens=settings.AI_MAX_TOKENS,
+        system_message="You are an expert interviewer and evaluator. Provide fair, accurate, and constructive summaries.",
+        caller="screening_summary",
+    )
+
+
+async def stream_screening_chat_reply(
+    application_id: str,
+    messages: List[ScreeningChatMessage],
+) -> AsyncIterator[str]:
+    """
+    Stream the interviewer's next turn in a text screening chat.
+
+    The application is loaded up front so an unknown id raises ValueError
+    before any response is started.
+
+    Args:
+        application_id: Application being screened
+        messages: Conversation so far, oldest first
+
+    Returns:
+        AsyncIterator[str]: Text chunks of the interviewer reply
+    """
+    from app.core.supabase_client import get_supabase_client
+    supabase = get_supabase_client()
+
+    app_response = supabase.table("applications").select(
+        "id, candidates(name, parsed_data), jobs(title, requirements)"
+    ).eq("id", application_id).single().execute()
+    if not app_response.data:
+        raise ValueError(f"Application {application_id} not found")
+
+    candidate = app_response.data.get("candidates") or {}
+    job = app_response.data.get("jobs") or {}
+    skills = (candidate.get("parsed_data") or {}).get("skills", [])
+    conversation = "\n".join(
+        f"{'Candidate' if m.role == 'user' else 'Interviewer'}: {m.content}"
+        for m in messages
+    )
+
+    prompt = f"""
+        You are screening {candidate.get("name", "a candidate")} for the role: {job.get("title", "the open position")}
+        Role requirements: {render_value(job.get("requirements"), settings.PROMPT_JOB_TOKEN_BUDGET)}
+        Candidate skills: {render_value(skills, settings.PROMPT_CANDIDATE_TOKEN_BUDGET)}
+
+        Conversation so far:
+        {conversation or "(the interview has not started yet)"}
+
+        Reply with the interviewer's next turn only: briefly acknowledge the last answer
+        and ask one open-ended follow-up or new question.
+        """
+
+    return generate_ai_response_stream(
+        prompt=prompt,
+        model=settings.AI_MODEL,
+        temperature=settings.AI_TEMPERATURE,
+        max_tokens=settings.AI_MAX_TOKENS,
+        system_message="You are a friendly, professional HR interviewer conducting a text screening.",
+        caller="screening_chat",
+    )
@@ -0,0 +1,400 @@
+"""
+Bulk Resume Ingestion
+
+Processes hundreds of resumes from one upload (many files and/or ZIP
+archives) as a pipeline of concurrently running stages:
+
+    read -> upload -> extract -> parse (AI) -> store
+
+Each stage has its own worker pool (settings.BULK_STAGE_WORKERS) and hands
+items to the next through a bounded queue (settings.BULK_QUEUE_SIZE), so a
+slow stage applies backpressure instead of buffering the whole archive in
+memory. Entries are read lazily, one at a time, as the first queue drains.
+Link scraping is not a stage: the store stage queues each candidate for
+the footprint enrichment worker (app.services.footprint_enrichment), which
+retries it and reports its status like it does for single uploads.
+
+Resumes seen before are served from the resume cache (app.services.
+resume_cache) unless the job was started with force=True: an identical
+file skips everything up to storage, identical text skips the AI parse.
+
+A file that fails before its candidate is stored has its storage object
+removed again. Once the candidate exists the file counts as done; a
+failure after that (queueing link scraping) is reported as a warning.
+
+Jobs run in the background; per-file progress and failures are kept in an
+in-memory registry per worker process and exposed via the status endpoint.
+"""
+
+import asyncio
+import time
+import uuid
+import zipfile
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from typing import IO, Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from supabase import Client
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.services.ai_parser import parse_resume_with_ai, store_candidate_data
+from app.services.document_extraction import DocumentExtraction, extract_document
+from app.services.footprint_enrichment import enqueue_footprint
+from app.services.resume_cache import (
+    cache_text_hash,
+    cached_parsed_data,
+    content_hash,
+    find_by_content_hash,
+    find_by_text_hash,
+    record_parse,
+)
+from app.services.resume_storage import delete_resume, ensure_resumes_bucket, upload_resume
+
+logger = get_logger(__name__)
+
+RESUME_EXTENSIONS = ("pdf", "doc", "docx")
+
+_CONTENT_TYPES = {
+    "pdf": "application/pdf",
+    "doc": "application/msword",
+    "docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+}
+
+# A named entry plus a callable that reads its bytes on demand
+BulkEntry = Tuple[str, Callable[[], bytes]]
+
+
+class BulkIngestionError(Exception):
+    """Raised when a bulk upload is rejected before processing starts."""
+
+
+@dataclass
+class BulkFileStatus:
+    """Progress of one resume within a bulk job."""
+    index: int
+    filename: str
+    status: str = "queued"  # queued, <stage>, done, failed, skipped
+    candidate_id: Optional[str] = None
+    resume_url: Optional[str] = None
+    error: Optional[str] = None
+    warning: Optional[str] = None  # non-fatal problem after the candidate was stored
+    cached: bool = False  # parse reused from the resume cache
+    stage_ms: Dict[str, float] = field(default_factory=dict)
+
+
+@dataclass
+class _WorkItem:
+    status: BulkFileStatus
+    read: Callable[[], bytes]
+    file_ext: str
+    content: Optional[bytes] = None
+    file_hash: Optional[str] = None
+    text_hash: Optional[str] = None
+    storage_path: Optional[str] = None
+    uploaded: bool = False  # storage_path was uploaded by this job (not reused from the cache)
+    extraction: Optional[DocumentExtraction] = None
+    parsed_data: Any = None
+
+
+class BulkIngestionJob:
+    """A bulk upload and the per-file status of everything in it."""
+
+    def __init__(self, entries: List[BulkEntry], force: bool = False):
+        self.id = str(uuid.uuid4())
+        self.force = force
+        self.created_at = datetime.now(timezone.utc)
+        self.finished_at: Optional[datetime] = None
+        self.files: List[BulkFileStatus] = []
+        self._items: List[_WorkItem] = []
+        self._task: Optional[asyncio.Task] = None
+        self._cleanup: List[Callable[[], None]] = []
+
+        for index, (name, read) in enumerate(entries):
+            file_ext = name.rsplit(".", 1)[-1].lower() if "." in name else ""
+            status = BulkFileStatus(index=index, filename=name)
+            self.files.append(status)
+            if file_ext not in RESUME_EXTENSIONS:
+                status.status = "skipped"
+                status.error = f"Unsupported file format: {file_ext or 'none'}"
+                continue
+            self._items.append(_WorkItem(status=status, read=read, file_ext=file_ext))
+
+    @property
+    def finished(self) -> bool:
+        return self.finished_at is not None
+
+    def counts(self) -> Dict[str, int]:
+        counts: Dict[str, int] = {}
+        for f in self.files:
+            counts[f.status] = counts.get(f.status, 0) + 1
+        return counts
+
+    def to_dict(self, include_files: bool = True) -> Dict[str, Any]:
+        counts = self.counts()
+        data = {
+            "job_id": self.id,
+            "status": "completed" if self.finished else "processing",
+            "created_at": self.created_at.isoformat(),
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+            "total": len(self.files),
+            "succeeded": counts.get("done", 0),
+            "failed": counts.get("failed", 0),
+            "skipped": counts.get("skipped", 0),
+            "cached": sum(1 for f in self.files if f.cached),
+            "in_progress": len(self.files) - sum(counts.get(k, 0) for k in ("done", "failed", "skipped")),
+            "counts": counts,
+        }
+        if include_files:
+            data["files"] = [asdict(f) for f in self.files]
+        return data
+
+
+def zip_entries(archive: IO[bytes]) -> List[BulkEntry]:
+    """
+    List resume entries of a ZIP archive without decompressing them.
+
+    Directory entries and OS metadata (__MACOSX/, dotfiles) are ignored.
+
+    Raises:
+        BulkIngestionError: If the archive is not a valid ZIP
+    """
+    try:
+        zf = zipfile.ZipFile(archive)
+    except zipfile.BadZipFile as e:
+        raise BulkIngestionError(f"Invalid ZIP archive: {str(e)}")
+
+    entries: List[BulkEntry] = []
+    for info in zf.infolist():
+        basename = info.filename.rsplit("/", 1)[-1]
+        if info.is_dir() or info.filename.startswith("__MACOSX/") or basename.startswith("."):
+            continue
+
+        def read(info: zipfile.ZipInfo = info) -> bytes:
+            if info.file_size > settings.MAX_UPLOAD_SIZE:
+                raise ValueError(
+                    f"File size ({info.file_size} bytes) exceeds maximum allowed size ({settings.MAX_UPLOAD_SIZE} bytes)"
+                )
+            with zf.open(info) as handle:
+                # Don't trust the header size alone (zip bombs)
+                data = handle.read(settings.MAX_UPLOAD_SIZE + 1)
+            if len(data) > settings.MAX_UPLOAD_SIZE:
+                raise ValueError(f"File exceeds maximum allowed size ({settings.MAX_UPLOAD_SIZE} bytes)")
+            return data
+
+        entries.append((basename, read))
+    return entries
+
+
+def _timed(stage: str, handler: Callable[[_WorkItem], Awaitable[None]]):
+    async def run(item: _WorkItem) -> None:
+        item.status.status = stage
+        started = time.perf_counter()
+        try:
+            await handler(item)
+        finally:
+            item.status.stage_ms[stage] = round((time.perf_counter() - started) * 1000, 1)
+    return run
+
+
+async def _run_stage(
+    inbox: asyncio.Queue,
+    outbox: Optional[asyncio.Queue],
+    workers: int,
+    handler: Callable[[_WorkItem], Awaitable[None]],
+    on_failure: Optional[Callable[[_WorkItem], Awaitable[None]]] = None,
+) -> None:
+    """Drain `inbox` with `workers` concurrent handlers, forwarding successes."""
+
+    async def worker() -> None:
+        while True:
+            item = await inbox.get()
+            if item is None:
+                # Let sibling workers see the end-of-stream marker too
+                await inbox.put(None)
+                return
+            try:
+                await handler(item)
+            except Exception as e:
+                item.status.status = "failed"
+                item.status.error = str(e)
+                item.content = None
+                logger.warning(f"Bulk ingestion: {item.status.filename} failed: {str(e)}")
+                if on_failure is not None:
+                    await on_failure(item)
+                continue
+            if outbox is not None:
+                await outbox.put(item)
+            else:
+                item.status.status = "done"
+
+    await asyncio.gather(*(worker() for _ in range(max(1, workers))))
+    if outbox is not None:
+        await outbox.put(None)
+
+
+class BulkIngestionManager:
+    """Starts bulk jobs and keeps recent ones for status queries."""
+
+    def __init__(self) -> None:
+        self._jobs: Dict[str, BulkIngestionJob] = {}
+
+    def start(
+        self,
+        entries: List[BulkEntry],
+        supabase: Client,
+        cleanup: Optional[List[Callable[[], None]]] = None,
+        force: bool = False,
+    ) -> BulkIngestionJob:
+        """
+        Register a job and start processing it in the background.
+
+        With force=True the resume cache is bypassed and every file is parsed.
+
+        Raises:
+            BulkIngestionError: If there is nothing to process or too much
+        """
+        if not entries:
+            raise BulkIngestionError("No files found in upload")
+        if len(entries) > settings.BULK_MAX_FILES:
+            raise BulkIngestionError(
+                f"Too many files ({len(entries)}); the maximum per bulk upload is {settings.BULK_MAX_FILES}"
+            )
+
+        job = BulkIngestionJob(entries, force=force)
+        job._cleanup = list(cleanup or [])
+        self._jobs[job.id] = job
+        self._evict()
+        job._task = asyncio.create_task(self._run(job, supabase))
+        logger.info(f"Started bulk ingestion job {job.id} with {len(job.files)} files")
+        return job
+
+    def get(self, job_id: str) -> Optional[BulkIngestionJob]:
+        return self._jobs.get(job_id)
+
+    def _evict(self) -> None:
+        finished = [j for j in self._jobs.values() if j.finished]
+        for job in finished[:max(0, len(finished) - settings.BULK_JOB_HISTORY)]:
+            self._jobs.pop(job.id, None)
+
+    async def _run(self, job: BulkIngestionJob, supabase: Client) -> None:
+        workers = settings.BULK_STAGE_WORKERS
+
+        async def read(item: _WorkItem) -> None:
+            item.content = await asyncio.to_thread(item.read)
+            if len(item.content) > settings.MAX_UPLOAD_SIZE:
+                raise ValueError(
+                    f"File size ({len(item.content)} bytes) exceeds maximum allowed size ({settings.MAX_UPLOAD_SIZE} bytes)"
+                )
+            item.file_hash = content_hash(item.content)
+
+        async def upload(item: _WorkItem) -> None:
+            cached = None if job.force else await asyncio.to_thread(find_by_content_hash, item.file_hash, supabase)
+            if cached:
+                # Identical file: reuse its storage object and parse
+                item.status.cached = True
+                item.status.resume_url = cached.get("resume_url")
+                item.storage_path = cached.get("storage_path")
+                item.text_hash = cached.get("text_hash")
+                item.parsed_data = cached_parsed_data(cached)
+                item.content = None
+                return
+            item.storage_path, item.status.resume_url = await asyncio.to_thread(
+                upload_resume, item.content, item.file_ext, _CONTENT_TYPES[item.file_ext], supabase
+            )
+            item.uploaded = True
+
+        async def extract(item: _WorkItem) -> None:
+            if item.parsed_data is not None:
+                return
+            item.extraction = await extract_document(item.content, item.file_ext)
+            item.text_hash = cache_text_hash(item.extraction.text)
+            item.content = None  # uploaded and extracted; free the bytes early
+
+        async def parse(item: _WorkItem) -> None:
+            if item.parsed_data is not None:
+                return
+            cached = None if job.force else await asyncio.to_thread(find_by_text_hash, item.text_hash, supabase)
+            if cached:
+                item.status.cached = True
+                item.parsed_data = cached_parsed_data(cached)
+                return
+            item.parsed_data = await parse_resume_with_ai(
+                item.extraction.text, item.extraction.links, mode=settings.BULK_RESUME_PARSE_MODE
+            )
+
+        async def store(item: _WorkItem) -> None:
+            item.status.candidate_id = await store_candidate_data(
+                item.parsed_data, item.status.resume_url, supabase, scrape=False,
+                extraction_meta=item.extraction.meta() if item.extraction else None,
+                resume_text=item.extraction.text if item.extraction else None,
+            )
+            item.extraction = None  # stored; only the parse is needed from here on
+            await asyncio.to_thread(
+                record_parse, item.file_hash, item.text_hash, item.parsed_data,
+                item.status.candidate_id, item.status.resume_url, item.storage_path, supabase,
+            )
+            try:
+                await asyncio.to_thread(enqueue_footprint, item.status.candidate_id, item.parsed_data.links, supabase)
+            except Exception as e:
+                # The candidate is stored; don't report the file as failed
+                item.status.warning = f"Link scraping was not queued: {str(e)}"
+                logger.warning(f"Bulk ingestion: queueing links for {item.status.filename} failed: {str(e)}")
+
+        async def discard(item: _WorkItem) -> None:
+            # A file that never became a candidate shouldn't leave its upload behind
+            if item.uploaded and item.status.candidate_id is None:
+                await asyncio.to_thread(delete_resume, item.storage_path, supabase)
+
+        stages = [
+            ("reading", 1, read),  # entries share one archive handle; read them in order
+            ("uploading", workers.get("upload", 4), upload),
+            ("extracting", workers.get("extract", 2), extract),
+            ("parsing", workers.get("parse", 4), parse),
+            ("storing", workers.get("store", 2), store),
+        ]
+        queues = [asyncio.Queue(maxsize=settings.BULK_QUEUE_SIZE) for _ in stages]
+
+        async def feed() -> None:
+            for item in job._items:
+                await queues[0].put(item)
+            await queues[0].put(None)
+
+        try:
+            await asyncio.to_thread(ensure_resumes_bucket, supabase)
+            await asyncio.gather(
+                feed(),
+                *(
+                    _run_stage(
+                        queues[i],
+                        queues[i + 1] if i + 1 < len(stages) else None,
+                        count,
+                        _timed(name, handler),
+                        discard,
+                    )
+                    for i, (name, count, handler) in enumerate(stages)
+                ),
+            )
+        except Exception as e:
+            logger.error(f"Bulk ingestion job {job.id} aborted: {str(e)}", exc_info=True)
+            for f in job.files:
+                if f.status not in ("done", "failed", "skipped"):
+                    f.status = "failed"
+                    f.error = f"Job aborted: {str(e)}"
+        finally:
+            job.finished_at = datetime.now(timezone.utc)
+            for close in job._cleanup:
+                try:
+                    close()
+                except Exception:
+                    pass
+            job._cleanup = []
+            job._items = []
+            counts = job.counts()
+            logger.info(
+                f"Bulk ingestion job {job.id} finished: {counts.get('done', 0)} succeeded, "
+                f"{counts.get('failed', 0)} failed, {counts.get('skipped', 0)} skipped"
+            )
+
+
+bulk_manager = BulkIngestionManager()
@@ -0,0 +1,308 @@
+"""
+Resume Document Extraction
+
+CPU-bound PDF/DOCX parsing, run off the event loop in a process pool so a
+large document can't stall other requests (voice WebSocket relays included)
+on the same worker.
+
+The pool is created lazily and warmed at application startup, so the first
+upload doesn't pay for process spawn and PyPDF2 imports. DOCX files are
+read with the streaming extractor in app.services.docx_text. Each
+document is bounded by settings.EXTRACTION_TIMEOUT_SECONDS,
+settings.EXTRACTION_MAX_PAGES and settings.EXTRACTION_MAX_CHARS: reading
+stops early once enough text has been collected, and the text is then cut
+to the character budget section by section (truncate_sections), keeping
+contact details, skills and recent experience over projects and the like.
+A document that times out retires its pool (retire_extraction_pool)
+without disturbing the other documents in flight.
+"""
+
+import asyncio
+import io
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from PyPDF2 import PdfReader
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.services.docx_text import iter_docx_text
+from app.services.link_classifier import categorize_urls
+from app.services.prompt_context import PAGE_BREAK
+from app.services.resume_prefilter import truncate_sections
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class DocumentExtraction:
+    """Everything read from a resume document in a single pass."""
+    text: str
+    links: Dict[str, str] = field(default_factory=dict)  # categorized github/linkedin/portfolio
+    urls: List[str] = field(default_factory=list)  # all non-mailto link annotations, in order
+    page_count: int = 0  # pages read
+    total_pages: int = 0
+    char_count: int = 0  # characters read, before the char budget was applied
+    truncated: bool = False  # stopped at the page cap or cut to the char budget
+    trimmed_sections: List[str] = field(default_factory=list)
+
+    def meta(self) -> Dict[str, Any]:
+        """Extraction summary recorded on the candidate (candidates.extraction_meta)."""
+        return {
+            "pages_read": self.page_count,
+            "total_pages": self.total_pages,
+            "chars_read": self.char_count,
+            "chars_kept": len(self.text),
+            "truncated": self.truncated,
+            "trimmed_sections": self.trimmed_sections,
+        }
+
+
+# Reading continues past the char budget up to this multiple of it, so
+# section-aware truncation still sees a skills section placed after a long
+# experience section; anything further is never extracted.
+READ_AHEAD_FACTOR = 2
+
+
+def _read_limit(max_chars: Optional[int]) -> Optional[int]:
+    return max_chars * READ_AHEAD_FACTOR if max_chars else None
+
+
+def _apply_char_budget(extraction: DocumentExtraction, max_chars: Optional[int]) -> DocumentExtraction:
+    extraction.char_count = len(extraction.text)
+    if max_chars and len(extraction.text) > max_chars:
+        extraction.text, extraction.trimmed_sections = truncate_sections(extraction.text, max_chars)
+        extraction.truncated = True
+    return extraction
+
+
+# Kept for callers written against the PDF-only extractor
+PdfExtraction = DocumentExtraction
+
+
+def _page_link_uris(page) -> List[str]:
+    """URI targets of a page's link annotations (mailto links skipped)."""
+    uris = []
+    if "/Annots" not in page:
+        return uris
+    try:
+        for annotation in page["/Annots"]:
+            obj = annotation.get_object()
+            if obj.get("/Subtype") != "/Link" or "/A" not in obj:
+                continue
+            action = obj["/A"]
+            if "/URI" in action:
+                uri = str(action["/URI"])
+                if not uri.startswith('mailto:'):
+                    uris.append(uri)
+    except Exception as annot_error:
+        logger.warning(f"Error extracting annotations: {str(annot_error)}")
+    return uris
+
+
+def extract_pdf(content: bytes, max_pages: Optional[int] = None, max_chars: Optional[int] = None) -> DocumentExtraction:
+    """
+    Extract page text and hyperlink annotations with a single PdfReader.
+
+    Page texts are collected in a list and joined once with PAGE_BREAK
+    (so normalize_text can drop running headers/footers), keeping cost
+    linear in document length. Pages past `max_pages` are not read, and
+    reading stops early once READ_AHEAD_FACTOR * `max_chars` characters
+    have been collected; the text is then cut to `max_chars`.
+    """
+    try:
+        # BytesIO over immutable bytes shares the buffer rather than copying it
+        pdf_reader = PdfReader(io.BytesIO(content))
+        total_pages = len(pdf_reader.pages)
+        limit = min(total_pages, max_pages) if max_pages else total_pages
+        read_limit = _read_limit(max_chars)
+        parts: List[str] = []
+        urls: List[str] = []
+        chars = 0
+        pages_read = 0
+        for index in range(limit):
+            page = pdf_reader.pages[index]
+            parts.append(page.extract_text() or "")
+            urls.extend(_page_link_uris(page))
+            chars += len(parts[-1]) + 1
+            pages_read += 1
+            if read_limit and chars >= read_limit:
+                break
+
+        links = categorize_urls(urls)
+        logger.info(f"Extracted {len(urls)} hyperlinks from PDF, categorized: {links}")
+        extraction = DocumentExtraction(
+            text=PAGE_BREAK.join(parts),
+            links=links,
+            urls=urls,
+            page_count=pages_read,
+            total_pages=total_pages,
+            truncated=pages_read < total_pages,
+        )
+        return _apply_char_budget(extraction, max_chars)
+    except Exception as e:
+        logger.error(f"Error extracting PDF: {str(e)}")
+        raise
+
+
+def extract_docx(content: bytes, max_chars: Optional[int] = None) -> DocumentExtraction:
+    """
+    Extract text and hyperlinks from a DOCX file in document order,
+    including headers, tables and text boxes.
+
+    The XML is streamed, and reading stops once READ_AHEAD_FACTOR *
+    `max_chars` characters have been collected, as for PDFs.
+    """
+    try:
+        read_limit = _read_limit(max_chars)
+        parts: List[str] = []
+        urls: List[str] = []
+        chars = 0
+        stopped = False
+        lines = iter_docx_text(content, urls)
+        try:
+            for line in lines:
+                if read_limit and chars >= read_limit:
+                    stopped = True
+                    break
+                parts.append(line)
+                chars += len(line) + 1
+        finally:
+            lines.close()
+
+        links = categorize_urls(urls)
+        extraction = DocumentExtraction(text="\n".join(parts), links=links, urls=urls, truncated=stopped)
+        return _apply_char_budget(extraction, max_chars)
+    except Exception as e:
+        logger.error(f"Error extracting DOCX text: {str(e)}")
+        raise
+
+
+def extract_sync(
+    content: bytes,
+    file_ext: str,
+    max_pages: Optional[int] = None,
+    max_chars: Optional[int] = None,
+) -> DocumentExtraction:
+    """Dispatch on file extension; runs inside a pool worker."""
+    if file_ext == 'pdf':
+        return extract_pdf(content, max_pages=max_pages, max_chars=max_chars)
+    if file_ext in ('doc', 'docx'):
+        return extract_docx(content, max_chars=max_chars)
+    raise ValueError(f"Unsupported file format: {file_ext}")
+
+
+def _warm_worker() -> bool:
+    # Importing this module in the worker already loaded PyPDF2
+    return True
+
+
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_extraction_executor() -> Optional[ProcessPoolExecutor]:
+    """Process pool for extraction, or None when EXTRACTION_WORKERS is 0."""
+    global _executor
+    if settings.EXTRACTION_WORKERS <= 0:
+        return None
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(max_workers=settings.EXTRACTION_WORKERS)
+            logger.info(f"Started document extraction pool with {settings.EXTRACTION_WORKERS} workers")
+        return _executor
+
+
+def warm_extraction_pool() -> None:
+    """Spawn every worker up front so the first upload doesn't pay for it."""
+    executor = get_extraction_executor()
+    if executor is None:
+        return
+    futures = [executor.submit(_warm_worker) for _ in range(settings.EXTRACTION_WORKERS)]
+    for future in futures:
+        future.result()
+
+
+def _workers(executor: ProcessPoolExecutor) -> List[Any]:
+    # ProcessPoolExecutor has no public way to stop a running task, and
+    # forgets its processes on shutdown, so callers take them beforehand
+    return list((getattr(executor, "_processes", None) or {}).values())
+
+
+def _terminate(processes: List[Any]) -> None:
+    for process in processes:
+        process.terminate()
+
+
+def shutdown_extraction_pool(kill: bool = False) -> None:
+    """Shut the pool down; with kill=True, terminate workers stuck on a document."""
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is None:
+        return
+    if kill:
+        _terminate(_workers(executor))
+    executor.shutdown(wait=not kill, cancel_futures=True)
+
+
+def retire_extraction_pool(executor: ProcessPoolExecutor) -> None:
+    """
+    Send new documents to a fresh pool after one in this pool timed out.
+
+    Documents already running or queued on the old pool carry on. Each of
+    their callers gives up within settings.EXTRACTION_TIMEOUT_SECONDS, so
+    once that has passed whatever the old pool is still running is stuck
+    and its workers are terminated.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is not executor:
+            return  # another timeout already replaced it
+        _executor = None
+    processes = _workers(executor)
+    executor.shutdown(wait=False)
+    reaper = threading.Timer(settings.EXTRACTION_TIMEOUT_SECONDS, _terminate, args=(processes,))
+    reaper.daemon = True
+    reaper.start()
+    logger.warning("Retired document extraction pool after a timeout; new documents use a fresh pool")
+
+
+async def extract_document(content: bytes, file_ext: str) -> DocumentExtraction:
+    """
+    Extract text and links from a resume without blocking the event loop.
+
+    Raises:
+        ValueError: Unsupported format, or extraction exceeded
+            settings.EXTRACTION_TIMEOUT_SECONDS
+    """
+    file_ext = file_ext.lower()
+    loop = asyncio.get_running_loop()
+    executor = get_extraction_executor()
+    limits = (settings.EXTRACTION_MAX_PAGES, settings.EXTRACTION_MAX_CHARS)
+    if executor is None:
+        call = asyncio.to_thread(extract_sync, content, file_ext, *limits)
+    else:
+        call = loop.run_in_executor(executor, extract_sync, content, file_ext, *limits)
+
+    try:
+        result = await asyncio.wait_for(call, timeout=settings.EXTRACTION_TIMEOUT_SECONDS)
+    except asyncio.TimeoutError:
+        logger.error(
+            f"Document extraction timed out after {settings.EXTRACTION_TIMEOUT_SECONDS}s "
+            f"({file_ext}, {len(content)} bytes)"
+        )
+        if executor is not None:
+            # The worker is still chewing on the document; stop routing new
+            # work to its pool rather than let it hold a slot indefinitely.
+            retire_extraction_pool(executor)
+        raise ValueError("Document extraction timed out; the file may be corrupt or too complex")
+
+    if result.truncated:
+        logger.warning(
+            f"Extraction truncated: {result.page_count}/{result.total_pages} pages read, "
+            f"{len(result.text)}/{result.char_count} chars kept, trimmed sections: {result.trimmed_sections}"
+        )
+    return result
@@ -0,0 +1,165 @@
+"""
+Streaming DOCX Text Extraction
+
+Reads resume text straight out of the DOCX zip with an incremental XML
+parser (iterparse) instead of building python-docx's object model:
+
+- parts are read in page order: word/header*.xml, word/document.xml,
+  word/footer*.xml
+- paragraphs, table rows (cells joined with " | ") and text boxes are
+  yielded in document order; python-docx's doc.paragraphs skips the last
+  two, which is where many resumes keep their skills
+- text boxes are read once, from their DrawingML form; Word's VML copy
+  (mc:Fallback) is skipped
+- external hyperlink targets are collected via the part's relationships
+
+Paragraphs and tables are dropped from the parsed tree as soon as their
+text is taken, and a caller that stops iterating early never decompresses
+the rest.
+"""
+
+import io
+import re
+import zipfile
+from typing import IO, Dict, Iterator, List, Optional, Union
+from xml.etree.ElementTree import fromstring, iterparse
+
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_R = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+_MC_FALLBACK = "{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback"
+_RELATIONSHIP = "{http://schemas.openxmlformats.org/package/2006/relationships}Relationship"
+
+W_P = _W + "p"
+W_T = _W + "t"
+W_TAB = _W + "tab"
+W_BREAKS = (_W + "br", _W + "cr")
+W_TR = _W + "tr"
+W_TC = _W + "tc"
+W_HYPERLINK = _W + "hyperlink"
+# Containers whose finished children can be dropped from the tree
+_BLOCK_PARENTS = (_W + "body", _W + "hdr", _W + "ftr")
+R_ID = _R + "id"
+
+MAIN_PART = "word/document.xml"
+_HEADER_RE = re.compile(r"word/header(\d*)\.xml")
+_FOOTER_RE = re.compile(r"word/footer(\d*)\.xml")
+
+
+def _numbered(names: List[str], pattern: "re.Pattern[str]") -> List[str]:
+    """Names matching pattern, ordered by their number (header2 before header10)."""
+    numbered = []
+    for name in names:
+        match = pattern.fullmatch(name)
+        if match:
+            numbered.append((int(match.group(1) or 0), name))
+    return [name for _, name in sorted(numbered)]
+
+
+def text_parts(names: List[str]) -> List[str]:
+    """Parts holding resume text, in the order they appear on a page."""
+    if MAIN_PART not in names:
+        raise ValueError("Not a Word document: word/document.xml is missing")
+    return [*_numbered(names, _HEADER_RE), MAIN_PART, *_numbered(names, _FOOTER_RE)]
+
+
+def _hyperlink_targets(zf: zipfile.ZipFile, part: str) -> Dict[str, str]:
+    """Relationship id -> external URL for a part's hyperlinks."""
+    folder, _, name = part.rpartition("/")
+    rels_name = f"{folder}/_rels/{name}.rels"
+    try:
+        root = fromstring(zf.read(rels_name))
+    except KeyError:
+        return {}
+    return {
+        rel.get("Id"): rel.get("Target")
+        for rel in root.iter(_RELATIONSHIP)
+        if rel.get("Type", "").endswith("/hyperlink") and rel.get("Target")
+    }
+
+
+def _iter_part(stream: IO[bytes], hyperlinks: Dict[str, str], urls: Optional[List[str]]) -> Iterator[str]:
+    paragraphs: List[List[str]] = []  # open paragraphs; text boxes nest inside one
+    cells: List[List[str]] = []  # open table cells (tables nest too)
+    rows: List[List[str]] = []
+    pending: List[str] = []
+    open_elements: List = []
+    fallback = 0
+
+    for event, elem in iterparse(stream, events=("start", "end")):
+        tag = elem.tag
+        if event == "start":
+            open_elements.append(elem)
+            if tag == _MC_FALLBACK:
+                fallback += 1
+            elif fallback:
+                continue
+            elif tag == W_P:
+                paragraphs.append([])
+            elif tag == W_TC:
+                cells.append([])
+            elif tag == W_TR:
+                rows.append([])
+            elif tag == W_HYPERLINK and urls is not None:
+                target = hyperlinks.get(elem.get(R_ID))
+                if target and not target.startswith("mailto:"):
+                    urls.append(target)
+            continue
+
+        open_elements.pop()
+        if open_elements and open_elements[-1].tag in _BLOCK_PARENTS:
+            # A top-level paragraph or table is done; detach it so the
+            # parsed tree doesn't grow with the document
+            open_elements[-1].remove(elem)
+        if tag == _MC_FALLBACK:
+            fallback -= 1
+            elem.clear()
+            continue
+        if fallback:
+            continue
+        if tag == W_T:
+            if paragraphs:
+                paragraphs[-1].append(elem.text or "")
+        elif tag == W_TAB:
+            if paragraphs:
+                paragraphs[-1].append("\t")
+        elif tag in W_BREAKS:
+            if paragraphs:
+                paragraphs[-1].append("\n")
+        elif tag == W_P:
+            text = "".join(paragraphs.pop())
+            (cells[-1] if cells else pending).append(text)
+            elem.clear()
+        elif tag == W_TC:
+            cell = " ".join(text.strip() for text in cells.pop() if text.strip())
+            if rows:
+                rows[-1].append(cell)
+        elif tag == W_TR:
+            line = " | ".join(cell for cell in rows.pop() if cell)
+            (cells[-1] if cells else pending).append(line)
+            elem.clear()
+        else:
+            continue
+
+        if pending:
+            yield from pending
+            pending.clear()
+
+
+def iter_docx_text(source: Union[bytes, IO[bytes]], urls: Optional[List[str]] = None) -> Iterator[str]:
+    """
+    Yield the text of a DOCX file one paragraph or table row at a time.
+
+    Pass a list as `urls` to have external hyperlink targets (mailto links
+    skipped) appended to it as they are reached.
+
+    Raises:
+        zipfile.BadZipFile: Not a zip archive (e.g. a legacy .doc file)
+        ValueError: A zip without a Word document part
+    """
+    if isinstance(source, (bytes, bytearray)):
+        source = io.BytesIO(source)
+    with zipfile.ZipFile(source) as zf:
+        for part in text_parts(zf.namelist()):
+            hyperlinks = _hyperlink_targets(zf, part) if urls is not None else {}
+            with zf.open(part) as stream:
+                yield from _iter_part(stream, hyperlinks, urls)
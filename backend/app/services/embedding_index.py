@@ -0,0 +1,391 @@
+"""
+Embedding Index
+
+A cheap first pass before LLM matching. Candidates (parsed_data) and jobs
+(title, requirements, description) are embedded (app.services.embeddings)
+and kept in two vector indexes under settings.EMBEDDING_INDEX_DIR:
+
+    candidates.f32 / candidates.json    float32 matrix, row ids
+    jobs.f32 / jobs.json
+
+Each matrix is memory-mapped, so an index of N candidates costs
+N x EMBEDDING_DIM x 4 bytes of page cache (3 KB per candidate at 768
+dimensions) and is shared by every worker process on the host. Ranking a
+job's applicants is one matrix-vector product and a partial sort.
+
+Indexes are kept current incrementally: store_candidate_data and the job
+endpoints re-embed the row they write. Candidates stored before the index
+existed (or written outside the API) are picked up by rebuild_index, or
+lazily when a job's applicants are pre-ranked.
+
+Indexing never fails an upload or a job update: errors are logged.
+"""
+
+import asyncio
+import json
+import os
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from supabase import Client
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.services.embeddings import candidate_text, embedder_signature, get_embedder, job_text, normalize_rows
+
+try:
+    import fcntl
+except ImportError:  # Windows: single-process development only
+    fcntl = None
+
+logger = get_logger(__name__)
+
+CANDIDATES = "candidates"
+JOBS = "jobs"
+INITIAL_CAPACITY = 256  # rows; the file doubles when full
+REBUILD_PAGE_SIZE = 500
+
+
+class VectorIndex:
+    """
+    Normalized float32 vectors in a memory-mapped file, with the id of each
+    row in a JSON sidecar.
+
+    Re-indexing an id rewrites its row in place; a new id takes a freed row
+    or grows the file. Only adding or removing ids rewrites the sidecar.
+    Writers serialize on a lock file, and a reader picks up other
+    processes' changes when the sidecar's mtime moves.
+    """
+
+    def __init__(self, path: Path, dim: int, signature: str):
+        self.dim = dim
+        self.signature = signature
+        self._matrix_path = path.with_suffix(".f32")
+        self._ids_path = path.with_suffix(".json")
+        self._lock_path = path.with_suffix(".lock")
+        self._lock = threading.RLock()
+        self._ids: List[Optional[str]] = []  # row -> id, None for a free row
+        self._rows: Dict[str, int] = {}
+        self._free: List[int] = []
+        self._matrix: Optional[np.memmap] = None
+        self._live: Optional[np.ndarray] = None  # cached mask of used rows
+        self._loaded_mtime: Optional[int] = None
+        self._matrix_path.parent.mkdir(parents=True, exist_ok=True)
+        self._load()
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._refresh()
+            return len(self._rows)
+
+    def __contains__(self, item_id: str) -> bool:
+        with self._lock:
+            self._refresh()
+            return item_id in self._rows
+
+    def _sidecar_mtime(self) -> Optional[int]:
+        try:
+            return self._ids_path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def _load(self) -> None:
+        ids: List[Optional[str]] = []
+        mtime = self._sidecar_mtime()
+        if mtime is not None:
+            meta = json.loads(self._ids_path.read_text())
+            if meta.get("signature") == self.signature and self._matrix_path.exists():
+                ids = meta["ids"]
+            else:
+                logger.warning(
+                    f"Embedding index {self._ids_path} was built with {meta.get('signature')}, "
+                    f"not {self.signature}; starting empty until it is rebuilt"
+                )
+        self._ids = ids
+        self._rows = {item_id: row for row, item_id in enumerate(ids) if item_id is not None}
+        self._free = [row for row, item_id in enumerate(ids) if item_id is None]
+        self._live = None
+        self._map(max(len(ids), INITIAL_CAPACITY))
+        self._loaded_mtime = mtime
+
+    def _map(self, capacity: int) -> None:
+        """(Re)map the matrix file, growing it to at least `capacity` rows."""
+        row_bytes = self.dim * 4
+        self._matrix_path.touch(exist_ok=True)
+        size = self._matrix_path.stat().st_size
+        if size < capacity * row_bytes:
+            # Extending the file leaves existing rows untouched; new rows read as zeros
+            os.truncate(self._matrix_path, capacity * row_bytes)
+            size = capacity * row_bytes
+        if self._matrix is not None:
+            self._matrix.flush()
+        self._matrix = np.memmap(self._matrix_path, dtype=np.float32, mode="r+", shape=(size // row_bytes, self.dim))
+
+    def _refresh(self) -> None:
+        if self._sidecar_mtime() != self._loaded_mtime:
+            self._load()
+
+    @contextmanager
+    def _writing(self):
+        """Thread lock plus an exclusive lock on the index files, with fresh state."""
+        with self._lock, open(self._lock_path, "a") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                self._refresh()
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _save_ids(self) -> None:
+        tmp = self._ids_path.with_suffix(".json.tmp")
+        tmp.write_text(json.dumps({"signature": self.signature, "dim": self.dim, "ids": self._ids}))
+        os.replace(tmp, self._ids_path)
+        self._loaded_mtime = self._sidecar_mtime()
+        self._live = None
+
+    def upsert(self, ids: Sequence[str], vectors: np.ndarray) -> None:
+        """Set the vectors for `ids` (normalized on the way in)."""
+        if not ids:
+            return
+        vectors = normalize_rows(np.array(vectors, dtype=np.float32).reshape(len(ids), self.dim))
+        with self._writing():
+            added = False
+            rows = []
+            for item_id in ids:
+                row = self._rows.get(item_id)
+                if row is None:
+                    row = self._free.pop() if self._free else len(self._ids)
+                    if row == len(self._ids):
+                        self._ids.append(item_id)
+                    else:
+                        self._ids[row] = item_id
+                    self._rows[item_id] = row
+                    added = True
+                rows.append(row)
+            if len(self._ids) > self._matrix.shape[0]:
+                self._map(max(len(self._ids), 2 * self._matrix.shape[0]))
+            self._matrix[rows] = vectors
+            self._matrix.flush()
+            if added:
+                self._save_ids()
+
+    def remove(self, ids: Iterable[str]) -> int:
+        """Drop ids from the index; returns how many were present."""
+        with self._writing():
+            rows = [self._rows.pop(item_id) for item_id in ids if item_id in self._rows]
+            if not rows:
+                return 0
+            for row in rows:
+                self._ids[row] = None
+                self._free.append(row)
+            self._matrix[rows] = 0.0
+            self._matrix.flush()
+            self._save_ids()
+            return len(rows)
+
+    def ids(self) -> List[str]:
+        with self._lock:
+            self._refresh()
+            return list(self._rows)
+
+    def vector(self, item_id: str) -> Optional[np.ndarray]:
+        with self._lock:
+            self._refresh()
+            row = self._rows.get(item_id)
+            return None if row is None else np.array(self._matrix[row])
+
+    def search(
+        self,
+        query: np.ndarray,
+        k: int,
+        ids: Optional[Iterable[str]] = None,
+    ) -> List[Tuple[str, float]]:
+        """
+        Top-k (id, cosine similarity), best first.
+
+        With `ids`, only those rows are scored (ids not in the index are
+        ignored); otherwise every indexed vector is.
+        """
+        query = normalize_rows(np.array(query, dtype=np.float32).reshape(1, self.dim))[0]
+        with self._lock:
+            self._refresh()
+            if ids is None:
+                used = len(self._ids)
+                if self._live is None:
+                    self._live = np.fromiter((i is not None for i in self._ids), dtype=bool, count=used)
+                rows = np.flatnonzero(self._live)
+                scores = self._matrix[:used] @ query  # a view: no copy of the matrix
+                scores = scores[rows]
+            else:
+                rows = np.fromiter((self._rows[i] for i in ids if i in self._rows), dtype=np.int64)
+                scores = self._matrix[rows] @ query
+            if not len(rows):
+                return []
+            k = min(k, len(rows))
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top], kind="stable")]
+            return [(self._ids[rows[i]], float(scores[i])) for i in top]
+
+
+class EmbeddingIndex:
+    """The candidate and job indexes for the configured embedder and directory."""
+
+    def __init__(self):
+        self._indexes: Dict[Tuple[str, str, str], VectorIndex] = {}
+        self._lock = threading.Lock()
+
+    def get(self, kind: str) -> VectorIndex:
+        embedder = get_embedder()
+        signature = embedder_signature(embedder)
+        key = (settings.EMBEDDING_INDEX_DIR, signature, kind)
+        with self._lock:
+            if key not in self._indexes:
+                self._indexes[key] = VectorIndex(Path(settings.EMBEDDING_INDEX_DIR) / kind, embedder.dim, signature)
+            return self._indexes[key]
+
+    @property
+    def candidates(self) -> VectorIndex:
+        return self.get(CANDIDATES)
+
+    @property
+    def jobs(self) -> VectorIndex:
+        return self.get(JOBS)
+
+
+embedding_index = EmbeddingIndex()
+
+
+async def index_candidates(parsed: Dict[str, Dict[str, Any]]) -> int:
+    """Embed and index candidates (candidate_id -> parsed_data); returns the count."""
+    if not parsed:
+        return 0
+    ids = list(parsed)
+    vectors = await get_embedder().embed([candidate_text(parsed[i]) for i in ids], task="document")
+    embedding_index.candidates.upsert(ids, vectors)
+    return len(ids)
+
+
+async def index_candidate(candidate_id: str, parsed_data: Dict[str, Any]) -> bool:
+    """Re-embed one candidate after an upsert. Returns False on failure (logged)."""
+    if not settings.EMBEDDING_ENABLED:
+        return False
+    try:
+        await index_candidates({candidate_id: parsed_data})
+        return True
+    except Exception as e:
+        logger.warning(f"Could not index candidate {candidate_id} for pre-ranking: {str(e)}")
+        return False
+
+
+async def index_job(job: Dict[str, Any]) -> Optional[np.ndarray]:
+    """Re-embed a job row after create/update. Returns its vector, or None on failure (logged)."""
+    if not settings.EMBEDDING_ENABLED:
+        return None
+    try:
+        vector = (await get_embedder().embed([job_text(job)], task="query"))[0]
+        embedding_index.jobs.upsert([job["id"]], vector)
+        return vector
+    except Exception as e:
+        logger.warning(f"Could not index job {job.get('id')} for pre-ranking: {str(e)}")
+        return None
+
+
+def remove_job(job_id: str) -> None:
+    if not settings.EMBEDDING_ENABLED:
+        return
+    try:
+        embedding_index.jobs.remove([job_id])
+    except Exception as e:
+        logger.warning(f"Could not drop job {job_id} from the pre-rank index: {str(e)}")
+
+
+def rows_by_id(supabase: Client, table: str, columns: str, ids: List[str]) -> Iterable[List[Dict[str, Any]]]:
+    """Rows for `ids`, fetched REBUILD_PAGE_SIZE ids per request."""
+    for start in range(0, len(ids), REBUILD_PAGE_SIZE):
+        response = supabase.table(table).select(columns).in_("id", ids[start:start + REBUILD_PAGE_SIZE]).execute()
+        if response.data:
+            yield response.data
+
+
+async def _index_missing_candidates(candidate_ids: List[str], supabase: Client) -> int:
+    """Index the given candidates that aren't in the index yet."""
+    index = embedding_index.candidates
+    missing = [i for i in candidate_ids if i not in index]
+    indexed = 0
+    for rows in rows_by_id(supabase, "candidates", "id, parsed_data", missing):
+        indexed += await index_candidates({row["id"]: row.get("parsed_data") or {} for row in rows})
+    return indexed
+
+
+async def prerank_candidates(
+    job: Dict[str, Any],
+    supabase: Client,
+    limit: int = 50,
+    candidate_ids: Optional[List[str]] = None,
+) -> List[Tuple[str, float]]:
+    """
+    (candidate_id, cosine similarity) for the job's closest candidates, best first.
+
+    candidate_ids restricts ranking to that pool (e.g. a job's applicants);
+    pool members not yet indexed are indexed first. Without it every
+    indexed candidate is ranked.
+    """
+    if not settings.EMBEDDING_ENABLED:
+        raise RuntimeError("Embedding pre-ranking is disabled (EMBEDDING_ENABLED=false)")
+    query = embedding_index.jobs.vector(job["id"])
+    if query is None:
+        query = await index_job(job)
+        if query is None:
+            raise RuntimeError(f"Could not embed job {job['id']}")
+    if candidate_ids is not None:
+        newly_indexed = await _index_missing_candidates(candidate_ids, supabase)
+        if newly_indexed:
+            logger.info(f"Indexed {newly_indexed} applicants of job {job['id']} on demand")
+    # Scoring is a single matrix-vector product; keep large indexes off the event loop
+    return await asyncio.to_thread(embedding_index.candidates.search, query, limit, candidate_ids)
+
+
+def table_pages(supabase: Client, table: str, columns: str) -> Iterable[List[Dict[str, Any]]]:
+    """Every row of a table, REBUILD_PAGE_SIZE rows at a time (ordered by id)."""
+    start = 0
+    while True:
+        response = (
+            supabase.table(table).select(columns).order("id")
+            .range(start, start + REBUILD_PAGE_SIZE - 1).execute()
+        )
+        rows = response.data or []
+        if rows:
+            yield rows
+        if len(rows) < REBUILD_PAGE_SIZE:
+            return
+        start += REBUILD_PAGE_SIZE
+
+
+async def rebuild_index(supabase: Client) -> Dict[str, int]:
+    """
+    Re-embed every candidate and job, then drop ids no longer in the database.
+
+    Existing vectors stay searchable while the rebuild runs.
+    """
+    counts = {}
+    for kind, columns in ((CANDIDATES, "id, parsed_data"), (JOBS, "id, title, requirements, description")):
+        index = embedding_index.get(kind)
+        seen = set()
+        for rows in table_pages(supabase, kind, columns):
+            ids = [row["id"] for row in rows]
+            if kind == CANDIDATES:
+                texts = [candidate_text(row.get("parsed_data") or {}) for row in rows]
+            else:
+                texts = [job_text(row) for row in rows]
+            vectors = await get_embedder().embed(texts, task="document" if kind == CANDIDATES else "query")
+            index.upsert(ids, vectors)
+            seen.update(ids)
+        removed = index.remove([i for i in index.ids() if i not in seen])
+        counts[kind] = len(seen)
+        logger.info(f"Rebuilt {kind} embedding index: {len(seen)} indexed, {removed} removed")
+    return counts
@@ -0,0 +1,161 @@
+"""
+Text Embeddings
+
+Turns candidate profiles and job postings into fixed-size float32 vectors
+for the pre-rank index (app.services.embedding_index). Two embedders,
+chosen with EMBEDDING_PROVIDER:
+
+- hashing (default): signed feature hashing of words, word pairs and
+  canonical skills (the prefilter's skill dictionary, so "k8s" on a resume
+  meets "Kubernetes" in a job). Local, deterministic and free - it ranks on
+  shared vocabulary, which is what a shortlist needs.
+- gemini: Gemini's embedding model, which also catches paraphrases, at one
+  API request per 100 texts.
+
+Vectors are L2-normalized, so cosine similarity is a dot product.
+"""
+
+import asyncio
+import math
+import re
+import zlib
+from collections import Counter
+from typing import Any, Dict, List, Sequence
+
+import google.generativeai as genai
+import numpy as np
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.services.prompt_context import render_candidate, render_job
+from app.services.resume_prefilter import SKILL_MATCHER
+
+logger = get_logger(__name__)
+
+EMBEDDING_PROVIDERS = ("hashing", "gemini")
+
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#.]*")
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it of on or our the to we will with you your".split()
+)
+SKILL_WEIGHT = 3.0  # a canonical skill counts as much as a term seen ~7 times
+GEMINI_BATCH_SIZE = 100  # texts per embed_content request
+
+
+def normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    """L2-normalize each row in place; all-zero rows stay zero."""
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    np.divide(vectors, norms, out=vectors, where=norms > 0)
+    return vectors
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased words of two or more characters, stopwords dropped."""
+    tokens = (t.rstrip(".") for t in _TOKEN_RE.findall(text.lower()))
+    return [t for t in tokens if len(t) > 1 and t not in _STOPWORDS]
+
+
+def candidate_text(parsed_data: Dict[str, Any]) -> str:
+    """What a candidate is embedded from: skills, experience, education."""
+    return render_candidate({"parsed_data": parsed_data or {}}, max_tokens=settings.EMBEDDING_MAX_TOKENS)
+
+
+def job_text(job: Dict[str, Any]) -> str:
+    """What a job is embedded from: title, requirements and description."""
+    posting = {k: job.get(k) for k in ("title", "requirements", "description")}
+    return render_job(posting, max_tokens=settings.EMBEDDING_MAX_TOKENS)
+
+
+class HashingEmbedder:
+    """Signed feature hashing (the "hashing trick") into `dim` buckets."""
+
+    name = "hashing"
+
+    def __init__(self, dim: int):
+        self.dim = dim
+
+    @staticmethod
+    def features(text: str) -> Dict[str, float]:
+        tokens = tokenize(text)
+        counts = Counter(tokens)
+        counts.update(f"{a} {b}" for a, b in zip(tokens, tokens[1:]))
+        # Sublinear term frequency: one keyword-stuffed line can't dominate
+        features = {feature: 1.0 + math.log(count) for feature, count in counts.items()}
+        for skill in SKILL_MATCHER.find(text):
+            features[f"skill:{skill.lower()}"] = SKILL_WEIGHT
+        return features
+
+    def embed_one(self, text: str) -> np.ndarray:
+        vector = np.zeros(self.dim, dtype=np.float32)
+        features = self.features(text)
+        if not features:
+            return vector
+        # crc32 rather than hash(): str hashes are salted per process
+        hashes = np.fromiter((zlib.crc32(f.encode("utf-8")) for f in features), dtype=np.uint32, count=len(features))
+        weights = np.fromiter(features.values(), dtype=np.float32, count=len(features))
+        signs = np.where(hashes >> 31, -1.0, 1.0).astype(np.float32)
+        np.add.at(vector, hashes % self.dim, weights * signs)
+        return vector
+
+    async def embed(self, texts: Sequence[str], task: str = "document") -> np.ndarray:
+        """(len(texts), dim) normalized vectors; `task` is ignored."""
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            vectors[row] = self.embed_one(text)
+        return normalize_rows(vectors)
+
+
+class GeminiEmbedder:
+    """Gemini embed_content, batched; documents and queries use their own task types."""
+
+    name = "gemini"
+
+    def __init__(self, dim: int, model: str):
+        if not settings.GEMINI_API_KEY:
+            raise ValueError(
+                "GEMINI_API_KEY is not configured. "
+                "Please set GEMINI_API_KEY in your environment variables."
+            )
+        genai.configure(api_key=settings.GEMINI_API_KEY)
+        self.dim = dim
+        self.model = model
+
+    async def embed(self, texts: Sequence[str], task: str = "document") -> np.ndarray:
+        """(len(texts), dim) normalized vectors; task is "document" or "query"."""
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for start in range(0, len(texts), GEMINI_BATCH_SIZE):
+            batch = list(texts[start:start + GEMINI_BATCH_SIZE])
+            # The SDK call is synchronous; run it off the event loop
+            result = await asyncio.to_thread(
+                genai.embed_content,
+                model=self.model,
+                content=batch,
+                task_type=f"retrieval_{task}",
+                output_dimensionality=self.dim,
+            )
+            vectors[start:start + len(batch)] = np.asarray(result["embedding"], dtype=np.float32)
+        return normalize_rows(vectors)
+
+
+_embedders: Dict[tuple, Any] = {}
+
+
+def get_embedder():
+    """The configured embedder (one per provider/model/dimension)."""
+    provider = settings.EMBEDDING_PROVIDER
+    if provider not in EMBEDDING_PROVIDERS:
+        raise ValueError(f"Unknown EMBEDDING_PROVIDER {provider!r}; expected one of {', '.join(EMBEDDING_PROVIDERS)}")
+    key = (provider, settings.EMBEDDING_MODEL, settings.EMBEDDING_DIM)
+    if key not in _embedders:
+        if provider == "gemini":
+            _embedders[key] = GeminiEmbedder(settings.EMBEDDING_DIM, settings.EMBEDDING_MODEL)
+        else:
+            _embedders[key] = HashingEmbedder(settings.EMBEDDING_DIM)
+        logger.info(f"Using {provider} embeddings ({settings.EMBEDDING_DIM} dimensions)")
+    return _embedders[key]
+
+
+def embedder_signature(embedder) -> str:
+    """Identifies the vector space; an index built under another signature is stale."""
+    model = getattr(embedder, "model", "")
+    return f"{embedder.name}:{model}:{embedder.dim}" if model else f"{embedder.name}:{embedder.dim}"
@@ -0,0 +1,241 @@
+"""
+Digital Footprint Enrichment
+
+Link scraping (GitHub, LinkedIn, portfolio) is slow and unreliable, so it
+is kept off the resume upload path. Uploads only enqueue work:
+
+    store candidate ──> enqueue_footprint ──> response
+                              │
+                              ▼
+        digital_footprints row (enrichment_status = 'pending')
+                              │
+                              ▼
+    FootprintEnrichmentWorker: claim ──> scrape ──> 'completed' | retry | 'failed'
+
+The queue is the digital_footprints table itself (migration 005), so queued
+work survives restarts and several API instances can share it: rows are
+claimed with the claim_footprint_enrichments function (FOR UPDATE SKIP
+LOCKED), and rows left in 'processing' by a dead worker are reclaimed after
+settings.FOOTPRINT_STALE_AFTER_SECONDS. A row whose worker died during its
+last allowed attempt can't be reclaimed; fail_abandoned_enrichments marks
+it 'failed' so its status settles.
+
+Clients follow progress through enrichment_status and last_scraped_at,
+either by polling GET /api/footprints/{candidate_id}/status or by
+subscribing to the table with Supabase Realtime.
+"""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+from supabase import Client
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.core.supabase_client import get_supabase_client
+from app.services.link_scraper import scrape_links
+
+logger = get_logger(__name__)
+
+# Columns the status endpoint exposes
+STATUS_COLUMNS = (
+    "candidate_id,enrichment_status,enrichment_attempts,enrichment_error,"
+    "enrichment_requested_at,enrichment_started_at,last_scraped_at"
+)
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def completed_footprint(candidate_id: str, links: Dict[str, str], enriched_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Row values for a footprint whose links have just been scraped."""
+    return {
+        "candidate_id": candidate_id,
+        "links": links,
+        "github_data": enriched_data.get("github"),
+        "linkedin_data": enriched_data.get("linkedin"),
+        "portfolio_data": enriched_data.get("portfolio"),
+        "enrichment_status": "completed",
+        "enrichment_error": None,
+        "last_scraped_at": _now(),
+    }
+
+
+def enqueue_footprint(candidate_id: str, links: Optional[Dict[str, str]], supabase: Client) -> str:
+    """
+    Queue link scraping for a candidate and wake the worker.
+
+    Re-uploads reset an existing footprint to 'pending'; previously scraped
+    data stays visible until the new scrape completes. Candidates without
+    links are marked 'skipped'.
+
+    Returns:
+        The enrichment status written ('pending' or 'skipped')
+    """
+    links = {k: v for k, v in (links or {}).items() if v}
+    status = "pending" if links else "skipped"
+    supabase.table("digital_footprints").upsert(
+        {
+            "candidate_id": candidate_id,
+            "links": links,
+            "enrichment_status": status,
+            "enrichment_attempts": 0,
+            "enrichment_error": None,
+            "enrichment_requested_at": _now(),
+        },
+        on_conflict="candidate_id",
+    ).execute()
+    if links:
+        footprint_worker.notify()
+    logger.info(f"Footprint enrichment for candidate {candidate_id}: {status}")
+    return status
+
+
+async def enrich_footprint(row: Dict[str, Any], supabase: Client) -> bool:
+    """
+    Scrape the links of one claimed queue row and record the outcome.
+
+    Failed scrapes go back to 'pending' until the row has used
+    settings.FOOTPRINT_MAX_ATTEMPTS, then end up 'failed'.
+
+    Returns:
+        True if the footprint was completed
+    """
+    candidate_id = row["candidate_id"]
+    links = row.get("links") or {}
+    try:
+        enriched_data = await scrape_links(links)
+    except Exception as e:
+        attempts = row.get("enrichment_attempts") or 1
+        status = "failed" if attempts >= settings.FOOTPRINT_MAX_ATTEMPTS else "pending"
+        logger.error(
+            f"Footprint enrichment for candidate {candidate_id} failed "
+            f"(attempt {attempts}/{settings.FOOTPRINT_MAX_ATTEMPTS}): {str(e)}"
+        )
+        supabase.table("digital_footprints").update(
+            {"enrichment_status": status, "enrichment_error": str(e)}
+        ).eq("candidate_id", candidate_id).execute()
+        return False
+
+    footprint_data = completed_footprint(candidate_id, links, enriched_data)
+    supabase.table("digital_footprints").update(footprint_data).eq("candidate_id", candidate_id).execute()
+    logger.info(f"Enriched digital footprint for candidate: {candidate_id}")
+    return True
+
+
+def fail_abandoned_enrichments(supabase: Client) -> int:
+    """
+    Mark 'failed' the rows left in 'processing' by a dead worker that have
+    no attempts left, so they don't report 'processing' forever.
+
+    Returns:
+        The number of rows marked failed
+    """
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=settings.FOOTPRINT_STALE_AFTER_SECONDS)
+    response = supabase.table("digital_footprints").update(
+        {"enrichment_status": "failed", "enrichment_error": "Worker stopped during the last attempt"}
+    ).eq("enrichment_status", "processing").gte(
+        "enrichment_attempts", settings.FOOTPRINT_MAX_ATTEMPTS
+    ).lt("enrichment_started_at", cutoff.isoformat()).execute()
+    abandoned = len(response.data or [])
+    if abandoned:
+        logger.warning(f"Marked {abandoned} abandoned footprint enrichments as failed")
+    return abandoned
+
+
+def get_enrichment_status(candidate_id: str, supabase: Client) -> Optional[Dict[str, Any]]:
+    """Enrichment progress for a candidate, or None if nothing was queued."""
+    response = supabase.table("digital_footprints").select(STATUS_COLUMNS).eq(
+        "candidate_id", candidate_id
+    ).limit(1).execute()
+    return response.data[0] if response.data else None
+
+
+class FootprintEnrichmentWorker:
+    """
+    Background loop draining the footprint queue for this API process.
+
+    Wakes up when enqueue_footprint notifies it and otherwise polls every
+    settings.FOOTPRINT_POLL_INTERVAL_SECONDS, which also picks up work
+    queued by other instances and retries.
+    """
+
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self, supabase: Optional[Client] = None) -> None:
+        if self.running:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run(supabase or get_supabase_client()))
+        logger.info("Footprint enrichment worker started")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        logger.info("Footprint enrichment worker stopped")
+
+    def notify(self) -> None:
+        """Wake the worker early; safe to call from any thread."""
+        if self.running:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    async def run_once(self, supabase: Client) -> int:
+        """Claim one batch of queued footprints and enrich them. Returns the batch size."""
+        await asyncio.to_thread(fail_abandoned_enrichments, supabase)
+        response = await asyncio.to_thread(
+            supabase.rpc(
+                "claim_footprint_enrichments",
+                {
+                    "batch_size": settings.FOOTPRINT_BATCH_SIZE,
+                    "stale_after_seconds": settings.FOOTPRINT_STALE_AFTER_SECONDS,
+                    "max_attempts": settings.FOOTPRINT_MAX_ATTEMPTS,
+                },
+            ).execute
+        )
+        rows: List[Dict[str, Any]] = response.data or []
+        if not rows:
+            return 0
+
+        semaphore = asyncio.Semaphore(settings.FOOTPRINT_WORKER_CONCURRENCY)
+
+        async def enrich(row: Dict[str, Any]) -> None:
+            async with semaphore:
+                await enrich_footprint(row, supabase)
+
+        await asyncio.gather(*(enrich(row) for row in rows), return_exceptions=True)
+        return len(rows)
+
+    async def _run(self, supabase: Client) -> None:
+        while True:
+            self._wakeup.clear()
+            try:
+                claimed = await self.run_once(supabase)
+            except Exception as e:
+                logger.error(f"Footprint enrichment worker error: {str(e)}")
+                claimed = 0
+            # A full batch means more may be waiting; go again straight away
+            if claimed >= settings.FOOTPRINT_BATCH_SIZE:
+                continue
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=settings.FOOTPRINT_POLL_INTERVAL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+
+
+footprint_worker = FootprintEnrichmentWorker()
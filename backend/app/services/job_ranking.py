@@ -0,0 +1,277 @@
+"""
+Job Ranking
+
+Ranks the candidates for a job in two stages so only a shortlist costs LLM
+calls:
+
+1. A first pass over the whole pool (the job's applicants, or every
+   candidate) with no AI calls:
+   - embedding: cosine similarity in the pre-rank index
+     (app.services.embedding_index)
+   - skills: the share of the job's dictionary skills each candidate has,
+     computed on one boolean candidates x skills matrix
+   - lexical: the BM25 fit score (0-100) from app.services.lexical_scoring,
+     which can be read next to the LLM's fit_score
+2. The top `shortlist` candidates go to the LLM matcher (the same prompt as
+   match_candidate_to_job) through iter_json_batch, so at most
+   `concurrency` prompts are in flight.
+
+rank_job yields (event, payload) pairs for app.core.sse.sse_event_response:
+
+    shortlist   pool size and the first-stage shortlist
+    result      one per shortlisted candidate, as its LLM score lands
+                (an `error` field instead of fit_score if matching failed;
+                `cached` if the stored analysis was reused, see below)
+    done        the final ranking by fit_score and how many scores were saved
+
+Scores are upserted into applications (candidate_id, job_id) in batches of
+settings.RANK_PERSIST_BATCH_SIZE while the stream runs. Whatever is still
+buffered is saved when the stream ends, including on client disconnect, so
+scores already paid for are kept. Existing highlights keys (e.g. a cover
+letter) are preserved. Only applicants' scores are saved: with
+applicants_only=False the other candidates are streamed but not written,
+so ranking never creates applications.
+
+Like match_candidate_to_job, a shortlisted candidate whose application
+carries the current match fingerprint (candidate and job unchanged) is
+reported from the stored analysis without an AI call.
+"""
+
+import asyncio
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from supabase import Client
+
+from app.core.ai_client import iter_json_batch
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.services.ai_matching import (
+    build_match_prompt,
+    match_fingerprint,
+    match_highlights,
+    match_request_options,
+    parse_fit_score,
+)
+from app.services.embedding_index import embedding_index, prerank_candidates, rows_by_id, table_pages
+from app.services.embeddings import candidate_text, job_text
+from app.services.lexical_scoring import score_candidates
+from app.services.resume_prefilter import SKILL_MATCHER
+
+logger = get_logger(__name__)
+
+RANK_STRATEGIES = ("embedding", "skills", "lexical")
+MAX_SHORTLIST = 200
+PROFILE_COLUMNS = "id, parsed_data, digital_footprints(github_data, linkedin_data)"
+
+
+def skill_overlap_scores(job_skills: Sequence[str], candidate_skills: Sequence[Sequence[str]]) -> np.ndarray:
+    """Fraction of job_skills each candidate has (0 for every candidate if the job names none)."""
+    scores = np.zeros(len(candidate_skills), dtype=np.float32)
+    if not job_skills or not candidate_skills:
+        return scores
+    column = {skill: i for i, skill in enumerate(job_skills)}
+    rows, cols = [], []
+    for row, skills in enumerate(candidate_skills):
+        for skill in skills:
+            col = column.get(skill)
+            if col is not None:
+                rows.append(row)
+                cols.append(col)
+    hits = np.zeros((len(candidate_skills), len(job_skills)), dtype=bool)
+    hits[rows, cols] = True
+    return hits.sum(axis=1, dtype=np.float32) / len(job_skills)
+
+
+def _pool_shortlist(
+    job: Dict[str, Any],
+    supabase: Client,
+    strategy: str,
+    candidate_ids: Optional[List[str]],
+    size: int,
+) -> Tuple[int, List[Tuple[str, float]]]:
+    """(pool size, top `size` (candidate_id, score)) by skill overlap or lexical fit."""
+    if candidate_ids is None:
+        pages = table_pages(supabase, "candidates", "id, parsed_data")
+    else:
+        pages = rows_by_id(supabase, "candidates", "id, parsed_data", candidate_ids)
+    ids, profiles = [], []
+    for rows in pages:
+        for row in rows:
+            ids.append(row["id"])
+            profiles.append(row.get("parsed_data") or {})
+
+    if strategy == "lexical":
+        scores = score_candidates(job, profiles)
+    else:
+        job_skills = SKILL_MATCHER.find(job_text(job))
+        # The whole profile, not just the skills list: "Kubernetes" is often only in a job description
+        scores = skill_overlap_scores(job_skills, [SKILL_MATCHER.find(candidate_text(p)) for p in profiles])
+    top = np.argsort(-scores, kind="stable")[:size]
+    return len(ids), [(ids[i], float(scores[i])) for i in top]
+
+
+async def first_stage(
+    job: Dict[str, Any],
+    supabase: Client,
+    strategy: str,
+    candidate_ids: Optional[List[str]],
+    size: int,
+) -> Tuple[int, List[Tuple[str, float]]]:
+    """
+    Shortlist candidates without AI calls; returns (pool size, [(candidate_id, score)]).
+
+    candidate_ids=None ranks every candidate.
+    """
+    if strategy == "embedding":
+        ranked = await prerank_candidates(job, supabase, limit=size, candidate_ids=candidate_ids)
+        pool_size = len(candidate_ids) if candidate_ids is not None else len(embedding_index.candidates)
+        return pool_size, ranked
+    return await asyncio.to_thread(_pool_shortlist, job, supabase, strategy, candidate_ids, size)
+
+
+class ScoreWriter:
+    """
+    Buffers fit scores and upserts them into applications in batches.
+
+    Only candidates with an application (keys of `applications`) are saved;
+    scores for anyone else are dropped, so ranking a pool never creates
+    applications.
+    """
+
+    def __init__(self, job_id: str, applications: Dict[str, Dict[str, Any]], supabase: Client):
+        self.job_id = job_id
+        self.persisted = 0
+        self._applications = applications
+        self._supabase = supabase
+        self._pending: List[Dict[str, Any]] = []
+
+    async def add(self, candidate_id: str, fit_score: float, highlights: Dict[str, Any], fingerprint: str) -> None:
+        if candidate_id not in self._applications:
+            return
+        existing = self._applications[candidate_id].get("highlights")
+        self._pending.append({
+            "candidate_id": candidate_id,
+            "job_id": self.job_id,
+            "fit_score": fit_score,
+            "highlights": {**(existing if isinstance(existing, dict) else {}), **highlights},
+            "match_fingerprint": fingerprint,
+        })
+        if len(self._pending) >= settings.RANK_PERSIST_BATCH_SIZE:
+            await self.flush()
+
+    def _upsert(self, rows: List[Dict[str, Any]]) -> None:
+        self._supabase.table("applications").upsert(rows, on_conflict="candidate_id,job_id").execute()
+
+    async def flush(self) -> None:
+        if not self._pending:
+            return
+        rows, self._pending = self._pending, []
+        try:
+            await asyncio.to_thread(self._upsert, rows)
+            self.persisted += len(rows)
+        except Exception as e:
+            logger.error(f"Failed to save {len(rows)} fit scores for job {self.job_id}: {str(e)}")
+
+
+async def rank_job(
+    job: Dict[str, Any],
+    supabase: Client,
+    strategy: str = "embedding",
+    shortlist: Optional[int] = None,
+    applicants_only: bool = True,
+    concurrency: Optional[int] = None,
+) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+    """
+    Rank candidates for a job; yields SSE (event, payload) pairs.
+
+    Args:
+        job: The jobs row
+        strategy: First stage, "embedding", "skills" or "lexical"
+        shortlist: Candidates sent to the LLM (default settings.RANK_SHORTLIST_SIZE)
+        applicants_only: Rank the job's applicants rather than every candidate
+        concurrency: LLM prompts in flight (default settings.AI_BATCH_CONCURRENCY)
+    """
+    job_id = job["id"]
+    size = min(shortlist or settings.RANK_SHORTLIST_SIZE, MAX_SHORTLIST)
+    response = supabase.table("applications").select(
+        "candidate_id, fit_score, highlights, match_fingerprint"
+    ).eq("job_id", job_id).execute()
+    applications = {row["candidate_id"]: row for row in response.data or []}
+    candidate_ids = list(applications) if applicants_only else None
+
+    pool_size, ranked = await first_stage(job, supabase, strategy, candidate_ids, size)
+    prerank = {candidate_id: round(score, 4) for candidate_id, score in ranked}
+    logger.info(f"Ranking job {job_id}: {strategy} shortlist of {len(ranked)} from {pool_size} candidates")
+    yield "shortlist", {
+        "strategy": strategy,
+        "pool_size": pool_size,
+        "candidates": [{"candidate_id": cid, "prerank_score": score} for cid, score in prerank.items()],
+    }
+
+    profiles = {}
+    for rows in rows_by_id(supabase, "candidates", PROFILE_COLUMNS, list(prerank)):
+        profiles.update((row["id"], row) for row in rows)
+    posting = {k: job.get(k) for k in ("title", "description", "requirements")}
+    fingerprints = {cid: match_fingerprint(profiles[cid], posting) for cid in prerank if cid in profiles}
+
+    # Candidates whose stored analysis has the same fingerprint need no AI call
+    scored: List[Dict[str, Any]] = []
+    ids = []
+    for candidate_id, fingerprint in fingerprints.items():
+        application = applications.get(candidate_id, {})
+        if application.get("match_fingerprint") == fingerprint and application.get("fit_score") is not None:
+            scored.append({
+                "candidate_id": candidate_id,
+                "prerank_score": prerank[candidate_id],
+                "completed": len(scored) + 1,
+                "total": len(fingerprints),
+                "fit_score": float(application["fit_score"]),
+                "highlights": match_highlights(application.get("highlights") or {}),
+                "cached": True,
+            })
+            yield "result", scored[-1]
+        else:
+            ids.append(candidate_id)
+    cached = len(scored)
+    prompts = [build_match_prompt(profiles[cid], posting) for cid in ids]
+
+    writer = ScoreWriter(job_id, applications, supabase)
+    failed = 0
+    try:
+        async for item in iter_json_batch(prompts, concurrency=concurrency, **match_request_options()):
+            candidate_id = ids[item.index]
+            payload = {
+                "candidate_id": candidate_id,
+                "prerank_score": prerank[candidate_id],
+                "completed": len(scored) + failed + 1,
+                "total": len(fingerprints),
+            }
+            fit_score = parse_fit_score(item.result) if item.ok else None
+            if fit_score is None:
+                failed += 1
+                payload["error"] = item.error or "Response has no numeric fit_score"
+            else:
+                payload["fit_score"] = fit_score
+                payload["highlights"] = match_highlights(item.result)
+                payload["cached"] = False
+                scored.append(payload)
+                await writer.add(candidate_id, fit_score, payload["highlights"], fingerprints[candidate_id])
+            yield "result", payload
+    finally:
+        await writer.flush()
+
+    ranking = sorted(scored, key=lambda r: (-r["fit_score"], -r["prerank_score"]))
+    logger.info(
+        f"Ranked job {job_id}: {len(scored)} scored ({cached} unchanged since the last match), "
+        f"{failed} failed, {writer.persisted} saved"
+    )
+    yield "done", {
+        "ranking": [
+            {"candidate_id": r["candidate_id"], "fit_score": r["fit_score"], "prerank_score": r["prerank_score"]}
+            for r in ranking
+        ],
+        "persisted": writer.persisted,
+        "cached": cached,
+        "failed": failed,
+    }
@@ -0,0 +1,326 @@
+"""
+Job Re-scoring
+
+An application's fit_score is computed against the job as it was when the
+candidate was matched. When a recruiter changes a job's description or
+requirements, update_job queues a re-score instead of leaving the scores
+stale:
+
+    update_job ──> enqueue_rescore ──> job_rescores row (status = 'pending')
+                                              │
+                                              ▼
+    JobRescoreWorker: claim ──> re-match applications ──> 'completed' | retry | 'failed'
+
+The queue is the job_rescores table (migration 010), one row per job, so a
+re-score survives restarts and several API instances can share it. Like the
+footprint queue, rows are claimed with FOR UPDATE SKIP LOCKED
+(claim_job_rescores), and a run whose worker stopped sending heartbeats for
+settings.RESCORE_STALE_AFTER_SECONDS is reclaimed; one that had no attempts
+left is marked 'failed' instead (fail_abandoned_rescores).
+
+A run works through the job's applications highest current fit_score
+first, in chunks of settings.RESCORE_CHUNK_SIZE. Each chunk's scores are
+saved (with their match fingerprint) before its progress is recorded, and
+applications whose fingerprint is already current are counted as
+unchanged without an AI call, so a reclaimed run picks up where the last
+one stopped. Editing the job again during a run re-queues it; the running
+worker notices at its next chunk and leaves the job to the new run.
+
+Prompts go through iter_json_batch with at most settings.RESCORE_CONCURRENCY
+in flight, under the global AI limiter, so re-scoring only ever uses part
+of the AI_MAX_CONCURRENCY budget that interactive matches share.
+
+Progress is exposed by GET /api/jobs/{job_id}/rescore.
+"""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+from supabase import Client
+
+from app.core.ai_client import iter_json_batch
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.core.supabase_client import get_supabase_client
+from app.services.ai_matching import (
+    build_match_prompt,
+    match_fingerprint,
+    match_highlights,
+    match_request_options,
+    parse_fit_score,
+)
+from app.services.embedding_index import rows_by_id
+from app.services.job_ranking import PROFILE_COLUMNS, ScoreWriter
+
+logger = get_logger(__name__)
+
+# Job fields the match prompt depends on that trigger a re-score when edited
+RESCORE_FIELDS = ("description", "requirements")
+
+STATUS_COLUMNS = (
+    "job_id,status,total,rescored,unchanged,failed,attempts,error,"
+    "requested_at,started_at,heartbeat_at,finished_at"
+)
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def needs_rescore(before: Dict[str, Any], after: Dict[str, Any]) -> bool:
+    """Whether a job edit changed a field the fit scores depend on."""
+    return any((before.get(field) or "") != (after.get(field) or "") for field in RESCORE_FIELDS)
+
+
+def rescore_order(applications: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Applications highest fit_score first, unscored ones last."""
+    return sorted(
+        applications,
+        key=lambda row: (row.get("fit_score") is None, -float(row.get("fit_score") or 0)),
+    )
+
+
+def enqueue_rescore(job_id: str, supabase: Client) -> bool:
+    """
+    Queue a re-score of a job's applications and wake the worker.
+
+    Re-queuing a job that is already queued or running resets its progress;
+    a running worker hands over to the new request at its next chunk.
+
+    Returns:
+        True if the re-score was queued
+    """
+    try:
+        supabase.table("job_rescores").upsert(
+            {
+                "job_id": job_id,
+                "status": "pending",
+                "total": 0,
+                "rescored": 0,
+                "unchanged": 0,
+                "failed": 0,
+                "attempts": 0,
+                "error": None,
+                "requested_at": _now(),
+                "started_at": None,
+                "heartbeat_at": None,
+                "finished_at": None,
+            },
+            on_conflict="job_id",
+        ).execute()
+    except Exception as e:
+        logger.error(f"Failed to queue re-score for job {job_id}: {str(e)}")
+        return False
+    rescore_worker.notify()
+    logger.info(f"Queued re-score for job {job_id}")
+    return True
+
+
+def get_rescore_status(job_id: str, supabase: Client) -> Optional[Dict[str, Any]]:
+    """Re-score progress for a job, or None if none was queued."""
+    response = supabase.table("job_rescores").select(STATUS_COLUMNS).eq("job_id", job_id).limit(1).execute()
+    return response.data[0] if response.data else None
+
+
+def fail_abandoned_rescores(supabase: Client) -> int:
+    """
+    Mark 'failed' the runs whose worker stopped sending heartbeats on their
+    last allowed attempt; claim_job_rescores won't reclaim them.
+
+    Returns:
+        The number of runs marked failed
+    """
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=settings.RESCORE_STALE_AFTER_SECONDS)
+    response = supabase.table("job_rescores").update(
+        {"status": "failed", "error": "Worker stopped during the last attempt", "finished_at": _now()}
+    ).eq("status", "processing").gte("attempts", settings.RESCORE_MAX_ATTEMPTS).lt(
+        "heartbeat_at", cutoff.isoformat()
+    ).execute()
+    abandoned = len(response.data or [])
+    if abandoned:
+        logger.warning(f"Marked {abandoned} abandoned job re-scores as failed")
+    return abandoned
+
+
+def _record_progress(row: Dict[str, Any], counts: Dict[str, int], supabase: Client, **fields: Any) -> bool:
+    """
+    Save progress for the claimed run. Returns False if the job was
+    re-queued since the claim (the run should stop).
+    """
+    response = supabase.table("job_rescores").update(
+        {**counts, "heartbeat_at": _now(), **fields}
+    ).eq("job_id", row["job_id"]).eq("requested_at", row["requested_at"]).execute()
+    return bool(response.data)
+
+
+def _profiles(supabase: Client, candidate_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+    profiles = {}
+    for rows in rows_by_id(supabase, "candidates", PROFILE_COLUMNS, candidate_ids):
+        profiles.update((row["id"], row) for row in rows)
+    return profiles
+
+
+async def rescore_job(row: Dict[str, Any], supabase: Client) -> bool:
+    """
+    Re-match the applications of one claimed job_rescores row.
+
+    Returns:
+        True if the run finished (False if the job was re-queued or gone)
+    """
+    job_id = row["job_id"]
+    job_response = await asyncio.to_thread(
+        supabase.table("jobs").select("id, title, description, requirements").eq("id", job_id).execute
+    )
+    if not job_response.data:
+        return False
+    posting = {k: job_response.data[0].get(k) for k in ("title", "description", "requirements")}
+
+    app_response = await asyncio.to_thread(
+        supabase.table("applications").select(
+            "candidate_id, fit_score, highlights, match_fingerprint"
+        ).eq("job_id", job_id).execute
+    )
+    queue = rescore_order(app_response.data or [])
+    applications = {application["candidate_id"]: application for application in queue}
+    counts = {"total": len(queue), "rescored": 0, "unchanged": 0, "failed": 0}
+    if not await asyncio.to_thread(_record_progress, row, counts, supabase):
+        return False
+
+    writer = ScoreWriter(job_id, applications, supabase)
+    concurrency = max(1, min(settings.RESCORE_CONCURRENCY, settings.AI_MAX_CONCURRENCY))
+    chunk_size = max(1, settings.RESCORE_CHUNK_SIZE)
+    for start in range(0, len(queue), chunk_size):
+        chunk = [application["candidate_id"] for application in queue[start:start + chunk_size]]
+        profiles = await asyncio.to_thread(_profiles, supabase, chunk)
+
+        ids, fingerprints = [], {}
+        for candidate_id in chunk:
+            if candidate_id not in profiles:
+                counts["failed"] += 1
+                continue
+            fingerprints[candidate_id] = match_fingerprint(profiles[candidate_id], posting)
+            application = applications[candidate_id]
+            if application.get("match_fingerprint") == fingerprints[candidate_id] and application.get("fit_score") is not None:
+                counts["unchanged"] += 1
+            else:
+                ids.append(candidate_id)
+
+        prompts = [build_match_prompt(profiles[cid], posting) for cid in ids]
+        try:
+            async for item in iter_json_batch(prompts, concurrency=concurrency, **match_request_options()):
+                candidate_id = ids[item.index]
+                fit_score = parse_fit_score(item.result) if item.ok else None
+                if fit_score is None:
+                    counts["failed"] += 1
+                    continue
+                counts["rescored"] += 1
+                await writer.add(candidate_id, fit_score, match_highlights(item.result), fingerprints[candidate_id])
+        finally:
+            await writer.flush()
+
+        if not await asyncio.to_thread(_record_progress, row, counts, supabase):
+            logger.info(f"Re-score of job {job_id} was re-queued; stopping this run")
+            return False
+
+    await asyncio.to_thread(
+        _record_progress, row, counts, supabase, status="completed", error=None, finished_at=_now()
+    )
+    logger.info(
+        f"Re-scored job {job_id}: {counts['rescored']} re-scored, {counts['unchanged']} unchanged, "
+        f"{counts['failed']} failed of {counts['total']}"
+    )
+    return True
+
+
+class JobRescoreWorker:
+    """
+    Background loop draining the re-score queue for this API process.
+
+    Takes one job at a time. Wakes up when enqueue_rescore notifies it and
+    otherwise polls every settings.RESCORE_POLL_INTERVAL_SECONDS, which also
+    picks up work queued by other instances and runs to reclaim.
+    """
+
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self, supabase: Optional[Client] = None) -> None:
+        if self.running:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run(supabase or get_supabase_client()))
+        logger.info("Job re-score worker started")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        logger.info("Job re-score worker stopped")
+
+    def notify(self) -> None:
+        """Wake the worker early; safe to call from any thread."""
+        if self.running:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    async def run_once(self, supabase: Client) -> int:
+        """Claim one queued job and re-score it. Returns the number claimed (0 or 1)."""
+        await asyncio.to_thread(fail_abandoned_rescores, supabase)
+        response = await asyncio.to_thread(
+            supabase.rpc(
+                "claim_job_rescores",
+                {
+                    "batch_size": 1,
+                    "stale_after_seconds": settings.RESCORE_STALE_AFTER_SECONDS,
+                    "max_attempts": settings.RESCORE_MAX_ATTEMPTS,
+                },
+            ).execute
+        )
+        rows: List[Dict[str, Any]] = response.data or []
+        for row in rows:
+            try:
+                await rescore_job(row, supabase)
+            except Exception as e:
+                attempts = row.get("attempts") or 1
+                status = "failed" if attempts >= settings.RESCORE_MAX_ATTEMPTS else "pending"
+                logger.error(
+                    f"Re-score of job {row['job_id']} failed "
+                    f"(attempt {attempts}/{settings.RESCORE_MAX_ATTEMPTS}): {str(e)}"
+                )
+                await asyncio.to_thread(
+                    supabase.table("job_rescores").update({"status": status, "error": str(e)}).eq(
+                        "job_id", row["job_id"]
+                    ).eq("requested_at", row["requested_at"]).execute
+                )
+        return len(rows)
+
+    async def _run(self, supabase: Client) -> None:
+        while True:
+            self._wakeup.clear()
+            try:
+                claimed = await self.run_once(supabase)
+            except Exception as e:
+                logger.error(f"Job re-score worker error: {str(e)}")
+                claimed = 0
+            # There may be more queued jobs; go again straight away
+            if claimed:
+                continue
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=settings.RESCORE_POLL_INTERVAL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+
+
+rescore_worker = JobRescoreWorker()
@@ -0,0 +1,195 @@
+"""
+Lexical Fit Scoring
+
+A deterministic fit score with no AI calls: BM25 of a candidate's profile
+(skills, experience, education) against the job's title, requirements and
+description. It serves triage over a whole candidate pool, matching while
+the AI provider is down, and a sanity check on LLM fit scores. Select it
+with strategy="lexical" on /api/applications/match, /api/jobs/{id}/prerank
+and /api/jobs/{id}/rank.
+
+Terms are the hashing embedder's words plus canonical skills from the
+prefilter's dictionary (`skill:kubernetes`), so "k8s" on a resume meets
+"Kubernetes" in a job. Field labels from the rendered profile ("title:",
+"description:") are dropped.
+
+Only the job's terms can score, so each posting is turned once into a
+JobVocabulary (term -> column, query weights), cached by posting text.
+Candidates become a CSR matrix over those columns (indptr/indices/data
+NumPy arrays) and one vectorized pass scores all of them:
+
+    score(d) = sum over job terms t of
+               w_t * idf_t * tf(t,d) * (k1 + 1) / (tf(t,d) + k1 * (1 - b + b * |d| / avgdl))
+
+    fit_score = 100 * score(d) / sum(w_t * idf_t), capped at 100
+
+so a profile of average length that mentions every job term once scores
+100. idf and avgdl come from the scored pool; with fewer than
+MIN_IDF_POOL candidates (e.g. a single match) every term has idf 1 and
+|d| = avgdl. Scores are comparable within a pass, not between pools.
+"""
+
+import hashlib
+import math
+import re
+import threading
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.services.embeddings import SKILL_WEIGHT, candidate_text, job_text, tokenize
+from app.services.resume_prefilter import SKILL_MATCHER
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+MIN_IDF_POOL = 20  # candidates needed before idf is estimated from the pool
+JOB_CACHE_SIZE = 256  # job vocabularies kept per process
+
+# "title: ", "- company: ", "; description: " labels written by prompt_context
+_LABEL_RE = re.compile(r"(?:^|(?<=; )|(?<=- ))[a-z][a-z_ ]*:", re.MULTILINE)
+
+
+def _terms(text: str) -> Tuple[Counter, int]:
+    """(term counts, document length in words) for rendered profile or posting text."""
+    tokens = tokenize(_LABEL_RE.sub(" ", text.lower()))
+    counts = Counter(tokens)
+    for skill in SKILL_MATCHER.find(text):
+        counts[f"skill:{skill.lower()}"] = 1
+    return counts, len(tokens)
+
+
+@dataclass(frozen=True)
+class JobVocabulary:
+    """A job's scoring terms: column per term, query weight per column."""
+
+    terms: Dict[str, int]
+    weights: np.ndarray  # float32, one per column
+    skills: List[str]  # canonical names of the job's dictionary skills
+
+
+@dataclass
+class TermMatrix:
+    """Candidates x job terms term frequencies in CSR form, plus document lengths."""
+
+    indptr: np.ndarray
+    indices: np.ndarray
+    data: np.ndarray
+    lengths: np.ndarray
+
+    @property
+    def rows(self) -> int:
+        return len(self.lengths)
+
+
+# Shared by the asyncio.to_thread workers that score pools, hence the lock
+_vocabularies: "OrderedDict[str, JobVocabulary]" = OrderedDict()
+_vocabularies_lock = threading.Lock()
+
+
+def job_vocabulary(job: Dict[str, Any]) -> JobVocabulary:
+    """The job's vocabulary, built once per posting text (LRU of JOB_CACHE_SIZE)."""
+    text = job_text(job)
+    key = hashlib.sha256(text.encode("utf-8")).hexdigest()
+    with _vocabularies_lock:
+        vocabulary = _vocabularies.get(key)
+        if vocabulary is not None:
+            _vocabularies.move_to_end(key)
+            return vocabulary
+
+    counts, _ = _terms(text)
+    terms, weights = {}, []
+    for term, count in counts.items():
+        terms[term] = len(weights)
+        if term.startswith("skill:"):
+            weights.append(SKILL_WEIGHT)
+        else:
+            # Sublinear, like the embedder: repeating a word in the posting doesn't multiply its weight
+            weights.append(1.0 + math.log(count))
+    vocabulary = JobVocabulary(terms, np.asarray(weights, dtype=np.float32), SKILL_MATCHER.find(text))
+
+    # Built outside the lock; if two threads raced, the first one stored wins
+    with _vocabularies_lock:
+        vocabulary = _vocabularies.setdefault(key, vocabulary)
+        _vocabularies.move_to_end(key)
+        while len(_vocabularies) > JOB_CACHE_SIZE:
+            _vocabularies.popitem(last=False)
+    return vocabulary
+
+
+def term_matrix(vocabulary: JobVocabulary, profiles: Sequence[Optional[Dict[str, Any]]]) -> TermMatrix:
+    """Term frequencies of the job's terms in each candidate's parsed_data."""
+    indptr = np.zeros(len(profiles) + 1, dtype=np.int64)
+    lengths = np.zeros(len(profiles), dtype=np.float32)
+    indices: List[int] = []
+    data: List[int] = []
+    columns = vocabulary.terms
+    for row, parsed_data in enumerate(profiles):
+        counts, length = _terms(candidate_text(parsed_data or {}))
+        for term, count in counts.items():
+            column = columns.get(term)
+            if column is not None:
+                indices.append(column)
+                data.append(count)
+        indptr[row + 1] = len(indices)
+        lengths[row] = length
+    return TermMatrix(
+        indptr=indptr,
+        indices=np.asarray(indices, dtype=np.int32),
+        data=np.asarray(data, dtype=np.float32),
+        lengths=lengths,
+    )
+
+
+def bm25_fit_scores(vocabulary: JobVocabulary, matrix: TermMatrix) -> np.ndarray:
+    """0-100 fit score per matrix row (see the module docstring for the formula)."""
+    if not matrix.rows or not len(vocabulary.weights):
+        return np.zeros(matrix.rows, dtype=np.float32)
+
+    if matrix.rows >= MIN_IDF_POOL:
+        df = np.bincount(matrix.indices, minlength=len(vocabulary.weights))
+        idf = np.log1p((matrix.rows - df + 0.5) / (df + 0.5)).astype(np.float32)
+        avgdl = float(matrix.lengths.mean()) or 1.0
+        length_norm = 1.0 - BM25_B + BM25_B * matrix.lengths / avgdl
+    else:
+        idf = np.ones(len(vocabulary.weights), dtype=np.float32)
+        length_norm = np.ones(matrix.rows, dtype=np.float32)
+
+    # One contribution per stored (candidate, term) entry, summed per row
+    rows = np.repeat(np.arange(matrix.rows), np.diff(matrix.indptr))
+    tf = matrix.data
+    weight = vocabulary.weights[matrix.indices] * idf[matrix.indices]
+    contributions = weight * tf * (BM25_K1 + 1.0) / (tf + BM25_K1 * length_norm[rows])
+    scores = np.bincount(rows, weights=contributions, minlength=matrix.rows)
+
+    best = float((vocabulary.weights * idf).sum())
+    if best <= 0:
+        return np.zeros(matrix.rows, dtype=np.float32)
+    return np.minimum(100.0, 100.0 * scores / best).astype(np.float32)
+
+
+def score_candidates(job: Dict[str, Any], profiles: Sequence[Optional[Dict[str, Any]]]) -> np.ndarray:
+    """Lexical fit score (0-100) of each candidate parsed_data against the job, in one pass."""
+    vocabulary = job_vocabulary(job)
+    return bm25_fit_scores(vocabulary, term_matrix(vocabulary, profiles))
+
+
+def lexical_match(candidate_profile: Dict[str, Any], job: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Fit analysis in the LLM matcher's shape (fit_score, strengths,
+    weaknesses, recommendations) for a candidate row and a job row.
+    """
+    parsed_data = candidate_profile.get("parsed_data") or {}
+    vocabulary = job_vocabulary(job)
+    fit_score = float(bm25_fit_scores(vocabulary, term_matrix(vocabulary, [parsed_data]))[0])
+
+    counts, _ = _terms(candidate_text(parsed_data))
+    present = [skill for skill in vocabulary.skills if f"skill:{skill.lower()}" in counts]
+    missing = [skill for skill in vocabulary.skills if f"skill:{skill.lower()}" not in counts]
+    return {
+        "fit_score": round(fit_score, 2),
+        "strengths": [f"Lists {skill}" for skill in present],
+        "weaknesses": [f"No mention of {skill}" for skill in missing],
+        "recommendations": ["Keyword-based score; run an AI match before deciding"],
+    }
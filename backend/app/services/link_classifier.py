@@ -0,0 +1,155 @@
+"""
+Link Classification
+
+Shared detection and categorization of profile links in resumes, used for
+resume text, PDF link annotations and scraped portfolio pages.
+
+Detection is one pass of a single precompiled pattern over the text. The
+pass yields each URL with its position and any "portfolio"-style keyword
+it passes on the way. Categories come from the URL's host rather than
+substring checks, so e.g. dropbox.com is not mistaken for x.com.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional
+
+GITHUB = "github"
+LINKEDIN = "linkedin"
+PORTFOLIO = "portfolio"
+TWITTER = "twitter"
+OTHER = "other"
+
+# Keywords that mark the next URL as a personal site
+PORTFOLIO_KEYWORDS = ("portfolio", "website", "personal site", "web site", "blog")
+
+# How far (chars) before a URL a keyword may appear to count as its label
+KEYWORD_WINDOW = 100
+
+# Hosted-site platforms that almost always mean a personal portfolio
+PORTFOLIO_HOST_SUFFIXES = ("vercel.app", "netlify.app", "github.io", "herokuapp.com", "pages.dev")
+
+_TLDS = "com|net|org|io|dev|me|co|in|app|site"
+
+# Matched against the lowercased text (cheaper than re.IGNORECASE); the
+# original casing is sliced back out by position. URL alternative first so
+# "portfolio.dev" is a URL, not a keyword + junk. The lookbehind keeps the
+# domain part of e-mail addresses out.
+_SCAN_RE = re.compile(
+    rf"(?P<url>(?<![@\w.-])(?:https?://)?(?:www\.)?[\w-]+(?:\.[\w-]+)*\.(?:{_TLDS})\b(?:/[\w/.%~#?=&+-]*)?)"
+    rf"|(?P<kw>{'|'.join(re.escape(k) for k in PORTFOLIO_KEYWORDS)})"
+)
+_SCHEME_RE = re.compile(r"^(https?)://", re.IGNORECASE)
+_GITHUB_PROFILE_RE = re.compile(r"^((?:www\.)?github\.com/[\w-]+)", re.IGNORECASE)
+_LINKEDIN_PROFILE_RE = re.compile(r"^((?:www\.)?linkedin\.com/in/[\w-]+)", re.IGNORECASE)
+
+
+@dataclass(frozen=True)
+class LinkMatch:
+    """A URL found in text (or given directly), with its classification."""
+    url: str  # normalized: scheme added (https) if missing, no trailing slash or punctuation
+    category: str
+    start: int = -1
+    end: int = -1
+    near_keyword: bool = False
+
+
+def _host(url_without_scheme: str) -> str:
+    host = url_without_scheme.split("/", 1)[0].lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+def _host_matches(host: str, domain: str) -> bool:
+    return host == domain or host.endswith("." + domain)
+
+
+def classify_host(host: str) -> str:
+    """Category of a bare host name (no scheme, no www.)."""
+    if any(_host_matches(host, suffix) for suffix in PORTFOLIO_HOST_SUFFIXES):
+        return PORTFOLIO
+    if _host_matches(host, "github.com"):
+        return GITHUB
+    if _host_matches(host, "linkedin.com"):
+        return LINKEDIN
+    if _host_matches(host, "twitter.com") or _host_matches(host, "x.com"):
+        return TWITTER
+    if "portfolio" in host:
+        return PORTFOLIO
+    return OTHER
+
+
+def classify_url(raw: str, start: int = -1, end: int = -1, near_keyword: bool = False) -> LinkMatch:
+    """Normalize and categorize one URL."""
+    raw = raw.strip()
+    scheme = _SCHEME_RE.match(raw)
+    bare = raw[scheme.end():] if scheme else raw
+    bare = bare.rstrip("/.,;:")
+    category = classify_host(_host(bare))
+
+    # Profile links are trimmed to the profile root (github.com/user/repo -> github.com/user)
+    profile_re = {GITHUB: _GITHUB_PROFILE_RE, LINKEDIN: _LINKEDIN_PROFILE_RE}.get(category)
+    if profile_re is not None:
+        profile = profile_re.match(bare)
+        if profile:
+            bare = profile.group(1)
+        elif category == LINKEDIN:
+            # linkedin.com/company/... etc. is not a candidate profile
+            category = OTHER
+
+    return LinkMatch(url=f"{scheme.group(1).lower() if scheme else 'https'}://{bare}", category=category, start=start, end=end, near_keyword=near_keyword)
+
+
+def scan_links(text: str) -> List[LinkMatch]:
+    """Find every URL in `text` in a single pass, in order of appearance."""
+    text = text or ""
+    matches: List[LinkMatch] = []
+    last_keyword_start: Optional[int] = None
+    for m in _SCAN_RE.finditer(text.lower()):
+        start, end = m.span()
+        if m.lastgroup == "kw":
+            last_keyword_start = start
+            continue
+        near = last_keyword_start is not None and start - last_keyword_start <= KEYWORD_WINDOW
+        matches.append(classify_url(text[start:end], start, end, near))
+    return matches
+
+
+def pick_profile_links(matches: Iterable[LinkMatch], fallback_portfolio: bool = True) -> Dict[str, str]:
+    """
+    Choose one GitHub, LinkedIn and portfolio URL from classified links.
+
+    Portfolio preference: a URL labelled by a portfolio keyword, then a
+    known portfolio host, then (if `fallback_portfolio`) any other site.
+    """
+    links: Dict[str, str] = {}
+    labelled = host_based = fallback = None
+    for match in matches:
+        if match.category in (GITHUB, LINKEDIN):
+            links.setdefault(match.category, match.url)
+        elif match.category == TWITTER:
+            continue
+        elif match.near_keyword and labelled is None:
+            labelled = match.url
+        elif match.category == PORTFOLIO and host_based is None:
+            host_based = match.url
+        elif fallback is None:
+            fallback = match.url
+
+    portfolio = labelled or host_based or (fallback if fallback_portfolio else None)
+    if portfolio:
+        links[PORTFOLIO] = portfolio
+    return links
+
+
+def extract_profile_links(text: str) -> Dict[str, str]:
+    """GitHub/LinkedIn/portfolio links mentioned in free text."""
+    return pick_profile_links(scan_links(text))
+
+
+def categorize_urls(urls: Iterable[str]) -> Dict[str, str]:
+    """
+    GitHub/LinkedIn/portfolio links from explicit URLs (e.g. PDF link
+    annotations). Without surrounding text only known portfolio hosts
+    count as a portfolio.
+    """
+    return pick_profile_links((classify_url(u) for u in urls), fallback_portfolio=False)
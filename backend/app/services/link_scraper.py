@@ -3,7 +3,7 @@ from bs4 import BeautifulSoup
 import re
 from typing import Dict, Optional
 from app.core.logging import get_logger
-from app.core.logging import get_logger
+from app.services.link_classifier import GITHUB, LINKEDIN, TWITTER, classify_url
 
 logger = get_logger(__name__)
 
@@ -162,13 +162,9 @@ async def scrape_portfolio(portfolio_url: str) -> Optional[Dict]:
             # Extract social media links
             social_links = {}
             for link in soup.find_all('a', href=True):
-                href = link['href']
-                if 'linkedin.com' in href:
-                    social_links['linkedin'] = href
-                elif 'github.com' in href:
-                    social_links['github'] = href
-                elif 'twitter.com' in href or 'x.com' in href:
-                    social_links['twitter'] = href
+                category = classify_url(link['href']).category
+                if category in (LINKEDIN, GITHUB, TWITTER):
+                    social_links.setdefault(category, link['href'])
             
             # Try to detect technologies (basic keywords)
             technologies = []
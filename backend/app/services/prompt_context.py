@@ -0,0 +1,238 @@
+"""
+Prompt Context Builder
+
+Renders candidate, job and digital footprint records into a compact,
+canonical plain-text form for LLM prompts. Compared with interpolating the
+raw Supabase dicts this drops empty and bookkeeping fields, removes
+duplicate list entries, avoids Python repr noise (quotes, None, braces) and
+caps each section at a token budget so prompt size stays predictable.
+"""
+
+import re
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+from app.core.config import settings
+
+# Rough chars-per-token ratio for English prose with Gemini's tokenizer
+CHARS_PER_TOKEN = 4
+
+TRUNCATION_MARKER = " …[truncated]"
+
+# Fields that carry no signal for matching or screening
+_IGNORED_KEYS = {
+    "id", "candidate_id", "job_id", "created_at", "updated_at", "scraped_at",
+    "scraped", "url", "image", "note", "resume_url", "social_links",
+}
+
+_WHITESPACE_RUN = re.compile(r"[ \t\f\v]+")
+_BLANK_LINES = re.compile(r"\n{3,}")
+_DIGITS = re.compile(r"\d+")
+
+# Separates pages in extracted text (document_extraction.extract_pdf)
+PAGE_BREAK = "\f"
+# Lines at each end of a page checked for running headers/footers; more
+# would start catching body lines such as a role title opening each page
+EDGE_LINES = 1
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate used for budgeting (no tokenizer round-trip)."""
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+def truncate_to_tokens(text: str, max_tokens: Optional[int]) -> str:
+    """Cut text to roughly `max_tokens`, preferring a line or word boundary."""
+    if not max_tokens or estimate_tokens(text) <= max_tokens:
+        return text
+    limit = max(0, max_tokens * CHARS_PER_TOKEN - len(TRUNCATION_MARKER))
+    cut = text[:limit]
+    boundary = max(cut.rfind("\n"), cut.rfind(" "))
+    if boundary > limit // 2:
+        cut = cut[:boundary]
+    return cut.rstrip() + TRUNCATION_MARKER
+
+
+def _page_edges(lines: List[str]) -> List[int]:
+    """Indices of the first and last EDGE_LINES non-empty lines of a page."""
+    filled = [index for index, line in enumerate(lines) if line]
+    return sorted(set(filled[:EDGE_LINES] + filled[-EDGE_LINES:]))
+
+
+def _edge_key(line: str) -> str:
+    # "Page 2 of 3" and "Page 3 of 3" are the same footer
+    return _DIGITS.sub("#", line.lower())
+
+
+def normalize_text(text: str) -> str:
+    """
+    Collapse whitespace runs and blank-line runs, and drop running page
+    headers/footers: a line at the top or bottom of at least half the
+    pages (PAGE_BREAK-separated, two pages minimum) is kept only once.
+    Repeated lines in the body, such as two roles with the same title,
+    are left alone.
+    """
+    pages = [
+        [line.strip() for line in _WHITESPACE_RUN.sub(" ", page).splitlines()]
+        for page in (text or "").split(PAGE_BREAK)
+    ]
+    edges = [_page_edges(lines) for lines in pages]
+    page_counts: Dict[str, int] = {}
+    for lines, indices in zip(pages, edges):
+        for key in {_edge_key(lines[index]) for index in indices}:
+            page_counts[key] = page_counts.get(key, 0) + 1
+    min_pages = max(2, -(-len(pages) // 2))
+    running = {key for key, count in page_counts.items() if count >= min_pages}
+
+    seen = set()
+    kept: List[str] = []
+    for lines, indices in zip(pages, edges):
+        repeats = set()
+        for index in indices:
+            key = _edge_key(lines[index])
+            if key in running:
+                if key in seen:
+                    repeats.add(index)
+                seen.add(key)
+        kept.extend(line for index, line in enumerate(lines) if index not in repeats)
+    return _BLANK_LINES.sub("\n\n", "\n".join(kept)).strip()
+
+
+def _is_empty(value: Any) -> bool:
+    return value is None or value == "" or value == [] or value == {}
+
+
+def compact(value: Any) -> Any:
+    """Recursively drop empty/ignored fields and de-duplicate lists."""
+    if isinstance(value, dict):
+        result = {}
+        for key, item in value.items():
+            if key in _IGNORED_KEYS:
+                continue
+            item = compact(item)
+            if not _is_empty(item):
+                result[key] = item
+        return result
+    if isinstance(value, (list, tuple, set)):
+        result = []
+        seen = set()
+        for item in value:
+            item = compact(item)
+            if _is_empty(item):
+                continue
+            key = repr(item).lower()
+            if key in seen:
+                continue
+            seen.add(key)
+            result.append(item)
+        return result
+    if isinstance(value, str):
+        return " ".join(value.split())
+    return value
+
+
+def _label(key: str) -> str:
+    return key.replace("_", " ")
+
+
+def _inline(value: Any) -> str:
+    """Single-line rendering for nested values."""
+    if isinstance(value, dict):
+        return "; ".join(f"{_label(k)}: {_inline(v)}" for k, v in value.items())
+    if isinstance(value, list):
+        return ", ".join(_inline(v) for v in value)
+    return str(value)
+
+
+def _render_lines(data: Dict[str, Any]) -> List[str]:
+    lines = []
+    for key, value in data.items():
+        if isinstance(value, list) and any(isinstance(v, dict) for v in value):
+            lines.append(f"{_label(key)}:")
+            lines.extend(f"- {_inline(v)}" for v in value)
+        else:
+            lines.append(f"{_label(key)}: {_inline(value)}")
+    return lines
+
+
+def render_section(data: Optional[Dict[str, Any]], max_tokens: Optional[int] = None) -> str:
+    """Render a record as compact `key: value` lines within a token budget."""
+    cleaned = compact(data or {})
+    if not cleaned:
+        return "(none)"
+    return truncate_to_tokens("\n".join(_render_lines(cleaned)), max_tokens)
+
+
+def render_value(value: Any, max_tokens: Optional[int] = None) -> str:
+    """Render a single field (string, list or dict) on one line."""
+    cleaned = compact(value)
+    if _is_empty(cleaned):
+        return "(none)"
+    return truncate_to_tokens(_inline(cleaned), max_tokens)
+
+
+def _footprint_rows(footprints: Union[Dict, List, None]) -> Iterable[Dict[str, Any]]:
+    # Supabase embeds one-to-many relations as a list, one-to-one as a dict
+    if isinstance(footprints, dict):
+        return [footprints]
+    return footprints or []
+
+
+def render_footprints(
+    footprints: Union[Dict, List, None],
+    max_tokens: Optional[int] = None,
+) -> str:
+    """Render scraped GitHub/LinkedIn/portfolio data for a candidate."""
+    if max_tokens is None:
+        max_tokens = settings.PROMPT_FOOTPRINT_TOKEN_BUDGET
+    merged: Dict[str, Any] = {}
+    for row in _footprint_rows(footprints):
+        for key in ("github_data", "linkedin_data", "portfolio_data"):
+            if row.get(key):
+                merged.setdefault(key.replace("_data", ""), row[key])
+    return render_section(merged, max_tokens)
+
+
+def render_candidate(
+    candidate: Dict[str, Any],
+    max_tokens: Optional[int] = None,
+    footprint_tokens: Optional[int] = None,
+) -> str:
+    """
+    Render a candidate row (name, parsed_data, digital_footprints) for a prompt.
+
+    Parsed resume data and footprints are budgeted separately so a verbose
+    scraped profile can't crowd out the resume itself.
+    """
+    if max_tokens is None:
+        max_tokens = settings.PROMPT_CANDIDATE_TOKEN_BUDGET
+    profile = dict(candidate.get("parsed_data") or {})
+    if candidate.get("name"):
+        profile.setdefault("name", candidate["name"])
+    # Contact details are irrelevant to fit and only cost tokens
+    for key in ("email", "phone", "links"):
+        profile.pop(key, None)
+    # Fixed field order keeps prompts stable across candidates
+    ordered = {k: profile.pop(k) for k in ("name", "skills", "experience", "education") if k in profile}
+    ordered.update(profile)
+
+    rendered = render_section(ordered, max_tokens)
+    footprints = candidate.get("digital_footprints")
+    if footprints:
+        rendered += "\n\nOnline presence:\n" + render_footprints(footprints, footprint_tokens)
+    return rendered
+
+
+def render_job(job: Dict[str, Any], max_tokens: Optional[int] = None) -> str:
+    """Render a job row (title, description, requirements) for a prompt."""
+    if max_tokens is None:
+        max_tokens = settings.PROMPT_JOB_TOKEN_BUDGET
+    ordered = {k: job.get(k) for k in ("title", "requirements", "description")}
+    ordered.update({k: v for k, v in job.items() if k not in ordered})
+    return render_section(ordered, max_tokens)
+
+
+def render_resume_text(text: str, max_tokens: Optional[int] = None) -> str:
+    """Normalize extracted resume text and cap it at the resume budget."""
+    if max_tokens is None:
+        max_tokens = settings.PROMPT_RESUME_TOKEN_BUDGET
+    return truncate_to_tokens(normalize_text(text), max_tokens)
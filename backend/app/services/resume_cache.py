@@ -0,0 +1,123 @@
+"""
+Resume Parse Cache
+
+Content-addressed index of previous resume parses (table resume_parses).
+Two keys are recorded for every parse:
+
+- content_hash: sha256 of the uploaded bytes. A hit means the exact same
+  file was seen before, so storage upload, extraction and the AI parse
+  can all be skipped.
+- text_hash: sha256 of the normalized extracted text. Catches the same CV
+  re-exported or re-saved (different bytes, same content); only the AI
+  parse is skipped. Only recorded and looked up when the text has at least
+  MIN_CACHEABLE_TEXT_CHARS characters: scanned and image-only PDFs extract
+  to (almost) nothing, and two different people's scans must not share a
+  parse.
+
+Lookups never fail a parse: errors (e.g. the migration not applied yet)
+are logged and treated as a miss.
+"""
+
+import hashlib
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+from supabase import Client
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.models.candidate import ParsedData
+
+logger = get_logger(__name__)
+
+CACHE_TABLE = "resume_parses"
+MIN_CACHEABLE_TEXT_CHARS = 200  # normalized characters needed to key the cache on text
+
+
+def content_hash(content: bytes) -> str:
+    """Hash of the raw file bytes."""
+    return hashlib.sha256(content).hexdigest()
+
+
+def _normalize(text: str) -> str:
+    return " ".join((text or "").lower().split())
+
+
+def text_hash(text: str) -> str:
+    """Hash of extracted text, insensitive to case and whitespace layout."""
+    return hashlib.sha256(_normalize(text).encode("utf-8")).hexdigest()
+
+
+def cache_text_hash(text: str) -> Optional[str]:
+    """text_hash to key the parse cache on, or None if the text is too short to identify a resume."""
+    if len(_normalize(text)) < MIN_CACHEABLE_TEXT_CHARS:
+        return None
+    return text_hash(text)
+
+
+def _find(column: str, value: str, supabase: Client) -> Optional[Dict[str, Any]]:
+    try:
+        response = supabase.table(CACHE_TABLE).select("*").eq(column, value).limit(1).execute()
+    except Exception as e:
+        logger.warning(f"Resume cache lookup failed ({column}): {str(e)}")
+        return None
+    if not response.data:
+        return None
+    row = response.data[0]
+    _record_hit(row, supabase)
+    logger.info(f"Resume cache hit on {column} {value[:12]} (candidate {row.get('candidate_id')})")
+    return row
+
+
+def _record_hit(row: Dict[str, Any], supabase: Client) -> None:
+    try:
+        supabase.table(CACHE_TABLE).update({
+            "hit_count": (row.get("hit_count") or 0) + 1,
+            "last_hit_at": datetime.now(timezone.utc).isoformat(),
+        }).eq("id", row["id"]).execute()
+    except Exception as e:
+        logger.debug(f"Could not update resume cache hit count: {str(e)}")
+
+
+def find_by_content_hash(digest: str, supabase: Client) -> Optional[Dict[str, Any]]:
+    """Previous parse of a byte-identical file, if any."""
+    return _find("content_hash", digest, supabase)
+
+
+def find_by_text_hash(digest: Optional[str], supabase: Client) -> Optional[Dict[str, Any]]:
+    """Previous parse of a file with the same extracted text, if any (never for a None digest)."""
+    if not digest:
+        return None
+    return _find("text_hash", digest, supabase)
+
+
+def cached_parsed_data(row: Dict[str, Any]) -> ParsedData:
+    return ParsedData(**row["parsed_data"])
+
+
+def record_parse(
+    file_hash: str,
+    extracted_text_hash: Optional[str],
+    parsed_data: ParsedData,
+    candidate_id: Optional[str],
+    resume_url: Optional[str],
+    storage_path: Optional[str],
+    supabase: Client,
+) -> None:
+    """
+    Store (or refresh) the cache entry for a completed parse. Pass
+    extracted_text_hash=None (see cache_text_hash) to record it for
+    byte-identical files only.
+    """
+    try:
+        supabase.table(CACHE_TABLE).upsert({
+            "content_hash": file_hash,
+            "text_hash": extracted_text_hash,
+            "candidate_id": candidate_id,
+            "resume_url": resume_url,
+            "storage_path": storage_path,
+            "parsed_data": parsed_data.dict(),
+            "model": settings.AI_MODEL,
+        }, on_conflict="content_hash").execute()
+    except Exception as e:
+        logger.warning(f"Failed to record resume parse in cache: {str(e)}")
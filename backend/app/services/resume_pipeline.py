@@ -0,0 +1,143 @@
+"""
+Resume Upload Pipeline
+
+Runs one resume upload as a small dependency graph instead of a strict
+sequence:
+
+    storage upload ──────────────────┐
+                                     ├──> store candidate ──> response
+    extract ──> AI parse (or cache) ─┘                   └──> enqueue link scraping
+
+Storage upload and extraction + AI parsing don't depend on each other and
+run concurrently. Link scraping is only queued; the footprint enrichment
+worker (app.services.footprint_enrichment) picks it up after the response
+has been sent. If either branch fails, the other is
+cancelled and a file that already reached storage is removed, so failed
+uploads leave no orphaned files behind.
+
+The storage branch streams the spooled upload (SpooledUpload.reader());
+only extraction reads the file into memory, and drops the bytes as soon
+as it is done. Stage and total wall times are logged for every upload.
+"""
+
+import asyncio
+import io
+import time
+from typing import Awaitable, Dict, Optional, Tuple, TypeVar
+
+from supabase import Client
+
+from app.core.logging import get_logger
+from app.core.uploads import SpooledUpload
+from app.models.candidate import ResumeUploadResponse
+from app.services.ai_parser import (
+    ResumeAnalysis,
+    parse_extracted_resume,
+    store_candidate_data,
+)
+from app.services.document_extraction import extract_document
+from app.services.resume_cache import record_parse
+from app.services.resume_storage import delete_resume, ensure_resumes_bucket, upload_resume
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+
+async def _timed(timings: Dict[str, float], stage: str, awaitable: Awaitable[T]) -> T:
+    started = time.perf_counter()
+    try:
+        return await awaitable
+    finally:
+        timings[stage] = round((time.perf_counter() - started) * 1000, 1)
+
+
+async def _store_file(
+    reader: io.BufferedReader, file_ext: str, content_type: Optional[str], supabase: Client
+) -> Tuple[str, str]:
+    await asyncio.to_thread(ensure_resumes_bucket, supabase)
+    return await asyncio.to_thread(upload_resume, reader, file_ext, content_type, supabase)
+
+
+async def _analyze(
+    content: bytes,
+    filename: str,
+    file_ext: str,
+    supabase: Client,
+    force: bool,
+    timings: Dict[str, float],
+) -> ResumeAnalysis:
+    extraction = await _timed(timings, "extract", extract_document(content, file_ext))
+    # Not needed past extraction; don't hold the file through AI parsing
+    content = None
+    return await _timed(timings, "parse", parse_extracted_resume(extraction, filename, supabase, force=force))
+
+
+async def _abort(upload_task: asyncio.Task, analyze_task: asyncio.Task, supabase: Client) -> None:
+    """Cancel the analysis branch and delete the upload if it made it to storage."""
+    analyze_task.cancel()
+    # The upload runs in a thread and can't be interrupted; wait for it so a
+    # file that lands after the failure is still cleaned up.
+    upload_result, _ = await asyncio.gather(upload_task, analyze_task, return_exceptions=True)
+    if isinstance(upload_result, tuple):
+        storage_path, _ = upload_result
+        await asyncio.to_thread(delete_resume, storage_path, supabase)
+
+
+async def process_resume_upload(
+    upload: SpooledUpload,
+    supabase: Client,
+    force: bool = False,
+) -> ResumeUploadResponse:
+    """
+    Upload, parse and store one resume, queueing its digital footprint
+    for enrichment. The caller keeps `upload` open until this returns.
+
+    Raises:
+        ResumeStorageError: If the storage upload fails
+        Exception: If extraction, parsing or storing the candidate fails
+    """
+    started = time.perf_counter()
+    timings: Dict[str, float] = {}
+    filename = upload.filename
+    file_ext = filename.lower().rsplit(".", 1)[-1]
+
+    # Read the bytes for extraction before the storage thread starts
+    # streaming the same spooled file, so the two never share a position
+    content = upload.read_bytes()
+    upload_task = asyncio.create_task(
+        _timed(timings, "upload", _store_file(upload.reader(), file_ext, upload.content_type, supabase))
+    )
+    analyze_task = asyncio.create_task(_analyze(content, filename, file_ext, supabase, force, timings))
+    # The analysis branch holds its own reference only as long as it needs it
+    content = None
+
+    try:
+        (storage_path, resume_url), analysis = await asyncio.gather(upload_task, analyze_task)
+    except BaseException:
+        await _abort(upload_task, analyze_task, supabase)
+        raise
+
+    parsed_data = analysis.parsed_data
+    try:
+        candidate_id = await _timed(
+            timings, "store", store_candidate_data(
+                parsed_data, resume_url, supabase,
+                extraction_meta=analysis.extraction_meta, resume_text=analysis.resume_text,
+            )
+        )
+    except BaseException:
+        await asyncio.to_thread(delete_resume, storage_path, supabase)
+        raise
+    await asyncio.to_thread(
+        record_parse, upload.sha256, analysis.text_hash, parsed_data, candidate_id, resume_url, storage_path, supabase
+    )
+
+    timings["total"] = round((time.perf_counter() - started) * 1000, 1)
+    logger.info(f"Processed resume {filename} in {timings['total']:.0f}ms (stages ms: {timings})")
+
+    return ResumeUploadResponse(
+        candidate_id=candidate_id,
+        message=analysis.message,
+        parsed_data=parsed_data,
+    )
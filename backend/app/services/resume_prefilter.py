@@ -0,0 +1,438 @@
+"""
+Rule-Based Resume Pre-Extraction
+
+Deterministic extraction of the resume fields that don't need an LLM:
+email and phone (regex), profile links (link_classifier), skills (a
+dictionary matched with an Aho-Corasick automaton, one pass over the text)
+and section segmentation with best-effort education/experience entries.
+
+parse_resume_with_ai uses the result to ask the LLM only for what is left
+unresolved ("hybrid" mode), or to skip the LLM entirely ("rules" mode).
+"""
+
+import re
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from app.services.link_classifier import extract_profile_links
+
+EMAIL_RE = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)*\.[a-z]{2,}", re.IGNORECASE)
+# International or local numbers with 8-15 digits, separators allowed
+PHONE_RE = re.compile(r"(?<![\w+])\+?\d[\d ().-]{7,18}\d(?!\w)")
+_YEAR = r"(?:19|20)\d{2}"
+_MONTH = r"(?:jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)[a-z]*\.?"
+DATE_RANGE_RE = re.compile(
+    rf"(?:{_MONTH}\s+)?{_YEAR}\s*(?:-|–|—|to)\s*(?:(?:{_MONTH}\s+)?{_YEAR}|present|current|now)",
+    re.IGNORECASE,
+)
+YEAR_RE = re.compile(rf"\b{_YEAR}\b")
+# BA/BE/MA/ME are also ordinary words ("to be", "to me") and state codes
+# ("Boston, MA"), so they only count dotted and uppercase (B.E., M.A) or
+# followed by a field of study ("MA in English", "BE (Mechanical)")
+DEGREE_RE = re.compile(
+    r"\b(?:b\.?\s?sc|m\.?\s?sc|b\.?\s?tech|m\.?\s?tech|b\.?\s?com|"
+    r"bachelor(?:'s)?|master(?:'s)?|ph\.?\s?d|mba|bba|diploma|associate(?:'s)? degree|high school)\b"
+    r"|\b(?-i:[BM]\.\s?[AE]\b|(?:BA|BE|MA|ME)\b(?=\s+(?:in|of)\b|\s*\([A-Z]))",
+    re.IGNORECASE,
+)
+INSTITUTION_RE = re.compile(r"\b(?:university|college|institute|school|academy|polytechnic|iit|nit)\b", re.IGNORECASE)
+ROLE_RE = re.compile(
+    r"\b(?:engineer|developer|manager|intern|analyst|lead|designer|consultant|architect|scientist|"
+    r"director|specialist|officer|administrator|programmer|head|founder|associate)\b",
+    re.IGNORECASE,
+)
+_FIELD_SPLIT_RE = re.compile(r"\s*(?:,|\||\s-\s|\s–\s|\s—\s|\bat\b)\s*")
+
+# Heading line (lowercased, trailing colon stripped) -> section name
+SECTION_HEADINGS: Dict[str, str] = {
+    **dict.fromkeys(["summary", "profile", "professional summary", "about", "about me", "objective"], "summary"),
+    **dict.fromkeys([
+        "experience", "work experience", "professional experience", "employment",
+        "employment history", "work history", "career history",
+    ], "experience"),
+    **dict.fromkeys(["education", "academic background", "academics", "education & training", "qualifications"], "education"),
+    **dict.fromkeys(["skills", "technical skills", "core competencies", "key skills", "technologies", "tech stack"], "skills"),
+    **dict.fromkeys(["projects", "personal projects", "key projects", "selected projects"], "projects"),
+    **dict.fromkeys(["certifications", "certificates", "licenses & certifications", "courses"], "certifications"),
+    **dict.fromkeys(["awards", "achievements", "publications", "languages", "interests", "hobbies"], "other"),
+}
+
+# Canonical skill -> spellings seen in resumes (all matched case-insensitively).
+# Deliberately leaves out ambiguous one-word skills such as "Go", "R" and "C",
+# and spellings that are everyday English (see SECTION_ONLY_ALIASES).
+SKILL_ALIASES: Dict[str, Tuple[str, ...]] = {
+    "Python": ("python",),
+    "Java": ("java",),
+    "JavaScript": ("javascript", "js", "ecmascript"),
+    "TypeScript": ("typescript",),
+    "C++": ("c++", "cpp"),
+    "C#": ("c#", "csharp"),
+    "Go": ("golang",),
+    "Rust": ("rust",),
+    "Ruby": ("ruby",),
+    "PHP": ("php",),
+    "Kotlin": ("kotlin",),
+    "Swift": ("swiftui",),
+    "Scala": ("scala",),
+    "SQL": ("sql",),
+    "Bash": ("bash", "shell scripting"),
+    "HTML": ("html", "html5"),
+    "CSS": ("css", "css3"),
+    "React": ("react", "react.js", "reactjs"),
+    "Next.js": ("next.js", "nextjs"),
+    "Angular": ("angular", "angularjs"),
+    "Vue.js": ("vue", "vue.js", "vuejs"),
+    "Node.js": ("node.js", "nodejs"),
+    "Express": ("express.js", "expressjs"),
+    "Django": ("django",),
+    "Flask": ("flask",),
+    "FastAPI": ("fastapi",),
+    "Spring": ("spring boot", "spring framework"),
+    ".NET": (".net", "asp.net", "dotnet"),
+    "Ruby on Rails": ("rails", "ruby on rails"),
+    "Tailwind CSS": ("tailwind", "tailwind css", "tailwindcss"),
+    "GraphQL": ("graphql",),
+    "REST APIs": ("rest api", "rest apis", "restful"),
+    "gRPC": ("grpc",),
+    "PostgreSQL": ("postgresql", "postgres"),
+    "MySQL": ("mysql",),
+    "SQLite": ("sqlite",),
+    "MongoDB": ("mongodb", "mongo"),
+    "Redis": ("redis",),
+    "Elasticsearch": ("elasticsearch",),
+    "Cassandra": ("cassandra",),
+    "DynamoDB": ("dynamodb",),
+    "Supabase": ("supabase",),
+    "Firebase": ("firebase",),
+    "Kafka": ("kafka",),
+    "RabbitMQ": ("rabbitmq",),
+    "Celery": ("celery",),
+    "Docker": ("docker",),
+    "Kubernetes": ("kubernetes", "k8s"),
+    "Terraform": ("terraform",),
+    "Ansible": ("ansible",),
+    "AWS": ("aws", "amazon web services"),
+    "GCP": ("gcp", "google cloud", "google cloud platform"),
+    "Azure": ("azure", "microsoft azure"),
+    "Linux": ("linux",),
+    "Git": ("git",),
+    "CI/CD": ("ci/cd", "continuous integration"),
+    "Jenkins": ("jenkins",),
+    "GitHub Actions": ("github actions",),
+    "Nginx": ("nginx",),
+    "Microservices": ("microservices",),
+    "Machine Learning": ("machine learning",),
+    "Deep Learning": ("deep learning",),
+    "NLP": ("nlp", "natural language processing"),
+    "Computer Vision": ("computer vision",),
+    "TensorFlow": ("tensorflow",),
+    "PyTorch": ("pytorch",),
+    "scikit-learn": ("scikit-learn", "sklearn"),
+    "Pandas": ("pandas",),
+    "NumPy": ("numpy",),
+    "Spark": ("spark", "pyspark", "apache spark"),
+    "Airflow": ("airflow",),
+    "Tableau": ("tableau",),
+    "Power BI": ("power bi", "powerbi"),
+    "Excel": ("microsoft excel", "ms excel"),
+    "LLMs": ("llm", "llms", "large language models"),
+    "Figma": ("figma",),
+    "Jira": ("jira",),
+    "Agile": ("scrum",),
+    "Android": ("android",),
+    "iOS": ("ios",),
+    "Flutter": ("flutter",),
+    "React Native": ("react native",),
+    "Unit Testing": ("unit testing", "pytest", "jest", "junit"),
+}
+
+# Spellings that are also ordinary words ("excel at", "spring 2021", "express
+# interest", "a well-rested team"). They only count inside a resume's skills
+# section, where a bare "Excel" or "Swift" is the skill.
+SECTION_ONLY_ALIASES: Dict[str, Tuple[str, ...]] = {
+    "Swift": ("swift",),
+    "Node.js": ("node",),
+    "Express": ("express",),
+    "Spring": ("spring",),
+    "REST APIs": ("rest",),
+    "Machine Learning": ("ml",),
+    "Excel": ("excel",),
+    "Agile": ("agile",),
+}
+
+
+class SkillMatcher:
+    """
+    Aho-Corasick automaton over skill spellings.
+
+    Finds every dictionary skill in one pass over the text regardless of
+    dictionary size. Matches must sit on word boundaries, so "java" does
+    not fire inside "javascript" and "rest" not inside "interest".
+    """
+
+    def __init__(self, aliases: Dict[str, Iterable[str]]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[Tuple[int, str]]] = [[]]  # (pattern length, canonical)
+        for canonical, spellings in aliases.items():
+            for spelling in spellings:
+                self._add(spelling.lower(), canonical)
+        self._build_failure_links()
+
+    def _add(self, pattern: str, canonical: str) -> None:
+        state = 0
+        for char in pattern:
+            nxt = self._goto[state].get(char)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][char] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            state = nxt
+        self._output[state].append((len(pattern), canonical))
+
+    def _build_failure_links(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                self._output[nxt] = self._output[nxt] + self._output[self._fail[nxt]]
+
+    def find(self, text: str) -> List[str]:
+        """Canonical skills in order of first appearance."""
+        text = text.lower()
+        found: Dict[str, None] = {}
+        state = 0
+        goto, fail, output = self._goto, self._fail, self._output
+        for index, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for length, canonical in output[state]:
+                if canonical in found:
+                    continue
+                start = index - length + 1
+                before = text[start - 1] if start > 0 else " "
+                after = text[index + 1] if index + 1 < len(text) else " "
+                if not before.isalnum() and not (after.isalnum() or after in "+#"):
+                    found[canonical] = None
+        return list(found)
+
+
+SKILL_MATCHER = SkillMatcher(SKILL_ALIASES)
+SKILLS_SECTION_MATCHER = SkillMatcher({
+    canonical: (*SKILL_ALIASES.get(canonical, ()), *SECTION_ONLY_ALIASES.get(canonical, ()))
+    for canonical in {**SKILL_ALIASES, **SECTION_ONLY_ALIASES}
+})
+
+
+def find_skills(text: str, skills_section: str = "") -> List[str]:
+    """Dictionary skills in the text, plus section-only spellings found in its skills section."""
+    found = dict.fromkeys(SKILL_MATCHER.find(text))
+    found.update(dict.fromkeys(SKILLS_SECTION_MATCHER.find(skills_section)))
+    return list(found)
+
+
+@dataclass
+class PrefilterResult:
+    """Fields resolved without the LLM; None/empty means unresolved."""
+    name: Optional[str] = None
+    email: Optional[str] = None
+    phone: Optional[str] = None
+    skills: List[str] = field(default_factory=list)
+    links: Dict[str, str] = field(default_factory=dict)
+    sections: Dict[str, str] = field(default_factory=dict)  # section name -> text (incl. "header")
+    education: List[Dict[str, Any]] = field(default_factory=list)
+    experience: List[Dict[str, Any]] = field(default_factory=list)
+
+    def unresolved(self, min_skills: int) -> List[str]:
+        """Fields the LLM still has to provide."""
+        missing = []
+        if not self.name:
+            missing.append("name")
+        if not self.email:
+            missing.append("email")
+        if len(self.skills) < min_skills:
+            missing.append("skills")
+        if not _entries_complete(self.education, ("degree", "institution", "year")):
+            missing.append("education")
+        if not _entries_complete(self.experience, ("company", "role", "duration")):
+            missing.append("experience")
+        return missing
+
+
+def _entries_complete(entries: List[Dict[str, Any]], keys: Tuple[str, ...]) -> bool:
+    return bool(entries) and all(entry.get(key) for entry in entries for key in keys)
+
+
+def split_sections(text: str) -> Dict[str, str]:
+    """Split resume text on recognised headings; text before the first is "header"."""
+    sections: Dict[str, List[str]] = {"header": []}
+    current = "header"
+    for line in text.splitlines():
+        key = line.strip().rstrip(":").strip().lower()
+        if key in SECTION_HEADINGS:
+            current = SECTION_HEADINGS[key]
+            sections.setdefault(current, [])
+            continue
+        sections[current].append(line)
+    return {name: "\n".join(lines).strip() for name, lines in sections.items() if "\n".join(lines).strip()}
+
+
+# Order in which sections get a share of a truncation budget; lower first.
+# Contact details and skills are kept whole where possible, then experience
+# (resumes list the most recent role first, so its head survives), then the
+# rest. Unknown sections count as "other".
+SECTION_PRIORITY: Dict[str, int] = {
+    "header": 0,
+    "skills": 0,
+    "summary": 1,
+    "experience": 1,
+    "education": 2,
+    "certifications": 3,
+    "projects": 4,
+    "other": 5,
+}
+
+
+def _section_blocks(text: str) -> List[Tuple[str, str]]:
+    """(section name, block text) in document order, each block including its heading line."""
+    blocks: List[Tuple[str, List[str]]] = [("header", [])]
+    for line in text.splitlines():
+        key = line.strip().rstrip(":").strip().lower()
+        if key in SECTION_HEADINGS:
+            blocks.append((SECTION_HEADINGS[key], [line]))
+        else:
+            blocks[-1][1].append(line)
+    return [(name, "\n".join(lines)) for name, lines in blocks if any(line.strip() for line in lines)]
+
+
+def _cut(block: str, limit: int) -> str:
+    """Keep the start of a block, up to `limit` chars, ending on a line break where possible."""
+    cut = block[:limit]
+    boundary = cut.rfind("\n")
+    return cut[:boundary] if boundary > limit // 2 else cut
+
+
+def truncate_sections(text: str, max_chars: int) -> Tuple[str, List[str]]:
+    """
+    Cut resume text to `max_chars` section by section rather than at the end.
+
+    Sections are granted budget in SECTION_PRIORITY order (document order
+    within a priority) and trimmed from their end, so a long projects list
+    or publication record gives way before contact details, skills and the
+    most recent experience do. Kept text stays in document order.
+
+    Returns:
+        (truncated text, names of the sections that were cut or dropped)
+    """
+    if len(text) <= max_chars:
+        return text, []
+    blocks = _section_blocks(text)
+    order = sorted(range(len(blocks)), key=lambda i: SECTION_PRIORITY.get(blocks[i][0], 5))
+    remaining = max_chars
+    kept: Dict[int, str] = {}
+    for index in order:
+        # One separator newline per kept block
+        allowance = remaining - 1
+        if allowance <= 0:
+            break
+        block = blocks[index][1]
+        kept[index] = block if len(block) <= allowance else _cut(block, allowance)
+        remaining -= len(kept[index]) + 1
+
+    trimmed = []
+    for index, (name, block) in enumerate(blocks):
+        if kept.get(index) != block and name not in trimmed:
+            trimmed.append(name)
+    return "\n".join(kept[i] for i in sorted(kept) if kept[i].strip()), trimmed
+
+
+def find_email(text: str) -> Optional[str]:
+    match = EMAIL_RE.search(text)
+    return match.group().lower() if match else None
+
+
+def find_phone(text: str) -> Optional[str]:
+    for match in PHONE_RE.finditer(text):
+        candidate = match.group().strip()
+        digits = re.sub(r"\D", "", candidate)
+        # Skip date ranges like 2018-2021 and other digit runs that aren't numbers
+        if 8 <= len(digits) <= 15 and not DATE_RANGE_RE.fullmatch(candidate):
+            return candidate
+    return None
+
+
+def find_name(header: str) -> Optional[str]:
+    """First header line that reads like a person's name."""
+    for line in header.splitlines()[:5]:
+        # "Jane Doe - Senior Backend Engineer" -> "Jane Doe"
+        candidate = _FIELD_SPLIT_RE.split(line.strip())[0].strip()
+        words = candidate.split()
+        if (
+            2 <= len(words) <= 4
+            and all(word[0].isupper() and word.replace("-", "").replace("'", "").replace(".", "").isalpha() for word in words)
+            and not ROLE_RE.search(candidate)
+        ):
+            return candidate
+    return None
+
+
+def parse_education(section: str) -> List[Dict[str, Any]]:
+    """One entry per line that names a degree."""
+    entries = []
+    for line in section.splitlines():
+        if not DEGREE_RE.search(line):
+            continue
+        year = YEAR_RE.findall(line)
+        parts = [p for p in _FIELD_SPLIT_RE.split(YEAR_RE.sub("", line)) if p and p.strip("() ")]
+        degree = next((p for p in parts if DEGREE_RE.search(p)), None)
+        institution = next((p for p in parts if INSTITUTION_RE.search(p) and p != degree), None)
+        if institution is None:
+            institution = next((p for p in parts if p != degree), None)
+        entries.append({
+            "degree": degree.strip() if degree else None,
+            "institution": institution.strip(" ()") if institution else None,
+            "year": year[-1] if year else None,
+        })
+    return entries
+
+
+def parse_experience(section: str) -> List[Dict[str, Any]]:
+    """One entry per line with a date range; following lines become its description."""
+    entries: List[Dict[str, Any]] = []
+    for line in section.splitlines():
+        dates = DATE_RANGE_RE.search(line)
+        if not dates:
+            if entries and line.strip():
+                entries[-1]["description"] = f"{entries[-1]['description']} {line.strip()}".strip()
+            continue
+        rest = (line[:dates.start()] + line[dates.end():]).strip(" ,|-–—()")
+        parts = [p.strip() for p in _FIELD_SPLIT_RE.split(rest) if p.strip(" ()")]
+        role = next((p for p in parts if ROLE_RE.search(p)), None)
+        company = next((p for p in parts if p != role), None)
+        entries.append({"company": company, "role": role, "duration": dates.group(), "description": ""})
+    return entries
+
+
+def prefilter_resume(text: str) -> PrefilterResult:
+    """Resolve everything that can be found deterministically."""
+    sections = split_sections(text)
+    return PrefilterResult(
+        name=find_name(sections.get("header", "")),
+        email=find_email(text),
+        phone=find_phone(sections.get("header", "") or text),
+        skills=find_skills(text, sections.get("skills", "")),
+        links=extract_profile_links(text),
+        sections=sections,
+        education=parse_education(sections.get("education", "")),
+        experience=parse_experience(sections.get("experience", "")),
+    )
@@ -0,0 +1,98 @@
+"""
+Resume Storage
+
+Uploads resume files to the Supabase Storage bucket and resolves their
+public URLs. Shared by the single-file and bulk upload endpoints.
+"""
+
+import io
+import uuid
+from typing import Tuple, Union
+
+from supabase import Client
+
+from app.core.logging import get_logger
+from app.core.supabase_client import ensure_storage_bucket_exists
+
+logger = get_logger(__name__)
+
+# Storage bucket name for resumes
+RESUMES_BUCKET_NAME = "resumes"
+
+
+class ResumeStorageError(Exception):
+    """Raised when a resume cannot be written to storage."""
+
+
+def ensure_resumes_bucket(supabase: Client) -> None:
+    """
+    Make sure the resumes bucket exists.
+
+    If automatic creation fails the bucket must be created manually in the
+    Supabase Dashboard; the upload itself will then fail with instructions.
+    """
+    try:
+        ensure_storage_bucket_exists(RESUMES_BUCKET_NAME, supabase)
+    except Exception as bucket_error:
+        logger.warning(
+            f"Could not automatically create storage bucket '{RESUMES_BUCKET_NAME}': {str(bucket_error)}. "
+            f"Will attempt upload - if bucket doesn't exist, upload will fail with clear instructions."
+        )
+
+
+def upload_resume(
+    content: Union[bytes, io.BufferedReader],
+    file_ext: str,
+    content_type: str,
+    supabase: Client,
+) -> Tuple[str, str]:
+    """
+    Upload a resume under a unique name.
+
+    `content` may be the file bytes or a buffered reader over them
+    (SpooledUpload.reader()), which is streamed without a bytes copy.
+
+    Returns:
+        (storage_path, resume_url)
+
+    Raises:
+        ResumeStorageError: If the upload fails
+    """
+    storage_path = f"resumes/{uuid.uuid4()}.{file_ext}"
+    logger.info(f"Uploading resume to storage: {storage_path}")
+
+    try:
+        supabase.storage.from_(RESUMES_BUCKET_NAME).upload(
+            file=content,
+            path=storage_path,
+            file_options={"content-type": content_type or "application/octet-stream"}
+        )
+        logger.info(f"Successfully uploaded resume to storage: {storage_path}")
+    except Exception as upload_error:
+        error_msg = str(upload_error)
+        logger.error(f"Failed to upload resume to storage: {error_msg}")
+        # Provide more helpful error messages
+        if "Bucket not found" in error_msg or "bucket" in error_msg.lower():
+            raise ResumeStorageError(
+                f"Storage bucket '{RESUMES_BUCKET_NAME}' not found. Please create it in your Supabase dashboard under Storage."
+            )
+        raise ResumeStorageError(f"Failed to upload resume: {error_msg}")
+
+    try:
+        resume_url = supabase.storage.from_(RESUMES_BUCKET_NAME).get_public_url(storage_path)
+        logger.info(f"Resume public URL: {resume_url}")
+    except Exception as url_error:
+        # Continue without URL if it fails, but log the error
+        logger.error(f"Failed to get public URL: {str(url_error)}")
+        resume_url = f"{RESUMES_BUCKET_NAME}/{storage_path}"
+
+    return storage_path, resume_url
+
+
+def delete_resume(storage_path: str, supabase: Client) -> None:
+    """Best-effort removal of an uploaded resume (e.g. after a failed parse)."""
+    try:
+        supabase.storage.from_(RESUMES_BUCKET_NAME).remove([storage_path])
+        logger.info(f"Removed resume from storage: {storage_path}")
+    except Exception as e:
+        logger.warning(f"Failed to remove resume {storage_path} from storage: {str(e)}")
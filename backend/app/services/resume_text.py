@@ -0,0 +1,71 @@
+"""
+Stored Resume Text
+
+The normalized extracted text of each candidate's latest resume is kept in
+candidate_resume_texts (gzip, base64-encoded for the REST API) together
+with its text hash (app.services.resume_cache.text_hash). Later pipelines
+- re-parsing after a prompt change, re-matching, interview context,
+full-text indexing - start from this text instead of downloading the file
+from storage and extracting it again.
+
+Storing text never fails an upload: errors are logged and the candidate is
+kept without it.
+"""
+
+import base64
+import gzip
+from typing import Any, Dict, Optional
+
+from supabase import Client
+
+from app.core.logging import get_logger
+from app.services.prompt_context import normalize_text
+from app.services.resume_cache import text_hash
+
+logger = get_logger(__name__)
+
+TEXT_TABLE = "candidate_resume_texts"
+
+
+def compress_text(text: str) -> str:
+    return base64.b64encode(gzip.compress(text.encode("utf-8"), compresslevel=6)).decode("ascii")
+
+
+def decompress_text(data: str) -> str:
+    return gzip.decompress(base64.b64decode(data)).decode("utf-8")
+
+
+def resume_text_row(candidate_id: str, text: str, digest: Optional[str] = None) -> Dict[str, Any]:
+    """Row for candidate_resume_texts; `digest` defaults to text_hash(text)."""
+    normalized = normalize_text(text)
+    compressed = compress_text(normalized)
+    return {
+        "candidate_id": candidate_id,
+        "text_hash": digest or text_hash(text),
+        "text_gzip": compressed,
+        "char_count": len(normalized),
+        "compressed_size": len(compressed),
+    }
+
+
+def store_resume_text(candidate_id: str, text: str, supabase: Client, digest: Optional[str] = None) -> bool:
+    """Save (or replace) a candidate's extracted resume text. Returns False on failure."""
+    try:
+        row = resume_text_row(candidate_id, text, digest)
+        supabase.table(TEXT_TABLE).upsert(row, on_conflict="candidate_id").execute()
+        logger.info(
+            f"Stored resume text for candidate {candidate_id}: "
+            f"{row['char_count']} chars in {row['compressed_size']} bytes"
+        )
+        return True
+    except Exception as e:
+        logger.warning(f"Could not store resume text for candidate {candidate_id}: {str(e)}")
+        return False
+
+
+def load_resume_text(candidate_id: str, supabase: Client) -> Optional[str]:
+    """A candidate's stored resume text, or None if none was stored."""
+    response = supabase.table(TEXT_TABLE).select("text_gzip").eq("candidate_id", candidate_id).limit(1).execute()
+    if not response.data:
+        return None
+    return decompress_text(response.data[0]["text_gzip"])
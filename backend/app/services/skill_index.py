@@ -0,0 +1,112 @@
+"""
+Skill Index
+
+Candidate skills are stored twice: as parsed (parsed_data->'skills', for
+display and prompts) and normalized in candidates.skills_normalized, a
+text[] with a GIN index (migration 008). Normalizing lowercases, collapses
+whitespace and maps known aliases to the prefilter's canonical name, so
+"K8s", "kubernetes" and "Kubernetes " are all stored and queried as
+"kubernetes".
+
+search_candidates answers skill queries with the array operators the GIN
+index serves:
+
+    all=[python, kubernetes]    skills_normalized @> '{python,kubernetes}'
+    any=[aws, gcp]              skills_normalized && '{aws,gcp}'
+
+Both may be combined. Every path that writes parsed_data also writes
+skills_normalized; backfill_skills re-normalizes existing rows.
+"""
+
+import re
+from typing import Any, Dict, Iterable, List, Optional
+
+from supabase import Client
+
+from app.core.logging import get_logger
+from app.services.embedding_index import table_pages
+from app.services.resume_prefilter import SECTION_ONLY_ALIASES, SKILL_ALIASES
+
+logger = get_logger(__name__)
+
+SKILLS_COLUMN = "skills_normalized"
+MAX_QUERY_SKILLS = 20  # per `all` / `any` list
+_SEPARATORS = re.compile(r"[,;\n]")
+
+_CANONICAL: Dict[str, str] = {}
+for _canonical, _spellings in (*SKILL_ALIASES.items(), *SECTION_ONLY_ALIASES.items()):
+    for _spelling in (_canonical, *_spellings):
+        _CANONICAL[_spelling.lower()] = _canonical.lower()
+
+
+def normalize_skill(skill: str) -> str:
+    """Lowercase, whitespace-collapsed skill name, with known aliases mapped to the canonical one."""
+    cleaned = " ".join(skill.split()).strip(" .:-").lower()
+    return _CANONICAL.get(cleaned, cleaned)
+
+
+def normalize_skills(skills: Optional[Iterable[Any]]) -> List[str]:
+    """Normalized, de-duplicated skills in their original order ("Python, Django" entries are split)."""
+    normalized: Dict[str, None] = {}
+    for entry in skills or []:
+        if not isinstance(entry, str):
+            continue
+        for part in _SEPARATORS.split(entry):
+            skill = normalize_skill(part)
+            if skill:
+                normalized[skill] = None
+    return list(normalized)
+
+
+def skill_columns(parsed_data: Optional[Dict[str, Any]]) -> Dict[str, List[str]]:
+    """Columns to write alongside parsed_data."""
+    return {SKILLS_COLUMN: normalize_skills((parsed_data or {}).get("skills"))}
+
+
+def array_literal(values: List[str]) -> str:
+    """Postgres array literal with every element quoted ("c++", "machine learning")."""
+    quoted = ('"' + value.replace("\\", "\\\\").replace('"', '\\"') + '"' for value in values)
+    return "{" + ",".join(quoted) + "}"
+
+
+def search_candidates(
+    supabase: Client,
+    all_skills: Optional[List[str]] = None,
+    any_skills: Optional[List[str]] = None,
+    limit: int = 20,
+    offset: int = 0,
+) -> Dict[str, Any]:
+    """
+    Candidates having every skill in `all_skills` and at least one of
+    `any_skills`, newest first, with the total match count.
+    """
+    required = normalize_skills(all_skills)
+    alternatives = normalize_skills(any_skills)
+    query = supabase.table("candidates").select(
+        f"id, name, email, {SKILLS_COLUMN}, created_at", count="exact"
+    )
+    if required:
+        query = query.contains(SKILLS_COLUMN, array_literal(required))
+    if alternatives:
+        query = query.overlaps(SKILLS_COLUMN, array_literal(alternatives))
+    response = query.order("created_at", desc=True).range(offset, offset + limit - 1).execute()
+    return {
+        "total": response.count or 0,
+        "limit": limit,
+        "offset": offset,
+        "skills": {"all": required, "any": alternatives},
+        "candidates": response.data or [],
+    }
+
+
+def backfill_skills(supabase: Client) -> int:
+    """Re-normalize skills_normalized for every candidate; returns the number updated."""
+    updated = 0
+    for rows in table_pages(supabase, "candidates", f"id, parsed_data, {SKILLS_COLUMN}"):
+        for row in rows:
+            columns = skill_columns(row.get("parsed_data"))
+            if columns[SKILLS_COLUMN] != row.get(SKILLS_COLUMN):
+                supabase.table("candidates").update(columns).eq("id", row["id"]).execute()
+                updated += 1
+    logger.info(f"Backfilled normalized skills for {updated} candidates")
+    return updated
@@ -140,7 +140,9 @@ class VoiceInterviewSession:
                 job_role,
                 candidate_profile.get("skills"),
             )
-            questions = await generate_screening_questions(job_role, candidate_profile)
+            questions = await generate_screening_questions(
+                job_role, candidate_profile, caller="voice_questions"
+            )
             self.questions = [q.strip() for q in questions if isinstance(q, str) and q.strip()]
         except Exception as exc:  # pragma: no cover - fallback path
             logger.warning("Falling back to default voice interview questions: %s", exc)
@@ -746,7 +748,9 @@ class VoiceInterviewSession:
 
         try:
             if questions and responses:
-                evaluation = await evaluate_screening_responses(questions, responses)
+                evaluation = await evaluate_screening_responses(
+                    questions, responses, caller="voice_evaluation"
+                )
             else:
                 evaluation = ScreeningEvaluation(
                     communication_score=70,
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Offline throughput benchmark for the AI pipelines (parse, match, screen).
+
+Runs the real service code against the synthetic or replay provider, so no
+API key or spend is needed. Supabase is never touched: matching is driven
+through the same prompt builder and client call as match_candidate_to_job.
+
+Usage (from backend/):
+    python -m benchmarks.ai_pipeline --requests 200 --concurrency 1 8 32
+    python -m benchmarks.ai_pipeline --provider replay --pipelines parse
+    python -m benchmarks.ai_pipeline --median-ms 1200 --failure-rate 0.05 --seed 7
+    python -m benchmarks.ai_pipeline --pipelines parse --parse-mode llm hybrid sections rules
+
+To build a replay store, run once with AI_PROVIDER=replay AI_REPLAY_MODE=record
+and a real GEMINI_API_KEY; later runs replay it deterministically.
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+# Settings require these; the benchmark never connects to Supabase
+for _key, _value in {
+    "SUPABASE_URL": "https://benchmark.invalid",
+    "SUPABASE_KEY": "benchmark",
+    "DATABASE_URL": "postgresql://benchmark",
+    "SECRET_KEY": "benchmark",
+    "AI_PROVIDER": "synthetic",
+    "LOG_LEVEL": "WARNING",
+}.items():
+    os.environ.setdefault(_key, _value)
+
+from app.core.ai_client import generate_json_response  # noqa: E402
+from app.core.ai_metrics import ai_metrics  # noqa: E402
+from app.core.ai_providers import SyntheticProvider, set_ai_provider  # noqa: E402
+from app.core.config import settings  # noqa: E402
+from app.services.ai_parser import parse_resume_with_ai  # noqa: E402
+from app.services.ai_screening import evaluate_screening_responses, generate_screening_questions  # noqa: E402
+from app.services.prompt_context import render_candidate, render_job  # noqa: E402
+
+SAMPLE_RESUME = """
+Jane Doe
+Senior Backend Engineer — jane.doe@example.com — github.com/janedoe
+Skills: Python, FastAPI, PostgreSQL, Redis, Docker, Kubernetes
+Experience:
+- Example Corp, Senior Engineer (2021-2024): led migration to async services
+- Startup Inc, Engineer (2018-2021): built billing and reporting APIs
+Education: BSc Computer Science, Example University, 2018
+""" * 3
+
+SAMPLE_CANDIDATE = {
+    "name": "Jane Doe",
+    "parsed_data": {
+        "skills": ["Python", "FastAPI", "PostgreSQL", "Redis", "Docker"],
+        "experience": [{"company": "Example Corp", "role": "Senior Engineer", "duration": "2021-2024"}],
+        "education": [{"degree": "BSc Computer Science", "institution": "Example University"}],
+    },
+    "digital_footprints": [{"github_data": {"username": "janedoe", "repositories": 40}}],
+}
+
+SAMPLE_JOB = {
+    "title": "Backend Engineer",
+    "description": "Design and run Python services for our hiring platform.",
+    "requirements": "3+ years Python, async frameworks, SQL",
+}
+
+
+async def _parse():
+    await parse_resume_with_ai(SAMPLE_RESUME)
+
+
+async def _match():
+    await generate_json_response(
+        prompt=f"Candidate Profile:\n{render_candidate(SAMPLE_CANDIDATE)}\n\nJob Description:\n{render_job(SAMPLE_JOB)}",
+        caller="candidate_match",
+    )
+
+
+async def _screen():
+    questions = await generate_screening_questions("Backend Engineer", {"skills": ["Python"]})
+    await evaluate_screening_responses(questions, ["A detailed answer."] * len(questions))
+
+
+PIPELINES = {"parse": _parse, "match": _match, "screen": _screen}
+
+
+def _percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[max(0, int(round(pct / 100 * len(ordered))) - 1)] if ordered else 0.0
+
+
+async def run_pipeline(name: str, total: int, concurrency: int) -> dict:
+    """Run `total` executions of a pipeline with at most `concurrency` in flight."""
+    slots = asyncio.Semaphore(concurrency)
+    latencies = []
+    failures = 0
+
+    async def one():
+        nonlocal failures
+        async with slots:
+            started = time.perf_counter()
+            try:
+                await PIPELINES[name]()
+                latencies.append((time.perf_counter() - started) * 1000)
+            except Exception:
+                failures += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(total)))
+    elapsed = time.perf_counter() - started
+    return {
+        "pipeline": name,
+        "concurrency": concurrency,
+        "ok": len(latencies),
+        "failed": failures,
+        "throughput": len(latencies) / elapsed if elapsed else 0.0,
+        "p50_ms": _percentile(latencies, 50),
+        "p95_ms": _percentile(latencies, 95),
+        "tokens_per_req": ai_metrics.summary()["total_tokens"] / len(latencies) if latencies else 0.0,
+    }
+
+
+async def main(args) -> None:
+    if args.provider == "synthetic":
+        set_ai_provider(SyntheticProvider(
+            median_ms=args.median_ms,
+            sigma=args.sigma,
+            failure_rate=args.failure_rate,
+            seed=args.seed,
+        ))
+    else:
+        settings.AI_PROVIDER = args.provider
+        set_ai_provider(None)
+
+    print(f"provider={args.provider} AI_MAX_CONCURRENCY={settings.AI_MAX_CONCURRENCY} requests={args.requests}")
+    print(
+        f"{'pipeline':<8} {'mode':<7} {'conc':>5} {'ok':>6} {'fail':>5} {'req/s':>8} "
+        f"{'p50 ms':>9} {'p95 ms':>9} {'tok/req':>8}"
+    )
+    for name in args.pipelines:
+        # The parse mode only changes the parse pipeline
+        for mode in (args.parse_mode if name == "parse" else [settings.RESUME_PARSE_MODE]):
+            settings.RESUME_PARSE_MODE = mode
+            for concurrency in args.concurrency:
+                ai_metrics.reset()
+                row = await run_pipeline(name, args.requests, concurrency)
+                print(
+                    f"{row['pipeline']:<8} {mode:<7} {row['concurrency']:>5} {row['ok']:>6} {row['failed']:>5} "
+                    f"{row['throughput']:>8.1f} {row['p50_ms']:>9.1f} {row['p95_ms']:>9.1f} "
+                    f"{row['tokens_per_req']:>8.0f}"
+                )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--provider", choices=["synthetic", "replay"], default="synthetic")
+    parser.add_argument("--pipelines", nargs="+", choices=list(PIPELINES), default=list(PIPELINES))
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--median-ms", type=float, default=settings.AI_SYNTHETIC_LATENCY_MEDIAN_MS)
+    parser.add_argument("--sigma", type=float, default=settings.AI_SYNTHETIC_LATENCY_SIGMA)
+    parser.add_argument("--failure-rate", type=float, default=settings.AI_SYNTHETIC_FAILURE_RATE)
+    parser.add_argument("--seed", type=int, default=settings.AI_SYNTHETIC_SEED)
+    parser.add_argument(
+        "--parse-mode", nargs="+", choices=["llm", "hybrid", "sections", "rules"], default=[settings.RESUME_PARSE_MODE]
+    )
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Benchmark: DOCX extraction with python-docx vs the streaming extractor.
+
+The python-docx baseline mirrors the previous extract_docx: load the whole
+document model and join doc.paragraphs. The streaming run is
+iter_docx_text (iterparse over the zip members) with no char budget, so
+both read the full document. Peak memory is measured with tracemalloc.
+
+The fixture puts skills in a table and a certification in a text box;
+the "chars" columns show what each approach actually extracts.
+
+Usage (from backend/):
+    python -m benchmarks.docx_extraction
+    python -m benchmarks.docx_extraction --sections 1 100 1000 --repeat 5
+"""
+
+import argparse
+import io
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+for _key, _value in {
+    "SUPABASE_URL": "https://benchmark.invalid",
+    "SUPABASE_KEY": "benchmark",
+    "DATABASE_URL": "postgresql://benchmark",
+    "SECRET_KEY": "benchmark",
+    "AI_PROVIDER": "synthetic",
+    "LOG_LEVEL": "WARNING",
+}.items():
+    os.environ.setdefault(_key, _value)
+
+from docx import Document  # noqa: E402
+
+from app.services.docx_text import iter_docx_text  # noqa: E402
+from benchmarks.fixtures import build_docx  # noqa: E402
+
+
+def python_docx(content: bytes) -> str:
+    doc = Document(io.BytesIO(content))
+    return "\n".join(paragraph.text for paragraph in doc.paragraphs)
+
+
+def streaming(content: bytes) -> str:
+    return "\n".join(iter_docx_text(content, []))
+
+
+def _measure(fn, content: bytes, repeat: int):
+    """(median ms, peak KB) for fn(content)."""
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn(content)
+        samples.append((time.perf_counter() - started) * 1000)
+    tracemalloc.start()
+    fn(content)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return statistics.median(samples), peak / 1024
+
+
+def main(args) -> None:
+    print(
+        f"{'sections':>8} {'size KB':>8} {'docx ms':>8} {'stream ms':>10} {'speedup':>8} "
+        f"{'docx KB':>9} {'stream KB':>10} {'docx chars':>11} {'stream chars':>13}"
+    )
+    for sections in args.sections:
+        content = build_docx(sections=sections)
+        before_ms, before_kb = _measure(python_docx, content, args.repeat)
+        after_ms, after_kb = _measure(streaming, content, args.repeat)
+        print(
+            f"{sections:>8} {len(content) / 1024:>8.1f} {before_ms:>8.1f} {after_ms:>10.1f} "
+            f"{before_ms / after_ms:>7.2f}x {before_kb:>9.0f} {after_kb:>10.0f} "
+            f"{len(python_docx(content)):>11} {len(streaming(content)):>13}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sections", type=int, nargs="+", default=[1, 50, 500])
+    parser.add_argument("--repeat", type=int, default=5)
+    main(parser.parse_args())
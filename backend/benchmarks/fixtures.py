@@ -0,0 +1,184 @@
+"""
+Synthetic resume documents for benchmarks and tests.
+
+Builds small but structurally realistic PDFs (Helvetica text, one link
+annotation per page) and DOCX files (header, body paragraphs, a skills
+table, a text box and hyperlinks) without any document-writing dependency.
+"""
+
+import io
+import zipfile
+from typing import List, Sequence
+from xml.sax.saxutils import escape
+
+RESUME_LINES = [
+    "Jane Doe - Senior Backend Engineer",
+    "jane.doe@example.com | +1 555 0100 | github.com/janedoe",
+    "EXPERIENCE",
+    "Example Corp, Senior Engineer, 2021-2024",
+    "Led the migration of billing services to async Python and PostgreSQL.",
+    "Startup Inc, Engineer, 2018-2021",
+    "Built reporting APIs with FastAPI, Redis and Celery for 40k daily users.",
+    "SKILLS",
+    "Python, FastAPI, PostgreSQL, Redis, Docker, Kubernetes, AWS, Terraform",
+    "EDUCATION",
+    "BSc Computer Science, Example University, 2018",
+]
+
+DEFAULT_LINKS = [
+    "https://github.com/janedoe",
+    "https://www.linkedin.com/in/janedoe",
+    "https://janedoe.vercel.app",
+]
+
+
+def _escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def build_pdf(pages: int = 1, lines: Sequence[str] = RESUME_LINES, links: List[str] = None) -> bytes:
+    """Return a PDF with `pages` pages of resume text and one URI link per page."""
+    links = DEFAULT_LINKS if links is None else links
+    objects: List[bytes] = []
+
+    def add(body: str) -> int:
+        objects.append(body.encode("latin-1"))
+        return len(objects)
+
+    catalog = add("")  # filled in once the page tree exists
+    page_tree = add("")
+    font = add("<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+
+    page_ids = []
+    for number in range(pages):
+        text_ops = ["BT", "/F1 11 Tf", "14 TL", "50 780 Td"]
+        for line in [f"Page {number + 1}", *lines]:
+            text_ops.append(f"({_escape(line)}) Tj T*")
+        text_ops.append("ET")
+        stream = "\n".join(text_ops)
+        content = add(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+
+        annots = ""
+        if links:
+            uri = links[number % len(links)]
+            link = add(
+                "<< /Type /Annot /Subtype /Link /Rect [50 700 250 715] /Border [0 0 0] "
+                f"/A << /S /URI /URI ({_escape(uri)}) >> >>"
+            )
+            annots = f" /Annots [{link} 0 R]"
+        page_ids.append(add(
+            f"<< /Type /Page /Parent {page_tree} 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 {font} 0 R >> >> /Contents {content} 0 R{annots} >>"
+        ))
+
+    kids = " ".join(f"{pid} 0 R" for pid in page_ids)
+    objects[catalog - 1] = f"<< /Type /Catalog /Pages {page_tree} 0 R >>".encode("latin-1")
+    objects[page_tree - 1] = f"<< /Type /Pages /Kids [{kids}] /Count {len(page_ids)} >>".encode("latin-1")
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n".encode("latin-1") + body + b"\nendobj\n"
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode("latin-1")
+    for offset in offsets:
+        out += f"{offset:010d} 00000 n \n".encode("latin-1")
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root {catalog} 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode("latin-1")
+    return bytes(out)
+
+
+_DOCX_NAMESPACES = (
+    'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships" '
+    'xmlns:mc="http://schemas.openxmlformats.org/markup-compatibility/2006" '
+    'xmlns:wps="http://schemas.microsoft.com/office/word/2010/wordprocessingShape" '
+    'xmlns:v="urn:schemas-microsoft-com:vml"'
+)
+_DOCX_REL = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+
+DOCX_SKILLS = ("Languages", "Python, Go, SQL")
+DOCX_TEXT_BOX = "Certified Kubernetes Administrator"
+
+
+def _w_p(text: str) -> str:
+    return f"<w:p><w:r><w:t xml:space=\"preserve\">{escape(text)}</w:t></w:r></w:p>"
+
+
+def _text_box(text: str) -> str:
+    # Word writes text boxes twice: a DrawingML choice and a VML fallback
+    box = f"<w:txbxContent>{_w_p(text)}</w:txbxContent>"
+    return (
+        "<w:p><w:r><mc:AlternateContent>"
+        f"<mc:Choice Requires=\"wps\"><w:drawing><wps:txbx>{box}</wps:txbx></w:drawing></mc:Choice>"
+        f"<mc:Fallback><w:pict><v:shape><v:textbox>{box}</v:textbox></v:shape></w:pict></mc:Fallback>"
+        "</mc:AlternateContent></w:r></w:p>"
+    )
+
+
+def build_docx(sections: int = 1, lines: Sequence[str] = RESUME_LINES, links: List[str] = None) -> bytes:
+    """
+    Return a DOCX whose header holds the first two resume lines and whose
+    body repeats the rest `sections` times, each time followed by a skills
+    table, a text box and one hyperlink paragraph per link.
+    """
+    links = DEFAULT_LINKS if links is None else links
+    header, body_lines = lines[:2], lines[2:]
+    rels = [
+        f'<Relationship Id="rIdHeader" Type="{_DOCX_REL}/header" Target="header1.xml"/>',
+        *(
+            f'<Relationship Id="rIdLink{i}" Type="{_DOCX_REL}/hyperlink" Target="{escape(url)}" TargetMode="External"/>'
+            for i, url in enumerate(links)
+        ),
+    ]
+    table = (
+        "<w:tbl><w:tr>"
+        + "".join(f"<w:tc>{_w_p(cell)}</w:tc>" for cell in DOCX_SKILLS)
+        + "</w:tr></w:tbl>"
+    )
+    hyperlinks = "".join(
+        f'<w:p><w:hyperlink r:id="rIdLink{i}"><w:r><w:t>{escape(url)}</w:t></w:r></w:hyperlink></w:p>'
+        for i, url in enumerate(links)
+    )
+    block = "".join(_w_p(line) for line in body_lines) + table + _text_box(DOCX_TEXT_BOX) + hyperlinks
+    document = (
+        f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n<w:document {_DOCX_NAMESPACES}><w:body>'
+        + block * sections
+        + '<w:sectPr><w:headerReference w:type="default" r:id="rIdHeader"/></w:sectPr></w:body></w:document>'
+    )
+    header_xml = (
+        f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n<w:hdr {_DOCX_NAMESPACES}>'
+        + "".join(_w_p(line) for line in header)
+        + "</w:hdr>"
+    )
+    wml = "application/vnd.openxmlformats-officedocument.wordprocessingml"
+    files = {
+        "[Content_Types].xml": (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+            '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="xml" ContentType="application/xml"/>'
+            f'<Override PartName="/word/document.xml" ContentType="{wml}.document.main+xml"/>'
+            f'<Override PartName="/word/header1.xml" ContentType="{wml}.header+xml"/>'
+            "</Types>"
+        ),
+        "_rels/.rels": (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            f'<Relationship Id="rId1" Type="{_DOCX_REL}/officeDocument" Target="word/document.xml"/>'
+            "</Relationships>"
+        ),
+        "word/document.xml": document,
+        "word/header1.xml": header_xml,
+        "word/_rels/document.xml.rels": (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            + "".join(rels)
+            + "</Relationships>"
+        ),
+    }
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as zf:
+        for name, data in files.items():
+            zf.writestr(name, data)
+    return buffer.getvalue()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Benchmark: resume link extraction on long texts.
+
+Compares the previous extract_links_with_regex (patterns compiled per call,
+a findall for all URLs, then a text.find plus 100-char context scan per URL)
+with the single-pass scanner in app.services.link_classifier.
+
+Usage (from backend/):
+    python -m benchmarks.link_extraction
+    python -m benchmarks.link_extraction --sizes 5 50 500 --repeat 20
+"""
+
+import argparse
+import re
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.services.link_classifier import extract_profile_links  # noqa: E402
+from benchmarks.fixtures import RESUME_LINES  # noqa: E402
+
+# Filler lines with distinct, unlabelled URLs, as in a long project list.
+# The legacy version re-finds each one from the start of the text.
+_NOISE_LINES = [
+    "Contributed to open source projects hosted at example.org/projects/api-gateway-{n}.",
+    "Wrote internal docs on confluence.company.com/engineering/backend-{n} for onboarding.",
+    "Published benchmarks at perf.example.net/reports/{n} and talks at conf.dev/speakers/{n}.",
+    "Maintained CI pipelines on ci.company.io/pipelines/main-{n} with 99.9% uptime.",
+]
+
+
+def legacy_extract(text: str):
+    """The previous implementation, kept verbatim minus logging."""
+    links = {}
+    text_lower = text.lower()
+    for pattern in [r'(?:https?://)?(?:www\.)?github\.com/[\w-]+/?', r'github\.com/[\w-]+']:
+        match = re.search(pattern, text, re.IGNORECASE)
+        if match:
+            url = match.group()
+            if not url.startswith('http'):
+                url = f"https://{url}"
+            links['github'] = url.rstrip('/')
+            break
+    for pattern in [r'(?:https?://)?(?:www\.)?linkedin\.com/in/[\w-]+/?', r'linkedin\.com/in/[\w-]+']:
+        match = re.search(pattern, text, re.IGNORECASE)
+        if match:
+            url = match.group()
+            if not url.startswith('http'):
+                url = f"https://{url}"
+            links['linkedin'] = url.rstrip('/')
+            break
+    portfolio_keywords = ['portfolio', 'website', 'personal site', 'web site', 'blog']
+    url_pattern = r'(?:https?://)?(?:www\.)?[\w.-]+\.(?:com|net|org|io|dev|me|co|in|app|site)(?:/[\w/-]*)?'
+    all_urls = re.findall(url_pattern, text, re.IGNORECASE)
+    for url in all_urls:
+        if 'github.com' in url.lower() or 'linkedin.com' in url.lower():
+            continue
+        url_index = text_lower.find(url.lower())
+        if url_index != -1:
+            context = text_lower[max(0, url_index - 100):url_index]
+            if any(keyword in context for keyword in portfolio_keywords):
+                if not url.startswith('http'):
+                    url = f"https://{url}"
+                links['portfolio'] = url.rstrip('/')
+                break
+    if 'portfolio' not in links and all_urls:
+        for url in all_urls:
+            if 'github.com' not in url.lower() and 'linkedin.com' not in url.lower():
+                if not url.startswith('http'):
+                    url = f"https://{url}"
+                links['portfolio'] = url.rstrip('/')
+                break
+    return links
+
+
+def build_text(kb: int) -> str:
+    """A resume of roughly `kb` KiB with the portfolio link near the end."""
+    lines = list(RESUME_LINES)
+    size, n = 0, 0
+    while size < kb * 1024:
+        block = [line.format(n=n) for line in _NOISE_LINES] + RESUME_LINES[2:]
+        lines.extend(block)
+        size += sum(len(line) + 1 for line in block)
+        n += 1
+    lines.append("Portfolio: janedoe.vercel.app")
+    lines.append("linkedin.com/in/janedoe")
+    return "\n".join(lines)
+
+
+def _time(fn, text: str, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn(text)
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def main(args) -> None:
+    print(f"{'size KB':>8} {'urls':>6} {'legacy ms':>10} {'single ms':>10} {'speedup':>8}")
+    for kb in args.sizes:
+        text = build_text(kb)
+        legacy, current = legacy_extract(text), extract_profile_links(text)
+        if legacy != current:
+            print(f"  note: results differ at {kb} KB: legacy={legacy} current={current}")
+        url_count = len(re.findall(r'\.(?:com|net|org|io|dev|app)\b', text))
+        before = _time(legacy_extract, text, args.repeat)
+        after = _time(extract_profile_links, text, args.repeat)
+        print(f"{kb:>8} {url_count:>6} {before:>10.2f} {after:>10.2f} {before / after:>7.2f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[5, 50, 500])
+    parser.add_argument("--repeat", type=int, default=10)
+    main(parser.parse_args())
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Benchmark: PDF extraction cost and concurrent upload throughput.
+
+1. Two-pass vs single-pass extraction. The two-pass baseline mirrors the
+   previous parse_resume flow: one PdfReader for text (accumulated with +=)
+   and a second PdfReader for link annotations.
+   The budgeted column adds EXTRACTION_MAX_PAGES / EXTRACTION_MAX_CHARS,
+   which caps the cost of very large documents.
+2. Documents/second for N concurrent uploads, extracting on the event loop
+   thread vs through the process pool (EXTRACTION_WORKERS).
+
+Usage (from backend/):
+    python -m benchmarks.pdf_extraction
+    python -m benchmarks.pdf_extraction --pages 1 10 100 --repeat 5
+    python -m benchmarks.pdf_extraction --concurrent 32 --workers 1 2 4
+"""
+
+import argparse
+import asyncio
+import io
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+for _key, _value in {
+    "SUPABASE_URL": "https://benchmark.invalid",
+    "SUPABASE_KEY": "benchmark",
+    "DATABASE_URL": "postgresql://benchmark",
+    "SECRET_KEY": "benchmark",
+    "AI_PROVIDER": "synthetic",
+    "LOG_LEVEL": "WARNING",
+}.items():
+    os.environ.setdefault(_key, _value)
+
+from PyPDF2 import PdfReader  # noqa: E402
+
+from app.core.config import settings  # noqa: E402
+from app.services.document_extraction import (  # noqa: E402
+    _page_link_uris,
+    extract_document,
+    extract_pdf,
+    shutdown_extraction_pool,
+    warm_extraction_pool,
+)
+from app.services.link_classifier import categorize_urls  # noqa: E402
+from benchmarks.fixtures import build_pdf  # noqa: E402
+
+
+def two_pass(content: bytes):
+    reader = PdfReader(io.BytesIO(content))
+    text = ""
+    for page in reader.pages:
+        text += page.extract_text()
+    reader = PdfReader(io.BytesIO(content))
+    urls = []
+    for page in reader.pages:
+        urls.extend(_page_link_uris(page))
+    return text, categorize_urls(urls)
+
+
+def single_pass(content: bytes):
+    result = extract_pdf(content)
+    return result.text, result.links
+
+
+def budgeted(content: bytes):
+    return extract_pdf(content, max_pages=settings.EXTRACTION_MAX_PAGES, max_chars=settings.EXTRACTION_MAX_CHARS)
+
+
+def _time(fn, content: bytes, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn(content)
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+async def _concurrent_uploads(content: bytes, count: int, workers: int) -> float:
+    """Documents per second for `count` simultaneous extractions."""
+    if workers == 0:
+        # Baseline: synchronous extraction on the loop thread, as before
+        async def one():
+            extract_pdf(content, max_pages=settings.EXTRACTION_MAX_PAGES)
+    else:
+        async def one():
+            await extract_document(content, "pdf")
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(count)))
+    return count / (time.perf_counter() - started)
+
+
+def main(args) -> None:
+    print(
+        f"{'pages':>6} {'size KB':>8} {'two-pass ms':>12} {'single ms':>10} {'speedup':>8} "
+        f"{'budgeted ms':>12} {'chars kept':>11}"
+    )
+    for pages in args.pages:
+        content = build_pdf(pages=pages)
+        assert two_pass(content)[1] == single_pass(content)[1]
+        before = _time(two_pass, content, args.repeat)
+        after = _time(single_pass, content, args.repeat)
+        bounded = _time(budgeted, content, args.repeat)
+        kept = len(budgeted(content).text)
+        print(
+            f"{pages:>6} {len(content) / 1024:>8.1f} {before:>12.1f} {after:>10.1f} {before / after:>7.2f}x "
+            f"{bounded:>12.1f} {kept:>11}"
+        )
+
+    content = build_pdf(pages=args.concurrent_pages)
+    print(f"\n{args.concurrent} concurrent {args.concurrent_pages}-page uploads")
+    print(f"{'workers':>8} {'docs/s':>8}")
+    for workers in args.workers:
+        settings.EXTRACTION_WORKERS = workers
+        warm_extraction_pool()
+        rate = asyncio.run(_concurrent_uploads(content, args.concurrent, workers))
+        shutdown_extraction_pool()
+        label = "inline" if workers == 0 else str(workers)
+        print(f"{label:>8} {rate:>8.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 10, 100, 500])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--concurrent", type=int, default=32)
+    parser.add_argument("--concurrent-pages", type=int, default=30)
+    parser.add_argument("--workers", type=int, nargs="+", default=[0, 1, 2, 4])
+    main(parser.parse_args())
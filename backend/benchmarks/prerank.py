@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Benchmark: embedding pre-rank and lexical scoring vs LLM matching for one job.
+
+Builds a candidate index of N synthetic profiles with the hashing embedder
+in a temporary directory, then times top-K search for a job. The lexical
+column times one BM25 pass over all N profiles (app.services.lexical_scoring,
+tokenizing included; the job vocabulary is built once and cached). The LLM
+column is what scoring every candidate with match_candidate_to_job would
+take at AI_SYNTHETIC_LATENCY_MEDIAN_MS per call and AI_BATCH_CONCURRENCY
+calls in flight - the cost the pre-rank lets recruiters skip for all but
+the shortlist.
+
+Usage (from backend/):
+    python -m benchmarks.prerank
+    python -m benchmarks.prerank --candidates 1000 10000 --top 50
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+for _key, _value in {
+    "SUPABASE_URL": "https://benchmark.invalid",
+    "SUPABASE_KEY": "benchmark",
+    "DATABASE_URL": "postgresql://benchmark",
+    "SECRET_KEY": "benchmark",
+    "AI_PROVIDER": "synthetic",
+    "EMBEDDING_PROVIDER": "hashing",
+    "LOG_LEVEL": "WARNING",
+}.items():
+    os.environ.setdefault(_key, _value)
+
+from app.core.config import settings  # noqa: E402
+from app.services.embedding_index import VectorIndex  # noqa: E402
+from app.services.embeddings import candidate_text, embedder_signature, get_embedder, job_text  # noqa: E402
+from app.services.lexical_scoring import score_candidates  # noqa: E402
+from app.services.resume_prefilter import SKILL_ALIASES  # noqa: E402
+
+SKILLS = list(SKILL_ALIASES)
+TITLES = ["Backend Engineer", "Frontend Developer", "Data Scientist", "DevOps Engineer", "Product Designer"]
+JOB = {
+    "id": "benchmark-job",
+    "title": "Senior Backend Engineer",
+    "requirements": "Python, FastAPI, PostgreSQL, Docker, Kubernetes, AWS",
+    "description": "Design and operate the APIs behind our hiring platform.",
+}
+
+
+def profile(rng: random.Random) -> dict:
+    return {
+        "skills": rng.sample(SKILLS, 8),
+        "experience": [
+            {"title": rng.choice(TITLES), "company": f"Company {rng.randrange(500)}", "description": "Shipped features."}
+            for _ in range(3)
+        ],
+        "education": [{"degree": "BSc Computer Science", "institution": "Example University"}],
+    }
+
+
+async def run(n: int, top: int, repeat: int) -> dict:
+    rng = random.Random(n)
+    embedder = get_embedder()
+    profiles = [profile(rng) for _ in range(n)]
+    texts = [candidate_text(p) for p in profiles]
+
+    started = time.perf_counter()
+    vectors = await embedder.embed(texts)
+    embed_s = time.perf_counter() - started
+
+    with tempfile.TemporaryDirectory() as directory:
+        index = VectorIndex(Path(directory) / "candidates", embedder.dim, embedder_signature(embedder))
+        ids = [f"candidate-{i}" for i in range(n)]
+        started = time.perf_counter()
+        for start in range(0, n, 500):
+            index.upsert(ids[start:start + 500], vectors[start:start + 500])
+        build_s = time.perf_counter() - started
+        size_mb = (Path(directory) / "candidates.f32").stat().st_size / 1024 ** 2
+
+        query = (await embedder.embed([job_text(JOB)], task="query"))[0]
+        samples = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            index.search(query, top)
+            samples.append((time.perf_counter() - started) * 1000)
+
+    score_candidates(JOB, profiles[:1])  # job vocabulary
+    started = time.perf_counter()
+    score_candidates(JOB, profiles)
+    lexical_s = time.perf_counter() - started
+
+    llm_s = n * settings.AI_SYNTHETIC_LATENCY_MEDIAN_MS / 1000 / settings.AI_BATCH_CONCURRENCY
+    return {
+        "embed_ms_per_candidate": embed_s * 1000 / n,
+        "build_s": build_s,
+        "search_ms": statistics.median(samples),
+        "size_mb": size_mb,
+        "lexical_pairs_per_s": n / lexical_s,
+        "llm_s": llm_s,
+    }
+
+
+def main(args) -> None:
+    print(
+        f"{'candidates':>10} {'embed ms/cand':>14} {'build s':>8} {'top-' + str(args.top) + ' ms':>10} "
+        f"{'index MB':>9} {'lexical pairs/s':>16} {'LLM all s':>10}"
+    )
+    for n in args.candidates:
+        result = asyncio.run(run(n, args.top, args.repeat))
+        print(
+            f"{n:>10} {result['embed_ms_per_candidate']:>14.3f} {result['build_s']:>8.2f} "
+            f"{result['search_ms']:>10.2f} {result['size_mb']:>9.1f} {result['lexical_pairs_per_s']:>16.0f} "
+            f"{result['llm_s']:>10.0f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--candidates", type=int, nargs="+", default=[200, 2000, 20000])
+    parser.add_argument("--top", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=20)
+    main(parser.parse_args())
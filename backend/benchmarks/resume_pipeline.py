@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Benchmark: wall time per resume upload, sequential vs pipelined.
+
+The sequential baseline mirrors the original endpoint: storage upload, then
+extraction, AI parse, candidate insert and link scraping one after another.
+The pipelined run is process_resume_upload, which only queues scraping for
+the footprint enrichment worker.
+
+Extraction is real (fixture PDF); the AI call uses the synthetic provider.
+Storage, database and scraping are simulated with fixed latencies.
+
+Usage (from backend/):
+    python -m benchmarks.resume_pipeline
+    python -m benchmarks.resume_pipeline --uploads 20 --storage-ms 400 --ai-ms 1500
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+for _key, _value in {
+    "SUPABASE_URL": "https://benchmark.invalid",
+    "SUPABASE_KEY": "benchmark",
+    "DATABASE_URL": "postgresql://benchmark",
+    "SECRET_KEY": "benchmark",
+    "AI_PROVIDER": "synthetic",
+    "LOG_LEVEL": "WARNING",
+    "EXTRACTION_WORKERS": "0",
+}.items():
+    os.environ.setdefault(_key, _value)
+
+from app.core.ai_providers import SyntheticProvider, set_ai_provider  # noqa: E402
+from app.core.config import settings  # noqa: E402
+from app.core.uploads import SpooledUpload  # noqa: E402
+from app.services import resume_pipeline  # noqa: E402
+from app.services.ai_parser import parse_extracted_resume  # noqa: E402
+from app.services.document_extraction import extract_document  # noqa: E402
+from benchmarks.fixtures import build_pdf  # noqa: E402
+
+
+def _simulated(args):
+    def upload(content, file_ext, content_type, supabase):
+        time.sleep(args.storage_ms / 1000)
+        return "resumes/bench.pdf", "https://cdn/bench.pdf"
+
+    async def store(parsed_data, resume_url, supabase, scrape=True, extraction_meta=None, resume_text=None):
+        # Includes queueing the footprint, one more small write
+        await asyncio.sleep(args.db_ms / 1000)
+        return "cand-1"
+
+    async def scrape(candidate_id, links, supabase):
+        await asyncio.sleep(args.scrape_ms / 1000)
+
+    return upload, store, scrape
+
+
+async def sequential(content: bytes, args) -> None:
+    upload, store, scrape = _simulated(args)
+    await asyncio.to_thread(upload, content, "pdf", "application/pdf", None)
+    extraction = await extract_document(content, "pdf")
+    analysis = await parse_extracted_resume(extraction, "bench.pdf", Mock(), force=True)
+    candidate_id = await store(analysis.parsed_data, "https://cdn/bench.pdf", None)
+    await scrape(candidate_id, analysis.parsed_data.links, None)
+
+
+async def pipelined(content: bytes, args) -> None:
+    with SpooledUpload.from_bytes("bench.pdf", "application/pdf", content) as upload:
+        await resume_pipeline.process_resume_upload(upload, Mock(), force=True)
+
+
+async def main(args) -> None:
+    set_ai_provider(SyntheticProvider(median_ms=args.ai_ms, sigma=0.0, seed=1))
+    # The fixture resume is fully resolved by the rules in hybrid mode
+    settings.RESUME_PARSE_MODE = args.parse_mode
+    upload, store, _ = _simulated(args)
+    content = build_pdf(pages=args.pages)
+
+    with patch.object(resume_pipeline, "upload_resume", upload), \
+         patch.object(resume_pipeline, "ensure_resumes_bucket", Mock()), \
+         patch.object(resume_pipeline, "store_candidate_data", store), \
+         patch.object(resume_pipeline, "record_parse", Mock()):
+        print(
+            f"storage={args.storage_ms}ms ai={args.ai_ms}ms ({args.parse_mode}) "
+            f"db={args.db_ms}ms scrape={args.scrape_ms}ms"
+        )
+        print(f"{'flow':<11} {'p50 ms':>8} {'max ms':>8}")
+        for name, flow in (("sequential", sequential), ("pipelined", pipelined)):
+            samples = []
+            for _ in range(args.uploads):
+                started = time.perf_counter()
+                await flow(content, args)
+                samples.append((time.perf_counter() - started) * 1000)
+            print(f"{name:<11} {statistics.median(samples):>8.0f} {max(samples):>8.0f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--uploads", type=int, default=10)
+    parser.add_argument("--pages", type=int, default=3)
+    parser.add_argument("--storage-ms", type=float, default=300)
+    parser.add_argument("--ai-ms", type=float, default=800)
+    parser.add_argument("--db-ms", type=float, default=50)
+    parser.add_argument("--scrape-ms", type=float, default=1500)
+    parser.add_argument("--parse-mode", choices=["llm", "hybrid", "sections", "rules"], default="llm")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,43 @@
+import pytest
+from unittest.mock import MagicMock
+
+from app.core.config import settings
+
+CHAINED_METHODS = (
+    "select", "eq", "neq", "gte", "lt", "in_", "order", "range", "limit", "single",
+    "insert", "update", "upsert", "delete",
+)
+
+
+@pytest.fixture(autouse=True)
+def embedding_index_dir(tmp_path, monkeypatch):
+    """Keep each test's pre-rank index out of the working tree and out of other tests."""
+    directory = tmp_path / "embeddings"
+    monkeypatch.setattr(settings, "EMBEDDING_INDEX_DIR", str(directory))
+    return directory
+
+
+@pytest.fixture
+def supabase_tables():
+    """Build a Supabase client whose tables answer every chained query with fixed rows.
+
+    Call the factory with ``{table name: data}``; it returns the client and a
+    ``table(name)`` accessor so tests can assert on the calls made to each table.
+    """
+    def make(rows):
+        supabase = MagicMock()
+        tables = {}
+
+        def table(name):
+            if name not in tables:
+                mock = MagicMock()
+                for method in CHAINED_METHODS:
+                    getattr(mock, method).return_value = mock
+                mock.execute.return_value.data = rows.get(name, [])
+                tables[name] = mock
+            return tables[name]
+
+        supabase.table.side_effect = table
+        return supabase, table
+
+    return make
@@ -0,0 +1,349 @@
+"""
+Unit tests for the unified AI client.
+
+These tests verify that:
+1. Calls are recorded with tokens, latency and caller tags
+2. Transient errors are retried and counted
+3. Usage summaries report per-feature percentiles and daily totals
+4. Streaming yields chunks in order and frames them as SSE events
+5. Batches run concurrently and report per-item failures
+6. Latency-budgeted callers hedge slow requests and fall back to a lighter model
+7. Synthetic and replay providers serve calls fully offline
+"""
+
+import asyncio
+import pytest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, Mock, patch
+
+from app.core.ai_client import (
+    generate_ai_response,
+    generate_ai_response_stream,
+    generate_json_batch,
+    generate_json_response,
+)
+from app.core.ai_providers import AIProvider, AIRequest, ReplayProvider, SyntheticProvider, set_ai_provider
+from app.core.config import settings
+from app.core.ai_metrics import AICallRecord, AIMetrics, ai_metrics
+from app.core.sse import _sse_events
+
+
+def _gemini_response(text: str, prompt_tokens: int = 10, output_tokens: int = 5):
+    response = Mock()
+    response.text = text
+    response.usage_metadata = Mock(
+        prompt_token_count=prompt_tokens,
+        candidates_token_count=output_tokens,
+    )
+    return response
+
+
+class TestAIAccounting:
+    """Test token and latency accounting in generate_ai_response"""
+
+    def setup_method(self):
+        ai_metrics.reset()
+
+    @pytest.mark.asyncio
+    async def test_records_usage_for_caller(self):
+        """Successful calls record tokens, model and caller tag"""
+        with patch('app.core.ai_providers.genai.GenerativeModel') as mock_model:
+            mock_model.return_value.generate_content.return_value = _gemini_response("ok", 120, 30)
+
+            result = await generate_ai_response("hello", caller="resume_parse")
+
+        assert result == "ok"
+        records = ai_metrics.records(caller="resume_parse")
+        assert len(records) == 1
+        assert records[0].prompt_tokens == 120
+        assert records[0].output_tokens == 30
+        assert records[0].retries == 0
+        assert records[0].success is True
+
+    @pytest.mark.asyncio
+    async def test_retries_transient_errors(self):
+        """Transient errors are retried and the retry count is recorded"""
+        with patch('app.core.ai_providers.genai.GenerativeModel') as mock_model, \
+             patch('app.core.ai_client._retry_delay', return_value=0):
+            mock_model.return_value.generate_content.side_effect = [
+                Exception("503 Service Unavailable"),
+                _gemini_response("recovered"),
+            ]
+
+            result = await generate_ai_response("hello", caller="candidate_match")
+
+        assert result == "recovered"
+        assert ai_metrics.records(caller="candidate_match")[0].retries == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_call_is_recorded(self):
+        """Non-transient errors fail fast and are recorded as errors"""
+        with patch('app.core.ai_providers.genai.GenerativeModel') as mock_model:
+            mock_model.return_value.generate_content.side_effect = ValueError("invalid prompt")
+
+            with pytest.raises(Exception):
+                await generate_ai_response("hello", caller="screening_evaluation")
+
+        records = ai_metrics.records(caller="screening_evaluation")
+        assert len(records) == 1
+        assert records[0].success is False
+        assert mock_model.return_value.generate_content.call_count == 1
+
+
+class TestAIMetricsSummary:
+    """Test aggregation of recorded AI calls"""
+
+    def test_summary_percentiles_and_daily_totals(self):
+        metrics = AIMetrics(max_records=100)
+        for latency in range(1, 101):
+            metrics.record(AICallRecord(
+                caller="candidate_match",
+                model="gemini-2.5-flash",
+                latency_ms=float(latency),
+                prompt_tokens=10,
+                output_tokens=2,
+            ))
+
+        summary = metrics.summary(days=1)
+        feature = summary["features"]["candidate_match"]
+
+        assert feature["calls"] == 100
+        assert feature["latency_ms"]["p95"] == 95.0
+        assert feature["total_tokens"] == 1200
+        assert summary["daily"][0]["total_tokens"] == 1200
+
+    def test_summary_excludes_old_records(self):
+        metrics = AIMetrics(max_records=10)
+        metrics.record(AICallRecord(
+            caller="resume_parse",
+            model="gemini-2.5-flash",
+            latency_ms=10.0,
+            timestamp=datetime.now(timezone.utc) - timedelta(days=30),
+        ))
+
+        assert metrics.summary(days=7)["total_calls"] == 0
+
+
+class _FakeStream:
+    """Async iterable standing in for Gemini's streamed response"""
+
+    def __init__(self, texts):
+        self._chunks = [Mock(text=t, usage_metadata=None) for t in texts]
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for chunk in self._chunks:
+            yield chunk
+
+
+class TestStreaming:
+    """Test streaming generation and SSE framing"""
+
+    def setup_method(self):
+        ai_metrics.reset()
+
+    @pytest.mark.asyncio
+    async def test_stream_yields_chunks_in_order(self):
+        with patch('app.core.ai_providers.genai.GenerativeModel') as mock_model:
+            mock_model.return_value.generate_content_async = AsyncMock(
+                return_value=_FakeStream(["Strong ", "Python ", "background."])
+            )
+
+            chunks = [c async for c in generate_ai_response_stream("hi", caller="match_recommendation")]
+
+        assert chunks == ["Strong ", "Python ", "background."]
+        record = ai_metrics.records(caller="match_recommendation")[0]
+        assert record.success is True
+        assert record.first_token_ms is not None
+
+    @pytest.mark.asyncio
+    async def test_sse_events_frame_tokens_and_done(self):
+        async def chunks():
+            yield "line one\n"
+            yield "line two"
+
+        frames = [f async for f in _sse_events(chunks())]
+
+        assert frames[0] == 'event: token\ndata: {"text": "line one\\n"}\n\n'
+        assert frames[-1].startswith("event: done")
+
+
+class TestJsonBatch:
+    """Test batched JSON generation"""
+
+    @pytest.mark.asyncio
+    async def test_batch_returns_results_in_input_order_with_errors(self):
+        async def fake_json_response(prompt, **kwargs):
+            if prompt == "bad":
+                raise Exception("AI API Error: permission denied")
+            return {"echo": prompt}
+
+        seen = []
+        with patch('app.core.ai_client.generate_json_response', side_effect=fake_json_response):
+            results = await generate_json_batch(
+                ["a", "bad", "c"],
+                concurrency=2,
+                on_result=lambda r: seen.append(r.index),
+                caller="screening_evaluation",
+            )
+
+        assert [r.ok for r in results] == [True, False, True]
+        assert results[0].result == {"echo": "a"}
+        assert "permission denied" in results[1].error
+        assert sorted(seen) == [0, 1, 2]
+
+    @pytest.mark.asyncio
+    async def test_batch_retries_invalid_json(self):
+        calls = {"count": 0}
+
+        async def flaky_json_response(prompt, **kwargs):
+            calls["count"] += 1
+            if calls["count"] == 1:
+                raise ValueError("AI response is not valid JSON")
+            return {"ok": True}
+
+        with patch('app.core.ai_client.generate_json_response', side_effect=flaky_json_response), \
+             patch('app.core.ai_client._retry_delay', return_value=0):
+            results = await generate_json_batch([{"prompt": "x", "temperature": 0}])
+
+        assert results[0].ok
+        assert results[0].attempts == 2
+
+
+class TestLatencyBudget:
+    """Test hedged requests and fallback tiers for latency-critical callers"""
+
+    def setup_method(self):
+        ai_metrics.reset()
+
+    def _seed_latencies(self, caller, latency_ms, count=20):
+        for _ in range(count):
+            ai_metrics.record(AICallRecord(caller=caller, model=settings.AI_MODEL, latency_ms=latency_ms))
+
+    @pytest.mark.asyncio
+    async def test_hedge_fires_after_observed_p90(self):
+        """A slow primary is raced by a duplicate once the p90 has passed"""
+        self._seed_latencies("candidate_match", 20.0)
+        calls = []
+
+        async def fake_once(prompt, model_name, *args):
+            calls.append(model_name)
+            if len(calls) == 1:
+                await asyncio.sleep(5)
+                return "primary"
+            return "hedge"
+
+        with patch.dict(settings.AI_LATENCY_BUDGETS_MS, {"candidate_match": 2000}), \
+             patch('app.core.ai_client._generate_once', side_effect=fake_once):
+            result = await generate_ai_response("hello", caller="candidate_match")
+
+        assert result == "hedge"
+        assert calls == [settings.AI_MODEL, settings.AI_MODEL]
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_light_model_at_budget(self):
+        """Without enough history, the fallback model launches when the budget is spent"""
+        calls = []
+
+        async def fake_once(prompt, model_name, *args):
+            calls.append(model_name)
+            if model_name == settings.AI_FALLBACK_MODEL:
+                return "fallback"
+            await asyncio.sleep(5)
+            return "primary"
+
+        with patch.dict(settings.AI_LATENCY_BUDGETS_MS, {"screening_questions": 30}), \
+             patch('app.core.ai_client._generate_once', side_effect=fake_once):
+            result = await generate_ai_response("hello", caller="screening_questions")
+
+        assert result == "fallback"
+        assert calls == [settings.AI_MODEL, settings.AI_FALLBACK_MODEL]
+
+    @pytest.mark.asyncio
+    async def test_primary_failure_launches_next_tier_immediately(self):
+        calls = []
+
+        async def fake_once(prompt, model_name, *args):
+            calls.append(model_name)
+            if model_name == settings.AI_MODEL:
+                raise Exception("AI API Error: 500 internal")
+            return "fallback"
+
+        with patch.dict(settings.AI_LATENCY_BUDGETS_MS, {"voice_questions": 60000}), \
+             patch('app.core.ai_client._generate_once', side_effect=fake_once):
+            result = await asyncio.wait_for(
+                generate_ai_response("hello", caller="voice_questions"), timeout=1
+            )
+
+        assert result == "fallback"
+
+    @pytest.mark.asyncio
+    async def test_unbudgeted_caller_makes_single_request(self):
+        with patch('app.core.ai_client._generate_once', new=AsyncMock(return_value="ok")) as once:
+            assert await generate_ai_response("hello", caller="resume_parse") == "ok"
+
+        assert once.await_count == 1
+
+
+class TestProviders:
+    """Test offline provider backends"""
+
+    def setup_method(self):
+        ai_metrics.reset()
+
+    def teardown_method(self):
+        set_ai_provider(None)
+
+    @pytest.mark.asyncio
+    async def test_synthetic_provider_serves_canned_json(self):
+        set_ai_provider(SyntheticProvider(median_ms=0, seed=1))
+
+        result = await generate_json_response("match this", caller="candidate_match")
+
+        assert result["fit_score"] == 72
+        assert ai_metrics.records(caller="candidate_match")[0].prompt_tokens > 0
+
+    @pytest.mark.asyncio
+    async def test_synthetic_failures_are_retried(self):
+        set_ai_provider(SyntheticProvider(median_ms=0, failure_rate=1.0, seed=1))
+
+        with patch('app.core.ai_client._retry_delay', return_value=0), \
+             pytest.raises(Exception, match="503"):
+            await generate_ai_response("hello", caller="resume_parse")
+
+        assert ai_metrics.records(caller="resume_parse")[0].retries == settings.AI_MAX_RETRIES
+
+    @pytest.mark.asyncio
+    async def test_synthetic_stream_yields_full_text(self):
+        set_ai_provider(SyntheticProvider(median_ms=0, seed=1))
+
+        chunks = [c async for c in generate_ai_response_stream("hi", caller="screening_summary")]
+
+        assert len(chunks) > 1
+        assert "".join(chunks).startswith("This is a synthetic response")
+
+    def test_provider_must_implement_generate_and_stream(self):
+        class GenerateOnly(AIProvider):
+            async def generate(self, request):
+                return None
+
+        with pytest.raises(TypeError):
+            AIProvider()
+        with pytest.raises(TypeError):
+            GenerateOnly()
+
+    @pytest.mark.asyncio
+    async def test_replay_round_trip(self, tmp_path):
+        path = tmp_path / "replay.json"
+        request = AIRequest(prompt="p", model="m", temperature=0, max_tokens=10, caller="resume_parse")
+
+        recorder = ReplayProvider(path=str(path), mode="record", upstream=SyntheticProvider(median_ms=0))
+        recorded = await recorder.generate(request)
+
+        replayer = ReplayProvider(path=str(path), mode="replay")
+        assert (await replayer.generate(request)).text == recorded.text
+
+        with pytest.raises(LookupError):
+            await replayer.generate(AIRequest(prompt="other", model="m", temperature=0, max_tokens=10))
@@ -0,0 +1,176 @@
+"""
+Unit tests for bulk resume ingestion.
+
+These tests verify that:
+1. ZIP archives are expanded lazily, skipping metadata and unsupported files
+2. Every resume flows through all pipeline stages
+3. A failure in one file is reported without stopping the rest
+4. Previously parsed resumes are reused from the resume cache
+5. Failed files leave no uploads behind; queueing errors don't fail a stored candidate
+"""
+
+import io
+import zipfile
+import pytest
+from unittest.mock import AsyncMock, Mock, patch
+
+from app.services.bulk_ingestion import BulkIngestionError, BulkIngestionManager, zip_entries
+from app.services.document_extraction import DocumentExtraction
+from app.services.resume_cache import content_hash
+
+
+def _zip(files):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as zf:
+        for name, data in files.items():
+            zf.writestr(name, data)
+    buffer.seek(0)
+    return buffer
+
+
+def _parsed(name):
+    parsed = Mock()
+    parsed.name = name
+    parsed.links = {"github": f"https://github.com/{name}"}
+    return parsed
+
+
+class TestBulkIngestion:
+    """Test the staged bulk ingestion pipeline"""
+
+    def test_zip_entries_skip_metadata(self):
+        archive = _zip({
+            "batch/a.pdf": b"%PDF a",
+            "batch/b.docx": b"docx",
+            "__MACOSX/batch/._a.pdf": b"junk",
+            "batch/.DS_Store": b"junk",
+        })
+
+        entries = zip_entries(archive)
+
+        assert [name for name, _ in entries] == ["a.pdf", "b.docx"]
+        assert entries[0][1]() == b"%PDF a"
+
+    def test_invalid_zip_rejected(self):
+        with pytest.raises(BulkIngestionError):
+            zip_entries(io.BytesIO(b"not a zip"))
+
+    @pytest.mark.asyncio
+    async def test_pipeline_processes_all_files_and_reports_failures(self):
+        entries = zip_entries(_zip({
+            f"resume_{i}.pdf": f"resume {i}".encode() for i in range(6)
+        })) + [("notes.txt", lambda: b"")]
+
+        async def fake_parse(text, links, mode=None):
+            if text == "resume 3":
+                raise Exception("AI API Error: quota exceeded")
+            return _parsed(text.replace(" ", "_"))
+
+        async def fake_extract(content, file_ext):
+            return DocumentExtraction(text=content.decode())
+
+        store = AsyncMock(side_effect=lambda parsed, url, supabase, scrape, **stored: f"id-{parsed.name}")
+        enqueue = Mock(return_value="pending")
+        with patch("app.services.bulk_ingestion.ensure_resumes_bucket"), \
+             patch("app.services.bulk_ingestion.find_by_content_hash", return_value=None), \
+             patch("app.services.bulk_ingestion.find_by_text_hash", return_value=None), \
+             patch("app.services.bulk_ingestion.record_parse"), \
+             patch("app.services.bulk_ingestion.upload_resume", return_value=("path", "https://cdn/r.pdf")), \
+             patch("app.services.bulk_ingestion.extract_document", side_effect=fake_extract), \
+             patch("app.services.bulk_ingestion.parse_resume_with_ai", side_effect=fake_parse), \
+             patch("app.services.bulk_ingestion.store_candidate_data", store), \
+             patch("app.services.bulk_ingestion.enqueue_footprint", enqueue):
+            job = BulkIngestionManager().start(entries, supabase=Mock())
+            await job._task
+
+        summary = job.to_dict()
+        assert summary["status"] == "completed"
+        assert (summary["succeeded"], summary["failed"], summary["skipped"]) == (5, 1, 1)
+        failed = [f for f in summary["files"] if f["status"] == "failed"]
+        assert failed[0]["filename"] == "resume_3.pdf"
+        assert "quota exceeded" in failed[0]["error"]
+        assert all(call.kwargs["scrape"] is False for call in store.call_args_list)
+        # Scraping is queued for the enrichment worker, not run inline
+        assert enqueue.call_count == 5
+        assert {call.args[0] for call in enqueue.call_args_list} == {f"id-resume_{i}" for i in (0, 1, 2, 4, 5)}
+
+    def test_rejects_oversized_batches(self):
+        with patch("app.services.bulk_ingestion.settings.BULK_MAX_FILES", 2), \
+             pytest.raises(BulkIngestionError):
+            BulkIngestionManager().start([("a.pdf", bytes)] * 3, supabase=Mock())
+
+    @pytest.mark.asyncio
+    async def test_cached_resumes_skip_upload_and_parse(self):
+        entries = zip_entries(_zip({"seen.pdf": b"same bytes", "new.pdf": b"new bytes"}))
+        cached_row = {
+            "resume_url": "https://cdn/seen.pdf",
+            "storage_path": "resumes/seen.pdf",
+            "text_hash": "abc",
+            "candidate_id": "cand-1",
+            "parsed_data": {"name": "Seen", "email": "seen@example.com", "links": {}},
+        }
+
+        def find_content(digest, supabase):
+            return cached_row if digest == content_hash(b"same bytes") else None
+
+        upload = Mock(return_value=("resumes/new.pdf", "https://cdn/new.pdf"))
+        parse = AsyncMock(return_value=_parsed("new"))
+        with patch("app.services.bulk_ingestion.ensure_resumes_bucket"), \
+             patch("app.services.bulk_ingestion.find_by_content_hash", side_effect=find_content), \
+             patch("app.services.bulk_ingestion.find_by_text_hash", return_value=None), \
+             patch("app.services.bulk_ingestion.record_parse"), \
+             patch("app.services.bulk_ingestion.upload_resume", upload), \
+             patch("app.services.bulk_ingestion.extract_document", AsyncMock(return_value=DocumentExtraction(text="x"))), \
+             patch("app.services.bulk_ingestion.parse_resume_with_ai", parse), \
+             patch("app.services.bulk_ingestion.store_candidate_data", AsyncMock(return_value="cand")), \
+             patch("app.services.bulk_ingestion.enqueue_footprint"):
+            job = BulkIngestionManager().start(entries, supabase=Mock())
+            await job._task
+
+        files = {f.filename: f for f in job.files}
+        assert files["seen.pdf"].cached and files["seen.pdf"].resume_url == "https://cdn/seen.pdf"
+        assert not files["new.pdf"].cached
+        assert upload.call_count == 1
+        assert parse.await_count == 1
+        assert job.to_dict()["succeeded"] == 2
+
+    @pytest.mark.asyncio
+    async def test_failed_files_are_removed_from_storage_and_queue_errors_are_warnings(self):
+        entries = zip_entries(_zip({"broken.pdf": b"broken", "ok.pdf": b"ok", "seen.pdf": b"seen"}))
+        cached_row = {"resume_url": "https://cdn/seen.pdf", "storage_path": "resumes/seen.pdf", "parsed_data": {}}
+
+        def upload(content, file_ext, content_type, supabase):
+            return f"resumes/{content.decode()}.pdf", f"https://cdn/{content.decode()}.pdf"
+
+        async def extract(content, file_ext):
+            if content == b"broken":
+                raise ValueError("Document extraction timed out")
+            return DocumentExtraction(text=content.decode())
+
+        async def store(parsed, url, supabase, scrape, **stored):
+            if url == "https://cdn/seen.pdf":
+                raise RuntimeError("db down")
+            return "cand-ok"
+
+        delete = Mock()
+        with patch("app.services.bulk_ingestion.ensure_resumes_bucket"), \
+             patch("app.services.bulk_ingestion.find_by_content_hash",
+                   side_effect=lambda digest, supabase: cached_row if digest == content_hash(b"seen") else None), \
+             patch("app.services.bulk_ingestion.find_by_text_hash", return_value=None), \
+             patch("app.services.bulk_ingestion.record_parse"), \
+             patch("app.services.bulk_ingestion.upload_resume", side_effect=upload), \
+             patch("app.services.bulk_ingestion.extract_document", side_effect=extract), \
+             patch("app.services.bulk_ingestion.parse_resume_with_ai", AsyncMock(return_value=_parsed("ok"))), \
+             patch("app.services.bulk_ingestion.store_candidate_data", side_effect=store), \
+             patch("app.services.bulk_ingestion.enqueue_footprint", side_effect=RuntimeError("queue down")), \
+             patch("app.services.bulk_ingestion.delete_resume", delete):
+            job = BulkIngestionManager().start(entries, supabase=Mock())
+            await job._task
+
+        files = {f.filename: f for f in job.files}
+        assert files["broken.pdf"].status == "failed"
+        assert files["seen.pdf"].status == "failed"
+        # Only this job's own upload is removed, never a cached file another candidate uses
+        assert [call.args[0] for call in delete.call_args_list] == ["resumes/broken.pdf"]
+        assert files["ok.pdf"].status == "done" and files["ok.pdf"].candidate_id == "cand-ok"
+        assert "queue down" in files["ok.pdf"].warning
@@ -0,0 +1,155 @@
+"""
+Unit tests for resume document extraction.
+
+These tests verify that:
+1. A single PDF pass returns page text and categorized link annotations
+2. The legacy text/link helpers agree with the single-pass result
+3. Extraction runs in the process pool and honours page caps
+4. Large documents stop early and are cut to the char budget by section
+5. DOCX text is streamed in document order, tables and text boxes included
+"""
+
+import asyncio
+import time
+
+import pytest
+from unittest.mock import patch
+
+from app.core.config import settings
+from app.services.ai_parser import extract_hyperlinks_from_pdf, extract_text_from_pdf
+from app.services import document_extraction
+from app.services.document_extraction import (
+    DocumentExtraction,
+    extract_docx,
+    extract_document,
+    extract_pdf,
+    get_extraction_executor,
+    shutdown_extraction_pool,
+)
+from app.services.docx_text import iter_docx_text
+from benchmarks.fixtures import DOCX_SKILLS, DOCX_TEXT_BOX, RESUME_LINES, build_docx, build_pdf
+
+
+def _sleepy_extract(content, file_ext, *limits):
+    """Stand-in for extract_sync in pool workers: content is the seconds to take."""
+    time.sleep(float(content))
+    return DocumentExtraction(text=content.decode())
+
+
+class TestPdfExtraction:
+    """Test single-pass PDF extraction"""
+
+    def test_extracts_text_and_links_together(self):
+        result = extract_pdf(build_pdf(pages=3))
+
+        assert result.page_count == 3
+        assert "Page 1" in result.text and "Page 3" in result.text
+        assert result.links == {
+            "github": "https://github.com/janedoe",
+            "linkedin": "https://www.linkedin.com/in/janedoe",
+            "portfolio": "https://janedoe.vercel.app",
+        }
+
+    @pytest.mark.asyncio
+    async def test_legacy_helpers_match_single_pass(self):
+        content = build_pdf(pages=2)
+        result = extract_pdf(content)
+
+        assert await extract_text_from_pdf(content) == result.text
+        assert extract_hyperlinks_from_pdf(content) == result.links
+
+    def test_invalid_pdf_links_fall_back_to_empty(self):
+        assert extract_hyperlinks_from_pdf(b"not a pdf") == {}
+
+
+class TestDocxExtraction:
+    """Test streaming DOCX extraction"""
+
+    def test_reads_header_tables_and_text_boxes_in_order(self):
+        lines = list(iter_docx_text(build_docx()))
+
+        assert lines[0] == RESUME_LINES[0]  # header comes first
+        assert " | ".join(DOCX_SKILLS) in lines
+        # Word stores text boxes twice; only one copy is read
+        assert lines.count(DOCX_TEXT_BOX) == 1
+        assert lines.index(RESUME_LINES[2]) < lines.index(DOCX_TEXT_BOX)
+
+    def test_collects_hyperlinks(self):
+        result = extract_docx(build_docx())
+        assert result.links["github"] == "https://github.com/janedoe"
+        assert result.links["linkedin"] == "https://www.linkedin.com/in/janedoe"
+
+    def test_char_budget_stops_reading(self):
+        result = extract_docx(build_docx(sections=200), max_chars=1000)
+        assert result.truncated is True
+        assert len(result.text) <= 1000
+        assert result.char_count < 3000  # stopped at the read-ahead limit
+
+    def test_not_a_docx(self):
+        with pytest.raises(Exception):
+            extract_docx(b"not a zip")
+
+
+class TestExtractionPool:
+    """Test off-loop extraction"""
+
+    def teardown_method(self):
+        shutdown_extraction_pool()
+
+    @pytest.mark.asyncio
+    async def test_pool_extraction_matches_inline(self):
+        content = build_pdf(pages=4)
+
+        with patch.object(settings, "EXTRACTION_WORKERS", 1):
+            result = await extract_document(content, "PDF")
+
+        assert result.text == extract_pdf(content).text
+        assert result.links["github"] == "https://github.com/janedoe"
+
+    @pytest.mark.asyncio
+    async def test_page_cap_truncates(self):
+        with patch.object(settings, "EXTRACTION_WORKERS", 0), \
+             patch.object(settings, "EXTRACTION_MAX_PAGES", 2):
+            result = await extract_document(build_pdf(pages=5), "pdf")
+
+        assert result.page_count == 2
+        assert result.truncated is True
+        assert "Page 3" not in result.text
+
+    @pytest.mark.asyncio
+    async def test_unsupported_format(self):
+        with patch.object(settings, "EXTRACTION_WORKERS", 0), pytest.raises(ValueError):
+            await extract_document(b"plain text", "txt")
+
+    @pytest.mark.asyncio
+    async def test_char_budget_stops_reading_early(self):
+        with patch.object(settings, "EXTRACTION_WORKERS", 0), \
+             patch.object(settings, "EXTRACTION_MAX_CHARS", 2000):
+            result = await extract_document(build_pdf(pages=40), "pdf")
+
+        assert result.page_count < 40
+        assert result.total_pages == 40
+        assert len(result.text) <= 2000
+        meta = result.meta()
+        assert meta["truncated"] is True
+        assert meta["chars_read"] > meta["chars_kept"]
+
+    @pytest.mark.asyncio
+    async def test_timeout_leaves_other_documents_running(self):
+        with patch.object(settings, "EXTRACTION_WORKERS", 2), \
+             patch.object(settings, "EXTRACTION_TIMEOUT_SECONDS", 1.0), \
+             patch.object(document_extraction, "extract_sync", _sleepy_extract):
+            await asyncio.to_thread(document_extraction.warm_extraction_pool)
+            pool = get_extraction_executor()
+            workers = list(pool._processes.values())
+            stuck = asyncio.create_task(extract_document(b"30", "pdf"))
+            await asyncio.sleep(0.8)
+            slow = asyncio.create_task(extract_document(b"0.5", "pdf"))
+
+            with pytest.raises(ValueError):
+                await stuck
+            assert (await slow).text == "0.5"  # finished on the retired pool
+
+            assert get_extraction_executor() is not pool
+            await asyncio.sleep(1.2)
+            assert not any(process.is_alive() for process in workers)
@@ -0,0 +1,168 @@
+"""
+Tests for the embedding pre-rank index
+"""
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+from unittest.mock import MagicMock
+
+from app.core.config import settings
+from app.core.supabase_client import get_supabase_client
+from app.main import app
+from app.models.candidate import ParsedData
+from app.services.ai_parser import store_candidate_data
+from app.services.embedding_index import INITIAL_CAPACITY, VectorIndex, embedding_index
+from app.services.embeddings import HashingEmbedder, candidate_text, job_text
+
+JOB = {
+    "id": "job-1",
+    "title": "Backend Engineer",
+    "requirements": "Python, FastAPI, PostgreSQL, Kubernetes",
+    "description": "Build and run our hiring APIs.",
+}
+CANDIDATES = {
+    "backend": {"skills": ["Python", "FastAPI", "Postgres", "k8s"], "experience": [{"title": "Backend Engineer"}]},
+    "frontend": {"skills": ["React", "TypeScript", "CSS"], "experience": [{"title": "Frontend Developer"}]},
+    "designer": {"skills": ["Figma", "Illustrator"], "experience": [{"title": "Product Designer"}]},
+}
+
+
+def _random_unit(n, dim, seed=0):
+    vectors = np.random.default_rng(seed).standard_normal((n, dim)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+class TestHashingEmbedder:
+    @pytest.mark.asyncio
+    async def test_vectors_are_deterministic_and_normalized(self):
+        embedder = HashingEmbedder(256)
+        first, second = await embedder.embed([job_text(JOB), job_text(JOB)])
+        assert np.array_equal(first, second)
+        assert np.linalg.norm(first) == pytest.approx(1.0, abs=1e-5)
+        assert not (await embedder.embed([""])).any()
+
+    @pytest.mark.asyncio
+    async def test_ranks_on_shared_skills_and_aliases(self):
+        embedder = HashingEmbedder(768)
+        job = (await embedder.embed([job_text(JOB)]))[0]
+        names = list(CANDIDATES)
+        vectors = await embedder.embed([candidate_text(CANDIDATES[n]) for n in names])
+        scores = dict(zip(names, vectors @ job))
+        assert scores["backend"] > 2 * max(scores["frontend"], scores["designer"])
+        # "k8s" and "Postgres" meet the job's "Kubernetes" and "PostgreSQL"
+        assert "skill:kubernetes" in HashingEmbedder.features(candidate_text(CANDIDATES["backend"]))
+
+
+class TestVectorIndex:
+    def test_search_matches_brute_force(self, tmp_path):
+        index = VectorIndex(tmp_path / "vectors", 32, "test:32")
+        vectors = _random_unit(INITIAL_CAPACITY * 3, 32)  # grows the file twice
+        ids = [f"c{i}" for i in range(len(vectors))]
+        index.upsert(ids, vectors)
+
+        query = vectors[7]
+        expected = np.argsort(-(vectors @ query), kind="stable")[:10]
+        assert [cid for cid, _ in index.search(query, 10)] == [ids[i] for i in expected]
+        assert index.search(query, 1)[0] == ("c7", pytest.approx(1.0, abs=1e-5))
+
+        pool = ["c3", "c40", "c500", "missing"]
+        assert sorted(cid for cid, _ in index.search(query, 10, ids=pool)) == ["c3", "c40", "c500"]
+
+    def test_update_remove_and_reuse_rows(self, tmp_path):
+        index = VectorIndex(tmp_path / "vectors", 8, "test:8")
+        a, b, c = _random_unit(3, 8)
+        index.upsert(["x", "y"], np.stack([a, b]))
+        index.upsert(["x"], c)  # in place
+        assert np.allclose(index.vector("x"), c)
+        assert len(index) == 2
+
+        assert index.remove(["x", "unknown"]) == 1
+        assert [cid for cid, _ in index.search(c, 5)] == ["y"]
+        index.upsert(["z"], a)
+        assert index._rows["z"] == 0  # took x's freed row
+
+    def test_persists_and_sees_other_writers(self, tmp_path):
+        writer = VectorIndex(tmp_path / "vectors", 8, "test:8")
+        reader = VectorIndex(tmp_path / "vectors", 8, "test:8")
+        vectors = _random_unit(2, 8)
+        writer.upsert(["a", "b"], vectors)
+        assert reader.search(vectors[1], 1)[0][0] == "b"
+
+        reopened = VectorIndex(tmp_path / "vectors", 8, "test:8")
+        assert sorted(reopened.ids()) == ["a", "b"]
+        # Another embedder's vectors aren't comparable: start empty
+        assert len(VectorIndex(tmp_path / "vectors", 8, "other:8")) == 0
+
+
+def _rows(candidates, applicant_ids):
+    return {
+        "jobs": [JOB],
+        "applications": [{"candidate_id": cid} for cid in applicant_ids],
+        "candidates": [
+            {"id": cid, "name": cid.title(), "email": f"{cid}@example.com", "parsed_data": data}
+            for cid, data in candidates.items()
+        ],
+    }
+
+
+class TestPrerankEndpoint:
+    def _get(self, supabase, **params):
+        app.dependency_overrides[get_supabase_client] = lambda: supabase
+        try:
+            return TestClient(app).get(f"/api/jobs/{JOB['id']}/prerank", params=params)
+        finally:
+            app.dependency_overrides.clear()
+
+    def test_ranks_applicants_indexing_them_on_demand(self, supabase_tables):
+        supabase, _ = supabase_tables(_rows(CANDIDATES, ["designer", "backend", "frontend"]))
+        response = self._get(supabase, limit=2)
+
+        assert response.status_code == 200
+        body = response.json()
+        assert body["pool_size"] == 3
+        assert len(body["candidates"]) == 2
+        assert body["candidates"][0]["candidate_id"] == "backend"
+        assert body["candidates"][0]["name"] == "Backend"
+        assert len(embedding_index.candidates) == 3
+        assert JOB["id"] in embedding_index.jobs
+
+    def test_unknown_job(self):
+        supabase = MagicMock()
+        supabase.table.return_value.select.return_value.eq.return_value.execute.return_value.data = []
+        assert self._get(supabase).status_code == 404
+
+    def test_disabled_embeddings_are_a_bad_request(self, supabase_tables, monkeypatch):
+        monkeypatch.setattr(settings, "EMBEDDING_ENABLED", False)
+        supabase, _ = supabase_tables(_rows(CANDIDATES, ["backend"]))
+        assert self._get(supabase).status_code == 400
+        assert self._get(supabase, strategy="skills").status_code == 200
+
+
+class TestIncrementalIndexing:
+    @pytest.mark.asyncio
+    async def test_stored_candidate_is_indexed(self):
+        supabase = MagicMock()
+        supabase.table.return_value.select.return_value.eq.return_value.execute.return_value.data = []
+        supabase.table.return_value.insert.return_value.execute.return_value.data = [{"id": "new-candidate"}]
+        parsed = ParsedData(name="Jane Doe", email="jane@example.com", skills=["Python", "FastAPI"])
+
+        candidate_id = await store_candidate_data(parsed, "resumes/jane.pdf", supabase, scrape=False)
+
+        assert candidate_id in embedding_index.candidates
+        job_vector = (await HashingEmbedder(768).embed([job_text(JOB)]))[0]
+        assert embedding_index.candidates.search(job_vector, 1)[0][0] == "new-candidate"
+
+    def test_job_update_reindexes(self):
+        supabase = MagicMock()
+        updated = {**JOB, "requirements": "Figma", "created_at": "2026-01-01T00:00:00", "updated_at": "2026-01-02T00:00:00"}
+        supabase.table.return_value.update.return_value.eq.return_value.execute.return_value.data = [updated]
+        app.dependency_overrides[get_supabase_client] = lambda: supabase
+        try:
+            before = embedding_index.jobs.vector(JOB["id"])
+            response = TestClient(app).put(f"/api/jobs/{JOB['id']}", json={"requirements": "Figma"})
+        finally:
+            app.dependency_overrides.clear()
+        assert response.status_code == 200
+        assert before is None
+        assert embedding_index.jobs.vector(JOB["id"]) is not None
@@ -0,0 +1,118 @@
+"""
+Tests for deferred digital footprint enrichment
+"""
+
+import asyncio
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.core.config import settings
+from app.services.footprint_enrichment import (
+    FootprintEnrichmentWorker,
+    enqueue_footprint,
+    enrich_footprint,
+    fail_abandoned_enrichments,
+)
+
+LINKS = {"github": "https://github.com/jane"}
+
+
+def _supabase(claimed=None):
+    supabase = MagicMock()
+    table = supabase.table.return_value
+    # Chained calls (upsert/update().eq()) all return the same mock
+    table.upsert.return_value = table
+    table.update.return_value = table
+    for method in ("eq", "gte", "lt"):
+        getattr(table, method).return_value = table
+    supabase.rpc.return_value.execute.return_value.data = claimed or []
+    return supabase, table
+
+
+def _row(attempts=1):
+    return {"candidate_id": "cand-1", "links": LINKS, "enrichment_attempts": attempts}
+
+
+class TestEnqueue:
+    def test_queues_pending_row_and_wakes_worker(self):
+        supabase, table = _supabase()
+        with patch("app.services.footprint_enrichment.footprint_worker") as worker:
+            assert enqueue_footprint("cand-1", LINKS, supabase) == "pending"
+        row = table.upsert.call_args.args[0]
+        assert row["enrichment_status"] == "pending"
+        assert row["enrichment_attempts"] == 0
+        assert row["links"] == LINKS
+        assert table.upsert.call_args.kwargs["on_conflict"] == "candidate_id"
+        worker.notify.assert_called_once()
+
+    def test_candidates_without_links_are_skipped(self):
+        supabase, table = _supabase()
+        with patch("app.services.footprint_enrichment.footprint_worker") as worker:
+            assert enqueue_footprint("cand-1", {"github": None}, supabase) == "skipped"
+        assert table.upsert.call_args.args[0]["enrichment_status"] == "skipped"
+        worker.notify.assert_not_called()
+
+
+class TestEnrich:
+    @pytest.mark.asyncio
+    async def test_success_marks_completed(self):
+        supabase, table = _supabase()
+        scraped = {"github": {"username": "jane"}}
+        with patch("app.services.footprint_enrichment.scrape_links", AsyncMock(return_value=scraped)):
+            assert await enrich_footprint(_row(), supabase) is True
+        update = table.update.call_args.args[0]
+        assert update["enrichment_status"] == "completed"
+        assert update["github_data"] == {"username": "jane"}
+        assert update["last_scraped_at"]
+
+    @pytest.mark.asyncio
+    async def test_failure_is_retried_then_marked_failed(self):
+        scrape = AsyncMock(side_effect=RuntimeError("rate limited"))
+        with patch("app.services.footprint_enrichment.scrape_links", scrape):
+            supabase, table = _supabase()
+            assert await enrich_footprint(_row(attempts=1), supabase) is False
+            assert table.update.call_args.args[0]["enrichment_status"] == "pending"
+
+            supabase, table = _supabase()
+            await enrich_footprint(_row(attempts=settings.FOOTPRINT_MAX_ATTEMPTS), supabase)
+            update = table.update.call_args.args[0]
+            assert update["enrichment_status"] == "failed"
+            assert update["enrichment_error"] == "rate limited"
+
+
+class TestWorker:
+    def test_abandoned_last_attempt_is_marked_failed(self):
+        supabase, table = _supabase()
+        table.execute.return_value.data = [_row(attempts=settings.FOOTPRINT_MAX_ATTEMPTS)]
+
+        assert fail_abandoned_enrichments(supabase) == 1
+        update = table.update.call_args.args[0]
+        assert update["enrichment_status"] == "failed" and update["enrichment_error"]
+        table.eq.assert_called_once_with("enrichment_status", "processing")
+        table.gte.assert_called_once_with("enrichment_attempts", settings.FOOTPRINT_MAX_ATTEMPTS)
+        assert table.lt.call_args.args[0] == "enrichment_started_at"
+
+    @pytest.mark.asyncio
+    async def test_run_once_enriches_claimed_rows(self):
+        supabase, _ = _supabase(claimed=[_row(), {**_row(), "candidate_id": "cand-2"}])
+        enrich = AsyncMock(return_value=True)
+        with patch("app.services.footprint_enrichment.enrich_footprint", enrich):
+            assert await FootprintEnrichmentWorker().run_once(supabase) == 2
+        assert supabase.table.return_value.gte.called  # abandoned rows are failed before claiming
+        assert supabase.rpc.call_args.args[0] == "claim_footprint_enrichments"
+        assert {call.args[0]["candidate_id"] for call in enrich.call_args_list} == {"cand-1", "cand-2"}
+
+    @pytest.mark.asyncio
+    async def test_notify_wakes_the_worker(self, monkeypatch):
+        monkeypatch.setattr(settings, "FOOTPRINT_POLL_INTERVAL_SECONDS", 60.0)
+        worker = FootprintEnrichmentWorker()
+        run_once = AsyncMock(return_value=0)
+        with patch.object(worker, "run_once", run_once):
+            worker.start(MagicMock())
+            await asyncio.sleep(0.05)
+            worker.notify()
+            await asyncio.sleep(0.05)
+            await worker.stop()
+        assert run_once.await_count == 2
+        assert not worker.running
@@ -0,0 +1,171 @@
+"""
+Tests for two-stage job ranking
+"""
+
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+from unittest.mock import MagicMock, patch
+
+from app.core.config import settings
+from app.core.supabase_client import get_supabase_client
+from app.main import app
+from app.services.ai_matching import match_fingerprint
+from app.services.job_ranking import rank_job, skill_overlap_scores
+
+JOB = {
+    "id": "job-1",
+    "title": "Backend Engineer",
+    "requirements": "Python, FastAPI, PostgreSQL, Docker",
+    "description": "Build and run our hiring APIs.",
+}
+PROFILES = {
+    "backend": {"skills": ["Python", "FastAPI", "Postgres", "Docker"]},
+    "fullstack": {"skills": ["Python", "React", "TypeScript"]},
+    "designer": {"skills": ["Figma", "Illustrator"]},
+}
+FIT = {"FastAPI": 91, "React": 64, "Figma": 12}
+
+
+def _rows(applications):
+    return {
+        "jobs": [JOB],
+        "applications": applications,
+        "candidates": [{"id": cid, "parsed_data": data} for cid, data in PROFILES.items()],
+    }
+
+
+async def _match(prompt, **kwargs):
+    for skill, score in FIT.items():
+        if skill in prompt:
+            return {"fit_score": score, "strengths": [skill], "weaknesses": [], "recommendations": []}
+    raise AssertionError("unexpected candidate")
+
+
+def test_skill_overlap_scores():
+    scores = skill_overlap_scores(["Python", "Docker"], [["Python", "Docker", "Go"], ["Go"], ["Docker"], []])
+    assert scores.tolist() == [1.0, 0.0, 0.5, 0.0]
+    assert skill_overlap_scores([], [["Python"]]).tolist() == [0.0]
+
+
+class TestRankJob:
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("strategy", ["embedding", "skills", "lexical"])
+    async def test_only_the_shortlist_reaches_the_llm(self, supabase_tables, strategy, monkeypatch):
+        monkeypatch.setattr(settings, "RANK_PERSIST_BATCH_SIZE", 1)
+        applications = [
+            {"candidate_id": "designer", "highlights": None},
+            {"candidate_id": "backend", "highlights": {"cover_letter": "Hello"}},
+            {"candidate_id": "fullstack", "highlights": None},
+        ]
+        supabase, table = supabase_tables(_rows(applications))
+
+        with patch("app.core.ai_client.generate_json_response", side_effect=_match) as generate:
+            events = [event async for event in rank_job(JOB, supabase, strategy=strategy, shortlist=2)]
+
+        names = [name for name, _ in events]
+        assert names == ["shortlist", "result", "result", "done"]
+        shortlist = events[0][1]
+        assert shortlist["pool_size"] == 3
+        assert [c["candidate_id"] for c in shortlist["candidates"]] == ["backend", "fullstack"]
+        assert generate.call_count == 2
+
+        done = events[-1][1]
+        assert [r["candidate_id"] for r in done["ranking"]] == ["backend", "fullstack"]
+        assert done["ranking"][0]["fit_score"] == 91
+        assert done["persisted"] == 2 and done["failed"] == 0
+
+        upserts = table("applications").upsert.call_args_list
+        assert len(upserts) == 2  # one batch per score at batch size 1
+        saved = {row["candidate_id"]: row for call in upserts for row in call.args[0]}
+        assert saved["backend"]["highlights"]["cover_letter"] == "Hello"
+        assert saved["backend"]["highlights"]["strengths"] == ["FastAPI"]
+        assert upserts[0].kwargs == {"on_conflict": "candidate_id,job_id"}
+
+    @pytest.mark.asyncio
+    async def test_failed_match_is_reported_and_not_saved(self, supabase_tables, monkeypatch):
+        monkeypatch.setattr(settings, "AI_MAX_RETRIES", 0)
+        supabase, table = supabase_tables(_rows([{"candidate_id": cid} for cid in PROFILES]))
+
+        async def match(prompt, **kwargs):
+            if "React" in prompt:
+                return {"summary": "no score"}
+            return await _match(prompt)
+
+        with patch("app.core.ai_client.generate_json_response", side_effect=match):
+            events = [event async for event in rank_job(JOB, supabase, strategy="skills", shortlist=3)]
+
+        errors = [payload for name, payload in events if name == "result" and "error" in payload]
+        assert [e["candidate_id"] for e in errors] == ["fullstack"]
+        done = events[-1][1]
+        assert done["failed"] == 1 and done["persisted"] == 2
+        saved = [row["candidate_id"] for call in table("applications").upsert.call_args_list for row in call.args[0]]
+        assert sorted(saved) == ["backend", "designer"]
+
+    @pytest.mark.asyncio
+    async def test_unchanged_candidates_reuse_stored_scores(self, supabase_tables):
+        posting = {k: JOB[k] for k in ("title", "description", "requirements")}
+        stored = {
+            "candidate_id": "backend",
+            "fit_score": 77,
+            "highlights": {"strengths": ["Stored"]},
+            "match_fingerprint": match_fingerprint({"id": "backend", "parsed_data": PROFILES["backend"]}, posting),
+        }
+        supabase, table = supabase_tables(_rows([stored, {"candidate_id": "fullstack"}]))
+
+        with patch("app.core.ai_client.generate_json_response", side_effect=_match) as generate:
+            events = [event async for event in rank_job(JOB, supabase, strategy="skills", shortlist=2)]
+
+        assert generate.call_count == 1  # only fullstack
+        results = {payload["candidate_id"]: payload for name, payload in events if name == "result"}
+        assert results["backend"]["cached"] is True and results["backend"]["fit_score"] == 77
+        assert events[-1][1]["cached"] == 1
+        saved = [row["candidate_id"] for call in table("applications").upsert.call_args_list for row in call.args[0]]
+        assert saved == ["fullstack"]
+
+    @pytest.mark.asyncio
+    async def test_whole_pool_saves_only_applicants(self, supabase_tables):
+        supabase, table = supabase_tables(_rows([{"candidate_id": "fullstack"}]))
+
+        with patch("app.core.ai_client.generate_json_response", side_effect=_match):
+            events = [
+                event async for event in rank_job(JOB, supabase, strategy="skills", shortlist=3, applicants_only=False)
+            ]
+
+        done = events[-1][1]
+        assert [r["candidate_id"] for r in done["ranking"]] == ["backend", "fullstack", "designer"]
+        assert done["persisted"] == 1
+        saved = [row["candidate_id"] for call in table("applications").upsert.call_args_list for row in call.args[0]]
+        assert saved == ["fullstack"]
+
+
+class TestRankEndpoint:
+    def _post(self, supabase, body=None):
+        app.dependency_overrides[get_supabase_client] = lambda: supabase
+        try:
+            return TestClient(app).post(f"/api/jobs/{JOB['id']}/rank", json=body)
+        finally:
+            app.dependency_overrides.clear()
+
+    def test_streams_ranking_events(self, supabase_tables):
+        supabase, _ = supabase_tables(_rows([{"candidate_id": cid} for cid in PROFILES]))
+        with patch("app.core.ai_client.generate_json_response", side_effect=_match):
+            response = self._post(supabase, {"strategy": "skills", "shortlist": 3})
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        frames = [frame for frame in response.text.split("\n\n") if frame]
+        events = [frame.split("\n")[0].removeprefix("event: ") for frame in frames]
+        assert events == ["shortlist", "result", "result", "result", "done"]
+        done = json.loads(frames[-1].split("data: ", 1)[1])
+        assert [r["candidate_id"] for r in done["ranking"]] == ["backend", "fullstack", "designer"]
+
+    def test_invalid_strategy(self, supabase_tables):
+        supabase, _ = supabase_tables(_rows([]))
+        assert self._post(supabase, {"strategy": "random"}).status_code == 400
+
+    def test_unknown_job(self):
+        supabase = MagicMock()
+        supabase.table.return_value.select.return_value.eq.return_value.execute.return_value.data = []
+        assert self._post(supabase).status_code == 404
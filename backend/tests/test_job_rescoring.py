@@ -0,0 +1,166 @@
+"""
+Tests for background re-scoring after job edits
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+from unittest.mock import MagicMock, patch
+
+from app.core.config import settings
+from app.core.supabase_client import get_supabase_client
+from app.main import app
+from app.services.ai_matching import match_fingerprint
+from app.services.job_rescoring import (
+    JobRescoreWorker,
+    fail_abandoned_rescores,
+    needs_rescore,
+    rescore_job,
+    rescore_order,
+)
+
+JOB = {
+    "id": "job-1",
+    "title": "Backend Engineer",
+    "requirements": "Python, PostgreSQL, Docker",
+    "description": "Build and run our hiring APIs.",
+}
+POSTING = {k: JOB[k] for k in ("title", "description", "requirements")}
+PROFILES = {
+    "backend": {"skills": ["Python", "FastAPI"]},
+    "fullstack": {"skills": ["Python", "React"]},
+    "designer": {"skills": ["Figma"]},
+}
+FIT = {"FastAPI": 93, "React": 58, "Figma": 9}
+TIMESTAMPS = {"created_at": "2026-01-01T00:00:00", "updated_at": "2026-01-02T00:00:00"}
+CLAIMED = {"job_id": "job-1", "requested_at": "2026-10-19T10:00:00+00:00", "attempts": 1}
+
+
+def _rows(applications, requeued=False):
+    return {
+        "jobs": [JOB],
+        "applications": applications,
+        "candidates": [{"id": cid, "parsed_data": data} for cid, data in PROFILES.items()],
+        "job_rescores": [] if requeued else [CLAIMED],
+    }
+
+
+async def _match(prompt, **kwargs):
+    for skill, score in FIT.items():
+        if skill in prompt:
+            return {"fit_score": score, "strengths": [skill], "weaknesses": [], "recommendations": []}
+    raise AssertionError("unexpected candidate")
+
+
+def _matched(prompt):
+    return next(skill for skill in FIT if skill in prompt)
+
+
+def test_needs_rescore_only_for_prompt_fields():
+    assert needs_rescore(JOB, {**JOB, "requirements": "Go"})
+    assert not needs_rescore(JOB, {**JOB, "title": "Senior Backend Engineer", "status": "paused"})
+    assert not needs_rescore({"description": None}, {"description": ""})
+
+
+def test_rescore_order_highest_fit_first():
+    rows = [{"candidate_id": "a", "fit_score": None}, {"candidate_id": "b", "fit_score": 40}, {"candidate_id": "c", "fit_score": "85.5"}]
+    assert [row["candidate_id"] for row in rescore_order(rows)] == ["c", "b", "a"]
+
+
+class TestRescoreJob:
+    @pytest.mark.asyncio
+    async def test_rescores_by_priority_and_skips_current(self, supabase_tables, monkeypatch):
+        monkeypatch.setattr(settings, "RESCORE_CONCURRENCY", 1)
+        monkeypatch.setattr(settings, "RESCORE_CHUNK_SIZE", 2)
+        current = match_fingerprint({"id": "fullstack", "parsed_data": PROFILES["fullstack"]}, POSTING)
+        supabase, table = supabase_tables(_rows([
+            {"candidate_id": "designer", "fit_score": 15, "match_fingerprint": "stale"},
+            {"candidate_id": "backend", "fit_score": 70, "highlights": {"cover_letter": "Hi"}, "match_fingerprint": "stale"},
+            {"candidate_id": "fullstack", "fit_score": 60, "match_fingerprint": current},
+        ]))
+
+        with patch("app.core.ai_client.generate_json_response", side_effect=_match) as generate:
+            assert await rescore_job(CLAIMED, supabase) is True
+
+        assert [_matched(call.kwargs["prompt"]) for call in generate.call_args_list] == ["FastAPI", "Figma"]
+        saved = {row["candidate_id"]: row for call in table("applications").upsert.call_args_list for row in call.args[0]}
+        assert set(saved) == {"backend", "designer"}
+        assert saved["backend"]["fit_score"] == 93
+        assert saved["backend"]["highlights"]["cover_letter"] == "Hi"
+        assert saved["backend"]["match_fingerprint"] == match_fingerprint(
+            {"id": "backend", "parsed_data": PROFILES["backend"]}, POSTING
+        )
+
+        progress = [call.args[0] for call in table("job_rescores").update.call_args_list]
+        assert len(progress) == 4  # start, two chunks, completion
+        assert progress[-1]["status"] == "completed"
+        assert {k: progress[-1][k] for k in ("total", "rescored", "unchanged", "failed")} == {
+            "total": 3, "rescored": 2, "unchanged": 1, "failed": 0,
+        }
+
+    @pytest.mark.asyncio
+    async def test_requeued_job_stops_the_run(self, supabase_tables):
+        supabase, table = supabase_tables(_rows([{"candidate_id": "backend", "fit_score": 70}], requeued=True))
+        with patch("app.core.ai_client.generate_json_response", side_effect=_match) as generate:
+            assert await rescore_job(CLAIMED, supabase) is False
+        generate.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_worker_requeues_a_failed_run(self, supabase_tables):
+        supabase, table = supabase_tables(_rows([]))
+        supabase.rpc.return_value.execute.return_value.data = [CLAIMED]
+        with patch("app.services.job_rescoring.rescore_job", side_effect=RuntimeError("boom")):
+            assert await JobRescoreWorker().run_once(supabase) == 1
+        assert supabase.rpc.call_args.args[0] == "claim_job_rescores"
+        assert table("job_rescores").update.call_args.args[0] == {"status": "pending", "error": "boom"}
+
+    def test_run_abandoned_on_its_last_attempt_fails(self, supabase_tables):
+        supabase, table = supabase_tables(_rows([]))
+        rescores = table("job_rescores")
+        rescores.execute.return_value.data = [{**CLAIMED, "attempts": settings.RESCORE_MAX_ATTEMPTS}]
+
+        assert fail_abandoned_rescores(supabase) == 1
+        update = rescores.update.call_args.args[0]
+        assert update["status"] == "failed" and update["error"] and update["finished_at"]
+        rescores.eq.assert_called_once_with("status", "processing")
+        rescores.gte.assert_called_once_with("attempts", settings.RESCORE_MAX_ATTEMPTS)
+        assert rescores.lt.call_args.args[0] == "heartbeat_at"
+
+
+class TestJobEndpoints:
+    def _client(self, supabase):
+        app.dependency_overrides[get_supabase_client] = lambda: supabase
+        return TestClient(app)
+
+    def teardown_method(self):
+        app.dependency_overrides.clear()
+
+    def _put(self, supabase_tables, changes, responses):
+        supabase, table = supabase_tables(_rows([]))
+        table("jobs").execute.side_effect = [MagicMock(data=[row]) for row in responses]
+        with patch("app.api.jobs.enqueue_rescore") as enqueue:
+            response = self._client(supabase).put(f"/api/jobs/{JOB['id']}", json=changes)
+        assert response.status_code == 200
+        return enqueue
+
+    def test_requirements_change_queues_rescore(self, supabase_tables):
+        updated = {**JOB, "requirements": "Go, gRPC", **TIMESTAMPS}
+        enqueue = self._put(supabase_tables, {"requirements": "Go, gRPC"}, [JOB, updated])  # current row, then the update
+        enqueue.assert_called_once()
+        assert enqueue.call_args.args[0] == JOB["id"]
+
+    def test_title_change_keeps_scores(self, supabase_tables):
+        enqueue = self._put(supabase_tables, {"title": "Staff Engineer"}, [{**JOB, "title": "Staff Engineer", **TIMESTAMPS}])
+        enqueue.assert_not_called()
+
+    def test_rescore_status(self, supabase_tables):
+        supabase, table = supabase_tables(_rows([]))
+        progress = {"job_id": "job-1", "status": "processing", "total": 120, "rescored": 40, "unchanged": 2, "failed": 1}
+        table("job_rescores").execute.return_value.data = [progress]
+        response = self._client(supabase).get("/api/jobs/job-1/rescore")
+        assert response.status_code == 200
+        assert response.json() == progress
+
+    def test_rescore_status_not_queued(self, supabase_tables):
+        supabase, table = supabase_tables(_rows([]))
+        table("job_rescores").execute.return_value.data = []
+        assert self._client(supabase).get("/api/jobs/job-1/rescore").status_code == 404
@@ -0,0 +1,159 @@
+"""
+Tests for the lexical (BM25) fit scorer
+"""
+
+import math
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.core.supabase_client import get_supabase_client
+from app.main import app
+from app.services import lexical_scoring
+from app.services.ai_matching import match_candidate_to_job
+from app.services.embeddings import candidate_text
+from app.services.lexical_scoring import (
+    BM25_B,
+    BM25_K1,
+    MIN_IDF_POOL,
+    _terms,
+    job_vocabulary,
+    lexical_match,
+    score_candidates,
+)
+
+JOB = {
+    "id": "job-1",
+    "title": "Backend Engineer",
+    "requirements": "Python, FastAPI, PostgreSQL, Kubernetes",
+    "description": "Build and run our hiring APIs.",
+}
+BACKEND = {
+    "skills": ["Python", "FastAPI", "Postgres", "k8s"],
+    "experience": [{"title": "Backend Engineer", "company": "Acme", "description": "Built hiring APIs in Python"}],
+}
+FULLSTACK = {"skills": ["Python", "React", "TypeScript"]}
+DESIGNER = {"skills": ["Figma", "Illustrator"], "experience": [{"title": "Product Designer"}]}
+
+
+def _reference_scores(job, profiles):
+    """BM25 one candidate at a time, straight from the formula."""
+    vocabulary = job_vocabulary(job)
+    docs = [_terms(candidate_text(p or {})) for p in profiles]
+    n = len(docs)
+    avgdl = sum(length for _, length in docs) / n
+    idf = {}
+    for term in vocabulary.terms:
+        df = sum(1 for counts, _ in docs if term in counts)
+        idf[term] = math.log(1 + (n - df + 0.5) / (df + 0.5))
+    best = sum(vocabulary.weights[col] * idf[term] for term, col in vocabulary.terms.items())
+    scores = []
+    for counts, length in docs:
+        score = 0.0
+        for term, col in vocabulary.terms.items():
+            tf = counts.get(term, 0)
+            if tf:
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * length / avgdl)
+                score += vocabulary.weights[col] * idf[term] * tf * (BM25_K1 + 1) / (tf + norm)
+        scores.append(min(100.0, 100 * score / best))
+    return scores
+
+
+class TestScorer:
+    def test_vectorized_pass_matches_reference(self):
+        rng = np.random.default_rng(7)
+        words = ["Python", "FastAPI", "PostgreSQL", "Docker", "Go", "React", "hiring", "APIs", "Figma", "Kubernetes"]
+        profiles = [
+            {"skills": list(rng.choice(words, size=rng.integers(0, 6), replace=False)),
+             "experience": [{"description": " ".join(rng.choice(words, size=rng.integers(0, 12)))}]}
+            for _ in range(MIN_IDF_POOL + 30)
+        ]
+        profiles.append(None)
+        np.testing.assert_allclose(score_candidates(JOB, profiles), _reference_scores(JOB, profiles), rtol=1e-4, atol=1e-4)
+
+    def test_ranks_on_shared_terms_and_aliases(self):
+        backend, fullstack, designer = score_candidates(JOB, [BACKEND, FULLSTACK, DESIGNER])
+        assert backend > fullstack > designer == 0
+        assert 0 <= backend <= 100
+
+    def test_scores_are_deterministic(self):
+        first = score_candidates(JOB, [BACKEND, FULLSTACK] * 15)
+        lexical_scoring._vocabularies.clear()
+        assert score_candidates(JOB, [BACKEND, FULLSTACK] * 15).tolist() == first.tolist()
+
+    def test_job_vocabulary_is_cached_per_posting(self):
+        assert job_vocabulary(JOB) is job_vocabulary({**JOB, "id": "job-2", "status": "paused"})
+        edited = job_vocabulary({**JOB, "requirements": "Docker, gRPC"})
+        assert edited is not job_vocabulary(JOB)
+        assert "skill:docker" in edited.terms
+        assert "title" not in edited.terms  # rendered labels are not terms
+
+    def test_job_vocabulary_cache_is_thread_safe(self, monkeypatch):
+        monkeypatch.setattr(lexical_scoring, "JOB_CACHE_SIZE", 4)
+        jobs = [{**JOB, "requirements": f"Python, Docker, skill-{i % 12}"} for i in range(600)]
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            vocabularies = list(pool.map(job_vocabulary, jobs))
+
+        assert len(lexical_scoring._vocabularies) <= 4
+        assert all("skill:docker" in vocabulary.terms for vocabulary in vocabularies)
+
+    def test_lexical_match_has_the_llm_shape(self):
+        analysis = lexical_match({"parsed_data": BACKEND}, JOB)
+        assert set(analysis) == {"fit_score", "strengths", "weaknesses", "recommendations"}
+        assert analysis["strengths"] == ["Lists Python", "Lists FastAPI", "Lists PostgreSQL", "Lists Kubernetes"]
+        assert lexical_match({"parsed_data": FULLSTACK}, JOB)["weaknesses"][0] == "No mention of FastAPI"
+
+
+class TestLexicalStrategy:
+    @pytest.mark.asyncio
+    async def test_match_makes_no_ai_call_and_writes_nothing(self):
+        supabase = MagicMock()
+        table = supabase.table.return_value
+        for method in ("select", "eq", "single", "limit"):
+            getattr(table, method).return_value = table
+        table.execute.side_effect = [MagicMock(data={"parsed_data": BACKEND}), MagicMock(data=JOB)]
+
+        with patch("app.services.ai_matching.get_supabase_client", return_value=supabase), \
+                patch("app.services.ai_matching.generate_json_response", AsyncMock()) as generate:
+            result = await match_candidate_to_job("cand-1", "job-1", strategy="lexical")
+
+        generate.assert_not_awaited()
+        table.upsert.assert_not_called()
+        assert result["strategy"] == "lexical" and result["cached"] is False
+        assert result["fit_score"] == lexical_match({"parsed_data": BACKEND}, JOB)["fit_score"]
+
+    def test_match_endpoint_rejects_unknown_strategy(self):
+        app.dependency_overrides[get_supabase_client] = lambda: MagicMock()
+        try:
+            response = TestClient(app).post(
+                "/api/applications/match", json={"candidate_id": "c", "job_id": "j", "strategy": "random"}
+            )
+        finally:
+            app.dependency_overrides.clear()
+        assert response.status_code == 400
+
+    def test_prerank_endpoint_scores_the_pool(self, supabase_tables):
+        candidates = [
+            {"id": "designer", "parsed_data": DESIGNER, "name": "Dee", "email": "dee@example.com"},
+            {"id": "backend", "parsed_data": BACKEND, "name": "Bea", "email": "bea@example.com"},
+        ]
+        supabase, _ = supabase_tables({
+            "jobs": [JOB],
+            "applications": [{"candidate_id": c["id"]} for c in candidates],
+            "candidates": candidates,
+        })
+        app.dependency_overrides[get_supabase_client] = lambda: supabase
+        try:
+            response = TestClient(app).get(f"/api/jobs/{JOB['id']}/prerank", params={"strategy": "lexical"})
+        finally:
+            app.dependency_overrides.clear()
+
+        assert response.status_code == 200
+        body = response.json()
+        assert body["strategy"] == "lexical" and body["pool_size"] == 2
+        assert [c["candidate_id"] for c in body["candidates"]] == ["backend", "designer"]
+        assert body["candidates"][0]["name"] == "Bea"
+        assert body["candidates"][0]["prerank_score"] > 50
@@ -0,0 +1,78 @@
+"""
+Tests for shared resume link detection and classification
+"""
+
+from app.services.ai_parser import extract_links_with_regex
+from app.services.link_classifier import (
+    GITHUB,
+    LINKEDIN,
+    OTHER,
+    PORTFOLIO,
+    TWITTER,
+    categorize_urls,
+    classify_url,
+    extract_profile_links,
+    scan_links,
+)
+
+
+class TestClassifyUrl:
+    def test_categories_come_from_host(self):
+        assert classify_url("https://github.com/janedoe").category == GITHUB
+        assert classify_url("www.linkedin.com/in/jane-doe").category == LINKEDIN
+        assert classify_url("https://x.com/janedoe").category == TWITTER
+        assert classify_url("janedoe.github.io").category == PORTFOLIO
+        assert classify_url("https://dropbox.com/s/resume").category == OTHER
+
+    def test_profile_urls_are_trimmed_and_normalized(self):
+        assert classify_url("github.com/janedoe/project/").url == "https://github.com/janedoe"
+        assert classify_url("http://linkedin.com/in/jane/").url == "http://linkedin.com/in/jane"
+        assert classify_url("https://linkedin.com/company/acme").category == OTHER
+
+
+class TestScanLinks:
+    def test_single_pass_positions_and_keyword_proximity(self):
+        text = "Contact: docs.example.com\nPortfolio: jane.dev and github.com/jane"
+        matches = scan_links(text)
+        assert [m.url for m in matches] == [
+            "https://docs.example.com", "https://jane.dev", "https://github.com/jane",
+        ]
+        assert text[matches[1].start:matches[1].end] == "jane.dev"
+        assert [m.near_keyword for m in matches] == [False, True, True]
+
+    def test_email_domains_are_not_links(self):
+        assert scan_links("jane.doe@example.com") == []
+
+    def test_keyword_window(self):
+        text = "portfolio" + " " * 120 + "far.example.com"
+        assert scan_links(text)[0].near_keyword is False
+
+
+class TestProfileLinks:
+    def test_matches_previous_extraction(self):
+        text = (
+            "Jane Doe | jane@mail.com | GitHub: https://github.com/janedoe/\n"
+            "LinkedIn: linkedin.com/in/janedoe\n"
+            "Worked at acme.com on payments.\n"
+            "Personal site: https://janedoe.me/"
+        )
+        assert extract_links_with_regex(text) == {
+            "github": "https://github.com/janedoe",
+            "linkedin": "https://linkedin.com/in/janedoe",
+            "portfolio": "https://janedoe.me",
+        }
+
+    def test_portfolio_falls_back_to_first_other_url(self):
+        assert extract_profile_links("Projects at acme.io and beta.org")["portfolio"] == "https://acme.io"
+
+    def test_annotation_urls_need_a_portfolio_host(self):
+        links = categorize_urls([
+            "https://www.linkedin.com/in/janedoe",
+            "https://example.com/resume.pdf",
+            "https://janedoe.vercel.app",
+        ])
+        assert links == {
+            "linkedin": "https://www.linkedin.com/in/janedoe",
+            "portfolio": "https://janedoe.vercel.app",
+        }
+        assert categorize_urls(["https://example.com"]) == {}
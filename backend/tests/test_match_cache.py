@@ -0,0 +1,72 @@
+"""
+Tests for match fingerprints: reusing an unchanged match and writing once
+"""
+
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from app.services.ai_matching import match_candidate_to_job, match_fingerprint
+
+CANDIDATE = {"parsed_data": {"name": "Jane Doe", "skills": ["Python", "FastAPI"]}, "digital_footprints": []}
+JOB = {"title": "Backend Engineer", "description": "Build APIs.", "requirements": "Python"}
+ANALYSIS = {"fit_score": 84, "strengths": ["Python"], "weaknesses": [], "recommendations": ["Hire"]}
+
+
+def _rows(application=None):
+    return {"candidates": CANDIDATE, "jobs": JOB, "applications": [application] if application else []}
+
+
+async def _match(supabase, **kwargs):
+    with patch("app.services.ai_matching.get_supabase_client", return_value=supabase):
+        return await match_candidate_to_job("cand-1", "job-1", **kwargs)
+
+
+class TestMatchCache:
+    def test_fingerprint_tracks_inputs(self):
+        assert match_fingerprint(CANDIDATE, JOB) == match_fingerprint(dict(CANDIDATE), dict(JOB))
+        changed = {**CANDIDATE, "parsed_data": {**CANDIDATE["parsed_data"], "skills": ["Python", "Go"]}}
+        assert match_fingerprint(changed, JOB) != match_fingerprint(CANDIDATE, JOB)
+        assert match_fingerprint(CANDIDATE, {**JOB, "requirements": "Go"}) != match_fingerprint(CANDIDATE, JOB)
+
+    @pytest.mark.asyncio
+    async def test_new_match_is_written_with_one_upsert(self, supabase_tables):
+        supabase, table = supabase_tables(_rows({"id": "app-1", "fit_score": None, "highlights": {"cover_letter": "Old"}}))
+        with patch("app.services.ai_matching.generate_json_response", AsyncMock(return_value=ANALYSIS)) as generate:
+            result = await _match(supabase, cover_letter="Hello")
+
+        assert generate.await_count == 1
+        assert result["fit_score"] == 84 and result["cached"] is False
+        applications = table("applications")
+        applications.upsert.assert_called_once()
+        applications.update.assert_not_called()
+        row = applications.upsert.call_args.args[0]
+        assert row["match_fingerprint"] == match_fingerprint(CANDIDATE, JOB)
+        assert row["highlights"]["cover_letter"] == "Hello"
+        assert row["highlights"]["recommendations"] == ["Hire"]
+        assert "status" not in row  # re-matching must not reset the pipeline stage
+
+    @pytest.mark.asyncio
+    async def test_unchanged_inputs_reuse_the_stored_analysis(self, supabase_tables):
+        stored = {
+            "id": "app-1",
+            "fit_score": "84.00",
+            "highlights": {"strengths": ["Python"], "cover_letter": "Hello"},
+            "match_fingerprint": match_fingerprint(CANDIDATE, JOB),
+        }
+        supabase, table = supabase_tables(_rows(stored))
+        with patch("app.services.ai_matching.generate_json_response", AsyncMock()) as generate:
+            result = await _match(supabase, cover_letter="Hello")
+            generate.assert_not_awaited()
+            assert result == {
+                "fit_score": 84.0,
+                "highlights": {"strengths": ["Python"], "weaknesses": [], "recommendations": []},
+                "cached": True,
+                "strategy": "llm",
+            }
+            table("applications").upsert.assert_not_called()
+            table("applications").update.assert_not_called()
+
+            generate.return_value = ANALYSIS
+            forced = await _match(supabase, force=True)
+        assert forced["cached"] is False
+        generate.assert_awaited_once()
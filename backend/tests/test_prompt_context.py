@@ -0,0 +1,104 @@
+"""
+Unit tests for prompt context rendering.
+
+These tests verify that:
+1. Empty and bookkeeping fields are dropped and lists are de-duplicated
+2. Sections are capped at their token budget
+3. Rendered candidates are much smaller than the raw dict repr
+4. Running page headers/footers are dropped, repeated body lines kept
+"""
+
+from app.services.prompt_context import (
+    PAGE_BREAK,
+    estimate_tokens,
+    normalize_text,
+    render_candidate,
+    render_job,
+    render_resume_text,
+    truncate_to_tokens,
+)
+
+
+CANDIDATE_ROW = {
+    "name": "Jane Doe",
+    "parsed_data": {
+        "name": "Jane Doe",
+        "email": "jane@example.com",
+        "phone": None,
+        "skills": ["Python", "FastAPI", "python", "", "React"],
+        "education": [{"degree": "BS Computer Science", "institution": "MIT", "year": None}],
+        "experience": [
+            {"company": "Tech Corp", "role": "Engineer", "duration": "2020-2024", "description": ""},
+        ],
+        "links": {"github": "https://github.com/jane", "linkedin": None},
+    },
+    "digital_footprints": [{
+        "github_data": {
+            "url": "https://github.com/jane", "username": "jane", "scraped": True,
+            "bio": "", "repositories": 42, "company": "",
+        },
+        "linkedin_data": {"url": "https://linkedin.com/in/jane", "scraped": False,
+                          "note": "LinkedIn API integration required for real data"},
+        "portfolio_data": None,
+    }],
+}
+
+
+class TestCompactRendering:
+    """Test canonical rendering of candidate and job records"""
+
+    def test_candidate_drops_noise_and_duplicates(self):
+        rendered = render_candidate(CANDIDATE_ROW)
+
+        assert "skills: Python, FastAPI, React" in rendered
+        assert "- degree: BS Computer Science; institution: MIT" in rendered
+        assert "repositories: 42" in rendered
+        for noise in ("None", "jane@example.com", "scraped", "https://", "{", "'"):
+            assert noise not in rendered
+        assert estimate_tokens(rendered) < estimate_tokens(str(CANDIDATE_ROW)) / 2
+
+    def test_job_fields_in_stable_order(self):
+        rendered = render_job({"description": "Build APIs", "title": "Backend Engineer", "requirements": None})
+
+        assert rendered == "title: Backend Engineer\ndescription: Build APIs"
+
+
+class TestBudgets:
+    """Test token budget enforcement"""
+
+    def test_truncates_on_word_boundary(self):
+        text = "word " * 500
+
+        truncated = truncate_to_tokens(text, 50)
+
+        assert estimate_tokens(truncated) <= 50
+        assert truncated.endswith("word …[truncated]")
+
+    def test_section_budget_applies_to_candidate(self):
+        row = {"parsed_data": {"skills": [f"skill-{i}" for i in range(1000)]}}
+
+        assert estimate_tokens(render_candidate(row, max_tokens=100)) <= 100
+
+    def test_resume_text_is_normalized_and_capped(self):
+        page = "Jane Doe  —  Resume\n\n\n\nPython    developer\n"
+        text = PAGE_BREAK.join([page] * 3)
+
+        assert normalize_text(text) == "Jane Doe — Resume\n\nPython developer"
+        assert estimate_tokens(render_resume_text("x " * 10000, max_tokens=200)) <= 200
+
+    def test_only_running_headers_and_footers_are_dropped(self):
+        pages = [
+            "Jane Doe — Resume\nSoftware Engineer\nAcme, 2021-2024\nPage 1 of 2",
+            "Jane Doe — Resume\nSoftware Engineer\nGlobex, 2018-2021\nPage 2 of 2",
+        ]
+
+        assert normalize_text(PAGE_BREAK.join(pages)).splitlines() == [
+            "Jane Doe — Resume",
+            "Software Engineer",
+            "Acme, 2021-2024",
+            "Page 1 of 2",
+            "Software Engineer",
+            "Globex, 2018-2021",
+        ]
+        # Without page breaks nothing is a header: both roles keep their title
+        assert normalize_text("\n".join(pages)).count("Software Engineer") == 2
@@ -0,0 +1,89 @@
+"""
+Unit tests for resume parse deduplication.
+
+These tests verify that:
+1. Text hashes ignore case and whitespace layout
+2. A text-hash hit skips the AI parse, and force=True bypasses the cache
+3. Text too short to identify a resume (scans) is never matched on text
+"""
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, Mock, patch
+
+from app.services.ai_parser import parse_resume
+from app.services.document_extraction import DocumentExtraction
+from app.services.resume_cache import cache_text_hash, content_hash, record_parse, text_hash
+
+RESUME_TEXT = (
+    "Jane Doe - Senior Backend Engineer\n"
+    "Experience: Acme Corp, 2019-2024. Built hiring APIs in Python and FastAPI on PostgreSQL.\n"
+    "Skills: Python, FastAPI, PostgreSQL, Docker, Kubernetes, AWS.\n"
+    "Education: BSc Computer Science, Example University."
+)
+CACHED_ROW = {
+    "id": "row-1",
+    "candidate_id": "cand-1",
+    "parsed_data": {"name": "Jane Doe", "email": "jane@example.com", "skills": ["Python"]},
+}
+
+
+class TestResumeCache:
+    """Test content-hash deduplication of resume parses"""
+
+    def test_text_hash_normalizes_layout(self):
+        assert text_hash("Jane  Doe\n\nPython") == text_hash("jane doe python")
+        assert text_hash("Jane Doe") != text_hash("John Doe")
+        assert content_hash(b"a") != content_hash(b"b")
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("force, ai_calls", [(False, 0), (True, 1)])
+    async def test_text_hit_skips_ai_unless_forced(self, force, ai_calls):
+        parse_ai = AsyncMock(return_value=Mock(name="parsed"))
+        with patch("app.services.ai_parser.get_supabase_client"), \
+             patch("app.services.ai_parser.extract_document", AsyncMock(return_value=DocumentExtraction(text=RESUME_TEXT))), \
+             patch("app.services.ai_parser.find_by_text_hash", return_value=CACHED_ROW) as find, \
+             patch("app.services.ai_parser.parse_resume_with_ai", parse_ai), \
+             patch("app.services.ai_parser.store_candidate_data", AsyncMock(return_value="cand-1")), \
+             patch("app.services.ai_parser.record_parse") as record, \
+             patch("app.services.ai_parser.ResumeUploadResponse") as response:
+            await parse_resume(b"bytes", "cv.pdf", "https://cdn/cv.pdf", force=force)
+
+        assert parse_ai.await_count == ai_calls
+        assert find.called is not force
+        record.assert_called_once()
+        if not force:
+            assert response.call_args.kwargs["parsed_data"].name == "Jane Doe"
+
+    def test_short_text_is_not_a_cache_key(self):
+        assert cache_text_hash(RESUME_TEXT) == text_hash(RESUME_TEXT)
+        assert cache_text_hash("") is None
+        assert cache_text_hash("Page 1 of 2") is None
+
+    @pytest.mark.asyncio
+    async def test_scanned_pdfs_never_share_a_parse(self):
+        # Every table lookup would "hit" CACHED_ROW; text-less PDFs must not look on text
+        supabase = MagicMock()
+        supabase.table.return_value.select.return_value.eq.return_value.limit.return_value.execute.return_value.data = [CACHED_ROW]
+        parse_ai = AsyncMock(return_value=Mock(name="parsed"))
+
+        with patch("app.services.ai_parser.get_supabase_client", return_value=supabase), \
+             patch("app.services.ai_parser.extract_document", AsyncMock(return_value=DocumentExtraction(text=""))), \
+             patch("app.services.ai_parser.parse_resume_with_ai", parse_ai), \
+             patch("app.services.ai_parser.store_candidate_data", AsyncMock(side_effect=["cand-a", "cand-b"])), \
+             patch("app.services.ai_parser.record_parse") as record, \
+             patch("app.services.ai_parser.ResumeUploadResponse"):
+            await parse_resume(b"%PDF scan of Alice", "alice.pdf", "https://cdn/alice.pdf")
+            await parse_resume(b"%PDF scan of Bob", "bob.pdf", "https://cdn/bob.pdf")
+
+        assert parse_ai.await_count == 2
+        supabase.table.return_value.select.assert_not_called()
+        assert [call.args[0] for call in record.call_args_list] == [content_hash(b"%PDF scan of Alice"), content_hash(b"%PDF scan of Bob")]
+        assert [call.args[1] for call in record.call_args_list] == [None, None]
+
+    def test_record_parse_writes_no_text_hash_for_short_text(self):
+        supabase = MagicMock()
+        parsed = Mock()
+        parsed.dict.return_value = {"name": "Alice"}
+        record_parse("f" * 64, cache_text_hash(""), parsed, "cand-a", None, None, supabase)
+        row = supabase.table.return_value.upsert.call_args.args[0]
+        assert row["text_hash"] is None and row["content_hash"] == "f" * 64
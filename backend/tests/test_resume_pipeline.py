@@ -0,0 +1,114 @@
+"""
+Tests for the concurrent resume upload pipeline
+"""
+
+import asyncio
+import hashlib
+import io
+import time
+from contextlib import ExitStack
+
+import pytest
+from unittest.mock import AsyncMock, Mock, patch
+
+from app.core.uploads import SpooledUpload
+from app.models.candidate import ParsedData
+from app.services.ai_parser import ResumeAnalysis
+from app.services.document_extraction import DocumentExtraction
+from app.services.resume_pipeline import process_resume_upload
+from app.services.resume_storage import ResumeStorageError
+
+PARSED = ParsedData(name="Jane Doe", email="jane@example.com", links={"github": "https://github.com/jane"})
+
+
+def _upload(delay: float = 0.2, error: Exception = None):
+    def upload(content, file_ext, content_type, supabase):
+        content.read()  # the storage client consumes the stream
+        time.sleep(delay)
+        if error:
+            raise error
+        return "resumes/cv.pdf", "https://cdn/cv.pdf"
+    return upload
+
+
+async def _parse(extraction, filename, supabase, force=False):
+    await asyncio.sleep(0.2)
+    return ResumeAnalysis(PARSED, "text-hash", cached=False)
+
+
+async def _failing_parse(*args, **kwargs):
+    raise ValueError("bad resume")
+
+
+async def _run(upload=None, parse=None, store=None):
+    """Run the pipeline with storage, AI and database mocked; returns (result or error, mocks)."""
+    mocks = {
+        "upload_resume": Mock(side_effect=upload or _upload()),
+        "parse_extracted_resume": AsyncMock(side_effect=parse or _parse),
+        "store_candidate_data": store or AsyncMock(return_value="cand-1"),
+        "delete_resume": Mock(),
+        "ensure_resumes_bucket": Mock(),
+        "record_parse": Mock(),
+        "extract_document": AsyncMock(return_value=DocumentExtraction(text="cv")),
+    }
+    with ExitStack() as stack:
+        for name, mock in mocks.items():
+            stack.enter_context(patch(f"app.services.resume_pipeline.{name}", mock))
+        try:
+            with SpooledUpload.from_bytes("cv.pdf", "application/pdf", b"%PDF") as upload:
+                result = await process_resume_upload(upload, Mock())
+        except Exception as e:
+            result = e
+    return result, mocks
+
+
+class TestResumePipeline:
+    @pytest.mark.asyncio
+    async def test_upload_overlaps_parsing(self):
+        started = time.perf_counter()
+        result, mocks = await _run()
+        elapsed = time.perf_counter() - started
+
+        assert result.candidate_id == "cand-1"
+        assert result.message == "Resume parsed successfully"
+        assert elapsed < 0.35  # 0.2s upload and 0.2s parse ran side by side
+        mocks["store_candidate_data"].assert_awaited_once()
+        assert mocks["store_candidate_data"].call_args.args[1] == "https://cdn/cv.pdf"
+        mocks["record_parse"].assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_storage_streams_and_only_extraction_reads_bytes(self):
+        _, mocks = await _run()
+        stream = mocks["upload_resume"].call_args.args[0]
+        assert isinstance(stream, io.BufferedReader)
+        assert mocks["extract_document"].call_args.args == (b"%PDF", "pdf")
+        assert mocks["record_parse"].call_args.args[0] == hashlib.sha256(b"%PDF").hexdigest()
+
+    @pytest.mark.asyncio
+    async def test_link_scraping_is_queued_with_the_candidate(self):
+        _, mocks = await _run()
+        # store_candidate_data only enqueues scraping by default
+        assert mocks["store_candidate_data"].call_args.kwargs.get("scrape", True) is True
+
+    @pytest.mark.asyncio
+    async def test_parse_failure_removes_uploaded_file(self):
+        error, mocks = await _run(parse=_failing_parse)
+        assert isinstance(error, ValueError)
+        # The upload was still in flight when parsing failed; it is removed once it lands
+        mocks["delete_resume"].assert_called_once()
+        assert mocks["delete_resume"].call_args.args[0] == "resumes/cv.pdf"
+        mocks["store_candidate_data"].assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_upload_failure_cancels_parsing(self):
+        error, mocks = await _run(upload=_upload(0.01, ResumeStorageError("storage down")))
+        assert isinstance(error, ResumeStorageError)
+        mocks["delete_resume"].assert_not_called()
+        mocks["store_candidate_data"].assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_store_failure_removes_uploaded_file(self):
+        error, mocks = await _run(store=AsyncMock(side_effect=RuntimeError("db down")))
+        assert isinstance(error, RuntimeError)
+        mocks["delete_resume"].assert_called_once()
+        mocks["record_parse"].assert_not_called()
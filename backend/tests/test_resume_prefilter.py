@@ -0,0 +1,128 @@
+"""
+Tests for rule-based resume pre-extraction and the parse modes built on it
+"""
+
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from app.services.ai_parser import parse_resume_with_ai
+from app.services.resume_prefilter import (
+    SkillMatcher,
+    parse_education,
+    prefilter_resume,
+    split_sections,
+    truncate_sections,
+)
+from benchmarks.fixtures import RESUME_LINES
+
+RESUME = "\n".join(RESUME_LINES)
+
+
+class TestPrefilter:
+    def test_resolves_fixture_resume(self):
+        result = prefilter_resume(RESUME)
+        assert result.name == "Jane Doe"
+        assert result.email == "jane.doe@example.com"
+        assert result.phone == "+1 555 0100"
+        assert result.links == {"github": "https://github.com/janedoe"}
+        assert {"Python", "FastAPI", "PostgreSQL", "Kubernetes"} <= set(result.skills)
+        assert result.education == [
+            {"degree": "BSc Computer Science", "institution": "Example University", "year": "2018"}
+        ]
+        assert result.experience[0]["company"] == "Example Corp"
+        assert result.experience[0]["role"] == "Senior Engineer"
+        assert result.experience[0]["duration"] == "2021-2024"
+        assert result.unresolved(min_skills=5) == []
+
+    def test_sections_split_on_headings(self):
+        sections = split_sections("Jane Doe\nWork Experience:\nAcme, Engineer, 2020 - Present\nSkills\nPython")
+        assert sections == {
+            "header": "Jane Doe",
+            "experience": "Acme, Engineer, 2020 - Present",
+            "skills": "Python",
+        }
+
+    def test_truncation_drops_low_priority_sections_first(self):
+        projects = "\n".join(f"Project {i}: a long description of a side project" for i in range(50))
+        text = RESUME.replace("SKILLS", f"PROJECTS\n{projects}\nSKILLS")
+        truncated, trimmed = truncate_sections(text, len(RESUME) + 200)
+
+        assert len(truncated) <= len(RESUME) + 200
+        assert trimmed == ["projects"]
+        # Contact details, the most recent role and skills survive intact
+        for line in (RESUME_LINES[1], RESUME_LINES[3], RESUME_LINES[8]):
+            assert line in truncated
+        assert truncated.index("Project 0") < truncated.index("SKILLS")
+
+    def test_skill_matcher_respects_word_boundaries(self):
+        matcher = SkillMatcher({"Java": ("java",), "JavaScript": ("javascript",), "C++": ("c++",), "REST": ("rest",)})
+        assert matcher.find("JavaScript and C++; interest in Java") == ["JavaScript", "C++", "Java"]
+
+    def test_common_words_count_only_in_skills_section(self):
+        prose = (
+            "Jane Doe\nSUMMARY\nI excel at shipping; joined in Spring 2021 to express interest in "
+            "ML-free tooling, node by node, with an agile mindset and a swift rest between releases."
+        )
+        assert prefilter_resume(prose).skills == []
+
+        listed = prefilter_resume(f"{prose}\nSKILLS\nSwift, Excel, REST, Node, Spring Boot")
+        assert set(listed.skills) == {"Swift", "Excel", "REST APIs", "Node.js", "Spring"}
+
+    @pytest.mark.parametrize("line", [
+        "Boston, MA 2019",
+        "Coursework to be completed 2024",
+        "Scholarship awarded to me twice, 2017",
+    ])
+    def test_plain_words_are_not_degrees(self, line):
+        assert parse_education(line) == []
+
+    def test_short_degrees_need_dots_or_a_field(self):
+        entries = parse_education(
+            "B.E. Mechanical, Anna University, 2015\nMA in English, Example College, 2019\nBA (Hons) Economics, 2012"
+        )
+        assert [entry["degree"] for entry in entries] == ["B.E. Mechanical", "MA in English", "BA (Hons) Economics"]
+        assert entries[1]["institution"] == "Example College" and entries[1]["year"] == "2019"
+
+    def test_unresolved_fields(self):
+        result = prefilter_resume("EXPERIENCE\nDid things at a place")
+        assert result.unresolved(min_skills=1) == ["name", "email", "skills", "education", "experience"]
+
+
+class TestParseModes:
+    @pytest.mark.asyncio
+    async def test_hybrid_skips_model_when_rules_resolve_everything(self):
+        with patch("app.services.ai_parser.generate_json_response", new_callable=AsyncMock) as generate:
+            parsed = await parse_resume_with_ai(RESUME, mode="hybrid")
+        generate.assert_not_called()
+        assert parsed.name == "Jane Doe"
+        assert parsed.links["github"] == "https://github.com/janedoe"
+
+    @pytest.mark.asyncio
+    async def test_hybrid_sends_only_unresolved_sections(self):
+        text = RESUME.replace("BSc Computer Science, Example University, 2018", "Studied somewhere")
+        with patch(
+            "app.services.ai_parser.generate_json_response",
+            new=AsyncMock(return_value={
+                "education": [{"degree": "BSc", "institution": "Somewhere", "year": "2018"}],
+                "name": "Ignored",
+            }),
+        ) as generate:
+            parsed = await parse_resume_with_ai(text, mode="hybrid")
+        prompt = generate.call_args.kwargs["prompt"]
+        assert "Studied somewhere" in prompt
+        assert "Example Corp" not in prompt
+        assert parsed.education[0]["institution"] == "Somewhere"
+        assert parsed.name == "Jane Doe"
+
+    @pytest.mark.asyncio
+    async def test_rules_mode_never_calls_model(self):
+        with patch("app.services.ai_parser.generate_json_response", new_callable=AsyncMock) as generate:
+            parsed = await parse_resume_with_ai("Skills\nPython\nContact: jane.doe@example.com", mode="rules")
+        generate.assert_not_called()
+        assert parsed.name == "Jane Doe"
+        assert parsed.skills == ["Python"]
+
+    @pytest.mark.asyncio
+    async def test_rules_mode_needs_an_email(self):
+        with pytest.raises(ValueError):
+            await parse_resume_with_ai("Jane Doe\nSkills\nPython", mode="rules")
@@ -0,0 +1,78 @@
+"""
+Tests for stored resume text and re-parsing from it
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.core.supabase_client import get_supabase_client
+from app.main import app
+from app.models.candidate import ParsedData
+from app.services.prompt_context import PAGE_BREAK, normalize_text
+from app.services.resume_cache import text_hash
+from app.services.resume_text import decompress_text, resume_text_row, store_resume_text
+from benchmarks.fixtures import RESUME_LINES
+
+RESUME = PAGE_BREAK.join(["\n".join(RESUME_LINES)] * 20)  # 20 pages
+CANDIDATE_ID = "00000000-0000-0000-0000-000000000001"
+
+
+def _rows(candidate=None, stored_text=None):
+    return {
+        "candidates": [candidate] if candidate else [],
+        "candidate_resume_texts": [resume_text_row(CANDIDATE_ID, stored_text)] if stored_text is not None else [],
+    }
+
+
+class TestStoredText:
+    def test_row_is_normalized_compressed_and_hashed(self):
+        row = resume_text_row(CANDIDATE_ID, RESUME + "\n\n\n   ")
+        assert row["text_hash"] == text_hash(RESUME)
+        # Running headers/footers are dropped by normalization, then the rest compresses
+        stored = decompress_text(row["text_gzip"])
+        assert stored == normalize_text(RESUME)
+        assert stored.count(RESUME_LINES[0]) == 1 and stored.count(RESUME_LINES[2]) == 20
+        assert row["compressed_size"] < row["char_count"]
+
+    def test_store_failure_is_not_raised(self):
+        supabase = MagicMock()
+        supabase.table.side_effect = RuntimeError("relation does not exist")
+        assert store_resume_text(CANDIDATE_ID, RESUME, supabase) is False
+
+
+class TestReparseEndpoint:
+    def _post(self, supabase, **params):
+        app.dependency_overrides[get_supabase_client] = lambda: supabase
+        try:
+            return TestClient(app).post(f"/api/candidates/{CANDIDATE_ID}/reparse", params=params)
+        finally:
+            app.dependency_overrides.clear()
+
+    def test_reparses_from_stored_text(self, supabase_tables):
+        links = {"github": "https://github.com/janedoe"}
+        supabase, table = supabase_tables(_rows(
+            candidate={"id": CANDIDATE_ID, "parsed_data": {"links": links}},
+            stored_text=RESUME,
+        ))
+        parse = AsyncMock(return_value=ParsedData(name="Jane Doe", email="jane.doe@example.com", links=links))
+        with patch("app.services.ai_parser.parse_resume_with_ai", parse):
+            response = self._post(supabase, mode="rules")
+
+        assert response.status_code == 200
+        assert response.json()["parsed_data"]["name"] == "Jane Doe"
+        assert parse.call_args.args == (normalize_text(RESUME), links)
+        assert parse.call_args.kwargs == {"mode": "rules"}
+        assert table("candidates").update.call_args.args[0]["name"] == "Jane Doe"
+
+    def test_missing_text_is_a_conflict(self, supabase_tables):
+        supabase, _ = supabase_tables(_rows(candidate={"id": CANDIDATE_ID, "parsed_data": {}}))
+        assert self._post(supabase).status_code == 409
+
+    def test_unknown_candidate(self, supabase_tables):
+        supabase, _ = supabase_tables(_rows())
+        assert self._post(supabase).status_code == 404
+
+    def test_invalid_mode(self, supabase_tables):
+        supabase, _ = supabase_tables(_rows())
+        assert self._post(supabase, mode="fast").status_code == 400
@@ -0,0 +1,98 @@
+"""
+Tests for map-reduce ("sections" mode) resume parsing
+"""
+
+import asyncio
+import re
+import time
+
+import pytest
+from unittest.mock import patch
+
+from app.core.config import settings
+from app.services.ai_parser import parse_resume_with_ai
+from benchmarks.fixtures import RESUME_LINES
+
+ROLES = [f"Company {i}, Engineer, {2000 + i}-{2001 + i}\nBuilt service number {i} with Python." for i in range(40)]
+LONG_RESUME = "\n".join([
+    *RESUME_LINES[:2],
+    "EXPERIENCE",
+    *ROLES,
+    "SKILLS",
+    "Python, Docker",
+    "PROJECTS",
+    "Search engine in Rust",
+    "EDUCATION",
+    RESUME_LINES[-1],
+])
+
+
+def _label(prompt: str) -> str:
+    return re.search(r"one part of a resume \(([^)]*)\)", prompt).group(1)
+
+
+async def _answer(prompt: str, **kwargs):
+    """Stand-in model: answers from whatever section text the prompt carries."""
+    await asyncio.sleep(0.1)
+    label = _label(prompt)
+    if label == "contact":
+        return {"name": "Jane Doe", "email": "jane.doe@example.com", "phone": "+1 555 0100"}
+    if label.startswith("experience"):
+        companies = re.findall(r"Company (\d+)", prompt)
+        return {"experience": [{"company": f"Company {n}"} for n in companies]}
+    if label == "skills":
+        return {"skills": ["Python", "Docker"]}
+    if label == "projects":
+        return {"skills": ["rust", "python"]}
+    if label == "education":
+        return {"education": [{"degree": "BSc", "institution": "Example University", "year": "2018"}]}
+    raise AssertionError(f"unexpected prompt {label}")
+
+
+class TestSectionParsing:
+    @pytest.mark.asyncio
+    async def test_sections_are_parsed_concurrently_and_merged_in_order(self, monkeypatch):
+        monkeypatch.setattr(settings, "RESUME_SECTION_CHUNK_TOKENS", 200)
+        prompts = []
+
+        async def answer(prompt, **kwargs):
+            prompts.append(prompt)
+            return await _answer(prompt, **kwargs)
+
+        started = time.perf_counter()
+        with patch("app.core.ai_client.generate_json_response", side_effect=answer):
+            parsed = await parse_resume_with_ai(LONG_RESUME, mode="sections")
+        elapsed = time.perf_counter() - started
+
+        experience_prompts = [p for p in prompts if _label(p).startswith("experience")]
+        assert len(experience_prompts) > 1  # the long section was chunked
+        assert len(prompts) > settings.AI_BATCH_CONCURRENCY
+        # Sequentially this would take len(prompts) * 0.1s
+        assert elapsed < 0.1 * len(prompts) / 2
+        assert "Company 0" not in next(p for p in prompts if _label(p) == "contact")
+
+        assert parsed.name == "Jane Doe"
+        assert [entry["company"] for entry in parsed.experience] == [f"Company {i}" for i in range(40)]
+        assert parsed.skills == ["Python", "Docker", "rust"]
+        assert parsed.education[0]["institution"] == "Example University"
+
+    @pytest.mark.asyncio
+    async def test_long_resume_in_llm_mode_uses_sections(self, monkeypatch):
+        monkeypatch.setattr(settings, "RESUME_SECTION_PARSE_MIN_CHARS", 1000)
+        with patch("app.core.ai_client.generate_json_response", side_effect=_answer) as generate:
+            parsed = await parse_resume_with_ai(LONG_RESUME, mode="llm")
+        assert generate.call_count >= 4
+        assert len(parsed.experience) == 40
+
+    @pytest.mark.asyncio
+    async def test_failed_section_fails_the_parse(self, monkeypatch):
+        monkeypatch.setattr(settings, "AI_MAX_RETRIES", 0)
+
+        async def answer(prompt, **kwargs):
+            if _label(prompt) == "education":
+                raise ValueError("AI response is not valid JSON")
+            return await _answer(prompt, **kwargs)
+
+        with patch("app.core.ai_client.generate_json_response", side_effect=answer):
+            with pytest.raises(Exception, match="education"):
+                await parse_resume_with_ai(LONG_RESUME, mode="sections")
@@ -0,0 +1,81 @@
+"""
+Tests for normalized candidate skills and skill search
+"""
+
+from fastapi.testclient import TestClient
+from unittest.mock import MagicMock
+
+from app.core.supabase_client import get_supabase_client
+from app.main import app
+from app.services.skill_index import MAX_QUERY_SKILLS, array_literal, normalize_skills, skill_columns
+
+ROWS = [{"id": "c1", "name": "Jane Doe", "email": "jane@example.com", "skills_normalized": ["python", "kubernetes"]}]
+
+
+class TestNormalization:
+    def test_aliases_case_and_whitespace(self):
+        skills = ["Python", " K8s ", "python", "Machine   Learning", "Node.js, nodejs; Go", None, ""]
+        assert normalize_skills(skills) == ["python", "kubernetes", "machine learning", "node.js", "go"]
+
+    def test_columns_follow_parsed_data(self):
+        assert skill_columns({"skills": ["Postgres"]}) == {"skills_normalized": ["postgresql"]}
+        assert skill_columns(None) == {"skills_normalized": []}
+
+    def test_array_literal_quotes_elements(self):
+        assert array_literal(["c++", 'say "hi"', "machine learning"]) == '{"c++","say \\"hi\\"","machine learning"}'
+
+
+class TestSearchEndpoint:
+    def _get(self, query, params):
+        supabase = MagicMock()
+        supabase.table.return_value.select.return_value = query
+        app.dependency_overrides[get_supabase_client] = lambda: supabase
+        try:
+            return TestClient(app).get("/api/candidates/search", params=params), supabase
+        finally:
+            app.dependency_overrides.clear()
+
+    def _query(self):
+        query = MagicMock()
+        for method in ("contains", "overlaps", "order", "range"):
+            getattr(query, method).return_value = query
+        query.execute.return_value.data = ROWS
+        query.execute.return_value.count = 1234
+        return query
+
+    def test_and_or_query_uses_array_operators(self):
+        query = self._query()
+        response, supabase = self._get(query, [("all", "Python"), ("all", "k8s"), ("any", "AWS,GCP"), ("offset", 40)])
+
+        assert response.status_code == 200
+        body = response.json()
+        assert body["total"] == 1234
+        assert body["skills"] == {"all": ["python", "kubernetes"], "any": ["aws", "gcp"]}
+        assert body["candidates"] == ROWS
+        assert supabase.table.return_value.select.call_args.kwargs == {"count": "exact"}
+        query.contains.assert_called_once_with("skills_normalized", '{"python","kubernetes"}')
+        query.overlaps.assert_called_once_with("skills_normalized", '{"aws","gcp"}')
+        query.range.assert_called_once_with(40, 59)
+
+    def test_or_only(self):
+        query = self._query()
+        response, _ = self._get(query, {"any": "Rust"})
+        assert response.status_code == 200
+        query.contains.assert_not_called()
+
+    def test_requires_a_skill(self):
+        response, _ = self._get(self._query(), {"limit": 10})
+        assert response.status_code == 400
+
+    def test_skill_cap_counts_normalized_skills(self):
+        too_many = ",".join(f"skill-{i}" for i in range(MAX_QUERY_SKILLS + 1))
+        response, _ = self._get(self._query(), {"all": too_many})
+        assert response.status_code == 400
+
+        repeated = [("any", "k8s"), ("any", "Kubernetes")] * MAX_QUERY_SKILLS
+        response, _ = self._get(self._query(), repeated)
+        assert response.status_code == 200
+        assert response.json()["skills"]["any"] == ["kubernetes"]
+
+        response, _ = self._get(self._query(), {"all": " , ;"})
+        assert response.status_code == 400
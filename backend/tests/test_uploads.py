@@ -0,0 +1,91 @@
+"""
+Tests for bounded upload streaming and early size rejection
+"""
+
+import hashlib
+import io
+
+import pytest
+from fastapi import FastAPI, File, UploadFile
+from fastapi.testclient import TestClient
+
+from app.main import app as api_app
+
+from app.core.config import settings
+from app.core.uploads import (
+    MULTIPART_OVERHEAD,
+    SPOOL_MEMORY_LIMIT,
+    UploadSizeLimitMiddleware,
+    UploadTooLargeError,
+    spool_upload,
+)
+
+
+def _upload(data: bytes) -> UploadFile:
+    return UploadFile(file=io.BytesIO(data), filename="resume.pdf")
+
+
+class TestSpoolUpload:
+    @pytest.mark.asyncio
+    async def test_spools_and_hashes_in_one_read(self):
+        data = b"%PDF-1.4 " * (SPOOL_MEMORY_LIMIT // 4)  # big enough to roll over to disk
+        with await spool_upload(_upload(data), max_size=len(data)) as upload:
+            assert upload.size == len(data)
+            assert upload.sha256 == hashlib.sha256(data).hexdigest()
+            assert upload.read_bytes() == data
+            reader = upload.reader()
+            assert isinstance(reader, io.BufferedReader)
+            assert reader.read() == data
+
+    @pytest.mark.asyncio
+    async def test_rejects_as_soon_as_limit_is_crossed(self):
+        with pytest.raises(UploadTooLargeError):
+            await spool_upload(_upload(b"x" * 1001), max_size=1000)
+
+
+class TestUploadSizeLimitMiddleware:
+    def _client(self, limit: int):
+        app = FastAPI()
+        app.add_middleware(UploadSizeLimitMiddleware, limits={"/upload": limit})
+
+        @app.post("/upload")
+        async def upload(file: UploadFile = File(...)):
+            return {"size": len(await file.read())}
+
+        @app.post("/other")
+        async def other(file: UploadFile = File(...)):
+            return {"size": len(await file.read())}
+
+        return TestClient(app)
+
+    def test_small_upload_passes(self):
+        response = self._client(4096).post("/upload", files={"file": ("a.pdf", b"x" * 100)})
+        assert response.status_code == 200
+        assert response.json() == {"size": 100}
+
+    def test_content_length_over_limit_is_rejected_up_front(self):
+        response = self._client(4096).post("/upload", files={"file": ("a.pdf", b"x" * 10000)})
+        assert response.status_code == 413
+
+    def test_chunked_body_is_cut_off(self):
+        def body():
+            for _ in range(10):
+                yield b"x" * 1000
+
+        response = self._client(4096).post(
+            "/upload", content=body(), headers={"content-type": "multipart/form-data; boundary=b"}
+        )
+        assert response.status_code == 413
+
+    def test_other_paths_are_not_limited(self):
+        response = self._client(4096).post("/other", files={"file": ("a.pdf", b"x" * 10000)})
+        assert response.status_code == 200
+
+    def test_rejection_carries_cors_headers(self):
+        origin = "https://hrms.vercel.app"
+        too_large = b"x" * (settings.MAX_UPLOAD_SIZE + MULTIPART_OVERHEAD + 1)
+        response = TestClient(api_app).post(
+            "/api/candidates/parse", files={"file": ("a.pdf", too_large)}, headers={"Origin": origin}
+        )
+        assert response.status_code == 413
+        assert response.headers["access-control-allow-origin"] == origin
@@ -0,0 +1,23 @@
+-- Resume parse cache
+-- Lets identical resumes (same file bytes, or same extracted text) reuse a
+-- previous AI parse instead of calling the model again
+
+CREATE TABLE IF NOT EXISTS resume_parses (
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    content_hash CHAR(64) NOT NULL UNIQUE, -- sha256 of the uploaded file bytes
+    text_hash CHAR(64) NOT NULL, -- sha256 of the normalized extracted text
+    candidate_id UUID REFERENCES candidates(id) ON DELETE SET NULL,
+    resume_url TEXT,
+    storage_path TEXT,
+    parsed_data JSONB NOT NULL,
+    model VARCHAR(100),
+    hit_count INTEGER DEFAULT 0,
+    last_hit_at TIMESTAMP WITH TIME ZONE,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_resume_parses_text_hash ON resume_parses(text_hash);
+
+ALTER TABLE resume_parses ENABLE ROW LEVEL SECURITY;
+
+COMMENT ON TABLE resume_parses IS 'Content-addressed cache of AI resume parses used to skip re-parsing duplicates';
@@ -0,0 +1,60 @@
+-- Deferred digital footprint enrichment
+-- digital_footprints doubles as a durable work queue: resume uploads insert
+-- a 'pending' row and return, and the API's enrichment worker claims rows,
+-- scrapes the candidate's links and marks them 'completed' or 'failed'.
+
+ALTER TABLE digital_footprints
+    ADD COLUMN IF NOT EXISTS links JSONB,
+    ADD COLUMN IF NOT EXISTS enrichment_status VARCHAR(20) NOT NULL DEFAULT 'completed'
+        CHECK (enrichment_status IN ('pending', 'processing', 'completed', 'failed', 'skipped')),
+    ADD COLUMN IF NOT EXISTS enrichment_attempts INTEGER NOT NULL DEFAULT 0,
+    ADD COLUMN IF NOT EXISTS enrichment_error TEXT,
+    ADD COLUMN IF NOT EXISTS enrichment_requested_at TIMESTAMP WITH TIME ZONE,
+    ADD COLUMN IF NOT EXISTS enrichment_started_at TIMESTAMP WITH TIME ZONE;
+
+-- last_scraped_at is set by the worker once scraping actually happened
+ALTER TABLE digital_footprints ALTER COLUMN last_scraped_at DROP DEFAULT;
+
+CREATE INDEX IF NOT EXISTS idx_digital_footprints_enrichment_queue
+    ON digital_footprints(enrichment_requested_at)
+    WHERE enrichment_status IN ('pending', 'processing');
+
+-- Claim up to batch_size queued rows for one worker. SKIP LOCKED lets several
+-- API instances share the queue; rows stuck in 'processing' (worker died)
+-- become claimable again after stale_after_seconds.
+CREATE OR REPLACE FUNCTION claim_footprint_enrichments(
+    batch_size INTEGER,
+    stale_after_seconds INTEGER,
+    max_attempts INTEGER
+)
+RETURNS SETOF digital_footprints AS $$
+    UPDATE digital_footprints f
+    SET enrichment_status = 'processing',
+        enrichment_started_at = NOW(),
+        enrichment_attempts = f.enrichment_attempts + 1
+    WHERE f.id IN (
+        SELECT id FROM digital_footprints
+        WHERE enrichment_attempts < max_attempts
+          AND (
+              enrichment_status = 'pending'
+              OR (enrichment_status = 'processing'
+                  AND enrichment_started_at < NOW() - make_interval(secs => stale_after_seconds))
+          )
+        ORDER BY enrichment_requested_at
+        LIMIT batch_size
+        FOR UPDATE SKIP LOCKED
+    )
+    RETURNING f.*;
+$$ LANGUAGE sql;
+
+-- Let the frontend subscribe to enrichment progress with Supabase Realtime
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_publication WHERE pubname = 'supabase_realtime') THEN
+        ALTER PUBLICATION supabase_realtime ADD TABLE digital_footprints;
+    END IF;
+EXCEPTION WHEN duplicate_object THEN
+    NULL;
+END $$;
+
+COMMENT ON COLUMN digital_footprints.enrichment_status IS 'pending -> processing -> completed | failed; skipped when the resume has no links';
@@ -0,0 +1,7 @@
+-- Resume extraction metadata
+-- Records how much of the uploaded document was read (page cap, char
+-- budget) and which sections were trimmed before the text went to the model
+
+ALTER TABLE candidates ADD COLUMN IF NOT EXISTS extraction_meta JSONB;
+
+COMMENT ON COLUMN candidates.extraction_meta IS 'pages_read, total_pages, chars_read, chars_kept, truncated, trimmed_sections from resume extraction';
@@ -0,0 +1,23 @@
+-- Stored resume text
+-- Normalized extracted text of each candidate's latest resume, so re-parsing,
+-- matching or indexing can run without downloading and extracting the file.
+-- Kept out of candidates so SELECT * on candidates stays small.
+
+CREATE TABLE IF NOT EXISTS candidate_resume_texts (
+    candidate_id UUID PRIMARY KEY REFERENCES candidates(id) ON DELETE CASCADE,
+    text_hash CHAR(64) NOT NULL, -- same hash as resume_parses.text_hash
+    text_gzip TEXT NOT NULL, -- base64 of gzip-compressed UTF-8 text
+    char_count INTEGER NOT NULL,
+    compressed_size INTEGER NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_candidate_resume_texts_text_hash ON candidate_resume_texts(text_hash);
+
+CREATE TRIGGER update_candidate_resume_texts_updated_at BEFORE UPDATE ON candidate_resume_texts
+    FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
+
+ALTER TABLE candidate_resume_texts ENABLE ROW LEVEL SECURITY;
+
+COMMENT ON TABLE candidate_resume_texts IS 'Compressed extracted resume text per candidate, for re-parsing without the original file';
@@ -0,0 +1,23 @@
+-- Normalized candidate skills
+-- Lowercased skill names (aliases mapped to one canonical name by the API,
+-- e.g. k8s -> kubernetes) in a text[] with a GIN index, so skill searches
+-- use @> (has all) and && (has any) instead of scanning parsed_data JSONB.
+
+ALTER TABLE candidates ADD COLUMN IF NOT EXISTS skills_normalized TEXT[] NOT NULL DEFAULT '{}';
+
+COMMENT ON COLUMN candidates.skills_normalized IS 'Normalized parsed_data skills, written by the API; see app/services/skill_index.py';
+
+-- Initial backfill: lowercase and trim only. POST /api/admin/skills/backfill
+-- applies the API's alias mapping to existing rows.
+UPDATE candidates c
+SET skills_normalized = COALESCE((
+    SELECT array_agg(DISTINCT lower(regexp_replace(btrim(s), '\s+', ' ', 'g')))
+    FROM jsonb_array_elements_text(c.parsed_data->'skills') AS s
+    WHERE btrim(s) <> ''
+), '{}')
+WHERE jsonb_typeof(c.parsed_data->'skills') = 'array';
+
+CREATE INDEX IF NOT EXISTS idx_candidates_skills_normalized ON candidates USING GIN (skills_normalized);
+
+-- Search results are paged newest first
+CREATE INDEX IF NOT EXISTS idx_candidates_created_at ON candidates(created_at DESC);
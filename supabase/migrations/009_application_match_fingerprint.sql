@@ -0,0 +1,8 @@
+-- Match result cache
+-- sha256 of the inputs of the stored AI match (rendered candidate profile,
+-- job posting, model); a re-match with the same inputs reuses fit_score and
+-- highlights instead of calling the model again
+
+ALTER TABLE applications ADD COLUMN IF NOT EXISTS match_fingerprint CHAR(64);
+
+COMMENT ON COLUMN applications.match_fingerprint IS 'Fingerprint of the inputs behind fit_score/highlights; see app/services/ai_matching.py';
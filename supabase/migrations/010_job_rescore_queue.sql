@@ -0,0 +1,60 @@
+-- Background re-scoring of a job's applications
+-- Editing a job's description or requirements makes its applications'
+-- fit_score stale. The API queues one job_rescores row per job; its re-score
+-- worker claims the row, re-matches the applications (highest current
+-- fit_score first) and records progress here. Applications whose
+-- match_fingerprint (migration 009) is already current are skipped, so a
+-- reclaimed or re-queued run resumes instead of starting over.
+
+CREATE TABLE IF NOT EXISTS job_rescores (
+    job_id UUID PRIMARY KEY REFERENCES jobs(id) ON DELETE CASCADE,
+    status VARCHAR(20) NOT NULL DEFAULT 'pending'
+        CHECK (status IN ('pending', 'processing', 'completed', 'failed')),
+    total INTEGER NOT NULL DEFAULT 0,
+    rescored INTEGER NOT NULL DEFAULT 0,
+    unchanged INTEGER NOT NULL DEFAULT 0,
+    failed INTEGER NOT NULL DEFAULT 0,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    requested_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+    started_at TIMESTAMP WITH TIME ZONE,
+    heartbeat_at TIMESTAMP WITH TIME ZONE,
+    finished_at TIMESTAMP WITH TIME ZONE
+);
+
+CREATE INDEX IF NOT EXISTS idx_job_rescores_queue
+    ON job_rescores(requested_at)
+    WHERE status IN ('pending', 'processing');
+
+-- Claim up to batch_size queued jobs for one worker. SKIP LOCKED lets several
+-- API instances share the queue; a run whose worker stopped sending
+-- heartbeats for stale_after_seconds becomes claimable again.
+CREATE OR REPLACE FUNCTION claim_job_rescores(
+    batch_size INTEGER,
+    stale_after_seconds INTEGER,
+    max_attempts INTEGER
+)
+RETURNS SETOF job_rescores AS $$
+    UPDATE job_rescores r
+    SET status = 'processing',
+        started_at = NOW(),
+        heartbeat_at = NOW(),
+        attempts = r.attempts + 1
+    WHERE r.job_id IN (
+        SELECT job_id FROM job_rescores
+        WHERE attempts < max_attempts
+          AND (
+              status = 'pending'
+              OR (status = 'processing'
+                  AND heartbeat_at < NOW() - make_interval(secs => stale_after_seconds))
+          )
+        ORDER BY requested_at
+        LIMIT batch_size
+        FOR UPDATE SKIP LOCKED
+    )
+    RETURNING r.*;
+$$ LANGUAGE sql;
+
+ALTER TABLE job_rescores ENABLE ROW LEVEL SECURITY;
+
+COMMENT ON TABLE job_rescores IS 'Re-score queue and progress per job; see app/services/job_rescoring.py';
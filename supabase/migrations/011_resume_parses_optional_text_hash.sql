@@ -0,0 +1,13 @@
+-- Resume parse cache: text_hash is optional
+-- Scanned and image-only PDFs extract to (almost) no text, so every one of
+-- them hashed to the same text_hash and reused the first such parse. The
+-- API now records text_hash only for extracted text long enough to identify
+-- a resume; other parses are cached by content_hash alone.
+
+ALTER TABLE resume_parses ALTER COLUMN text_hash DROP NOT NULL;
+
+-- Entries written before this migration for empty text can't be told apart
+-- from each other; stop them from matching on text
+UPDATE resume_parses
+SET text_hash = NULL
+WHERE text_hash = encode(sha256(''::bytea), 'hex');